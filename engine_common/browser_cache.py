@@ -0,0 +1,201 @@
+# engine_common/browser_cache.py
+"""
+실행 간에 유지되는 Chrome 프로필(HTTP 디스크 캐시) 관리.
+
+_make_driver 가 매번 임시 프로필로 Chrome 을 띄우면, 실행마다 ihd/kpc/kie/kacpta 의 JS 번들·CSS 를
+처음부터 다시 받는다. BROWSER_CACHE_DIR 을 지정하면 풀 슬롯마다 고정 user-data-dir 을 쓰게 해서
+다음 실행(스케줄 실행 포함)은 디스크 캐시에서 정적 파일을 바로 읽는다.
+
+- 슬롯: <dir>/slot-<n>  (n = 0 … BROWSER_CACHE_SLOTS-1, 기본 DRIVER_POOL_SIZE)
+  · 슬롯마다 잠금 파일(slot-<n>.lock)을 OS 파일 잠금으로 잡는다 → 같은 프로필을 두 Chrome 이 동시에 쓰지 않음
+    (다른 프로세스의 run_once 포함). 프로세스가 죽으면 OS 가 잠금을 푼다.
+  · 빈 슬롯이 없으면 예전처럼 임시 프로필로 띄운다.
+- 정리
+  · 잡을 때: 크기가 상한(BROWSER_CACHE_MB × 2)을 넘으면 지우고 새로 시작, 남은 Singleton* 잠금 파일 삭제
+  · 기동 실패(프로필 손상 등): 슬롯을 지우고 한 번 더 시도
+  · 드라이버 폐기(풀 재활용/종료) 때: 크기 상한을 넘었으면 지움
+- Chrome 의 --disk-cache-size 로 HTTP 캐시 자체도 BROWSER_CACHE_MB 로 제한
+
+launch(opts, start) : 슬롯을 잡아 opts 에 프로필 인자를 넣고 start(opts) 로 기동 → 드라이버
+release(driver)     : 드라이버 quit 뒤 호출(DriverPool on_discard) → 슬롯 반납
+
+환경변수
+  BROWSER_CACHE_DIR=          비어 있으면 사용 안 함 (예: data/_browser)
+  BROWSER_CACHE_MB=300        슬롯당 HTTP 디스크 캐시 상한(MB)
+  BROWSER_CACHE_SLOTS=        슬롯 수 (기본 DRIVER_POOL_SIZE — auto 면 engine_common.memory 산정값, 없으면 2)
+"""
+from __future__ import annotations
+import os, shutil, threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from engine_common import memory
+
+BROWSER_CACHE_DIR   = os.getenv("BROWSER_CACHE_DIR", "").strip()
+BROWSER_CACHE_MB    = float(os.getenv("BROWSER_CACHE_MB", "300"))
+BROWSER_CACHE_SLOTS = int(os.getenv("BROWSER_CACHE_SLOTS") or 0) or memory.env_size("DRIVER_POOL_SIZE", 2, memory.ENGINE_DRIVER_MB)
+
+_SINGLETON = ("SingletonLock", "SingletonSocket", "SingletonCookie")
+
+try:
+    import fcntl
+except ImportError:       # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+def _try_lock(f) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f) -> None:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    f.close()
+
+
+def dir_size_mb(path: Path) -> float:
+    total = 0
+    for dirpath, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                continue
+    return total / (1024 * 1024)
+
+
+class Slot:
+    def __init__(self, root: Path, n: int, lockfile):
+        self.n = n
+        self.path = root / f"slot-{n}"
+        self._lockfile = lockfile
+
+    def too_large(self) -> bool:
+        return self.path.exists() and dir_size_mb(self.path) > BROWSER_CACHE_MB * 2
+
+    def wipe(self, why: str) -> None:
+        print(f"[browser-cache] slot-{self.n}: reset ({why})")
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def prepare(self) -> None:
+        if self.too_large():
+            self.wipe(f"> {BROWSER_CACHE_MB * 2:.0f}MB")
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name in _SINGLETON:            # 비정상 종료한 Chrome 이 남긴 잠금 (슬롯 잠금을 잡았으니 쓰는 쪽 없음)
+            try:
+                os.unlink(self.path / name)
+            except OSError:
+                pass
+
+    def release(self) -> None:
+        if self.too_large():
+            self.wipe(f"> {BROWSER_CACHE_MB * 2:.0f}MB")
+        _unlock(self._lockfile)
+
+
+class ProfileSlots:
+    def __init__(self, root, slots: int = 2):
+        self.root = Path(root)
+        self.slots = max(1, int(slots))
+        self._held: Dict[int, Slot] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Optional[Slot]:
+        """비어 있는 슬롯 하나 (다른 스레드/프로세스가 쓰는 슬롯은 건너뜀). 없으면 None."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            for n in range(self.slots):
+                if n in self._held:
+                    continue
+                f = open(self.root / f"slot-{n}.lock", "a+")
+                if not _try_lock(f):
+                    f.close()
+                    continue
+                slot = self._held[n] = Slot(self.root, n, f)
+                break
+            else:
+                return None
+        slot.prepare()
+        return slot
+
+    def release(self, slot: Slot) -> None:
+        with self._lock:
+            self._held.pop(slot.n, None)
+        slot.release()
+
+
+_SLOTS: Optional[ProfileSlots] = None
+_bound: Dict[int, Slot] = {}            # id(driver) → 슬롯
+_init_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return bool(BROWSER_CACHE_DIR)
+
+
+def _slots() -> ProfileSlots:
+    global _SLOTS
+    with _init_lock:
+        if _SLOTS is None:
+            _SLOTS = ProfileSlots(BROWSER_CACHE_DIR, BROWSER_CACHE_SLOTS)
+        return _SLOTS
+
+
+def _with_profile(opts, slot: Slot):
+    opts.add_argument(f"--user-data-dir={slot.path.resolve()}")
+    opts.add_argument(f"--disk-cache-size={int(BROWSER_CACHE_MB * 1024 * 1024)}")
+    return opts
+
+
+def launch(opts, start: Callable[[Any], Any]):
+    """
+    start(opts) 로 드라이버 기동. 캐시 사용 시 빈 슬롯의 프로필로 띄우고,
+    기동에 실패하면 프로필을 지우고 한 번 더 시도한다. 빈 슬롯이 없으면 임시 프로필.
+    """
+    if not enabled():
+        return start(opts)
+    slots = _slots()
+    slot = slots.acquire()
+    if slot is None:
+        print("[browser-cache] no free profile slot → temporary profile")
+        return start(opts)
+    opts = _with_profile(opts, slot)
+    try:
+        try:
+            d = start(opts)
+        except Exception as e:
+            slot.wipe(f"launch failed: {type(e).__name__}")
+            slot.prepare()
+            d = start(opts)
+    except Exception:
+        slots.release(slot)
+        raise
+    with _init_lock:
+        _bound[id(d)] = slot
+    return d
+
+
+def release(driver) -> None:
+    """드라이버를 quit 한 뒤 호출 → 슬롯 반납 (크기 상한을 넘었으면 정리)."""
+    with _init_lock:
+        slot = _bound.pop(id(driver), None)
+    if slot is not None:
+        _slots().release(slot)
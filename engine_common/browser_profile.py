@@ -0,0 +1,170 @@
+# engine_common/browser_profile.py
+"""
+스크래핑용 경량 Chrome 프로필.
+
+사설 사이트(ihd/kpc/kie/kca-coffee …)는 표 텍스트만 필요하지만, 기본 Chrome 은 이미지·폰트·동영상·
+분석 스크립트까지 모두 받고 load 이벤트까지 기다린다. 여기서는
+
+- configure(opts)  : page load 전략 eager(DOMContentLoaded 에서 반환) + 불필요한 백그라운드 기능 끄기
+- apply(driver)    : CDP Network.setBlockedURLs 로 종류별(이미지/미디어/폰트/트래커/CSS) 요청 차단
+- scope(allow, block): 탭 설정(cert_map 의 allow:/block:)으로 현재 스레드의 차단 종류를 조정
+                       → 풀에서 드라이버를 빌릴 때(DriverPool on_lease)와 runner 호출 직전에 apply
+
+차단 목록은 드라이버마다 마지막으로 적용한 값과 같으면 다시 보내지 않는다(탭이 바뀔 때만 CDP 1회).
+img 의 src 속성은 차단과 무관하게 DOM 에 남으므로 이미지 URL 만 읽는 탭은 allow 가 필요 없다.
+CSS 차단은 화면 배치(offsetParent / getComputedStyle 로 보이는 요소 판단)가 바뀌므로 기본값에서 빼고
+block: [css] 로 명시한 탭에서만 쓴다.
+
+환경변수
+  BROWSER_PROFILE=lite                      lite | full (full = 예전 동작: 차단 없음, load 까지 대기)
+  BROWSER_BLOCK=images,media,fonts,trackers lite 에서 기본으로 차단할 종류
+  BROWSER_PAGE_LOAD=eager                   lite 의 page load 전략 (normal | eager | none)
+"""
+from __future__ import annotations
+import os, threading
+from contextlib import contextmanager
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+BROWSER_PROFILE   = os.getenv("BROWSER_PROFILE", "lite").strip().lower()
+BROWSER_BLOCK     = os.getenv("BROWSER_BLOCK", "images,media,fonts,trackers")
+BROWSER_PAGE_LOAD = os.getenv("BROWSER_PAGE_LOAD", "eager")
+
+_EXT = {
+    "images": ("png", "jpg", "jpeg", "gif", "webp", "bmp", "ico", "svg"),
+    "media":  ("mp4", "webm", "mp3", "m4a", "ogg", "avi", "mov"),
+    "fonts":  ("woff", "woff2", "ttf", "otf", "eot"),
+    "css":    ("css",),
+}
+_TRACKERS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "connect.facebook.com", "wcs.naver.net", "wcs.naver.com", "acecounter.com",
+    "logger.co.kr", "hotjar.com", "clarity.ms", "t1.daumcdn.net/kas",
+)
+KINDS: FrozenSet[str] = frozenset(_EXT) | {"trackers"}
+
+_ARGS = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--mute-audio",
+    "--autoplay-policy=user-gesture-required",
+)
+
+
+def _kinds(values: Optional[Iterable[str]]) -> FrozenSet[str]:
+    if isinstance(values, str):
+        values = values.split(",")
+    out = {str(v).strip().lower() for v in values or () if str(v).strip()}
+    unknown = out - KINDS
+    if unknown:
+        print(f"[WARN] browser_profile: unknown resource kinds {sorted(unknown)}")
+    return frozenset(out & KINDS)
+
+
+def enabled() -> bool:
+    return BROWSER_PROFILE != "full"
+
+
+def default_blocked() -> FrozenSet[str]:
+    return _kinds(BROWSER_BLOCK) if enabled() else frozenset()
+
+
+def configure(opts):
+    """selenium ChromeOptions 에 경량 프로필 적용 (full 이면 그대로 반환)."""
+    if not enabled():
+        return opts
+    opts.page_load_strategy = BROWSER_PAGE_LOAD
+    for a in _ARGS:
+        opts.add_argument(a)
+    return opts
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 탭별 조정 (스레드별: run_once --all 병렬 실행에서 자격증마다 독립)
+# ──────────────────────────────────────────────────────────────────────────────
+_local = threading.local()
+
+
+def blocked_kinds() -> FrozenSet[str]:
+    """현재 스레드에서 차단할 종류 (기본값 → scope 의 allow 제외 / block 추가)."""
+    kinds = getattr(_local, "kinds", None)
+    return default_blocked() if kinds is None else kinds      # 빈 집합(모두 허용)도 그대로
+
+
+@contextmanager
+def scope(allow: Optional[Iterable[str]] = None, block: Optional[Iterable[str]] = None):
+    """with scope(t.get("allow"), t.get("block")): ... → 블록 안에서 빌리거나 apply 한 드라이버에 반영."""
+    prev = getattr(_local, "kinds", None)
+    kinds = (default_blocked() if prev is None else prev) - _kinds(allow)
+    if enabled():
+        kinds |= _kinds(block)
+    _local.kinds = kinds
+    try:
+        yield kinds
+    finally:
+        _local.kinds = prev
+
+
+def merge(tabs: Iterable[dict]) -> Tuple[List[str], List[str]]:
+    """
+    드라이버 하나로 여러 탭을 도는 경우(사이트 단위 수집)의 (allow, block):
+    어느 한 탭이라도 허용한 종류는 허용, 모든 탭이 차단한 종류만 추가 차단.
+    """
+    tabs = list(tabs)
+    allow = set().union(*(_kinds(t.get("allow")) for t in tabs)) if tabs else set()
+    blocks = [_kinds(t.get("block")) for t in tabs]
+    block = set.intersection(*(set(b) for b in blocks)) if blocks else set()
+    return sorted(allow), sorted(block)
+
+
+def patterns(kinds: Iterable[str]) -> List[str]:
+    """차단 종류 → Network.setBlockedURLs 패턴 (* 와일드카드, 쿼리스트링 붙은 URL 포함)."""
+    out: List[str] = []
+    for k in sorted(kinds):
+        if k == "trackers":
+            out.extend(f"*{h}*" for h in _TRACKERS)
+            continue
+        for ext in _EXT.get(k, ()):
+            out.extend((f"*.{ext}", f"*.{ext}?*"))
+    return out
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 드라이버 적용
+# ──────────────────────────────────────────────────────────────────────────────
+_applied: Dict[int, Tuple[str, ...]] = {}      # id(driver) → 마지막으로 보낸 패턴
+_unsupported: set = set()
+_lock = threading.Lock()
+
+
+def apply(driver, kinds: Optional[Iterable[str]] = None) -> bool:
+    """
+    driver 에 차단 목록 적용 (kinds 기본값 = blocked_kinds()). 같은 목록이면 CDP 호출 없음.
+    CDP 를 지원하지 않는 드라이버(재생용 등)는 한 번 경고 후 무시. 적용했으면 True.
+    """
+    if driver is None or (not enabled() and kinds is None):
+        return False
+    pats = tuple(patterns(blocked_kinds() if kinds is None else _kinds(kinds)))
+    key = id(driver)
+    with _lock:
+        if key in _unsupported or _applied.get(key) == pats:
+            return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(pats)})
+    except Exception as e:
+        with _lock:
+            _unsupported.add(key)
+        print(f"[WARN] browser_profile: request blocking unavailable ({type(e).__name__})")
+        return False
+    with _lock:
+        _applied[key] = pats
+    return True
+
+
+def forget(driver) -> None:
+    """드라이버 폐기 시 적용 기록 삭제 (id 재사용 대비)."""
+    with _lock:
+        _applied.pop(id(driver), None)
+        _unsupported.discard(id(driver))
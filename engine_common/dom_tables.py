@@ -0,0 +1,215 @@
+# engine_common/dom_tables.py
+"""
+브라우저 안에서 표를 바로 구조화해서 꺼내기 (driver.page_source + BeautifulSoup 대체).
+
+page_source 는 렌더링된 DOM 전체를 직렬화해 WebDriver 로 보내고, Python 에서 다시 파싱한다.
+여기서는 execute_script 한 번으로 페이지 안에서
+
+  1) 대상 표 찾기   : 헤더 키워드(keywords) / 제목(heading, h3·h4 …) 다음 표 / css / 보이는 표만(visible_only)
+  2) 격자 펼치기    : rowspan/colspan — engine_common.table_grid.build_grid 와 같은 규칙
+                      (tbody 행만, style 의 display:none 셀 제외, rowspan 은 표 끝에서 자름)
+  3) 셀 내용        : 텍스트 조각(text node, script/style 제외) + img src + li 목록
+
+을 JSON 으로 받아 table_grid.Grid 로 복원한다 → 기존 records() / grid.at() / cell.text(sep) 파서를 그대로 쓴다.
+병합 셀은 한 번만 보내고 칸에는 번호만 둔다.
+
+Python HTML 파서가 필요한 탭은 table_html()/tables_html() 로 대상 표의 outerHTML 만 받는다(페이지 전체 대신).
+
+keywords: 항목마다 문자열(반드시 포함) 또는 튜플/리스트(그 중 하나 포함).
+          헤더 텍스트 = thead 의 모든 th/td (thead 가 없으면 첫 행), 공백은 한 칸으로 정리.
+          예) ["회차", ("접수", "원서접수"), ("발표", "합격자")]
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Union
+from urllib.parse import urljoin
+
+from engine_common.table_grid import Cell, Grid
+
+Keywords = Sequence[Union[str, Sequence[str]]]
+
+_JS = r"""
+const o = arguments[0];
+const SKIP = new Set(["SCRIPT", "STYLE", "TEMPLATE"]);
+const SECTIONS = ["THEAD", "TBODY", "TFOOT"];
+const norm = s => (s || "").replace(/\s+/g, " ").trim();
+function strings(el, out) {
+  for (const n of el.childNodes) {
+    if (n.nodeType === 3) out.push(n.nodeValue);
+    else if (n.nodeType === 1 && !SKIP.has(n.tagName)) strings(n, out);
+  }
+  return out;
+}
+function visible(el) {
+  return !!(el.offsetParent !== null || el.getClientRects().length);
+}
+function hidden(el) {
+  const s = el.getAttribute("style");
+  return !!s && s.replace(/\s/g, "").toLowerCase().includes("display:none");
+}
+function span(v) {
+  return /^\s*\d+\s*$/.test(v || "") ? Math.max(1, parseInt(v, 10)) : 1;
+}
+function headerText(t) {
+  const thead = [...t.children].find(c => c.tagName === "THEAD");
+  const cells = thead ? thead.querySelectorAll("th,td")
+                      : ((t.querySelector("tr") || {children: []}).children);
+  return [...cells].filter(c => c.tagName === "TH" || c.tagName === "TD")
+                   .map(c => norm(strings(c, []).join(""))).join(" ");
+}
+function matches(t) {
+  if (!o.keywords || !o.keywords.length) return true;
+  const h = headerText(t);
+  return o.keywords.every(k => Array.isArray(k) ? k.some(a => h.includes(a)) : h.includes(k));
+}
+function cellJson(td, r, c, rs, cs) {
+  const d = {t: td.tagName.toLowerCase(), r: r, c: c, rs: rs, cs: cs, s: strings(td, [])};
+  const imgs = td.querySelectorAll("img");
+  if (imgs.length) d.i = [...imgs].map(i => i.getAttribute("src") || "");
+  const lis = td.querySelectorAll("li");
+  if (lis.length) d.l = [...lis].map(li => strings(li, []));
+  return d;
+}
+function rowEls(t) {
+  const kids = [...t.children];
+  if (o.body_only) {
+    const bodies = kids.filter(c => c.tagName === "TBODY");
+    if (bodies.length) return bodies.flatMap(b => [...b.children].filter(r => r.tagName === "TR"));
+  }
+  const out = [];
+  for (const c of kids) {
+    if (c.tagName === "TR") out.push(c);
+    else if (SECTIONS.includes(c.tagName)) out.push(...[...c.children].filter(r => r.tagName === "TR"));
+  }
+  return out;
+}
+function grid(t) {
+  const trs = rowEls(t), cells = [], rows = [], carry = [], left = [];
+  trs.forEach((tr, r) => {
+    const row = [];
+    for (const td of tr.children) {
+      if (!(td.tagName === "TH" || td.tagName === "TD") || (o.skip_hidden && hidden(td))) continue;
+      let c = row.length;
+      while (c < left.length && left[c] > 0) { row.push(carry[c]); left[c]--; c++; }
+      const rs = Math.min(span(td.getAttribute("rowspan")), trs.length - r);
+      const cs = span(td.getAttribute("colspan"));
+      const idx = cells.push(cellJson(td, r, c, rs, cs)) - 1;
+      for (let cc = c; cc < c + cs; cc++) {
+        if (cc === left.length) { carry.push(-1); left.push(0); }
+        row.push(idx); carry[cc] = idx; left[cc] = rs - 1;
+      }
+    }
+    for (let cc = row.length; cc < left.length; cc++) {
+      if (left[cc] > 0) { left[cc]--; row.push(carry[cc]); } else row.push(-1);
+    }
+    rows.push(row);
+  });
+  const ncols = Math.max(0, ...rows.map(r => r.length));
+  for (const r of rows) while (r.length < ncols) r.push(-1);
+  const thead = [...t.children].find(c => c.tagName === "THEAD");
+  const htr = (thead || t).querySelector("tr");
+  const header = htr ? [...htr.children].filter(c => c.tagName === "TH" || c.tagName === "TD")
+                                        .map((c, i) => cellJson(c, 0, i, 1, 1)) : [];
+  return {header: header, cells: cells, rows: rows};
+}
+
+const root = (o.root && document.querySelector(o.root)) || document;
+let tables = [...root.querySelectorAll(o.css || "table")].filter(t => t.tagName === "TABLE");
+if (o.visible_only) tables = tables.filter(visible);
+if (o.heading) {
+  const heads = [...document.querySelectorAll(o.heading_tags)]
+    .filter(h => h.textContent.includes(o.heading) && (!o.visible_only || visible(h)));
+  const picked = [];
+  for (const h of heads) {
+    const t = tables.find(t => h.compareDocumentPosition(t) & Node.DOCUMENT_POSITION_FOLLOWING);
+    if (t && !picked.includes(t)) picked.push(t);
+  }
+  tables = picked;
+}
+tables = tables.filter(matches);
+if (o.outermost) tables = tables.filter(t => !tables.some(p => p !== t && p.contains(t)));
+if (o.limit > 0) tables = tables.slice(0, o.limit);
+return tables.map(t => o.html ? t.outerHTML : grid(t));
+"""
+
+
+class JsCell(Cell):
+    """브라우저에서 받은 셀 (원본 lxml 요소 없음). 텍스트 조각/이미지/목록은 JSON 에 들어 있다."""
+    __slots__ = ("_imgs", "_items")
+
+    def __init__(self, d: Dict[str, Any]):
+        self.el = None
+        self.name = d.get("t") or "td"
+        self.r0, self.c0 = d.get("r", 0), d.get("c", 0)
+        self.rowspan, self.colspan = d.get("rs", 1), d.get("cs", 1)
+        self._strings = list(d.get("s") or [])
+        self._text = {}
+        self._imgs = list(d.get("i") or [])
+        self._items = [list(x) for x in d.get("l") or []]
+
+    def get(self, attr: str, default=None):
+        return default
+
+    def imgs(self, base: Optional[str] = None) -> List[str]:
+        return [urljoin(base, s) for s in self._imgs] if base else list(self._imgs)
+
+    def list_items(self, sep: str = " ") -> List[str]:
+        return [sep.join(parts) for parts in self._items]
+
+
+def grid_from_json(d: Optional[Dict[str, Any]]) -> Optional[Grid]:
+    """_JS 결과(표 1개) → table_grid.Grid (셀 번호 -1 은 빈 칸)."""
+    if not d:
+        return None
+    cells = [JsCell(c) for c in d.get("cells") or []]
+    rows = [[cells[i] if i >= 0 else None for i in row] for row in d.get("rows") or []]
+    return Grid(rows, [JsCell(c) for c in d.get("header") or []])
+
+
+def _opts(keywords: Keywords, heading: Optional[str], heading_tags: Sequence[str], css: str,
+          root: Optional[str], limit: Optional[int], visible_only: bool, body_only: bool,
+          skip_hidden: bool, html: bool, outermost: bool = False) -> Dict[str, Any]:
+    return {
+        "keywords": [k if isinstance(k, str) else list(k) for k in keywords or ()],
+        "heading": heading, "heading_tags": ",".join(heading_tags), "css": css, "root": root,
+        "limit": limit or 0, "visible_only": visible_only, "body_only": body_only,
+        "skip_hidden": skip_hidden, "html": html, "outermost": outermost,
+    }
+
+
+def find_grids(driver, keywords: Keywords = (), *, heading: Optional[str] = None,
+               heading_tags: Sequence[str] = ("h3", "h4"), css: str = "table", root: Optional[str] = None,
+               limit: Optional[int] = None, visible_only: bool = False, body_only: bool = True,
+               skip_hidden: bool = True) -> List[Grid]:
+    """조건에 맞는 표들(문서 순서) → Grid 목록. execute_script 1회."""
+    res = driver.execute_script(_JS, _opts(keywords, heading, heading_tags, css, root, limit,
+                                           visible_only, body_only, skip_hidden, False))
+    return [g for g in (grid_from_json(d) for d in res or []) if g is not None]
+
+
+def find_grid(driver, keywords: Keywords = (), **kw) -> Optional[Grid]:
+    """조건에 맞는 첫 표 → Grid (없으면 None)."""
+    grids = find_grids(driver, keywords, limit=1, **kw)
+    return grids[0] if grids else None
+
+
+def tables_html(driver, keywords: Keywords = (), *, heading: Optional[str] = None,
+                heading_tags: Sequence[str] = ("h3", "h4"), css: str = "table", root: Optional[str] = None,
+                limit: Optional[int] = None, visible_only: bool = False,
+                outermost: bool = False) -> List[str]:
+    """
+    조건에 맞는 표들의 outerHTML (Python 파서용 raw HTML — 페이지 전체 대신 표만).
+    outermost=True 면 다른 표 안에 든 표는 빼서, 이어 붙여도 중첩 표가 두 번 나오지 않게 한다.
+    """
+    res = driver.execute_script(_JS, _opts(keywords, heading, heading_tags, css, root, limit,
+                                           visible_only, True, True, True, outermost))
+    return [h for h in res or [] if h]
+
+
+def table_html(driver, keywords: Keywords = (), **kw) -> Optional[str]:
+    res = tables_html(driver, keywords, limit=1, **kw)
+    return res[0] if res else None
+
+
+def page_tables_html(driver) -> str:
+    """페이지의 (바깥) 표들만 이어 붙인 HTML — 표만 읽는 parse_page(html) 를 page_source 대신 먹일 때."""
+    return "".join(tables_html(driver, outermost=True))
@@ -0,0 +1,319 @@
+# engine_common/driver_pool.py
+"""
+WebDriver 풀.
+
+Chrome 기동(수 초)이 대부분의 페이지 스크랩보다 길기 때문에, 탭마다 새로 띄우고 quit 하는 대신
+미리 띄워 둔 브라우저를 빌려주고 돌려받는다.
+
+- warm()        : size 개까지 백그라운드로 미리 기동
+- lease()       : with 블록 동안 드라이버 1개 대여 → 반납 시 상태 초기화(쿠키/스토리지/about:blank)
+- map(fn, items): 한 runner 가 여러 드라이버로 fan-out (예: barista 1급/2급 페이지 동시 수집)
+- 재활용        : max_pages 페이지를 넘기거나 브라우저 프로세스 트리 RSS 가 max_rss_mb 를 넘으면
+                  반납 시 quit 후 새로 띄움 (shm_size 2GB 안에 머무르기 위함)
+
+드라이버 생성은 factory(호출 가능 객체)에 맡긴다 → selenium 옵션은 호출부(run_once._make_driver)가 소유.
+on_lease(driver) / on_discard(driver): 대여 직전 / 폐기(quit 후) 시 호출 (예: 탭별 요청 차단 목록 적용, engine_common.browser_profile).
+
+환경변수(run_once 기본값)
+  DRIVER_POOL_SIZE=2   DRIVER_MAX_PAGES=40   DRIVER_MAX_RSS_MB=900
+"""
+from __future__ import annotations
+import os, queue, threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, List, Optional
+
+_RESET_JS = "try{window.localStorage.clear();window.sessionStorage.clear();}catch(e){}"
+
+
+def _proc_tree_rss_mb(pid: Optional[int]) -> float:
+    """pid 와 모든 자손 프로세스의 RSS 합(MB). /proc 가 없으면 0."""
+    if not pid or not os.path.isdir("/proc"):
+        return 0.0
+    children: dict[int, list[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read().decode("utf-8", "replace")
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    total_kb, stack = 0, [pid]
+    while stack:
+        p = stack.pop()
+        stack.extend(children.get(p, ()))
+        try:
+            with open(f"/proc/{p}/status", "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024.0
+
+
+def _driver_pid(driver) -> Optional[int]:
+    try:
+        return driver.service.process.pid
+    except Exception:
+        return None
+
+
+class DriverPool:
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 2,
+        max_pages: int = 40,
+        max_rss_mb: float = 900.0,
+        on_lease: Optional[Callable[[Any], Any]] = None,
+        on_discard: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.factory = factory
+        self.on_lease = on_lease
+        self.on_discard = on_discard
+        self.size = max(1, int(size))
+        self.max_pages = max(1, int(max_pages))
+        self.max_rss_mb = float(max_rss_mb)
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._live = 0            # 기동 중 + 유휴 + 대여 중
+        self._pages: dict[int, int] = {}
+        self._raw_get: dict[int, Callable] = {}
+        self._closed = False
+        self.stats = {"launched": 0, "recycled": 0, "leases": 0}
+        self.warmed = threading.Event()     # 드라이버가 한 번이라도 유휴 큐에 들어감 (engine_server /readyz)
+
+    # ── 생성/폐기 ──
+    def _launch(self):
+        d = self.factory()
+        orig_get = d.get
+
+        def _counting_get(url, *a, **kw):
+            self._pages[id(d)] = self._pages.get(id(d), 0) + 1
+            return orig_get(url, *a, **kw)
+
+        d.get = _counting_get     # 페이지 수 집계(재활용 기준)
+        self._pages[id(d)] = 0
+        self._raw_get[id(d)] = orig_get
+        self.stats["launched"] += 1
+        return d
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._closed or self._live >= self.size:
+                return False
+            self._live += 1
+            return True
+
+    def _new(self):
+        try:
+            return self._launch()
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+
+    def _discard(self, d) -> None:
+        self._pages.pop(id(d), None)
+        self._raw_get.pop(id(d), None)
+        try:
+            d.quit()
+        except Exception:
+            pass
+        if self.on_discard is not None:
+            try:
+                self.on_discard(d)
+            except Exception as e:
+                print(f"[WARN] driver on_discard failed: {e}")
+        with self._lock:
+            self._live -= 1
+
+    def warm(self, n: Optional[int] = None) -> None:
+        """n(기본 size)개까지 백그라운드 스레드로 미리 기동."""
+        def _bg():
+            try:
+                d = self._new()
+            except Exception as e:
+                print(f"[WARN] driver warm-up failed: {e}")
+                return
+            with self._lock:
+                closed = self._closed
+            if closed:           # 기동 중에 close() 가 지나갔으면 유휴 큐에 남기지 않고 바로 정리
+                self._discard(d)
+            else:
+                self._idle.put(d)
+                self.warmed.set()
+        want = self.size if n is None else min(self.size, n)
+        for _ in range(max(0, want - self._live)):
+            if self._reserve():
+                threading.Thread(target=_bg, daemon=True).start()
+
+    # ── 대여/반납 ──
+    def _leased(self, d):
+        self.stats["leases"] += 1
+        if self.on_lease is not None:
+            try:
+                self.on_lease(d)
+            except Exception as e:
+                print(f"[WARN] driver on_lease failed: {e}")
+        return d
+
+    def try_acquire(self):
+        """유휴 드라이버 또는 여유가 있으면 새 드라이버. 둘 다 없으면 None (기다리지 않음)."""
+        try:
+            d = self._idle.get_nowait()
+        except queue.Empty:
+            d = self._new() if self._reserve() else None
+        return self._leased(d) if d is not None else None
+
+    def acquire(self, timeout: Optional[float] = None):
+        waited = 0.0
+        while True:
+            d = self.try_acquire()
+            if d is not None:
+                return d
+            if timeout is not None and waited >= timeout:
+                raise TimeoutError("driver pool exhausted")
+            # 다른 runner 반납 또는 warm-up 완료 대기 (warm-up 실패 시 다시 기동 시도)
+            try:
+                d = self._idle.get(timeout=1.0)
+            except queue.Empty:
+                waited += 1.0
+                continue
+            return self._leased(d)
+
+    def _reset(self, d) -> bool:
+        try:
+            d.delete_all_cookies()
+            d.execute_script(_RESET_JS)
+            self._raw_get.get(id(d), d.get)("about:blank")   # 초기화 이동은 페이지 수에서 제외
+            return True
+        except Exception:
+            return False
+
+    def _worn_out(self, d) -> bool:
+        if self._pages.get(id(d), 0) >= self.max_pages:
+            return True
+        return self.max_rss_mb > 0 and _proc_tree_rss_mb(_driver_pid(d)) > self.max_rss_mb
+
+    def release(self, d, broken: bool = False) -> None:
+        if d is None:
+            return
+        if self._closed or broken or self._worn_out(d) or not self._reset(d):
+            if not (self._closed or broken):
+                self.stats["recycled"] += 1
+            self._discard(d)
+            return
+        self._idle.put(d)
+        self.warmed.set()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        d = self.acquire(timeout)
+        broken = False
+        try:
+            yield d
+        except BaseException:
+            broken = True        # 예외 뒤의 브라우저 상태는 믿지 않는다
+            raise
+        finally:
+            self.release(d, broken=broken)
+
+    # ── fan-out ──
+    def map(self, fn: Callable[[Any, Any], Any], items: Iterable[Any], driver=None) -> List[Any]:
+        """
+        fn(driver, item) 을 items 에 대해 실행, 입력 순서대로 결과 반환.
+        driver(이미 빌린 것)가 있으면 함께 쓰고, 풀에 여유가 있는 만큼만 추가로 빌려 병렬 실행.
+        """
+        items = list(items)
+        own = [driver] if driver is not None else []
+        extra: list = []
+        while len(own) + len(extra) < len(items):
+            d = self.try_acquire()
+            if d is None:
+                break
+            extra.append(d)
+        if not own and not extra:
+            extra.append(self.acquire())
+        drivers = own + extra
+        results: List[Any] = [None] * len(items)
+        broken = False
+        try:
+            if len(drivers) == 1:
+                for i, it in enumerate(items):
+                    results[i] = fn(drivers[0], it)
+                return results
+
+            todo: "queue.Queue[int]" = queue.Queue()
+            for i in range(len(items)):
+                todo.put(i)
+            errors: list = []
+
+            def _worker(d):
+                while not errors:
+                    try:
+                        i = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        results[i] = fn(d, items[i])
+                    except BaseException as e:
+                        errors.append(e)
+
+            threads = [threading.Thread(target=_worker, args=(d,), daemon=True) for d in drivers]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            if errors:
+                raise errors[0]
+            return results
+        except BaseException:
+            broken = True        # lease() 와 같이: 예외가 난 뒤의 브라우저 상태는 믿지 않는다
+            raise
+        finally:
+            for d in extra:
+                self.release(d, broken=broken)
+
+    def counts(self) -> dict:
+        """기동 중 + 유휴 + 대여 중(live) / 유휴(idle) 드라이버 수."""
+        with self._lock:
+            live = self._live
+        return {"live": live, "idle": self._idle.qsize()}
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                d = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(d)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# runner 에서 쓰는 현재 풀 (run_once 가 설정, 없으면 None)
+# ──────────────────────────────────────────────────────────────────────────────
+_CURRENT: Optional[DriverPool] = None
+
+
+def set_current(pool: Optional[DriverPool]) -> None:
+    global _CURRENT
+    _CURRENT = pool
+
+
+def current() -> Optional[DriverPool]:
+    return _CURRENT
+
+
+def fan_out(driver, fn: Callable[[Any, Any], Any], items: Iterable[Any]) -> List[Any]:
+    """runner 용: 풀이 있으면 풀로 병렬, 없으면 받은 driver 로 순차 실행."""
+    pool = _CURRENT
+    if pool is None:
+        return [fn(driver, it) for it in items]
+    return pool.map(fn, items, driver=driver)
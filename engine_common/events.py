@@ -0,0 +1,148 @@
+# engine_common/events.py
+"""
+배치 실행의 기계 판독용 진행/결과 스트림 (JSON Lines).
+
+사람용 로그("===== [jmcd] =====", "✔ saved(flat)")만으로는 백엔드(Spring 등)가 배치가 끝날 때까지
+기다렸다가 폴더를 훑어야 한다. 스트림을 켜면 단위(jmcd / cert)가 끝나는 즉시 한 줄씩 내보내므로
+호출 쪽은 첫 결과부터 바로 적재를 시작할 수 있다.
+
+이벤트 (한 줄 = JSON 객체 1개, 항상 "event", "ts" 포함)
+  {"event": "start", "kind": "jmcd"|"cert", "units": [...]}
+  {"event": "stage", "kind": ..., "id": ..., "stage": "fetch", "seconds": 1.2}      단계가 끝날 때마다
+  {"event": "unit",  "kind": ..., "id": ..., "ok": true, "seconds": 3.4,
+                     "stages": {"fetch": 1.2, ...}, "out": "...norm.json", "issues": [...], "doc": {...}}
+  {"event": "unit",  ..., "ok": false, "error": "SystemExit: 1"}
+  {"event": "end",   "kind": ..., "ok": 10, "failed": 1, "seconds": 42.0}
+
+"-" (stdout) 로 받으면 원래 stdout(fd 1)은 이벤트 전용이 되고, 사람용 print 와 자식 프로세스 출력은
+모두 stderr 로 간다 (fd 단위로 바꾸므로 run_public 의 자식 파이썬 프로세스도 포함).
+스트림을 열기 전(모듈 임포트 시점)의 print 는 stdout 에 남을 수 있으니 받는 쪽은 '{' 로 시작하지 않는 줄을 건너뛴다.
+
+사용
+  events.open_stream(target, inline)          # CLI 시작 시 1회
+  u = events.Unit("jmcd", jmcd); ... u.lap("fetch") ...; u.done(out=path, issues=...) / u.fail(e)
+  events.emit("end", ...)
+
+환경변수
+  ENGINE_EVENTS=             "-" = stdout, 파일 경로 = 그 파일에 이어 쓰기, 비어 있으면 끔
+  ENGINE_EVENTS_INLINE=0     1 이면 unit 이벤트에 정규화 결과 문서(doc)를 그대로 실음
+"""
+from __future__ import annotations
+import json, os, sys, threading, time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+ENGINE_EVENTS        = os.getenv("ENGINE_EVENTS", "").strip()
+ENGINE_EVENTS_INLINE = os.getenv("ENGINE_EVENTS_INLINE", "0") == "1"
+
+
+class EventStream:
+    def __init__(self, fp, inline: bool = False):
+        self._fp = fp
+        self.inline = inline
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        rec = {"event": event, "ts": round(time.time(), 3)}
+        rec.update(fields)
+        line = json.dumps(rec, ensure_ascii=False, default=str)
+        with self._lock:
+            self._fp.write(line + "\n")
+            self._fp.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fp.close()
+
+
+_CURRENT: Optional[EventStream] = None
+
+
+def _stdout_stream():
+    """fd 1 을 이벤트 전용으로 떼어 내고, 이후의 stdout(파이썬 print·자식 프로세스)은 stderr 로."""
+    sys.stdout.flush()
+    fd = os.dup(1)
+    os.dup2(2, 1)
+    return os.fdopen(fd, "w", encoding="utf-8", buffering=1)
+
+
+def open_stream(target: Optional[str] = None, inline: Optional[bool] = None) -> Optional[EventStream]:
+    """target: "-" | 파일 경로 | None(= ENGINE_EVENTS). 비어 있으면 끈 채로 None."""
+    global _CURRENT
+    target = (target if target is not None else ENGINE_EVENTS).strip()
+    if not target:
+        return None
+    if target == "-":
+        fp = _stdout_stream()
+    else:
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        fp = open(target, "a", encoding="utf-8")
+    _CURRENT = EventStream(fp, ENGINE_EVENTS_INLINE if inline is None else inline)
+    return _CURRENT
+
+
+def close_stream() -> None:
+    global _CURRENT
+    if _CURRENT is not None:
+        _CURRENT.close()
+        _CURRENT = None
+
+
+def current() -> Optional[EventStream]:
+    return _CURRENT
+
+
+def emit(event: str, **fields: Any) -> None:
+    """스트림이 꺼져 있으면 아무것도 하지 않음."""
+    if _CURRENT is not None:
+        _CURRENT.emit(event, **fields)
+
+
+class Unit:
+    """
+    한 단위(jmcd / cert)의 단계별 시간 + 결과 이벤트.
+    lap(name): 직전 lap(또는 생성) 이후 걸린 시간을 그 단계 시간으로 기록하고 stage 이벤트 발행.
+    """
+
+    def __init__(self, kind: str, id: str):
+        self.kind, self.id = kind, id
+        self.t0 = self._last = time.time()
+        self.stages: Dict[str, float] = {}
+        self.ok = False
+
+    def lap(self, stage: str) -> float:
+        now = time.time()
+        sec = round(now - self._last, 3)
+        self._last = now
+        self.stages[stage] = round(self.stages.get(stage, 0.0) + sec, 3)
+        emit("stage", kind=self.kind, id=self.id, stage=stage, seconds=sec)
+        return sec
+
+    def _base(self, ok: bool) -> Dict[str, Any]:
+        return {"kind": self.kind, "id": self.id, "ok": ok,
+                "seconds": round(time.time() - self.t0, 3), "stages": self.stages}
+
+    def done(self, out=None, issues=None, **extra: Any) -> None:
+        self.ok = True
+        if _CURRENT is None:
+            return
+        rec = self._base(True)
+        if out is not None:
+            rec["out"] = str(out)
+        if issues is not None:
+            rec["issues"] = issues
+        rec.update(extra)
+        if _CURRENT.inline and out is not None and Path(out).is_file():
+            try:
+                rec["doc"] = json.loads(Path(out).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"[WARN] events: cannot inline {out}: {e}")
+        _CURRENT.emit("unit", **rec)
+
+    def fail(self, err: BaseException, **extra: Any) -> None:
+        if _CURRENT is None:
+            return
+        rec = self._base(False)
+        rec["error"] = f"{type(err).__name__}: {err}"
+        rec.update(extra)
+        _CURRENT.emit("unit", **rec)
@@ -0,0 +1,279 @@
+# engine_common/freshness.py
+"""
+신선도 기반 재수집 계획: 시험일정 날짜 + 탭별 변경 이력으로 "무엇을, 언제" 다시 받을지 정한다.
+
+전체 갱신은 ~665 jmcd × 3탭을 똑같이 다시 받지만 변경 빈도는 크게 다르다
+(접수 시작이 다음 주인 종목의 시험정보 탭 ↔ 거의 안 바뀌는 우대현황 탭). 여기서는
+
+- observe(): 수집이 끝날 때마다 탭별 결과 섹션의 해시를 남겨 확인/변경 횟수와 시각을 쌓고,
+             시험일정에서 날짜(접수·시험·발표)를 뽑아 둔다
+             (run_public.process_jmcd / run_once.run 이 호출, 스냅샷 재생·fetch 없는 실행은 기록하지 않음)
+- plan()   : 탭마다 재수집 간격을 정하고 지난 비율(경과/간격)로 우선순위를 매겨, 하루 요청 예산 안에서
+             jmcd / cert 단위 계획을 만든다 → run_public.py --plan / run_once.py --plan 이 순서대로 실행
+
+재수집 간격 (탭)
+  기본 = 탭 설정의 recrawl:(예: 6h, 1d, 30d) → 없으면 탭 이름별 기본값(_DEFAULT_RECRAWL) → RECRAWL_DEFAULT
+  × 변경률 보정: 확인 대비 변경 비율이 높을수록 짧게(최소 0.4배), 한 번도 안 바뀌었으면 길게(최대 2배)
+  시험일정 탭(exam_info / exam_schedule): 가까운 날짜가 7일 안이면 ≤ RECRAWL_NEAR, 30일 안이면 ≤ 1일,
+  다가오는 날짜가 하나도 없으면 × 1.5 (새 회차 공고는 이 간격으로 확인)
+  처음 보는 탭은 항상 대상.
+
+요청 비용 (예산 계산용)
+  jmcd: 문서 열기 1 + 탭마다 1 / cert: 탭마다 1 (사설은 자격증 단위로 전체 탭을 다시 받음)
+
+상태 파일: {"jmcd:1320": {"tabs": {"exam_info": {"hash", "checked", "changed", "checks", "changes"}}, "dates": [...]}}
+
+환경변수
+  RECRAWL_STATE=            상태 파일 (기본: <CERT_DATA_DIR|Engine/data>/_cache/freshness.json)
+  RECRAWL_OBSERVE=1         0 이면 수집 결과를 기록하지 않음
+  RECRAWL_DEFAULT=7d        탭 기본 간격
+  RECRAWL_NEAR=6h           시험일정 날짜가 7일 안일 때 간격 상한
+  RECRAWL_BUDGET=800        plan() 의 하루 요청 예산 기본값
+"""
+from __future__ import annotations
+import hashlib, json, os, re, threading, time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+_BASE_DIR = Path(__file__).resolve().parents[1]
+
+_DUR = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*$", re.I)
+_UNIT_S = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(v: Any) -> float:
+    """600 / "45m" / "6h" / "7d" → 초."""
+    if isinstance(v, (int, float)):
+        return float(v)
+    m = _DUR.match(str(v or ""))
+    if not m:
+        raise ValueError(f"bad duration: {v!r}")
+    return float(m.group(1)) * _UNIT_S[m.group(2).lower()]
+
+
+RECRAWL_STATE   = os.getenv("RECRAWL_STATE", "").strip()
+RECRAWL_OBSERVE = os.getenv("RECRAWL_OBSERVE", "1") == "1"
+RECRAWL_DEFAULT = parse_duration(os.getenv("RECRAWL_DEFAULT", "7d"))
+RECRAWL_NEAR    = parse_duration(os.getenv("RECRAWL_NEAR", "6h"))
+RECRAWL_BUDGET  = int(os.getenv("RECRAWL_BUDGET", "800"))
+
+_DAY = 86400.0
+_DEFAULT_RECRAWL = {
+    "exam_info": _DAY, "exam_schedule": _DAY,
+    "basic_info": 7 * _DAY, "syllabus": 14 * _DAY,
+    "preference": 30 * _DAY,
+}
+SCHEDULE_TABS = ("exam_info", "exam_schedule")
+
+# 공공 정규화 결과(norm.json) 섹션 → 그 섹션을 만든 Q-Net 탭
+PUBLIC_SECTIONS = {
+    "basic_info": ("기본정보", "종목별검정현황"),
+    "exam_info": ("시험일정", "시험정보"),
+    "preference": ("우대현황",),
+}
+
+_DATE = re.compile(r"(\d{4})[.\-/]\s?(\d{1,2})[.\-/]\s?(\d{1,2})")
+
+
+def event_dates(events: Any) -> List[str]:
+    """시험일정(공공 이벤트 목록 / 사설 정기검정일정 …)의 문자열 값에서 날짜만 → 정렬된 ISO 목록."""
+    out = set()
+
+    def _walk(v):
+        if isinstance(v, dict):
+            for x in v.values():
+                _walk(x)
+        elif isinstance(v, list):
+            for x in v:
+                _walk(x)
+        elif isinstance(v, str):
+            for y, m, d in _DATE.findall(v):
+                try:
+                    out.add(date(int(y), int(m), int(d)).isoformat())
+                except ValueError:
+                    continue
+
+    _walk(events)
+    return sorted(out)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+                        .encode("utf-8")).hexdigest()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 상태 (변경 이력)
+# ──────────────────────────────────────────────────────────────────────────────
+class FreshnessState:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._data, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def unit(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            return json.loads(json.dumps(self._load().get(key) or {}))
+
+    def observe(self, key: str, sections: Dict[str, Any], events: Any = None,
+                now: Optional[float] = None) -> Dict[str, bool]:
+        """탭별 결과 섹션 기록 → {탭: 바뀌었는지}. 처음 본 탭은 변경으로 세지 않는다."""
+        now = time.time() if now is None else now
+        changed: Dict[str, bool] = {}
+        with self._lock:
+            data = self._load()
+            # 다른 프로세스(워커)가 쓴 기록을 덮지 않도록 저장 직전에 다시 읽어 합침
+            try:
+                data.update(json.loads(self.path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                pass
+            u = data.setdefault(key, {"tabs": {}})
+            for tab, value in sections.items():
+                h = _digest(value)
+                rec = u["tabs"].setdefault(tab, {"checks": 0, "changes": 0})
+                diff = rec.get("hash") is not None and rec["hash"] != h
+                if diff:
+                    rec["changes"] += 1
+                    rec["changed"] = now
+                rec.update(hash=h, checked=now, checks=rec["checks"] + 1)
+                changed[tab] = diff
+            if events is not None:
+                u["dates"] = event_dates(events)
+            self._save()
+        return changed
+
+
+_STATE: Optional[FreshnessState] = None
+
+
+def state() -> FreshnessState:
+    global _STATE
+    if _STATE is None:
+        root = os.getenv("CERT_DATA_DIR")
+        _STATE = FreshnessState(RECRAWL_STATE or (Path(root) if root else _BASE_DIR / "data") / "_cache" / "freshness.json")
+    return _STATE
+
+
+def observe(kind: str, id: str, sections: Dict[str, Any], events: Any = None) -> None:
+    """수집 결과 기록 (RECRAWL_OBSERVE=0 이면 무시, 실패해도 수집은 계속)."""
+    if not RECRAWL_OBSERVE or not sections:
+        return
+    try:
+        changed = state().observe(f"{kind}:{id}", sections, events)
+        moved = [t for t, c in changed.items() if c]
+        if moved:
+            print(f"[freshness] {kind}:{id} changed: {', '.join(moved)}")
+    except Exception as e:
+        print(f"[WARN] freshness: observe {kind}:{id} failed: {type(e).__name__}: {e}")
+
+
+def observe_public(jmcd: str, doc: Dict[str, Any], tabs: Iterable[str]) -> None:
+    """공공 norm.json → 이번에 받은 탭(tabs)의 섹션만 기록."""
+    sections = {t: {s: doc.get(s) for s in PUBLIC_SECTIONS.get(t, ())} for t in tabs}
+    observe("jmcd", jmcd, sections, doc.get("시험일정") if "exam_info" in sections else None)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 계획
+# ──────────────────────────────────────────────────────────────────────────────
+def base_interval(tab: str, tab_cfg: Optional[dict] = None) -> float:
+    if tab_cfg and tab_cfg.get("recrawl") is not None:
+        return parse_duration(tab_cfg["recrawl"])
+    return _DEFAULT_RECRAWL.get(tab, RECRAWL_DEFAULT)
+
+
+def interval(tab: str, rec: Dict[str, Any], dates: List[str], today: date,
+             tab_cfg: Optional[dict] = None) -> tuple[float, str]:
+    """탭의 재수집 간격(초)과 이유."""
+    iv = base_interval(tab, tab_cfg)
+    why = f"ttl {iv / 3600:.0f}h"
+    checks = rec.get("checks") or 0
+    if checks >= 2:
+        rate = (rec.get("changes") or 0) / (checks - 1)         # 비교 가능한 확인 수 대비 변경
+        factor = 2.0 if rate == 0 else max(0.4, min(2.0, 0.25 / rate))
+        iv *= factor
+        why += f" × {factor:.2f} (change rate {rate:.2f})"
+    if tab in SCHEDULE_TABS:
+        upcoming = [d for d in dates if d >= today.isoformat()]
+        if upcoming:
+            days = (date.fromisoformat(upcoming[0]) - today).days
+            cap = RECRAWL_NEAR if days <= 7 else (_DAY if days <= 30 else None)
+            if cap is not None and cap < iv:
+                iv = cap
+                why += f", next date in {days}d → {cap / 3600:.0f}h"
+        elif dates:
+            iv *= 1.5
+            why += ", no upcoming dates × 1.5"
+    return iv, why
+
+
+def unit_cost(kind: str, tabs: List[str]) -> int:
+    return (1 + len(tabs)) if kind == "jmcd" else len(tabs)
+
+
+def plan(units: Iterable[tuple], budget: Optional[int] = None, now: Optional[float] = None,
+         st: Optional[FreshnessState] = None) -> Dict[str, Any]:
+    """
+    units: (kind, id, {탭 이름: 탭 설정 dict}) 목록 → 우선순위 순 재수집 계획.
+    반환: {"generated_at", "budget", "cost", "units": [{kind, id, tabs, score, cost, reasons}], "deferred": [...]}
+    - 탭 점수 = 경과 / 간격 (≥ 1 이면 대상, 처음 보는 탭 = 1000)
+    - 단위 점수 = 대상 탭 점수의 최댓값, 예산을 넘으면 deferred 로 (점수 순으로 채움)
+    - 사설(cert)은 자격증 단위로 전체 탭을 다시 받으므로 tabs 는 설정 탭 전체
+    """
+    now = time.time() if now is None else now
+    st = st or state()
+    budget = RECRAWL_BUDGET if budget is None else budget
+    today = datetime.fromtimestamp(now).date()
+    cands = []
+    for kind, id, tab_cfgs in units:
+        u = st.unit(f"{kind}:{id}")
+        recs, dates = u.get("tabs") or {}, u.get("dates") or []
+        due, reasons, score = [], {}, 0.0
+        for tab, cfg in tab_cfgs.items():
+            rec = recs.get(tab) or {}
+            if not rec.get("checked"):
+                s, why = 1000.0, "never crawled"
+            else:
+                iv, why = interval(tab, rec, dates, today, cfg)
+                s = (now - rec["checked"]) / iv
+                why = f"{(now - rec['checked']) / 3600:.0f}h / {why}"
+            if s >= 1.0:
+                due.append(tab)
+                reasons[tab] = why
+                score = max(score, s)
+        if not due:
+            continue
+        tabs = list(tab_cfgs) if kind == "cert" else due
+        cands.append({"kind": kind, "id": id, "tabs": tabs, "score": round(score, 3),
+                      "cost": unit_cost(kind, tabs), "reasons": reasons})
+    cands.sort(key=lambda c: -c["score"])
+    picked, deferred, spent = [], [], 0
+    for c in cands:
+        if spent + c["cost"] <= budget:
+            picked.append(c)
+            spent += c["cost"]
+        else:
+            deferred.append({"kind": c["kind"], "id": c["id"], "score": c["score"]})
+    return {"generated_at": datetime.fromtimestamp(now).isoformat(timespec="seconds"),
+            "budget": budget, "cost": spent, "units": picked, "deferred": deferred}
+
+
+def load_plan(path, kind: str) -> List[Dict[str, Any]]:
+    """plan() 결과 파일 → 해당 kind 단위들 (우선순위 순)."""
+    with open(path, encoding="utf-8") as f:
+        return [u for u in json.load(f).get("units") or [] if u.get("kind") == kind]
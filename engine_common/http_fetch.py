@@ -0,0 +1,66 @@
+# engine_common/http_fetch.py
+"""
+JS 없이 서버 렌더링 HTML 만으로 파싱 가능한 탭을 위한 HTTP 빠른 경로.
+
+- 스레드별 requests.Session (커넥션 풀 + 재시도) → run_once --all 병렬 실행에서도 안전
+- 브라우저와 비슷한 헤더로 요청하고, 인코딩이 헤더에 없으면 본문에서 추정
+- has_markers(html, markers) 로 "기대한 표가 들어 있는지" 확인 → auto 모드에서 브라우저 폴백 판단
+
+환경변수
+  HTTP_TIMEOUT=10      요청 타임아웃(초)
+  HTTP_POOL_SIZE=16    호스트당 커넥션 풀 크기
+"""
+from __future__ import annotations
+import os, threading
+from typing import Iterable, Optional
+
+HTTP_TIMEOUT   = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+
+_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.6",
+}
+
+_local = threading.local()
+
+
+def session():
+    """현재 스레드의 공유 Session (처음 호출 시 생성)."""
+    s = getattr(_local, "session", None)
+    if s is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        s = requests.Session()
+        s.headers.update(_HEADERS)
+        retry = Retry(total=2, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset({"GET", "HEAD"}))
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE,
+                              pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        _local.session = s
+    return s
+
+
+def fetch_html(url: str, timeout: Optional[float] = None) -> str:
+    """GET → HTML 문자열. HTTP 오류는 예외로 올린다(requests.HTTPError 등)."""
+    r = session().get(url, timeout=timeout or HTTP_TIMEOUT)
+    r.raise_for_status()
+    # 헤더에 charset 이 없으면 requests 는 ISO-8859-1 로 가정 → 본문 기반 추정으로 교체
+    if not r.encoding or r.encoding.lower() == "iso-8859-1":
+        r.encoding = r.apparent_encoding or "utf-8"
+    return r.text
+
+
+def has_markers(html: Optional[str], markers: Iterable[str]) -> bool:
+    """markers 가 모두 html 안에 있으면 True (비어 있으면 '<table' 하나만 확인)."""
+    if not html:
+        return False
+    markers = list(markers or ()) or ["<table"]
+    return all(m in html for m in markers)
@@ -0,0 +1,242 @@
+# engine_common/memory.py
+"""
+워커 메모리 관리: RSS 측정/지표, 작업 수·RSS 상한 재활용, 임포트 뒤 fork, 가용 메모리 기반 크기 산정.
+
+긴 배치는 BeautifulSoup 트리·HTML 문자열·큰 dict 를 계속 만들고, 파이썬 힙은 해제해도 잘 줄지 않는다
+(in-process / 상주 모드에서 천천히 부풂). 브라우저는 driver_pool 이 페이지 수·RSS 로 재활용하듯이
+파이썬 워커도 같은 방식으로 묶는다.
+
+- rss_bytes()       : 현재 프로세스 RSS (/proc → psutil → 최대 RSS 순으로 대체)
+- available_bytes() : 컨테이너(cgroup v2/v1) 한도 - 사용량 과 MemAvailable 중 작은 값
+- auto_size()       : 가용 메모리 / 1개당 예상 메모리 → 개수 (DRIVER_POOL_SIZE=auto, engine_worker --procs 0)
+- Recycler          : 작업이 끝날 때마다 tick() → 작업 수(ENGINE_MAX_JOBS)나 RSS(ENGINE_RSS_MAX_MB)를 넘으면 이유 반환
+- prefork(n, fn)    : 임포트·설정 로드가 끝난 부모에서 gc.freeze() 후 n 개 fork → 자식이 RECYCLE_EXIT 로
+                      끝나면 같은 자리에 새로 fork (부모 힙은 copy-on-write 로 공유, 자식 힙만 버려짐)
+                      fork 가 없는 플랫폼(Windows)은 같은 프로세스에서 1개만 실행
+
+fork 전 부모는 스레드·소켓(Redis 연결, Chrome)을 열지 않아야 한다 → 대기열 연결·드라이버 풀은 자식에서.
+
+환경변수
+  ENGINE_MAX_JOBS=0          워커 프로세스가 이만큼 작업하면 재활용 (0 = 끔)
+  ENGINE_RSS_MAX_MB=0        작업 뒤 RSS 가 이 값을 넘으면 재활용 (0 = 끔)
+  ENGINE_WORKER_MB=300       파이썬 워커 1개 예상 메모리 (자동 산정용)
+  ENGINE_DRIVER_MB=600       Chrome 1개 예상 메모리 (DRIVER_POOL_SIZE=auto)
+  ENGINE_MEM_RESERVE_MB=512  자동 산정 때 남겨 둘 여유
+"""
+from __future__ import annotations
+import gc, os, signal, sys, time, traceback
+from typing import Callable, Dict, Optional
+
+try:
+    import psutil
+except ImportError:       # /proc 가 있으면 필요 없음
+    psutil = None
+
+ENGINE_MAX_JOBS       = int(os.getenv("ENGINE_MAX_JOBS", "0"))
+ENGINE_RSS_MAX_MB     = float(os.getenv("ENGINE_RSS_MAX_MB", "0"))
+ENGINE_WORKER_MB      = float(os.getenv("ENGINE_WORKER_MB", "300"))
+ENGINE_DRIVER_MB      = float(os.getenv("ENGINE_DRIVER_MB", "600"))
+ENGINE_MEM_RESERVE_MB = float(os.getenv("ENGINE_MEM_RESERVE_MB", "512"))
+
+RECYCLE_EXIT = 75         # 자식 워커: "재활용해 주세요" (EX_TEMPFAIL)
+_MB = 1024 * 1024
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 측정
+# ──────────────────────────────────────────────────────────────────────────────
+def rss_bytes(pid: Optional[int] = None) -> int:
+    """pid(기본: 자신)의 현재 RSS. 알 수 없으면 0 (자신이면 최대 RSS)."""
+    try:
+        with open(f"/proc/{pid or 'self'}/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except Exception:
+            pass
+    if pid is None:
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == "darwin" else peak * 1024
+        except (ImportError, OSError):
+            pass
+    return 0
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            v = f.read().strip()
+    except OSError:
+        return None
+    return int(v) if v.isdigit() else None          # cgroup v2 "max" = 한도 없음
+
+
+def available_bytes() -> Optional[int]:
+    """새 워커에 쓸 수 있는 메모리 (컨테이너 한도 우선). 알 수 없으면 None."""
+    vals = []
+    for limit, usage in (("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+                         ("/sys/fs/cgroup/memory/memory.limit_in_bytes",
+                          "/sys/fs/cgroup/memory/memory.usage_in_bytes")):
+        lim, use = _read_int(limit), _read_int(usage)
+        if lim is not None and use is not None and lim < (1 << 60):     # v1 의 "무제한"은 거대한 수
+            vals.append(max(0, lim - use))
+            break
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    vals.append(int(line.split()[1]) * 1024)
+                    break
+    except (OSError, ValueError, IndexError):
+        if psutil is not None:
+            vals.append(psutil.virtual_memory().available)
+    return min(vals) if vals else None
+
+
+def auto_size(per_mb: float, cap: int, what: str = "workers", reserve_mb: float = ENGINE_MEM_RESERVE_MB) -> int:
+    """(가용 메모리 - reserve) / per_mb 를 1…cap 으로 자름. 가용 메모리를 모르면 cap."""
+    avail = available_bytes()
+    if avail is None or per_mb <= 0:
+        return max(1, cap)
+    n = max(1, min(cap, int((avail / _MB - reserve_mb) // per_mb)))
+    print(f"[mem] {what}={n} (available {avail / _MB:.0f}MB, reserve {reserve_mb:.0f}MB, {per_mb:.0f}MB each)")
+    return n
+
+
+_SIZES: Dict[str, int] = {}
+
+
+def env_size(name: str, default: int, per_mb: float, cap: Optional[int] = None) -> int:
+    """정수 환경변수, "auto"(또는 0)면 가용 메모리로 산정 — 같은 이름은 한 번만 계산해 모든 읽는 쪽이 같은 값."""
+    if name not in _SIZES:
+        raw = os.getenv(name, str(default)).strip().lower()
+        if raw in ("auto", "0"):
+            _SIZES[name] = auto_size(per_mb, cap or max(default, os.cpu_count() or 1), name)
+        else:
+            _SIZES[name] = int(raw)
+    return _SIZES[name]
+
+
+def report(gauge=None) -> int:
+    """RSS 를 재서 ENGINE_MEMORY_USAGE 같은 Gauge 에 기록 → RSS(바이트)."""
+    rss = rss_bytes()
+    if gauge is not None:
+        gauge.set(rss)
+    return rss
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 재활용
+# ──────────────────────────────────────────────────────────────────────────────
+class Recycler:
+    """작업이 끝날 때마다 tick() → 재활용할 때가 되면 이유 문자열 (아니면 None)."""
+
+    def __init__(self, max_jobs: int = ENGINE_MAX_JOBS, rss_max_mb: float = ENGINE_RSS_MAX_MB, gauge=None):
+        self.max_jobs, self.rss_max_mb, self.gauge = max_jobs, rss_max_mb, gauge
+        self.jobs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_jobs > 0 or self.rss_max_mb > 0
+
+    def tick(self) -> Optional[str]:
+        self.jobs += 1
+        rss_mb = report(self.gauge) / _MB
+        if self.max_jobs > 0 and self.jobs >= self.max_jobs:
+            return f"{self.jobs} jobs (max {self.max_jobs}), rss {rss_mb:.0f}MB"
+        if self.rss_max_mb > 0 and rss_mb > self.rss_max_mb:
+            gc.collect()                                # 순환 참조만 남은 경우면 여기서 내려감
+            rss_mb = report(self.gauge) / _MB
+            if rss_mb > self.rss_max_mb:
+                return f"rss {rss_mb:.0f}MB > {self.rss_max_mb:.0f}MB after {self.jobs} jobs"
+        return None
+
+
+def freeze() -> None:
+    """지금까지 만든 객체를 GC 대상에서 빼서 fork 뒤 자식이 건드리지 않게 (copy-on-write 공유 유지)."""
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+def prefork(n: int, child: Callable[[int], int], respawn: bool = True) -> Dict[int, int]:
+    """
+    n 개 자식 워커를 fork 해 child(slot) 실행 → {slot: 마지막 종료 코드}.
+    - child 가 RECYCLE_EXIT 를 반환하면 (respawn=True 일 때) 같은 slot 으로 새로 fork
+    - 그 밖의 종료 코드는 그 slot 의 끝 (0 = 정상, 나머지는 경고)
+    - 부모가 SIGINT/SIGTERM 을 받으면 자식들에 SIGTERM 을 전달하고 기다림
+    """
+    if not hasattr(os, "fork"):
+        print("[mem] fork unavailable → running a single in-process worker")
+        return {0: child(0)}
+
+    freeze()
+    slots: Dict[int, int] = {}          # pid → slot
+    codes: Dict[int, int] = {}
+    stopping = False
+
+    def _spawn(slot: int) -> None:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                signal.signal(signal.SIGINT, signal.default_int_handler)
+                signal.signal(signal.SIGTERM, signal.default_int_handler)   # 부모의 종료 전달 → KeyboardInterrupt
+                code = child(slot) or 0
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except KeyboardInterrupt:
+                code = 130
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        slots[pid] = slot
+        print(f"[mem] worker {slot} started (pid {pid})")
+
+    def _stop(*_):
+        nonlocal stopping
+        stopping = True
+        for pid in list(slots):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    prev = {s: signal.signal(s, _stop) for s in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        for slot in range(max(1, n)):
+            _spawn(slot)
+        while slots:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = slots.pop(pid, None)
+            if slot is None:
+                continue
+            code = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status >> 8
+            codes[slot] = code
+            if code == RECYCLE_EXIT and respawn and not stopping:
+                print(f"[mem] worker {slot} recycled (pid {pid}, parent rss {rss_bytes() / _MB:.0f}MB)")
+                time.sleep(0.2)
+                _spawn(slot)
+            elif code not in (0, RECYCLE_EXIT):
+                print(f"[WARN] worker {slot} exited with {code} (pid {pid})")
+    finally:
+        for s, h in prev.items():
+            signal.signal(s, h)
+    return codes
@@ -0,0 +1,73 @@
+# engine_common/metrics.py
+"""
+prometheus_client 지연 로딩 래퍼.
+
+prometheus_client 임포트(http.server·exposition 포함)는 30ms 안팎인데, 지표는 작업이 끝날 때 한 번
+올리고 보내는 것이 전부다. 모듈 최상단에서는 이름만 정해 두고 실제 Counter/Gauge 는 처음 쓸 때 만든다.
+
+  registry = metrics.Registry()
+  CRAWL_SUCCESS_TOTAL = registry.counter('crawl_success_total', '...')
+  CRAWL_SUCCESS_TOTAL.inc()                                   # ← 여기서 prometheus_client 임포트
+  metrics.push_to_gateway('pushgateway:9091', job='...', registry=registry)
+
+Registry 는 같은 이름·같은 호출 방식(push_to_gateway(..., registry=))을 유지해서 기존 호출부를 바꾸지 않는다.
+"""
+from __future__ import annotations
+from typing import List, Optional
+
+
+class _Metric:
+    """처음 속성에 접근할 때 registry 안에 진짜 Counter/Gauge 를 만들고 그쪽으로 넘김."""
+
+    def __init__(self, registry: "Registry", kind: str, name: str, doc: str, labels=()):
+        self._registry, self._kind, self._name, self._doc, self._labels = registry, kind, name, doc, tuple(labels)
+        self._real = None
+
+    def _get(self):
+        if self._real is None:
+            import prometheus_client
+            cls = getattr(prometheus_client, self._kind)
+            self._real = cls(self._name, self._doc, self._labels, registry=self._registry.real())
+        return self._real
+
+    def __getattr__(self, attr):
+        return getattr(self._get(), attr)
+
+
+class Registry:
+    """CollectorRegistry 를 필요할 때 만듦. counter()/gauge() 는 지연 지표를 돌려줌."""
+
+    def __init__(self):
+        self._real = None
+        self._metrics: List[_Metric] = []
+
+    def real(self):
+        if self._real is None:
+            from prometheus_client import CollectorRegistry
+            self._real = CollectorRegistry()
+        return self._real
+
+    def _add(self, kind: str, name: str, doc: str, labels=()) -> _Metric:
+        m = _Metric(self, kind, name, doc, labels)
+        self._metrics.append(m)
+        return m
+
+    def counter(self, name: str, doc: str, labels=()) -> _Metric:
+        return self._add("Counter", name, doc, labels)
+
+    def gauge(self, name: str, doc: str, labels=()) -> _Metric:
+        return self._add("Gauge", name, doc, labels)
+
+    def materialize(self):
+        """선언한 지표를 모두 만든 CollectorRegistry (전송 직전: 한 번도 안 쓴 지표도 0 으로 나가게)."""
+        for m in self._metrics:
+            m._get()
+        return self.real()
+
+
+def push_to_gateway(gateway: str, job: str, registry: Optional[Registry] = None, **kw) -> None:
+    """prometheus_client.push_to_gateway 와 같은 시그니처 (registry 는 Registry 또는 CollectorRegistry)."""
+    from prometheus_client import push_to_gateway as _push
+    if isinstance(registry, Registry):
+        registry = registry.materialize()
+    _push(gateway, job=job, registry=registry, **kw)
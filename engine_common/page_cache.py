@@ -0,0 +1,78 @@
+# engine_common/page_cache.py
+"""
+실행(run) 범위 페이지 캐시.
+
+같은 실행 안에서 여러 탭/자격증이 같은 페이지를 다시 여는 경우
+(예: kacpta info_diary.aspx 를 exam_schedule·syllabus 가 각각 로드)
+렌더링된 HTML 을 (URL, 상호작용 레시피) 키로 보관해 두 번째 소비자는 브라우저 이동 없이 받는다.
+
+- recipe: 페이지에 가한 조작을 나타내는 튜플 (예: ("시험일정", "검색")). 빈 튜플 = 로드만.
+  HTTP 응답은 ("http",) 로 구분(브라우저 DOM 과 섞지 않음).
+- run_once 가 실행 시작 시 set_current(PageCache()) → 탭/자격증(스레드) 간 공유.
+  설정돼 있지 않으면 캐시 없이 loader 를 그대로 호출.
+- stats(): hits/misses 와 키별 적중 수 → 절약한 페이지 로드 수 확인용.
+"""
+from __future__ import annotations
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+Recipe = Tuple[str, ...]
+
+
+class PageCache:
+    def __init__(self):
+        self._pages: Dict[str, str] = {}
+        self._hits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(url: str, recipe: Recipe = ()) -> str:
+        return url if not recipe else url + " |> " + " > ".join(recipe)
+
+    def get(self, url: str, recipe: Recipe = ()) -> Optional[str]:
+        k = self.key(url, recipe)
+        with self._lock:
+            html = self._pages.get(k)
+            if html is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._hits[k] = self._hits.get(k, 0) + 1
+            return html
+
+    def put(self, url: str, recipe: Recipe, html: Optional[str]) -> None:
+        if not html:
+            return
+        with self._lock:
+            self._pages[self.key(url, recipe)] = html
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "pages": len(self._pages),
+                    "by_key": dict(self._hits)}
+
+
+_CURRENT: Optional[PageCache] = None
+
+
+def set_current(cache: Optional[PageCache]) -> None:
+    global _CURRENT
+    _CURRENT = cache
+
+
+def current() -> Optional[PageCache]:
+    return _CURRENT
+
+
+def cached(url: str, recipe: Recipe, loader: Callable[[], Optional[str]]) -> Optional[str]:
+    """캐시에 있으면 그 HTML, 없으면 loader() 결과를 저장 후 반환."""
+    cache = _CURRENT
+    if cache is None:
+        return loader()
+    html = cache.get(url, recipe)
+    if html is None:
+        html = loader()
+        cache.put(url, recipe, html)
+    return html
@@ -0,0 +1,245 @@
+# engine_common/result_cache.py
+"""
+요청 기반(on-demand) 수집 결과 캐시: TTL + stale-while-revalidate + single-flight.
+
+사용자가 같은 자격증을 연달아 열면 같은 jmcd / 사설 cert 를 몇 초 간격으로 처음부터 다시 수집한다
+(Selenium/fetch 비용 + 원 사이트 부하). 여기서는 결과 문서(정규화 결과)를 키별로 저장해 두고
+
+- age < ttl           : 그대로 반환 (hit)
+- ttl ≤ age < ttl+stale: 있던 결과를 바로 반환하고 뒤에서 한 번만 새로 수집 (stale → 백그라운드 갱신)
+- 그 밖 / 없음         : 수집 (miss). 같은 키를 동시에 요청하면 한 번만 수집하고 나머지는 그 결과를 같이 받음
+
+engine_server 는 작업 제출 단계에서 lookup()/put() 으로 직접 판단하고(대기열 자리를 쓰지 않도록),
+라이브러리 호출은 get_or_load(key, loader, ttl) 한 번으로 같은 규칙을 쓴다
+(run_once.py --cache / run_public.py --cache — 곧 끝나는 프로세스는 drain() 으로 백그라운드 갱신을 기다린다).
+
+TTL 은 탭 설정의 ttl:(초)로 탭마다 줄 수 있고, 자격증 결과의 TTL 은 실행한 탭들 중 가장 짧은 값이다
+(ttl_for(tabs)). 공공 jmcd 는 public_cert_api/configs/cert_map.yaml 의 탭 ttl: 을 같은 방식으로 쓴다.
+
+저장소: 로컬 디스크(<dir>/<sha1(key)>.json, 원자적 교체) 또는 Redis(SET EX = ttl + stale).
+
+환경변수
+  RESULT_CACHE=disk              disk | redis | off
+  RESULT_CACHE_DIR=              디스크 위치 (기본: <CERT_DATA_DIR|Engine/data>/_cache/results)
+  RESULT_CACHE_REDIS=            Redis URL (기본 WORK_QUEUE_URL)
+  RESULT_CACHE_TTL_S=600         탭에 ttl: 이 없을 때 기본 TTL(초)
+  RESULT_CACHE_STALE_S=3600      TTL 이 지난 뒤에도 stale 로 바로 돌려줄 시간(초, 0 이면 SWR 끔)
+"""
+from __future__ import annotations
+import hashlib, json, os, threading, time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_BASE_DIR = Path(__file__).resolve().parents[1]
+
+RESULT_CACHE         = os.getenv("RESULT_CACHE", "disk").strip().lower()
+RESULT_CACHE_DIR     = os.getenv("RESULT_CACHE_DIR", "").strip()
+RESULT_CACHE_REDIS   = os.getenv("RESULT_CACHE_REDIS") or os.getenv("WORK_QUEUE_URL", "redis://localhost:6379/0")
+RESULT_CACHE_TTL_S   = float(os.getenv("RESULT_CACHE_TTL_S", "600"))
+RESULT_CACHE_STALE_S = float(os.getenv("RESULT_CACHE_STALE_S", "3600"))
+
+
+@dataclass
+class Entry:
+    key: str
+    value: Any
+    at: float           # 저장 시각(epoch)
+    ttl: float
+    stale: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.at
+
+    def state(self) -> str:
+        """fresh | stale | expired"""
+        age = self.age
+        if age < self.ttl:
+            return "fresh"
+        return "stale" if age < self.ttl + self.stale else "expired"
+
+
+def ttl_for(tabs: Iterable[dict], default: Optional[float] = None) -> float:
+    """탭 설정들의 ttl: 중 최솟값 (없으면 RESULT_CACHE_TTL_S)."""
+    vals = [float(t["ttl"]) for t in tabs if t.get("ttl") is not None]
+    base = RESULT_CACHE_TTL_S if default is None else default
+    return min(vals) if vals else base
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 저장소
+# ──────────────────────────────────────────────────────────────────────────────
+class DiskStore:
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            d = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return d if d.get("key") == key else None
+
+    def put(self, key: str, rec: Dict[str, Any]) -> None:
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(rec, ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def drop(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+
+class RedisStore:
+    def __init__(self, url: str, prefix: str = "rc"):
+        import redis            # requirements.txt 의 redis>=5 (RESULT_CACHE=redis 일 때만 필요)
+        self.r = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.r.get(f"{self.prefix}:{key}")
+        return json.loads(raw) if raw else None
+
+    def put(self, key: str, rec: Dict[str, Any]) -> None:
+        ex = max(1, int(rec["ttl"] + rec["stale"]))
+        self.r.set(f"{self.prefix}:{key}", json.dumps(rec, ensure_ascii=False, default=str), ex=ex)
+
+    def drop(self, key: str) -> None:
+        self.r.delete(f"{self.prefix}:{key}")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 캐시
+# ──────────────────────────────────────────────────────────────────────────────
+class ResultCache:
+    def __init__(self, store, stale_s: float = RESULT_CACHE_STALE_S):
+        self.store = store
+        self.stale_s = stale_s
+        self._flights: Dict[str, Future] = {}
+        self._refreshing: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "stale": 0, "miss": 0, "shared": 0}
+
+    def lookup(self, key: str) -> Optional[Entry]:
+        try:
+            d = self.store.get(key)
+        except Exception as e:          # 캐시 장애는 수집을 막지 않음
+            print(f"[WARN] result_cache: get {key} failed: {type(e).__name__}: {e}")
+            return None
+        if not d:
+            return None
+        return Entry(key, d.get("value"), float(d.get("at") or 0), float(d.get("ttl") or 0),
+                     float(d.get("stale") if d.get("stale") is not None else self.stale_s))
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self.store.put(key, {"key": key, "value": value, "at": time.time(), "ttl": ttl, "stale": self.stale_s})
+        except Exception as e:
+            print(f"[WARN] result_cache: put {key} failed: {type(e).__name__}: {e}")
+
+    def drop(self, key: str) -> None:
+        self.store.drop(key)
+
+    def count(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] = self.stats.get(outcome, 0) + 1
+
+    # ── single-flight ──
+    def single_flight(self, key: str, loader: Callable[[], Any], ttl: float) -> Tuple[Any, bool]:
+        """같은 key 의 loader 는 동시에 하나만 실행 → (값, 내가 실행했는지). 성공하면 캐시에 저장."""
+        with self._lock:
+            fut = self._flights.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._flights[key] = Future()
+        if not leader:
+            return fut.result(), False
+        try:
+            value = loader()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            self.put(key, value, ttl)
+            fut.set_result(value)
+            return value, True
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._flights
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: float,
+                    refresh: bool = False) -> Tuple[Any, str]:
+        """
+        캐시 규칙대로 값을 돌려줌 → (값, "hit" | "stale" | "miss" | "shared").
+        refresh=True 면 캐시를 보지 않고 수집(동시 요청은 여전히 하나로 묶음).
+        """
+        entry = None if refresh else self.lookup(key)
+        state = entry.state() if entry else None
+        if state == "fresh":
+            self.count("hit")
+            return entry.value, "hit"
+        if state == "stale":
+            self.count("stale")
+            if not self.in_flight(key):
+                t = threading.Thread(target=self._refresh, args=(key, loader, ttl),
+                                     name=f"swr-{key}", daemon=True)
+                t.start()
+                with self._lock:
+                    self._refreshing = [x for x in self._refreshing if x.is_alive()] + [t]
+            return entry.value, "stale"
+        value, led = self.single_flight(key, loader, ttl)
+        outcome = "miss" if led else "shared"
+        self.count(outcome)
+        return value, outcome
+
+    def _refresh(self, key: str, loader: Callable[[], Any], ttl: float) -> None:
+        try:
+            self.single_flight(key, loader, ttl)
+        except Exception as e:
+            print(f"[WARN] result_cache: background refresh {key} failed: {type(e).__name__}: {e}")
+
+    def drain(self, timeout: Optional[float] = None) -> int:
+        """stale 로 시작한 백그라운드 갱신이 끝날 때까지 대기 (CLI 종료 전). 반환: 기다린 갱신 수."""
+        with self._lock:
+            threads, self._refreshing = self._refreshing, []
+        for t in threads:
+            t.join(timeout)
+        return len(threads)
+
+
+_CURRENT: Optional[ResultCache] = None
+_init_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return RESULT_CACHE not in ("", "off", "0", "none")
+
+
+def current() -> Optional[ResultCache]:
+    """RESULT_CACHE 설정에 맞는 공유 캐시 (off 면 None)."""
+    global _CURRENT
+    if not enabled():
+        return None
+    with _init_lock:
+        if _CURRENT is None:
+            if RESULT_CACHE == "redis":
+                store = RedisStore(RESULT_CACHE_REDIS)
+            else:
+                root = RESULT_CACHE_DIR or os.path.join(os.getenv("CERT_DATA_DIR") or _BASE_DIR / "data",
+                                                        "_cache", "results")
+                store = DiskStore(root)
+            _CURRENT = ResultCache(store)
+        return _CURRENT
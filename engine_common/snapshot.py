@@ -0,0 +1,257 @@
+# engine_common/snapshot.py
+"""
+사설 탭 runner 용 record/replay 스냅샷.
+
+record : 실제 WebDriver 를 RecordingDriver 로 감싸서, runner 가 부른 드라이버/요소 호출 결과
+         (page_source, execute_script 가 돌려준 outerHTML, find_element 성공/실패, get_attribute …)
+         를 호출 키(메서드 + 인자)별 순서대로 저장한다. HTTP 빠른 경로의 응답 HTML 도 같은 파일에.
+replay : ReplayDriver 가 같은 키로 기록된 결과를 순서대로 돌려준다 → 브라우저/네트워크 없이
+         같은 runner·parse 함수가 그대로 돈다 (파서 회귀 테스트/벤치마크용).
+
+- 요소는 기록 시 번호({"$el": n})로 바꿔 저장하고, 재생 시 ReplayElement(n) 로 복원.
+- 예외도 기록({"$exc": 이름}) → 재생 시 같은 selenium 예외로 다시 발생.
+- 기록보다 더 많이 호출되면(대기 루프가 타임아웃까지 돈 경우) TimeoutException → 대기 타임아웃과 동일.
+- 기록된 적 없는 호출(click 등 새로 추가된 조작)은 None.
+
+파일: <dir>/<cert>/<tab>.json  (형식: {"version": 1, "calls": {key: [result, ...]}})
+"""
+from __future__ import annotations
+import json, os, threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+_VERSION = 1
+
+
+def _key(name: str, args=None, kw=None) -> str:
+    """호출 키. args=None 은 속성 읽기(page_source 등), 리스트는 메서드 호출."""
+    return json.dumps([name, None if args is None else list(args), kw or {}],
+                      ensure_ascii=False, sort_keys=True, default=str)
+
+
+def http_key(url: str) -> str:
+    """HTTP 빠른 경로 응답의 호출 키 (Recorder.call / Replayer.take 에 그대로 사용)."""
+    return _key("http.get", [url])
+
+
+def _is_element(v) -> bool:
+    return hasattr(v, "id") and hasattr(v, "get_attribute") and hasattr(v, "parent")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 저장/로드
+# ──────────────────────────────────────────────────────────────────────────────
+def snapshot_path(root, cert: str, tab: str) -> Path:
+    return Path(root) / cert / f"{tab}.json"
+
+
+def write_snapshot(path: Path, calls: Dict[str, List[Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"version": _VERSION, "calls": calls}, ensure_ascii=False),
+                   encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: Path) -> Dict[str, List[Any]]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != _VERSION:
+        raise ValueError(f"unsupported snapshot version: {path}")
+    return data.get("calls") or {}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# record
+# ──────────────────────────────────────────────────────────────────────────────
+class Recorder:
+    def __init__(self):
+        self.calls: Dict[str, List[Any]] = {}
+        self._elements: Dict[str, int] = {}     # WebElement.id → 번호
+        self._lock = threading.Lock()
+
+    def _el_no(self, el) -> int:
+        with self._lock:
+            n = self._elements.get(el.id)
+            if n is None:
+                n = self._elements[el.id] = len(self._elements) + 1
+            return n
+
+    def encode(self, v):
+        if isinstance(v, RecordingElement):
+            v = v._real
+        if _is_element(v):
+            return {"$el": self._el_no(v)}
+        if isinstance(v, (list, tuple)):
+            return [self.encode(x) for x in v]
+        if isinstance(v, dict):
+            return {str(k): self.encode(x) for k, x in v.items()}
+        if v is None or isinstance(v, (str, int, float, bool)):
+            return v
+        return str(v)
+
+    def add(self, key: str, result) -> None:
+        with self._lock:
+            self.calls.setdefault(key, []).append(result)
+
+    def wrap(self, v):
+        if isinstance(v, (list, tuple)):
+            return type(v)(self.wrap(x) for x in v)
+        return RecordingElement(v, self) if _is_element(v) else v
+
+    def call(self, prefix: str, fn, args, kw):
+        real_args = [a._real if isinstance(a, RecordingElement) else a for a in args]
+        key = _key(prefix, self.encode(list(args)), self.encode(kw))
+        try:
+            v = fn(*real_args, **kw)
+        except Exception as e:
+            self.add(key, {"$exc": type(e).__name__, "msg": str(e)[:200]})
+            raise
+        self.add(key, self.encode(v))
+        return self.wrap(v)
+
+
+class _RecordingProxy:
+    _prefix = ""
+
+    def __init__(self, real, rec: Recorder):
+        object.__setattr__(self, "_real", real)
+        object.__setattr__(self, "_rec", rec)
+
+    def _name(self, name: str) -> str:
+        return f"{self._prefix}{name}"
+
+    def __getattr__(self, name):
+        v = getattr(self._real, name)
+        if name == "switch_to":
+            return _RecordingSwitchTo(v, self._rec)
+        if callable(v):
+            def _call(*args, **kw):
+                return self._rec.call(self._name(name), v, args, kw)
+            return _call
+        self._rec.add(_key(self._name(name)), self._rec.encode(v))
+        return self._rec.wrap(v)
+
+    def __setattr__(self, name, value):
+        setattr(self._real, name, value)
+
+
+class RecordingDriver(_RecordingProxy):
+    _prefix = "driver."
+
+
+class RecordingElement(_RecordingProxy):
+    @property
+    def _prefix(self):
+        return f"el{self._rec._el_no(self._real)}."
+
+
+class _RecordingSwitchTo(_RecordingProxy):
+    _prefix = "switch_to."
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# replay
+# ──────────────────────────────────────────────────────────────────────────────
+def _exc(name: str, msg: str):
+    try:
+        from selenium.common import exceptions as sx
+        cls = getattr(sx, name, None)
+        if isinstance(cls, type) and issubclass(cls, Exception):
+            return cls(msg)
+    except ImportError:
+        pass
+    return RuntimeError(f"{name}: {msg}")
+
+
+def _timeout(msg: str):
+    return _exc("TimeoutException", msg)
+
+
+class Replayer:
+    def __init__(self, calls: Dict[str, List[Any]]):
+        self.calls = calls
+        self._pos: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def has(self, key: str) -> bool:
+        return key in self.calls
+
+    def take(self, key: str):
+        with self._lock:
+            seq = self.calls.get(key)
+            if seq is None:
+                return None                      # 기록에 없는 조작 → no-op
+            i = self._pos.get(key, 0)
+            if i >= len(seq):
+                raise _timeout(f"replay: no more recorded results for {key[:120]}")
+            self._pos[key] = i + 1
+            v = seq[i]
+        if isinstance(v, dict) and "$exc" in v:
+            raise _exc(v["$exc"], v.get("msg", ""))
+        return self.decode(v)
+
+    def decode(self, v):
+        if isinstance(v, dict):
+            if "$el" in v and len(v) == 1:
+                return ReplayElement(v["$el"], self)
+            return {k: self.decode(x) for k, x in v.items()}
+        if isinstance(v, list):
+            return [self.decode(x) for x in v]
+        return v
+
+    def encode_args(self, args):
+        return [{"$el": a._no} if isinstance(a, ReplayElement) else
+                (self.encode_args(a) if isinstance(a, (list, tuple)) else a) for a in args]
+
+
+class _ReplayProxy:
+    _prefix = ""
+
+    def __init__(self, rp: Replayer):
+        object.__setattr__(self, "_rp", rp)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name == "switch_to":
+            return _ReplaySwitchTo(self._rp)
+        full = f"{self._prefix}{name}"
+        attr_key = _key(full)
+        if self._rp.has(attr_key):
+            return self._rp.take(attr_key)
+
+        def _call(*args, **kw):
+            return self._rp.take(_key(full, self._rp.encode_args(args), kw))
+        return _call
+
+    def __setattr__(self, name, value):
+        pass
+
+
+class ReplayDriver(_ReplayProxy):
+    _prefix = "driver."
+
+    @classmethod
+    def from_file(cls, path) -> "ReplayDriver":
+        return cls(Replayer(read_snapshot(path)))
+
+    def quit(self):
+        pass
+
+
+class ReplayElement(_ReplayProxy):
+    def __init__(self, no: int, rp: Replayer):
+        super().__init__(rp)
+        object.__setattr__(self, "_no", no)
+
+    @property
+    def _prefix(self):
+        return f"el{self._no}."
+
+    @property
+    def id(self):
+        return f"replay-{self._no}"
+
+
+class _ReplaySwitchTo(_ReplayProxy):
+    _prefix = "switch_to."
@@ -0,0 +1,385 @@
+# engine_common/snapshot_codec.py
+"""
+공공 탭 HTML 스냅샷 보존 코덱 (zstd + 학습 사전, gzip 호환).
+
+Q-Net 탭 페이지는 머리말·메뉴·스크립트 등 마크업 대부분이 같다. 우리 스냅샷으로 학습한 zstd 사전을 쓰면
+gzip 보다 훨씬 작고, 풀기(재파싱 I/O)도 빠르다. gzip(.gz)은 읽기/쓰기 모두 그대로 지원한다.
+
+- find(p) / exists(p)     : p, p.zst, p.gz 순으로 실제 파일 (읽는 쪽은 확장자를 몰라도 됨)
+- open_read(p)            : 확장자에 맞춰 스트리밍으로 푸는 바이너리 파일 객체
+- read_text(p)            : 위를 문자열로 (parse_tabs_min.read_html, run_public 의 JSON 변형 읽기)
+- write_text(p, text)     : p 의 확장자(.zst/.gz/그 외 평문)대로 저장
+- compress_file(src)      : src → src.zst|.gz 스트리밍 압축(전체를 메모리에 올리지 않음) 후 원본 삭제
+- compress_later(src)     : 같은 일을 백그라운드 스레드에서 (파이프라인 임계 경로 밖) → drain() 으로 대기
+- transcode(src, codec)   : .gz → .zst 등 재압축 (+ 검증) — tools/snapshot_codec.py migrate
+- train(paths)            : 스냅샷으로 사전 학습 → <사전 폴더>/qnet-html-v<N>.zdict
+
+사전 버전: 쓰기는 가장 높은 버전(또는 SNAPSHOT_DICT 로 고정), 읽기는 zstd 프레임 머리의 사전 ID 로
+맞는 파일을 찾는다 → 새 버전을 학습해도 예전 파일은 그대로 읽힌다(사전 파일은 지우지 말 것, 저장소에 커밋).
+사전이 없으면 사전 없는 zstd, zstandard 가 없으면 gzip 으로 쓴다.
+
+환경변수
+  SNAPSHOT_CODEC=auto          auto | zst | gz  (auto: zstandard 가 있으면 zst)
+  SNAPSHOT_ZSTD_LEVEL=19       zstd 압축 레벨
+  SNAPSHOT_DICT_DIR=...        사전 폴더 (os.pathsep 로 여러 개, 첫 폴더에 학습 결과 저장;
+                               기본 public_cert_api/configs/zstd)
+  SNAPSHOT_DICT=...            쓰기에 쓸 사전 파일 고정 (기본: 가장 높은 버전)
+  SNAPSHOT_COMPRESS_WORKERS=1  백그라운드 압축 스레드 수 (0 = 호출한 자리에서 바로 압축)
+"""
+from __future__ import annotations
+import atexit, gzip, hashlib, os, queue, re, threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:       # 없으면 gzip 만 (.zst 파일은 읽을 수 없음)
+    zstandard = None
+
+ROOT = Path(__file__).resolve().parents[1]         # Engine/
+
+SNAPSHOT_CODEC            = os.getenv("SNAPSHOT_CODEC", "auto").strip().lower()
+SNAPSHOT_ZSTD_LEVEL       = int(os.getenv("SNAPSHOT_ZSTD_LEVEL", "19"))
+SNAPSHOT_COMPRESS_WORKERS = int(os.getenv("SNAPSHOT_COMPRESS_WORKERS", "1"))
+DICT_DIRS = [Path(p) for p in (os.getenv("SNAPSHOT_DICT_DIR") or "").split(os.pathsep) if p] \
+    or [ROOT / "public_cert_api" / "configs" / "zstd"]
+DICT_PREFIX = "qnet-html"
+DICT_SIZE   = 112 * 1024
+
+_CHUNK = 256 * 1024
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 사전
+# ──────────────────────────────────────────────────────────────────────────────
+_DICTS: Optional[Dict[int, Tuple[int, Path]]] = None     # dict_id → (version, path)
+_LOADED: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+_DICT_LOCK = threading.Lock()
+_VER_RX = re.compile(rf"^{DICT_PREFIX}-v(\d+)\.zdict$")
+
+
+def _scan_dicts() -> Dict[int, Tuple[int, Path]]:
+    global _DICTS
+    with _DICT_LOCK:
+        if _DICTS is None:
+            found: Dict[int, Tuple[int, Path]] = {}
+            for d in DICT_DIRS:
+                for p in sorted(d.glob(f"{DICT_PREFIX}-v*.zdict")) if d.is_dir() else []:
+                    m = _VER_RX.match(p.name)
+                    if not m:
+                        continue
+                    did = zstandard.ZstdCompressionDict(p.read_bytes()).dict_id()
+                    found.setdefault(did, (int(m.group(1)), p))
+            _DICTS = found
+        return _DICTS
+
+
+def _dict(dict_id: int):
+    """프레임 머리의 사전 ID → 사전 (0 = 사전 없음)."""
+    if not dict_id:
+        return None
+    if dict_id not in _LOADED:
+        hit = _scan_dicts().get(dict_id)
+        if hit is None:
+            raise RuntimeError(f"zstd dictionary id {dict_id} not found in {', '.join(map(str, DICT_DIRS))}")
+        _LOADED[dict_id] = zstandard.ZstdCompressionDict(hit[1].read_bytes())
+    return _LOADED[dict_id]
+
+
+def current_dict():
+    """쓰기용 사전 (SNAPSHOT_DICT 또는 가장 높은 버전) → 없으면 None."""
+    if zstandard is None:
+        return None
+    pinned = os.getenv("SNAPSHOT_DICT")
+    if pinned:
+        d = zstandard.ZstdCompressionDict(Path(pinned).read_bytes())
+        return _LOADED.setdefault(d.dict_id(), d)
+    dicts = _scan_dicts()
+    if not dicts:
+        return None
+    did = max(dicts, key=lambda k: dicts[k][0])
+    return _dict(did)
+
+
+def dict_info() -> List[dict]:
+    """사전 목록 (버전 순) — tools/snapshot_codec.py stats 용."""
+    if zstandard is None:
+        return []
+    return [{"version": v, "id": did, "path": str(p), "bytes": p.stat().st_size}
+            for did, (v, p) in sorted(_scan_dicts().items(), key=lambda x: x[1][0])]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 코덱
+# ──────────────────────────────────────────────────────────────────────────────
+class GzipCodec:
+    name, suffix = "gz", ".gz"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def open_write(self, path: Path):
+        return gzip.open(path, "wb", compresslevel=self.level)
+
+    def open_read(self, path: Path):
+        return gzip.open(path, "rb")
+
+
+class ZstdCodec:
+    name, suffix = "zst", ".zst"
+
+    def __init__(self, level: int = SNAPSHOT_ZSTD_LEVEL, dictionary=None):
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed (pip install zstandard)")
+        self.level, self.dictionary = level, dictionary
+
+    def open_write(self, path: Path):
+        # 압축기는 스레드 안전하지 않으므로 파일마다 새로 (사전 전처리는 ZstdCompressionDict 가 캐시)
+        cctx = zstandard.ZstdCompressor(level=self.level, dict_data=self.dictionary, write_checksum=True)
+        return cctx.stream_writer(open(path, "wb"), closefd=True)
+
+    def open_read(self, path: Path):
+        f = open(path, "rb")
+        try:
+            head = f.read(18)
+            dict_id = zstandard.get_frame_parameters(head).dict_id if head[:4] == _ZSTD_MAGIC else 0
+            f.seek(0)
+            return zstandard.ZstdDecompressor(dict_data=_dict(dict_id)).stream_reader(f, closefd=True)
+        except BaseException:
+            f.close()
+            raise
+
+
+_SUFFIX_CODEC = {".zst": ZstdCodec, ".gz": GzipCodec}
+SUFFIXES = tuple(_SUFFIX_CODEC)
+
+
+def get_codec(name: Optional[str] = None):
+    """이름(auto|zst|gz) → 쓰기 코덱. zstd 는 현재 사전을 씀."""
+    name = (name or SNAPSHOT_CODEC or "auto").lower()
+    if name in ("auto", "zst", "zstd"):
+        if zstandard is not None:
+            return ZstdCodec(dictionary=current_dict())
+        if name != "auto":
+            print("[WARN] zstandard not installed → gzip")
+    return GzipCodec()
+
+
+def _codec_for(path: Path):
+    cls = _SUFFIX_CODEC.get(path.suffix)
+    if cls is ZstdCodec:
+        return ZstdCodec(dictionary=None)      # 읽기는 프레임의 사전 ID 로
+    return cls() if cls else None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 읽기
+# ──────────────────────────────────────────────────────────────────────────────
+def find(path) -> Optional[Path]:
+    """path 또는 압축본(path.zst, path.gz) 중 실제로 있는 파일."""
+    path = Path(path)
+    for p in (path, *(Path(str(path) + s) for s in SUFFIXES)):
+        if p.exists():
+            return p
+    return None
+
+
+def exists(path) -> bool:
+    return find(path) is not None
+
+
+def open_read(path):
+    """실제 파일(압축본 포함)을 찾아 바이너리 스트림으로. 없으면 FileNotFoundError."""
+    p = find(path)
+    if p is None:
+        raise FileNotFoundError(path)
+    codec = _codec_for(p)
+    return codec.open_read(p) if codec else open(p, "rb")
+
+
+def read_bytes(path) -> bytes:
+    with open_read(path) as f:
+        return f.read()
+
+
+def read_text(path, errors: str = "strict") -> str:
+    return read_bytes(path).decode("utf-8", errors=errors)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 쓰기 / 압축
+# ──────────────────────────────────────────────────────────────────────────────
+def _tmp(dst: Path) -> Path:
+    return dst.with_name(f"{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def write_text(path, text: str) -> Path:
+    """path 의 확장자대로 저장 (.zst/.gz 이면 압축, 그 외 평문)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    codec = get_codec(_SUFFIX_CODEC[path.suffix].name) if path.suffix in _SUFFIX_CODEC else None
+    tmp = _tmp(path)
+    with (codec.open_write(tmp) if codec else open(tmp, "wb")) as f:
+        f.write(text.encode("utf-8"))
+    os.replace(tmp, path)
+    return path
+
+
+def _copy(src_stream, codec, dst: Path) -> Tuple[int, str]:
+    """스트림 → codec 으로 dst (임시 파일 후 교체). 반환: (원본 바이트 수, sha256)."""
+    h, n = hashlib.sha256(), 0
+    tmp = _tmp(dst)
+    try:
+        with codec.open_write(tmp) as out:
+            while True:
+                chunk = src_stream.read(_CHUNK)
+                if not chunk:
+                    break
+                h.update(chunk)
+                n += len(chunk)
+                out.write(chunk)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return n, h.hexdigest()
+
+
+def _digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open_read(path) as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def compress_file(src, codec=None, remove: bool = True) -> Path:
+    """평문 src → src.zst|.gz (스트리밍). remove=True 면 원본 삭제. 압축본 경로 반환."""
+    src = Path(src)
+    codec = codec or get_codec()
+    dst = Path(str(src) + codec.suffix)
+    with open(src, "rb") as f:
+        _copy(f, codec, dst)
+    for other in SUFFIXES:                   # 다른 코덱의 예전 압축본은 정리 (읽기 우선순위 혼동 방지)
+        if other != codec.suffix:
+            Path(str(src) + other).unlink(missing_ok=True)
+    if remove:
+        src.unlink(missing_ok=True)
+    return dst
+
+
+def transcode(src, codec=None, verify: bool = True) -> Path:
+    """압축본 src(.gz 등) → 같은 이름의 codec 압축본. verify 면 풀어서 sha256 비교 후 원본 삭제."""
+    src = Path(src)
+    codec = codec or get_codec()
+    if src.suffix == codec.suffix:
+        return src
+    base = src.with_suffix("") if src.suffix in _SUFFIX_CODEC else src
+    dst = Path(str(base) + codec.suffix)
+    with open_read(src) as f:
+        _, digest = _copy(f, codec, dst)
+    if verify and _digest(dst) != digest:
+        dst.unlink(missing_ok=True)
+        raise ValueError(f"verify failed: {dst}")
+    src.unlink(missing_ok=True)
+    return dst
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 백그라운드 압축
+# ──────────────────────────────────────────────────────────────────────────────
+class Compressor:
+    """compress_file 을 스레드로 (zlib/zstd 는 GIL 을 놓음). 실패하면 경고만 남기고 원본은 그대로."""
+
+    def __init__(self, workers: int = 1):
+        self.q: "queue.Queue[Optional[Tuple[Path, object]]]" = queue.Queue()
+        self.done = self.failed = self.bytes_in = self.bytes_out = 0
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, name=f"snapshot-compress-{i}", daemon=True)
+                         for i in range(max(1, workers))]
+        for t in self._threads:
+            t.start()
+
+    def _run(self):
+        while True:
+            item = self.q.get()
+            try:
+                if item is None:
+                    return
+                src, codec = item
+                try:
+                    size = src.stat().st_size
+                    dst = compress_file(src, codec)
+                    with self._lock:
+                        self.done += 1
+                        self.bytes_in += size
+                        self.bytes_out += dst.stat().st_size
+                except FileNotFoundError:
+                    pass                             # 그 사이 다른 쪽에서 이미 처리
+                except Exception as e:
+                    with self._lock:
+                        self.failed += 1
+                    print(f"[WARN] snapshot compress failed: {src} ({type(e).__name__}: {e})")
+            finally:
+                self.q.task_done()
+
+    def submit(self, src: Path, codec=None) -> None:
+        self.q.put((Path(src), codec or get_codec()))
+
+    def drain(self) -> None:
+        self.q.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"done": self.done, "failed": self.failed, "pending": self.q.unfinished_tasks,
+                    "bytes_in": self.bytes_in, "bytes_out": self.bytes_out}
+
+
+_WORKER: Optional[Compressor] = None
+_WORKER_LOCK = threading.Lock()
+
+
+def compress_later(src, codec=None) -> None:
+    """백그라운드로 compress_file (SNAPSHOT_COMPRESS_WORKERS=0 이면 바로)."""
+    global _WORKER
+    if SNAPSHOT_COMPRESS_WORKERS <= 0:
+        compress_file(src, codec)
+        return
+    with _WORKER_LOCK:
+        if _WORKER is None:
+            _WORKER = Compressor(SNAPSHOT_COMPRESS_WORKERS)
+            atexit.register(drain)
+    _WORKER.submit(src, codec)
+
+
+def drain() -> Optional[dict]:
+    """남은 백그라운드 압축을 끝까지 기다림 → 통계 (워커가 없으면 None)."""
+    if _WORKER is None:
+        return None
+    _WORKER.drain()
+    return _WORKER.stats()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 사전 학습
+# ──────────────────────────────────────────────────────────────────────────────
+def train(paths: Iterable[Path], size: int = DICT_SIZE, out_dir: Optional[Path] = None,
+          level: int = SNAPSHOT_ZSTD_LEVEL) -> Path:
+    """스냅샷 파일들(평문/압축본)로 사전 학습 → 다음 버전 파일로 저장. 경로 반환."""
+    if zstandard is None:
+        raise RuntimeError("zstandard is not installed (pip install zstandard)")
+    samples = [read_bytes(p) for p in paths]
+    samples = [s for s in samples if s]
+    if len(samples) < 8:
+        raise ValueError(f"need at least 8 non-empty samples to train a dictionary (got {len(samples)})")
+    d = zstandard.train_dictionary(size, samples, level=level)
+    out_dir = Path(out_dir) if out_dir else DICT_DIRS[0]
+    out_dir.mkdir(parents=True, exist_ok=True)
+    versions = [int(m.group(1)) for m in (_VER_RX.match(p.name) for p in out_dir.glob(f"{DICT_PREFIX}-v*.zdict")) if m]
+    path = out_dir / f"{DICT_PREFIX}-v{max(versions, default=0) + 1}.zdict"
+    path.write_bytes(d.as_bytes())
+    global _DICTS
+    with _DICT_LOCK:
+        _DICTS = None                        # 다음 쓰기부터 새 버전
+    return path
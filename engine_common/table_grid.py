@@ -0,0 +1,286 @@
+# engine_common/table_grid.py
+"""
+rowspan/colspan 을 펼친 표 격자(grid) — 사설 탭 파서 공용.
+
+각 탭이 따로 갖고 있던 표 펼치기(_grid + cellmap, _consume_row + prev/left 트래커)를 대신한다.
+lxml 요소(또는 HTML 조각 / BeautifulSoup Tag)를 받아 한 번의 순회로
+
+    grid.rows[r][c] -> Cell | None   (행마다 ncols 칸, 병합 셀은 덮는 모든 칸에 같은 Cell)
+
+을 만든다.
+
+- Cell: 원본 요소(el), 태그명(name), 시작 좌표(r0, c0), rowspan/colspan, text()/strings()/imgs()/list_items()
+  · 텍스트는 처음 요청할 때 한 번만 계산(병합 셀은 여러 칸이 공유)
+  · text(sep) / get_text(sep) 는 BeautifulSoup get_text(sep) 와 같은 규칙 (주석/script/style 제외)
+- records(grid, cols): 행마다 {열 이름: 값} — 비는 칸은 직전 행 값 (예전 _consume_row 대체)
+- 숨김 셀(style 에 display:none)은 배치하지 않는다(브라우저에 보이는 표 기준). skip_hidden=False 로 끌 수 있음.
+- rowspan 이 마지막 행을 넘으면 표 끝에서 자른다(브라우저와 동일).
+- body_only=True(기본): tbody 가 있으면 tbody 행만, 없으면 표의 모든 행. header 는 thead 첫 행(없으면 표 첫 행)의 셀.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+
+_SKIP_TEXT = frozenset({"script", "style", "template"})
+_SECTIONS = ("thead", "tbody", "tfoot")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 입력 정규화
+# ──────────────────────────────────────────────────────────────────────────────
+def as_element(obj):
+    """lxml 요소 / HTML 문자열(bytes) / BeautifulSoup Tag → lxml 요소."""
+    if obj is None:
+        return None
+    if isinstance(obj, (str, bytes)):
+        if not obj.strip():
+            return None
+        return lxml.html.fromstring(obj)
+    if isinstance(obj, etree._Element):
+        return obj
+    return lxml.html.fromstring(str(obj))       # bs4 Tag 등 (Tag 는 모르는 속성을 find() 로 풀어서 hasattr 검사 불가)
+
+
+def find_tables(obj) -> List:
+    """obj 안의 모든 table 요소 (obj 자신이 table 이면 맨 앞)."""
+    el = as_element(obj)
+    if el is None:
+        return []
+    return ([el] if el.tag == "table" else []) + el.xpath(".//table")
+
+
+def _span(v) -> int:
+    try:
+        return max(1, int(str(v).strip()))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _hidden(el) -> bool:
+    style = el.get("style")
+    return bool(style) and "display:none" in style.replace(" ", "").lower()
+
+
+def _strings(el, out: list) -> list:
+    if el.text:
+        out.append(el.text)
+    for ch in el:
+        if isinstance(ch.tag, str) and ch.tag not in _SKIP_TEXT:
+            _strings(ch, out)
+        if ch.tail:
+            out.append(ch.tail)
+    return out
+
+
+def text_of(el, sep: str = "") -> str:
+    """lxml 요소 텍스트 — BeautifulSoup get_text(sep) 와 같은 규칙 (셀 안 li 등 하위 요소용)."""
+    return sep.join(_strings(el, [])) if el is not None else ""
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cell / Grid
+# ──────────────────────────────────────────────────────────────────────────────
+class Cell:
+    __slots__ = ("el", "name", "r0", "c0", "rowspan", "colspan", "_strings", "_text")
+
+    def __init__(self, el, r0: int, c0: int, rowspan: int, colspan: int):
+        self.el = el
+        self.name = el.tag
+        self.r0, self.c0 = r0, c0
+        self.rowspan, self.colspan = rowspan, colspan
+        self._strings = None
+        self._text = {}
+
+    def get(self, attr: str, default=None):
+        return self.el.get(attr, default)
+
+    def strings(self) -> List[str]:
+        """셀 안 텍스트 조각(원문 그대로) — BeautifulSoup .strings 와 같은 순서."""
+        if self._strings is None:
+            self._strings = _strings(self.el, [])
+        return self._strings
+
+    def text(self, sep: str = "") -> str:
+        t = self._text.get(sep)
+        if t is None:
+            t = self._text[sep] = sep.join(self.strings())
+        return t
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        """BeautifulSoup Tag.get_text 호환 → 탭별 _txt(el) 헬퍼를 셀에 그대로 쓸 수 있다."""
+        if strip:
+            return separator.join(t.strip() for t in self.strings() if t.strip())
+        return self.text(separator)
+
+    def imgs(self, base: Optional[str] = None) -> List[str]:
+        srcs = [img.get("src", "") for img in self.el.iter("img")]
+        return [urljoin(base, s) for s in srcs] if base else srcs
+
+    def list_items(self, sep: str = " ") -> List[str]:
+        """셀 안 li 마다 텍스트 (<ul><li>… 목록 칸용)."""
+        return [text_of(li, sep) for li in self.el.iter("li")]
+
+    def is_origin(self, r: int) -> bool:
+        """r 행이 이 셀이 실제로 놓인 행인지 (rowspan 으로 이어진 행이면 False)."""
+        return r == self.r0
+
+    def __repr__(self):
+        return f"Cell({self.name}@{self.r0},{self.c0} {self.rowspan}x{self.colspan} {self.text()[:20]!r})"
+
+
+class Grid:
+    __slots__ = ("rows", "header", "ncols", "table")
+
+    def __init__(self, rows: List[List[Optional[Cell]]], header: List[Cell], table=None):
+        self.rows = rows
+        self.header = header
+        self.ncols = max((len(r) for r in rows), default=0)
+        self.table = table
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[List[Optional[Cell]]]:
+        return iter(self.rows)
+
+    @property
+    def nrows(self) -> int:
+        return len(self.rows)
+
+    def at(self, r: int, c: Optional[int]) -> Optional[Cell]:
+        """(r, c) 칸의 셀. 범위 밖/None 이면 None. c=-1 은 그 행의 마지막 셀."""
+        if c is None or not (0 <= r < len(self.rows)):
+            return None
+        row = self.rows[r]
+        if c < 0:
+            filled = [x for x in row if x is not None]
+            return filled[c] if len(filled) >= -c else None
+        return row[c] if c < len(row) else None
+
+    def header_texts(self, sep: str = "") -> List[str]:
+        return [c.text(sep) for c in self.header]
+
+
+def _row_elements(table, body_only: bool) -> list:
+    sections = [ch for ch in table if isinstance(ch.tag, str) and ch.tag in _SECTIONS]
+    if body_only:
+        bodies = [s for s in sections if s.tag == "tbody"]
+        if bodies:
+            return [tr for b in bodies for tr in b if tr.tag == "tr"]
+    out = []
+    for ch in table:
+        if not isinstance(ch.tag, str):
+            continue
+        if ch.tag == "tr":
+            out.append(ch)
+        elif ch.tag in _SECTIONS:
+            out.extend(tr for tr in ch if tr.tag == "tr")
+    return out
+
+
+def _header_cells(table) -> List[Cell]:
+    thead = next((ch for ch in table if ch.tag == "thead"), None)
+    src = thead if thead is not None else table
+    tr = next(iter(src.iter("tr")), None)
+    if tr is None:
+        return []
+    return [Cell(td, 0, i, 1, 1) for i, td in enumerate(x for x in tr if x.tag in ("th", "td"))]
+
+
+def build_grid(table, body_only: bool = True, skip_hidden: bool = True) -> Optional[Grid]:
+    """
+    table(lxml 요소 / HTML / bs4 Tag) → Grid. table 이 아니면 그 안의 첫 table. 표가 없으면 None.
+    한 번의 순회: 열마다 (셀, 남은 rowspan) 만 들고 다니며 행을 채운다.
+    """
+    el = as_element(table)
+    if el is not None and el.tag != "table":
+        found = el.xpath(".//table")
+        el = found[0] if found else None
+    if el is None:
+        return None
+
+    trs = _row_elements(el, body_only)
+    rows: List[List[Optional[Cell]]] = []
+    carry: List[Optional[Cell]] = []      # 열별로 아래 행까지 이어지는 셀
+    left: List[int] = []                  # 열별 남은 rowspan
+    for r, tr in enumerate(trs):
+        row: List[Optional[Cell]] = []    # 항상 len(row) == 다음에 채울 열
+        for td in tr:
+            if td.tag not in ("th", "td") or (skip_hidden and _hidden(td)):
+                continue
+            c = len(row)
+            while c < len(left) and left[c] > 0:      # 위에서 내려온 셀이 차지한 칸 건너뛰기
+                row.append(carry[c])
+                left[c] -= 1
+                c += 1
+            rs = min(_span(td.get("rowspan", 1)), len(trs) - r)
+            cs = _span(td.get("colspan", 1))
+            cell = Cell(td, r, c, rs, cs)
+            for cc in range(c, c + cs):
+                if cc == len(left):
+                    carry.append(None)
+                    left.append(0)
+                row.append(cell)
+                carry[cc] = cell
+                left[cc] = rs - 1
+        for cc in range(len(row), len(left)):         # 행 끝쪽에 이어지는 셀
+            if left[cc] > 0:
+                left[cc] -= 1
+                row.append(carry[cc])
+            else:
+                row.append(None)
+        rows.append(row)
+
+    ncols = max((len(r) for r in rows), default=0)
+    for row in rows:
+        if len(row) < ncols:
+            row.extend([None] * (ncols - len(row)))
+    return Grid(rows, _header_cells(el), el)
+
+
+def grid_from_html(html, index: int = 0, **kw) -> Optional[Grid]:
+    """HTML(조각/페이지)에서 index 번째 table 의 Grid."""
+    tables = find_tables(html)
+    return build_grid(tables[index], **kw) if len(tables) > index else None
+
+
+def grids(html, **kw) -> List[Grid]:
+    return [build_grid(t, **kw) for t in find_tables(html)]
+
+
+def records(grid: Grid, cols: Sequence[str], text: Optional[Callable[[Cell, str], Any]] = None,
+            fill: Any = None) -> Iterator[Dict[str, Any]]:
+    """
+    행마다 {열 이름: 값} (cols[i] = i 번째 칸).
+    - 값은 text(cell, key) (기본 cell.text()) — 병합 셀은 한 번만 계산해 덮는 행/칸에 재사용
+    - 칸이 비어 있으면(행 끝 셀 누락) 직전 행 값, 첫 행이면 fill
+    이전 탭들의 _consume_row(prev/left rowspan 트래커) 를 대신한다.
+    """
+    text = text or (lambda cell, key: cell.text())
+    memo: Dict[Tuple[int, str], Any] = {}
+    prev = {k: fill for k in cols}
+    for row in grid.rows:
+        out = {}
+        for i, key in enumerate(cols):
+            cell = row[i] if i < len(row) else None
+            if cell is None:
+                out[key] = prev[key]
+                continue
+            mk = (id(cell), key)
+            if mk not in memo:
+                memo[mk] = text(cell, key)
+            out[key] = memo[mk]
+        prev = out
+        yield out
+
+
+def column_values(grid: Grid, r: int, cols: Sequence[Optional[int]], sep: str = "") -> List[Optional[str]]:
+    """r 행의 cols 칸 텍스트 (칸이 비면 None)."""
+    out = []
+    for c in cols:
+        cell = grid.at(r, c)
+        out.append(cell.text(sep) if cell is not None else None)
+    return out
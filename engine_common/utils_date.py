@@ -1,20 +1,27 @@
 import re
 from datetime import datetime
+from functools import lru_cache
+from typing import Iterable
 from .utils_text import _clean
 
 _YEAR_2DIGIT = re.compile(r"^[`'’‵′]?(?P<yy>\d{2})\.(?P<mm>\d{2})\.(?P<dd>\d{2})")
 _MD          = re.compile(r"(?P<mm>\d{2})\.(?P<dd>\d{2})")
+_RANGE_SEP   = re.compile(r"[~∼\-]+")
+_HHMM_PAIR   = re.compile(r"(\d{1,2}:\d{2}).*?(\d{1,2}:\d{2})")
+_MINUTES     = re.compile(r"(\d+)\s*분")
 
-def _to_year(yy: int) -> int: return 2000 + yy
+# Q-Net(공공) 표기: "2025.01.13" / "2025.01.13 ~ 2025.01.16"
+DATE_ANY    = re.compile(r"\d{4}\.\d{1,2}\.\d{1,2}")
+DATE_RANGE  = re.compile(r"\d{4}\.\d{2}\.\d{2}\s*[~\-]\s*\d{4}\.\d{2}\.\d{2}")
+DATE_SINGLE = re.compile(r"\d{4}\.\d{2}\.\d{2}")
 
-def _parse_one_date(token: str, base_year: int) -> str | None:
-    """
-    "01.20.(월)" / "'24.11.05.(화)" / "02.27(목)" / "01.02" -> "YYYY-MM-DD"
-    """
-    if not token:
-        return None
-    s = token.strip()
+# 같은 표시 문자열이 회차/등급마다 반복되므로 (token, base_year) 단위로 메모
+_MEMO_SIZE = 4096
 
+def _to_year(yy: int) -> int: return 2000 + yy
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _one_date(s: str, base_year: int) -> str | None:
     m = _YEAR_2DIGIT.search(s)
     if m:
         yy = int(m.group("yy")); mm = int(m.group("mm")); dd = int(m.group("dd"))
@@ -27,15 +34,18 @@ def _parse_one_date(token: str, base_year: int) -> str | None:
 
     return None
 
-
-def _parse_md_range(s: str, base_year: int) -> tuple[str | None, str | None]:
+def _parse_one_date(token: str, base_year: int) -> str | None:
     """
-    "01.20 ~ 02.07" / "'24.12.23 ~ `25.01.01" -> (YYYY-MM-DD, YYYY-MM-DD)
+    "01.20.(월)" / "'24.11.05.(화)" / "02.27(목)" / "01.02" -> "YYYY-MM-DD"
     """
-    if not s:
-        return (None, None)
+    if not token:
+        return None
+    return _one_date(token.strip(), base_year)
 
-    parts = re.split(r"[~∼\-]+", _clean(s))
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _md_range(s: str, base_year: int) -> tuple[str | None, str | None]:
+    parts = _RANGE_SEP.split(_clean(s))
     if len(parts) < 2:
         d = _parse_one_date(parts[0], base_year)
         return (d, d)
@@ -78,13 +88,75 @@ def _parse_md_range(s: str, base_year: int) -> tuple[str | None, str | None]:
         pass
     return (left, right)
 
-def _split_time_range(s: str):
+def _parse_md_range(s: str, base_year: int) -> tuple[str | None, str | None]:
+    """
+    "01.20 ~ 02.07" / "'24.12.23 ~ `25.01.01" -> (YYYY-MM-DD, YYYY-MM-DD)
+    """
     if not s:
         return (None, None)
-    flat = _clean(s)
-    m = re.search(r"(\d{1,2}:\d{2}).*?(\d{1,2}:\d{2})", flat)
+    return _md_range(s, base_year)
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _time_range(s: str):
+    m = _HHMM_PAIR.search(_clean(s))
     return (m.group(1), m.group(2)) if m else (None, None)
 
+def _split_time_range(s: str):
+    if not s:
+        return (None, None)
+    return _time_range(s)
+
 def _minutes_ko(s: str | None):
-    m = re.search(r"(\d+)\s*분", s or "")
+    m = _MINUTES.search(s or "")
     return int(m.group(1)) if m else None
+
+
+# ── 배치 API ─────────────────────────────────────────────────────────────────
+def parse_date_column(values: Iterable[str | None], base_year: int | None = None,
+                      kind: str = "range") -> list[tuple[str | None, str | None]]:
+    """
+    표시 문자열 열(column) 전체를 한 번에 ISO 로 변환.
+      kind="range" → 각 값마다 (start, end)  (_parse_md_range 규칙 = 연도 넘김 포함)
+      kind="one"   → 각 값마다 (date, None)  (_parse_one_date)
+    같은 표시 문자열은 한 번만 파싱한다.
+    """
+    base_year = base_year or datetime.now().year
+    seen: dict = {}
+    out = []
+    for v in values:
+        if not v or not isinstance(v, str):
+            out.append((None, None))
+            continue
+        r = seen.get(v)
+        if r is None:
+            if kind == "one":
+                r = (_parse_one_date(v, base_year), None)
+            else:
+                r = _md_range(v, base_year)
+            seen[v] = r
+        out.append(r)
+    return out
+
+def parse_time_column(values: Iterable[str | None]) -> list[tuple[str | None, str | None]]:
+    """시험시간 표시 열 → [(start, end), ...]"""
+    return [_split_time_range(v) if isinstance(v, str) else (None, None) for v in values]
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _coalesce(s: str) -> str | None:
+    dates = DATE_SINGLE.findall(s)
+    if not dates:
+        return None
+    if "~" in s and len(dates) == 1:
+        return f"{dates[0]} ~"
+    if len(dates) == 1:
+        return dates[0]
+    return f"{dates[0]} ~ {dates[-1]}"
+
+def coalesce_dotted(value: str | None) -> str | None:
+    """
+    Q-Net 표기 정리: 날짜 1개 → "YYYY.MM.DD", 여러 개 → "첫날 ~ 끝날",
+    "YYYY.MM.DD ~" (끝 미정)은 그대로 유지. 날짜가 없으면 None.
+    """
+    if not value:
+        return None
+    return _coalesce(value.strip())
@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 
 def _clean(s: str | None) -> str:
     return re.sub(r"\s+", " ", s or "").strip()
@@ -14,6 +13,7 @@ def sanitize_text(txt: str) -> str:
     
     # <p, <br, <span 등 태그 기호가 보인다면 한 번 더 파싱하여 텍스트만 추출
     if "<" in txt and ">" in txt:
+        from bs4 import BeautifulSoup       # 태그가 남은 경우에만 (engine_common 임포트를 가볍게)
         try:
             # lxml을 사용하여 가장 강력하게 정화
             txt = BeautifulSoup(txt, "lxml").get_text(" ", strip=True)
@@ -0,0 +1,323 @@
+# engine_common/waits.py
+"""
+사설 탭 runner 용 조건 기반 대기 도구.
+
+고정 sleep(time.sleep(1), 0.25초×20 폴링, 프레임마다 2~3초 타임아웃) 대신
+"페이지가 실제로 준비된 시점"까지만 기다린다.
+
+- until / present / clickable / first_present : WebDriverWait 래퍼 (짧은 폴링 + 탭 예산 적용)
+- header_present(text)       : h3/h4 등 제목에 text 가 보일 때까지
+- rows_stable(css)           : 표 행 수가 min_rows 이상이고 settle 초 동안 변하지 않을 때까지
+- dom_settled()              : MutationObserver 로 DOM 변경이 quiet_ms 동안 없을 때까지 (브라우저 안에서 1회 호출)
+- network_idle()             : performance 로그(없으면 Resource Timing)로 진행 중 요청이 없을 때까지
+- find_in_frames(finder)     : 현재 문서 + 모든 iframe 을 즉시 훑어 finder 결과를 찾을 때까지 (프레임별 대기 없음)
+- budget(seconds)            : 탭 단위 지연 예산. 예산 안에서는 모든 대기 타임아웃이 남은 시간으로 잘린다.
+- set_replay(True)           : 스냅샷 재생(run_once --replay) 중에는 폴링 사이에 쉬지 않는다
+
+대기 실패는 selenium TimeoutException 으로 올린다(WebDriverWait 와 동일).
+상태 확인용(header_present/rows_stable/dom_settled/network_idle)은 예외 대신 결과값을 돌려준다.
+
+환경변수
+  WAIT_TIMEOUT=10   기본 대기 타임아웃(초)
+  WAIT_POLL=0.1     폴링 간격(초)
+  TAB_BUDGET_S=90   run_once 탭 하나의 기본 지연 예산(초, cert_map 의 budget 으로 탭별 지정)
+"""
+from __future__ import annotations
+import json, os, threading, time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple
+
+from selenium.common.exceptions import (
+    NoSuchElementException, NoSuchFrameException, StaleElementReferenceException, TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from engine_common import xhr_capture
+
+WAIT_TIMEOUT = float(os.getenv("WAIT_TIMEOUT", "10"))
+WAIT_POLL    = float(os.getenv("WAIT_POLL", "0.1"))
+TAB_BUDGET_S = float(os.getenv("TAB_BUDGET_S", "90"))
+
+Locator = Tuple[str, str]
+
+# 재생 중에는 ReplayDriver 가 기록된 결과를 바로 돌려준다 → 폴링 간격은 의미가 없고,
+# 조건이 끝내 참이 안 되면 기록이 바닥나 TimeoutException 이 난다(기록 때와 같은 결과).
+_REPLAY = False
+_REPLAY_POLL = 1e-6          # WebDriverWait 는 0 을 기본값(0.5초)으로 바꾸므로 0 대신 아주 작은 값
+
+
+def set_replay(on: bool) -> None:
+    global _REPLAY
+    _REPLAY = bool(on)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 탭 지연 예산 (스레드별: run_once --all 병렬 실행에서 자격증마다 독립)
+# ──────────────────────────────────────────────────────────────────────────────
+_local = threading.local()
+
+
+class Budget:
+    def __init__(self, seconds: float, name: str = ""):
+        self.seconds = float(seconds)
+        self.name = name
+        self.start = time.monotonic()
+        self.deadline = self.start + self.seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+
+@contextmanager
+def budget(seconds: Optional[float] = None, name: str = ""):
+    """with budget(30, "gtq/exam_schedule"): ... → 블록 안의 대기는 남은 예산 이상 기다리지 않는다."""
+    b = Budget(TAB_BUDGET_S if seconds is None else seconds, name)
+    prev = getattr(_local, "budget", None)
+    _local.budget = b
+    try:
+        yield b
+    finally:
+        _local.budget = prev
+        if b.elapsed() > b.seconds:
+            print(f"[WARN] {name or 'tab'}: latency budget exceeded ({b.elapsed():.1f}s > {b.seconds:.0f}s)")
+
+
+def remaining() -> Optional[float]:
+    b = getattr(_local, "budget", None)
+    return None if b is None else b.remaining()
+
+
+def _timeout(timeout: Optional[float]) -> float:
+    t = WAIT_TIMEOUT if timeout is None else float(timeout)
+    r = remaining()
+    return t if r is None else min(t, r)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 기본 대기
+# ──────────────────────────────────────────────────────────────────────────────
+def until(driver, cond: Callable[[Any], Any], timeout: Optional[float] = None,
+          message: str = "", poll: Optional[float] = None):
+    """cond(driver) 가 참 값을 돌려줄 때까지 → 그 값. 시간 초과면 TimeoutException."""
+    poll = _REPLAY_POLL if _REPLAY else (poll or WAIT_POLL)
+    return WebDriverWait(driver, _timeout(timeout), poll_frequency=poll).until(cond, message)
+
+
+def present(driver, locator: Locator, timeout: Optional[float] = None):
+    return until(driver, EC.presence_of_element_located(locator), timeout)
+
+
+def clickable(driver, locator: Locator, timeout: Optional[float] = None):
+    return until(driver, EC.element_to_be_clickable(locator), timeout)
+
+
+def first_present(driver, locators: Sequence[Locator], timeout: Optional[float] = None,
+                  clickable_only: bool = False):
+    """
+    후보 locator 여러 개를 한 번의 대기로 확인 → 먼저 나타난 요소(같은 시점이면 앞 순서 우선).
+    후보마다 차례로 타임아웃까지 기다리던 방식(실패 후보 × 5초)을 대체.
+    """
+    make = EC.element_to_be_clickable if clickable_only else EC.presence_of_element_located
+    conds = [make(loc) for loc in locators]
+
+    def _any(d):
+        for c in conds:
+            try:
+                el = c(d)
+            except (NoSuchElementException, StaleElementReferenceException):
+                continue
+            if el:
+                return el
+        return False
+    return until(driver, _any, timeout)
+
+
+def js_click(driver, el) -> None:
+    driver.execute_script("arguments[0].scrollIntoView({block:'center'}); arguments[0].click();", el)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 상태 확인 대기 (실패 시 예외 대신 결과값)
+# ──────────────────────────────────────────────────────────────────────────────
+_HEADER_JS = """
+const text = arguments[0], tags = arguments[1];
+for (const h of document.querySelectorAll(tags)) {
+  if (h.textContent.includes(text) && (h.offsetParent !== null || h.getClientRects().length)) return true;
+}
+return false;
+"""
+
+
+def header_present(driver, text: str, tags: Iterable[str] = ("h3", "h4"),
+                   timeout: Optional[float] = None) -> bool:
+    """보이는 제목(h3/h4 …)에 text 가 나타날 때까지. 나타나면 True."""
+    sel = ",".join(tags)
+    try:
+        return bool(until(driver, lambda d: d.execute_script(_HEADER_JS, text, sel), timeout))
+    except TimeoutException:
+        return False
+
+
+_COUNT_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+
+def rows_stable(driver, css: str, min_rows: int = 1, settle: float = 0.3,
+                timeout: Optional[float] = None) -> int:
+    """
+    css 로 잡히는 행 수가 min_rows 이상이 되고 settle 초 동안 그대로면 그 행 수를 반환.
+    시간 초과면 마지막으로 본 행 수(0 일 수 있음).
+    """
+    state = {"n": -1, "since": 0.0}
+
+    def _cond(d):
+        n = int(d.execute_script(_COUNT_JS, css) or 0)
+        now = time.monotonic()
+        if n != state["n"]:
+            state["n"], state["since"] = n, now
+            return False
+        return n >= min_rows and now - state["since"] >= settle
+
+    try:
+        until(driver, _cond, timeout)
+    except TimeoutException:
+        pass
+    return max(state["n"], 0)
+
+
+_SETTLED_JS = """
+const quiet = arguments[0], limit = arguments[1], sel = arguments[2];
+const done = arguments[arguments.length - 1];
+const root = (sel && document.querySelector(sel)) || document.documentElement;
+const start = performance.now();
+let last = start;
+const obs = new MutationObserver(() => { last = performance.now(); });
+obs.observe(root, {subtree: true, childList: true, characterData: true, attributes: true});
+(function tick() {
+  const now = performance.now();
+  if (now - last >= quiet) { obs.disconnect(); done(true); return; }
+  if (now - start >= limit) { obs.disconnect(); done(false); return; }
+  setTimeout(tick, Math.min(50, quiet));
+})();
+"""
+
+
+def dom_settled(driver, quiet_ms: int = 250, timeout: Optional[float] = None,
+                root_css: Optional[str] = None) -> bool:
+    """
+    MutationObserver 로 root_css(기본 문서 전체) 아래 DOM 변경이 quiet_ms 동안 없을 때까지.
+    브라우저 안에서 끝까지 기다리므로 WebDriver 왕복은 1회. 조용해지면 True.
+    """
+    limit = _timeout(timeout)
+    try:
+        driver.set_script_timeout(limit + 5)
+        return bool(driver.execute_async_script(_SETTLED_JS, quiet_ms, int(limit * 1000), root_css))
+    except (TimeoutException, WebDriverException) as e:
+        print(f"[WARN] dom_settled: {e.__class__.__name__}")
+        return False
+
+
+_RESOURCE_COUNT_JS = "return performance.getEntriesByType('resource').length;"
+_NET_START = "Network.requestWillBeSent"
+_NET_END = ("Network.loadingFinished", "Network.loadingFailed")
+
+
+def _perf_events(driver):
+    """performance 로그(goog:loggingPrefs) → Network.* (method, requestId). 지원하지 않으면 None."""
+    try:
+        entries = driver.get_log("performance")
+    except (WebDriverException, ValueError, AttributeError):
+        return None
+    xhr_capture.feed(driver, entries)      # 로그는 읽으면 비워지므로 진행 중인 XHR 캡처에도 전달
+    out = []
+    for e in entries or ():
+        try:
+            msg = json.loads(e["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = msg.get("method", "")
+        if method == _NET_START or method in _NET_END:
+            out.append((method, (msg.get("params") or {}).get("requestId")))
+    return out
+
+
+def network_idle(driver, idle_ms: int = 500, timeout: Optional[float] = None,
+                 max_inflight: int = 0) -> bool:
+    """
+    진행 중 요청이 max_inflight 이하인 상태가 idle_ms 동안 이어질 때까지.
+    performance 로그가 켜져 있으면(run_once._make_driver) 요청 시작/종료 이벤트로,
+    아니면 Resource Timing 항목 수 + document.readyState 로 판단. 조용해지면 True.
+    """
+    inflight: set = set()
+    state = {"last": time.monotonic(), "mark": None, "perf": True}
+
+    def _cond(d):
+        now = time.monotonic()
+        events = _perf_events(d) if state["perf"] else None
+        if events is None:
+            state["perf"] = False
+            mark = (d.execute_script("return document.readyState;"),
+                    d.execute_script(_RESOURCE_COUNT_JS))
+            if mark != state["mark"]:
+                state["mark"], state["last"] = mark, now
+                return False
+            return mark[0] == "complete" and now - state["last"] >= idle_ms / 1000
+        for method, rid in events:
+            if method == _NET_START:
+                inflight.add(rid)
+            else:
+                inflight.discard(rid)
+        if events:
+            state["last"] = now
+            return False
+        return len(inflight) <= max_inflight and now - state["last"] >= idle_ms / 1000
+
+    try:
+        until(driver, _cond, timeout)
+        return True
+    except TimeoutException:
+        return False
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# iframe 탐색
+# ──────────────────────────────────────────────────────────────────────────────
+def _scan_frames(driver, finder: Callable[[Any], Any], depth: int, max_depth: int):
+    found = finder(driver)
+    if found or depth >= max_depth:
+        return found
+    for i in range(len(driver.find_elements(By.TAG_NAME, "iframe"))):
+        try:
+            driver.switch_to.frame(i)
+        except (NoSuchFrameException, StaleElementReferenceException):
+            continue
+        try:
+            found = _scan_frames(driver, finder, depth + 1, max_depth)
+        finally:
+            driver.switch_to.parent_frame()
+        if found:
+            return found
+    return None
+
+
+def find_in_frames(driver, finder: Callable[[Any], Any], timeout: Optional[float] = None,
+                   max_depth: int = 5):
+    """
+    현재 문서와 모든 (중첩) iframe 에서 finder(driver) 를 즉시 실행 → 처음 나온 참 값.
+    프레임마다 기다리지 않고 전체를 한 번 훑은 뒤, 못 찾으면 폴링 간격 후 다시 훑는다.
+    끝나면 기본 문서로 돌아온다. 시간 초과면 TimeoutException.
+    """
+    def _cond(d):
+        d.switch_to.default_content()
+        try:
+            return _scan_frames(d, finder, 0, max_depth)
+        except StaleElementReferenceException:
+            return None
+    try:
+        return until(driver, _cond, timeout, poll=max(WAIT_POLL, 0.2))
+    finally:
+        driver.switch_to.default_content()
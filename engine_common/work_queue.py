@@ -0,0 +1,410 @@
+# engine_common/work_queue.py
+"""
+여러 엔진 노드가 나눠 가지는 작업 대기열 (Redis, 테스트/단일 노드용 인메모리 대역 포함).
+
+r013.txt / others.txt 를 손으로 쪼개 컨테이너마다 돌리던 것을, 공유 대기열에서 각 워커가
+jmcd / cert 를 하나씩 가져가게 바꾼다.
+
+- 단위 id      : "<kind>:<id>" (예: jmcd:1320, cert:gtq). 실행(run) 안에서 한 번만 들어감
+                 (이미 들어 있거나 끝난 단위는 enqueue 가 건너뜀 → 같은 회차에서 두 번 수집하지 않음)
+- 임대(lease)  : 가져간 워커만 heartbeat 로 기한을 늘릴 수 있다. 기한(visibility timeout)이 지나면
+                 다음 lease 때 대기열 앞으로 되돌려 다른 워커가 재시도
+- 실패         : 시도 횟수가 max_attempts 에 닿으면 dead 목록으로 (requeue_dead 로 되살림)
+- 결과 기록    : done 에 처음 기록한 결과만 남음(HSETNX) → 임대가 만료된 뒤 늦게 끝난 워커와 겹쳐도 결과는 1개.
+                 기록하면 pending 에 되돌려진 같은 id 도 지우고, lease 는 이미 done 인 id 를 꺼내면 버린다
+                 (만료 → 재대기 뒤 원래 워커가 늦게 끝낸 단위를 다시 수집하거나 dead 로 보내지 않음)
+- 임대 상실    : heartbeat 가 실패하면(다른 워커가 가져감) cancel 콜백이 LeaseLost 를 올려 작업을 멈춘다
+                 (run_once.run / run_public.process_jmcd 의 cancel 인자)
+
+Redis 키 (<prefix>:<run>:…)
+  pending(list) units(hash id→payload) leases(zset id→기한 ms) owner(hash id→토큰)
+  attempts(hash) errors(hash) done(hash id→결과) dead(list)
+상태 변경은 모두 Lua 스크립트 1회 → 노드 간 경합에도 원자적.
+
+환경변수
+  WORK_QUEUE_URL=redis://localhost:6379/0   memory 면 인메모리 대역 (한 프로세스 안에서만 공유)
+  WORK_QUEUE_PREFIX=cq                      Redis 키 접두어
+  WORK_QUEUE_RUN=default                    회차 이름 (회차마다 새로 전체 갱신, 예: 2026-10-19)
+  WORK_QUEUE_LEASE_S=120                    임대 기한(초), heartbeat 는 1/3 주기
+  WORK_QUEUE_MAX_ATTEMPTS=3                 이 횟수만큼 실패/만료되면 dead
+"""
+from __future__ import annotations
+import json, os, socket, threading, time, uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import redis
+except ImportError:       # 인메모리 대역만 쓸 때는 없어도 됨
+    redis = None
+
+WORK_QUEUE_URL          = os.getenv("WORK_QUEUE_URL", "redis://localhost:6379/0")
+WORK_QUEUE_PREFIX       = os.getenv("WORK_QUEUE_PREFIX", "cq")
+WORK_QUEUE_RUN          = os.getenv("WORK_QUEUE_RUN", "default")
+WORK_QUEUE_LEASE_S      = float(os.getenv("WORK_QUEUE_LEASE_S", "120"))
+WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "3"))
+
+
+class LeaseLost(Exception):
+    """heartbeat 실패: 임대 기한이 지나 다른 워커가 가져갔음."""
+
+
+@dataclass
+class Lease:
+    id: str
+    payload: Dict[str, Any]
+    attempt: int
+    token: str
+
+
+def unit_id(kind: str, id: str) -> str:
+    return f"{kind}:{id}"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Redis
+# ──────────────────────────────────────────────────────────────────────────────
+# 만료된 임대 회수 (lease 앞에서 함께 실행): 이미 done 이면 버림, 시도 횟수가 남았으면 대기열 앞으로, 아니면 dead
+_LUA_REAP = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, id in ipairs(expired) do
+  redis.call('ZREM', KEYS[2], id)
+  redis.call('HDEL', KEYS[3], id)
+  if redis.call('HEXISTS', KEYS[8], id) == 0 then      -- 결과가 이미 기록됐으면 되돌리지 않음
+    redis.call('HSET', KEYS[6], id, 'lease expired')
+    if tonumber(redis.call('HGET', KEYS[4], id) or '0') >= tonumber(ARGV[4]) then
+      redis.call('LPUSH', KEYS[7], id)
+    else
+      redis.call('RPUSH', KEYS[1], id)
+    end
+  end
+end
+"""
+
+# KEYS: pending leases owner attempts units errors dead done   ARGV: now_ms ttl_ms token max_attempts
+_LUA_LEASE = _LUA_REAP + """
+local id = redis.call('RPOP', KEYS[1])
+while id and redis.call('HEXISTS', KEYS[8], id) == 1 do   -- 늦게 끝난 워커가 이미 기록한 단위는 버림
+  id = redis.call('RPOP', KEYS[1])
+end
+if not id then return nil end
+redis.call('ZADD', KEYS[2], tonumber(ARGV[1]) + tonumber(ARGV[2]), id)
+redis.call('HSET', KEYS[3], id, ARGV[3])
+local n = redis.call('HINCRBY', KEYS[4], id, 1)
+return {id, redis.call('HGET', KEYS[5], id), n}
+"""
+
+# KEYS: units pending done   ARGV: id payload
+_LUA_ENQUEUE = """
+if redis.call('HEXISTS', KEYS[3], ARGV[1]) == 1 or redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+  return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('LPUSH', KEYS[2], ARGV[1])
+return 1
+"""
+
+# KEYS: leases owner   ARGV: id token deadline_ms
+_LUA_HEARTBEAT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('ZADD', KEYS[1], 'XX', ARGV[3], ARGV[1])
+return 1
+"""
+
+# KEYS: leases owner done pending   ARGV: id token result  → 1 = 이 결과가 기록됨, 0 = 이미 다른 결과가 있음
+_LUA_COMPLETE = """
+local won = redis.call('HSETNX', KEYS[3], ARGV[1], ARGV[3])
+redis.call('LREM', KEYS[4], 0, ARGV[1])
+if redis.call('HGET', KEYS[2], ARGV[1]) == ARGV[2] then
+  redis.call('ZREM', KEYS[1], ARGV[1])
+  redis.call('HDEL', KEYS[2], ARGV[1])
+end
+return won
+"""
+
+# KEYS: leases owner attempts pending dead errors   ARGV: id token error max_attempts
+# → 1 = 재시도 대기, 0 = dead, -1 = 이미 임대를 잃음(아무것도 안 함)
+_LUA_FAIL = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then return -1 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HSET', KEYS[6], ARGV[1], ARGV[3])
+if tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0') >= tonumber(ARGV[4]) then
+  redis.call('LPUSH', KEYS[5], ARGV[1])
+  return 0
+end
+redis.call('LPUSH', KEYS[4], ARGV[1])
+return 1
+"""
+
+# KEYS: dead attempts pending
+_LUA_REQUEUE_DEAD = """
+local n = 0
+local id = redis.call('RPOP', KEYS[1])
+while id do
+  redis.call('HDEL', KEYS[2], id)
+  redis.call('LPUSH', KEYS[3], id)
+  n = n + 1
+  id = redis.call('RPOP', KEYS[1])
+end
+return n
+"""
+
+
+class RedisQueue:
+    def __init__(self, url: str = WORK_QUEUE_URL, run: str = WORK_QUEUE_RUN,
+                 prefix: str = WORK_QUEUE_PREFIX, max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS, client=None):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("redis package is not installed (pip install 'redis>=5')")
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.r = client
+        self.run = run
+        self.max_attempts = max_attempts
+        p = f"{prefix}:{run}"
+        self.k = {n: f"{p}:{n}" for n in
+                  ("pending", "units", "leases", "owner", "attempts", "errors", "done", "dead")}
+        self._lease = self.r.register_script(_LUA_LEASE)
+        self._enqueue = self.r.register_script(_LUA_ENQUEUE)
+        self._heartbeat = self.r.register_script(_LUA_HEARTBEAT)
+        self._complete = self.r.register_script(_LUA_COMPLETE)
+        self._fail = self.r.register_script(_LUA_FAIL)
+        self._requeue_dead = self.r.register_script(_LUA_REQUEUE_DEAD)
+
+    def _keys(self, *names: str) -> List[str]:
+        return [self.k[n] for n in names]
+
+    def enqueue(self, id: str, payload: Dict[str, Any]) -> bool:
+        return bool(self._enqueue(keys=self._keys("units", "pending", "done"),
+                                  args=[id, json.dumps(payload, ensure_ascii=False)]))
+
+    def lease(self, token: str, ttl_s: float = WORK_QUEUE_LEASE_S) -> Optional[Lease]:
+        res = self._lease(keys=self._keys("pending", "leases", "owner", "attempts", "units", "errors", "dead", "done"),
+                          args=[_now_ms(), int(ttl_s * 1000), token, self.max_attempts])
+        if not res:
+            return None
+        id, payload, n = res
+        return Lease(id, json.loads(payload or "{}"), int(n), token)
+
+    def heartbeat(self, lease: Lease, ttl_s: float = WORK_QUEUE_LEASE_S) -> bool:
+        return bool(self._heartbeat(keys=self._keys("leases", "owner"),
+                                    args=[lease.id, lease.token, _now_ms() + int(ttl_s * 1000)]))
+
+    def complete(self, lease: Lease, result: Any) -> bool:
+        return bool(self._complete(keys=self._keys("leases", "owner", "done", "pending"),
+                                   args=[lease.id, lease.token, json.dumps(result, ensure_ascii=False, default=str)]))
+
+    def fail(self, lease: Lease, error: str) -> int:
+        return int(self._fail(keys=self._keys("leases", "owner", "attempts", "pending", "dead", "errors"),
+                              args=[lease.id, lease.token, error, self.max_attempts]))
+
+    def requeue_dead(self) -> int:
+        return int(self._requeue_dead(keys=self._keys("dead", "attempts", "pending")))
+
+    def stats(self) -> Dict[str, int]:
+        pipe = self.r.pipeline()
+        pipe.hlen(self.k["units"]).llen(self.k["pending"]).zcard(self.k["leases"])
+        pipe.hlen(self.k["done"]).llen(self.k["dead"])
+        units, pending, leased, done, dead = pipe.execute()
+        return {"units": units, "pending": pending, "leased": leased, "done": done, "dead": dead}
+
+    def dead(self) -> List[Dict[str, Any]]:
+        ids = self.r.lrange(self.k["dead"], 0, -1)
+        errs = self.r.hmget(self.k["errors"], ids) if ids else []
+        return [{"id": i, "error": e} for i, e in zip(ids, errs)]
+
+    def results(self) -> Dict[str, Any]:
+        return {k: json.loads(v) for k, v in self.r.hgetall(self.k["done"]).items()}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 인메모리 대역 (RedisQueue 와 같은 규칙, 한 프로세스 안의 여러 워커 스레드용)
+# ──────────────────────────────────────────────────────────────────────────────
+class MemoryQueue:
+    def __init__(self, run: str = WORK_QUEUE_RUN, max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS):
+        self.run = run
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._pending: List[str] = []            # 앞 = 다음에 나갈 단위
+        self._units: Dict[str, Dict[str, Any]] = {}
+        self._leases: Dict[str, float] = {}      # id → 기한(ms)
+        self._owner: Dict[str, str] = {}
+        self._attempts: Dict[str, int] = {}
+        self._errors: Dict[str, str] = {}
+        self._done: Dict[str, Any] = {}
+        self._dead: List[str] = []
+
+    def enqueue(self, id: str, payload: Dict[str, Any]) -> bool:
+        with self._lock:
+            if id in self._done or id in self._units:
+                return False
+            self._units[id] = payload
+            self._pending.append(id)
+            return True
+
+    def _reap(self, now: int) -> None:
+        for id in [i for i, dl in self._leases.items() if dl <= now]:
+            del self._leases[id]
+            self._owner.pop(id, None)
+            if id in self._done:
+                continue
+            self._errors[id] = "lease expired"
+            if self._attempts.get(id, 0) >= self.max_attempts:
+                self._dead.append(id)
+            else:
+                self._pending.insert(0, id)
+
+    def lease(self, token: str, ttl_s: float = WORK_QUEUE_LEASE_S) -> Optional[Lease]:
+        with self._lock:
+            now = _now_ms()
+            self._reap(now)
+            while self._pending and self._pending[0] in self._done:
+                self._pending.pop(0)
+            if not self._pending:
+                return None
+            id = self._pending.pop(0)
+            self._leases[id] = now + int(ttl_s * 1000)
+            self._owner[id] = token
+            n = self._attempts[id] = self._attempts.get(id, 0) + 1
+            return Lease(id, dict(self._units.get(id) or {}), n, token)
+
+    def heartbeat(self, lease: Lease, ttl_s: float = WORK_QUEUE_LEASE_S) -> bool:
+        with self._lock:
+            if self._owner.get(lease.id) != lease.token or lease.id not in self._leases:
+                return False
+            self._leases[lease.id] = _now_ms() + int(ttl_s * 1000)
+            return True
+
+    def complete(self, lease: Lease, result: Any) -> bool:
+        with self._lock:
+            won = lease.id not in self._done
+            if won:
+                self._done[lease.id] = json.loads(json.dumps(result, default=str))
+            self._pending = [i for i in self._pending if i != lease.id]
+            if self._owner.get(lease.id) == lease.token:
+                self._leases.pop(lease.id, None)
+                self._owner.pop(lease.id, None)
+            return won
+
+    def fail(self, lease: Lease, error: str) -> int:
+        with self._lock:
+            if self._owner.get(lease.id) != lease.token:
+                return -1
+            self._leases.pop(lease.id, None)
+            self._owner.pop(lease.id, None)
+            self._errors[lease.id] = error
+            if self._attempts.get(lease.id, 0) >= self.max_attempts:
+                self._dead.append(lease.id)
+                return 0
+            self._pending.append(lease.id)
+            return 1
+
+    def requeue_dead(self) -> int:
+        with self._lock:
+            n = len(self._dead)
+            for id in self._dead:
+                self._attempts.pop(id, None)
+                self._pending.append(id)
+            self._dead.clear()
+            return n
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"units": len(self._units), "pending": len(self._pending), "leased": len(self._leases),
+                    "done": len(self._done), "dead": len(self._dead)}
+
+    def dead(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"id": i, "error": self._errors.get(i)} for i in self._dead]
+
+    def results(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._done)
+
+
+_MEMORY: Dict[str, MemoryQueue] = {}
+
+
+def open_queue(url: Optional[str] = None, run: Optional[str] = None):
+    """WORK_QUEUE_URL 에 맞는 대기열 (memory → 프로세스 안에서 회차별로 공유하는 MemoryQueue)."""
+    url = url or WORK_QUEUE_URL
+    run = run or WORK_QUEUE_RUN
+    if url == "memory":
+        return _MEMORY.setdefault(run, MemoryQueue(run))
+    return RedisQueue(url, run)
+
+
+def enqueue_many(q, kind: str, ids: Iterable[str], **payload: Any) -> int:
+    """ids 를 kind 단위로 넣음 → 새로 들어간 수 (이미 있거나 끝난 단위는 건너뜀)."""
+    return sum(q.enqueue(unit_id(kind, i), dict(payload, kind=kind, id=i)) for i in ids)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 워커 루프
+# ──────────────────────────────────────────────────────────────────────────────
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+
+def work(q, handler: Callable[[Dict[str, Any], Callable[[], None]], Any],
+         lease_s: float = WORK_QUEUE_LEASE_S, drain: bool = True, poll_s: float = 2.0,
+         stop: Optional[threading.Event] = None) -> Dict[str, int]:
+    """
+    대기열에서 단위를 하나씩 임대해 handler(payload, cancel) 실행 → 결과 기록.
+    - handler 가 반환한 값이 결과 (JSON 직렬화 가능해야 함), 예외는 실패로 기록(재시도/dead)
+    - cancel(): 임대를 잃었으면 LeaseLost → handler 가 탭/단계 경계에서 호출
+    - drain=True 면 대기열이 비고 임대 중인 단위도 없으면 종료, False 면 stop 이 설정될 때까지 poll_s 간격으로 대기
+    반환: {"done": n, "failed": n, "lost": n, "duplicate": n}
+    """
+    stop = stop or threading.Event()
+    counts = {"done": 0, "failed": 0, "lost": 0, "duplicate": 0}
+    name = worker_name()
+    while not stop.is_set():
+        lease = q.lease(f"{name}:{uuid.uuid4().hex[:8]}", lease_s)
+        if lease is None:
+            # 다른 워커가 잡고 있는 단위는 실패/만료로 돌아올 수 있으므로 모두 끝날 때까지 기다림
+            if drain and not q.stats()["leased"]:
+                break
+            stop.wait(poll_s)
+            continue
+        lost, finished = threading.Event(), threading.Event()
+
+        def _beat(lease=lease, lost=lost, finished=finished):
+            while not finished.wait(lease_s / 3):
+                if not q.heartbeat(lease, lease_s):
+                    lost.set()
+                    return
+
+        def cancel(lease=lease, lost=lost):
+            if lost.is_set():
+                raise LeaseLost(lease.id)
+
+        hb = threading.Thread(target=_beat, name=f"hb-{lease.id}", daemon=True)
+        hb.start()
+        t0 = time.time()
+        print(f"[queue] {lease.id} leased by {name} (attempt {lease.attempt})")
+        try:
+            result = handler(lease.payload, cancel)
+        except LeaseLost:
+            counts["lost"] += 1
+            print(f"[WARN] {lease.id}: lease lost, leaving it to the new owner")
+            continue
+        except (Exception, SystemExit) as e:       # SystemExit(자식 실패/unknown cert) 포함
+            counts["failed"] += 1
+            state = q.fail(lease, f"{type(e).__name__}: {e}")
+            where = {1: "will retry", 0: "dead-lettered", -1: "lease already lost"}[state]
+            print(f"[WARN] {lease.id} failed ({where}): {type(e).__name__}: {e}")
+            continue
+        finally:
+            finished.set()
+        if q.complete(lease, result):
+            counts["done"] += 1
+            print(f"[queue] {lease.id} done in {time.time() - t0:.1f}s")
+        else:
+            counts["duplicate"] += 1
+            print(f"[queue] {lease.id} already committed by another worker (result ignored)")
+    return counts
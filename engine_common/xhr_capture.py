@@ -0,0 +1,310 @@
+# engine_common/xhr_capture.py
+"""
+동적으로 채워지는 표 뒤의 XHR/JSON 응답 캡처 → 다음 실행부터 HTTP 로 바로 호출.
+
+KPC #testScheduleList 처럼 "검색" 클릭 후 AJAX 로 표를 채우는 페이지는 지금까지
+렌더링을 기다렸다가 표 HTML 을 긁고 날짜를 다시 추정했다. 캡처 모드(XHR_CAPTURE=1)에서는
+
+  1) Capture(driver).start()  : 클릭 직전에 Chrome performance 로그(run_once._make_driver 가 켬)를 비우고
+  2) capture.exchanges()      : 그 뒤 끝난 XHR/Fetch 요청들의 (url, method, postData, 응답 본문) 을
+                                CDP Network.getResponseBody 로 모은다
+  3) learn_fields(records, items, fields)
+                              : JSON 행(records)과 같은 방문에서 DOM 으로 파싱한 행(items)을 맞춰 보고
+                                "어느 JSON 키가 어느 출력 필드인지" 값으로 학습 (키 이름을 추측하지 않음)
+  4) endpoints().put(key, …)  : 학습한 요청 + 필드 매핑을 저장 → 호출부가 JSON 파싱 결과가 DOM 결과와
+                                같을 때만 저장한다
+
+다음 실행부터는 endpoints().get(key) 가 있으면 call(endpoint) 로 브라우저 없이 JSON 을 받아
+매핑대로 행을 만든다 (실패하면 호출부가 예전처럼 브라우저로 폴백).
+
+기록/재생(engine_common.snapshot)에서는 get_log / execute_cdp_cmd 결과도 드라이버 호출로 기록되므로
+캡처 경로도 브라우저 없이 그대로 재생된다(테스트용 기록 프록시 역할).
+
+환경변수
+  XHR_CAPTURE=0            1 이면 캡처/학습 (opt-in)
+  XHR_ENDPOINTS=1          0 이면 학습된 엔드포인트를 쓰지 않음(항상 브라우저)
+  XHR_ENDPOINTS_PATH=...   저장 파일 (기본: <CERT_DATA_DIR|Engine/data>/_cache/xhr_endpoints.json)
+"""
+from __future__ import annotations
+import json, os, re, threading, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+XHR_CAPTURE   = os.getenv("XHR_CAPTURE", "0") == "1"
+XHR_ENDPOINTS = os.getenv("XHR_ENDPOINTS", "1") != "0"
+
+_BASE_DIR = Path(__file__).resolve().parents[1]
+_XHR_TYPES = ("XHR", "Fetch")
+_TEXT_MIME = ("json", "javascript", "text/html", "text/plain", "xml")
+
+
+def enabled() -> bool:
+    return XHR_CAPTURE
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# performance 로그 → 요청/응답 쌍
+# ──────────────────────────────────────────────────────────────────────────────
+_taps: Dict[int, "Capture"] = {}        # id(driver) → 진행 중 캡처 (waits.network_idle 가 읽은 로그도 전달받음)
+_taps_lock = threading.Lock()
+
+
+def feed(driver, entries) -> None:
+    """다른 곳(waits._perf_events)에서 읽어 간 performance 로그 항목을 진행 중 캡처에 넘긴다."""
+    with _taps_lock:
+        cap = _taps.get(id(driver))
+    if cap is not None:
+        cap._consume(entries)
+
+
+class Capture:
+    def __init__(self, driver, url_contains: Optional[str] = None):
+        self.driver = driver
+        self.url_contains = url_contains
+        self._req: Dict[str, Dict[str, Any]] = {}
+        self._done: List[str] = []
+
+    def start(self) -> "Capture":
+        """지금까지 쌓인 로그는 버리고 이후 요청만 모은다."""
+        try:
+            self.driver.get_log("performance")
+        except Exception as e:
+            print(f"[WARN] xhr capture unavailable: {type(e).__name__}")
+        with _taps_lock:
+            _taps[id(self.driver)] = self
+        return self
+
+    def stop(self) -> None:
+        with _taps_lock:
+            if _taps.get(id(self.driver)) is self:
+                del _taps[id(self.driver)]
+
+    def _consume(self, entries) -> None:
+        for e in entries or ():
+            try:
+                msg = json.loads(e["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method, p = msg.get("method", ""), msg.get("params") or {}
+            rid = p.get("requestId")
+            if method == "Network.requestWillBeSent":
+                if p.get("type") not in _XHR_TYPES:
+                    continue
+                req = p.get("request") or {}
+                if self.url_contains and self.url_contains not in req.get("url", ""):
+                    continue
+                self._req[rid] = {
+                    "url": req.get("url"), "method": req.get("method", "GET"),
+                    "post_data": req.get("postData"),
+                    "content_type": _header(req.get("headers"), "content-type"),
+                }
+            elif rid in self._req and method == "Network.responseReceived":
+                resp = p.get("response") or {}
+                self._req[rid].update(status=resp.get("status"), mime=resp.get("mimeType", ""))
+            elif rid in self._req and method == "Network.loadingFinished":
+                self._done.append(rid)
+
+    def exchanges(self) -> List[Dict[str, Any]]:
+        """start() 이후 끝난 XHR/Fetch 요청들 (본문 포함, 완료 순서). 캡처를 끝낸다."""
+        try:
+            self._consume(self.driver.get_log("performance"))
+        except Exception:
+            pass
+        finally:
+            self.stop()
+        out = []
+        for rid in self._done:
+            x = self._req[rid]
+            if not any(m in (x.get("mime") or "") for m in _TEXT_MIME):
+                continue
+            try:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": rid})
+            except Exception:
+                continue                      # 본문이 이미 버려진 경우
+            text = (body or {}).get("body")
+            if text and not (body or {}).get("base64Encoded"):
+                out.append(dict(x, body=text))
+        return out
+
+
+def _header(headers, name: str) -> Optional[str]:
+    for k, v in (headers or {}).items():
+        if k.lower() == name:
+            return v
+    return None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# JSON → 행, 필드 학습
+# ──────────────────────────────────────────────────────────────────────────────
+def parse_json(text: Optional[str]):
+    """응답 본문 → JSON (JSON 이 아니면 None)."""
+    if not text:
+        return None
+    t = text.strip()
+    if not t or t[0] not in "[{":
+        return None
+    try:
+        return json.loads(t)
+    except ValueError:
+        return None
+
+
+def json_records(payload) -> List[Dict[str, Any]]:
+    """JSON 안에서 가장 긴 '객체 리스트' (보통 표 한 줄 = 객체 하나)."""
+    best: List[Dict[str, Any]] = []
+
+    def _walk(v):
+        nonlocal best
+        if isinstance(v, list):
+            if v and all(isinstance(x, dict) for x in v) and len(v) > len(best):
+                best = v
+            for x in v:
+                _walk(x)
+        elif isinstance(v, dict):
+            for x in v.values():
+                _walk(x)
+    _walk(payload)
+    return best
+
+
+_DATE_LIKE = re.compile(r"^\s*\d{4}\s*[-./]?\s*\d{1,2}\s*[-./]?\s*\d{1,2}(?:[ T].*)?$")
+
+
+def as_ymd(v) -> Optional[str]:
+    """'20250308' / '2025.03.08' / '2025-3-8 00:00:00' → '2025-03-08' (날짜가 아니면 None)."""
+    if v is None:
+        return None
+    s = str(v).strip()
+    if not _DATE_LIKE.match(s):
+        return None
+    m = re.match(r"\s*(\d{4})\s*[-./]?\s*(\d{1,2})\s*[-./]?\s*(\d{1,2})", s)
+    if not m:
+        return None
+    y, mo, d = (int(x) for x in m.groups())
+    return f"{y:04d}-{mo:02d}-{d:02d}" if 1 <= mo <= 12 and 1 <= d <= 31 else None
+
+
+def _norm(v) -> Optional[str]:
+    if v is None:
+        return None
+    return as_ymd(v) or re.sub(r"\s+", " ", str(v)).strip() or None
+
+
+def learn_fields(records: Sequence[Dict[str, Any]], items: Sequence[Dict[str, Any]],
+                 fields: Iterable[str], key: str) -> Optional[Dict[str, str]]:
+    """
+    records(JSON 행) 와 items(같은 화면을 DOM 으로 파싱한 행) 의 값을 맞춰 {출력 필드: JSON 키} 학습.
+    - key 필드(예: examDate)로 행을 짝지음: 모든 item 의 key 값이 어떤 JSON 키 값들에 다 들어 있어야 함
+    - 나머지 필드: 짝지은 모든 행에서 값이 같은 첫 JSON 키 (날짜는 형식 무시, 문자열은 공백 정리 후 비교)
+    key 를 못 찾으면 None. 못 찾은 필드는 매핑에서 빠진다.
+    """
+    items = [it for it in items if it.get(key)]
+    if not records or not items:
+        return None
+    want = [_norm(it[key]) for it in items]
+    jkeys = list(dict.fromkeys(k for r in records for k in r))
+    jkey = next((k for k in jkeys if set(want) <= {_norm(r.get(k)) for r in records}), None)
+    if jkey is None:
+        return None
+    by_key: Dict[Optional[str], Dict[str, Any]] = {}
+    for r in records:
+        by_key.setdefault(_norm(r.get(jkey)), r)
+    pairs = [(it, by_key[w]) for it, w in zip(items, want)]
+
+    mapping = {key: jkey}
+    for f in fields:
+        if f == key:
+            continue
+        rows = [(it, r) for it, r in pairs if it.get(f) not in (None, "")]
+        if not rows:
+            continue
+        used = set(mapping.values())       # 값이 우연히 같은 키(예: 수험표 마감일 = 시험일)보다 아직 안 쓴 키 우선
+        for k in sorted(jkeys, key=lambda k: k in used):
+            if all(_norm(it[f]) == _norm(r.get(k)) for it, r in rows):
+                mapping[f] = k
+                break
+    return mapping
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 학습된 엔드포인트 저장/호출
+# ──────────────────────────────────────────────────────────────────────────────
+def _default_path() -> Path:
+    p = os.getenv("XHR_ENDPOINTS_PATH")
+    if p:
+        return Path(p)
+    root = os.getenv("CERT_DATA_DIR")
+    return (Path(root) if root else _BASE_DIR / "data") / "_cache" / "xhr_endpoints.json"
+
+
+class EndpointStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, endpoint: Dict[str, Any]) -> None:
+        with self._lock:
+            data = self._load()
+            data[key] = dict(endpoint, learned_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+    def drop(self, key: str) -> None:
+        with self._lock:
+            data = self._load()
+            if data.pop(key, None) is not None:
+                self.path.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+
+
+_STORE: Optional[EndpointStore] = None
+
+
+def endpoints() -> EndpointStore:
+    global _STORE
+    if _STORE is None:
+        _STORE = EndpointStore(_default_path())
+    return _STORE
+
+
+def usable(key: str) -> Optional[Dict[str, Any]]:
+    """브라우저 없이 호출할 학습된 엔드포인트 (XHR_ENDPOINTS=0 이면 None)."""
+    return endpoints().get(key) if XHR_ENDPOINTS else None
+
+
+def call(endpoint: Dict[str, Any], timeout: Optional[float] = None):
+    """
+    학습된 요청을 HTTP 로 재현 → JSON. 세션 쿠키가 필요한 사이트를 위해 referer 페이지를 먼저 연다.
+    HTTP 오류/JSON 아님은 예외.
+    """
+    from engine_common import http_fetch
+    s = http_fetch.session()
+    t = timeout or http_fetch.HTTP_TIMEOUT
+    headers = {"X-Requested-With": "XMLHttpRequest", "Accept": "application/json, text/javascript, */*"}
+    if endpoint.get("referer"):
+        s.get(endpoint["referer"], timeout=t)
+        headers["Referer"] = endpoint["referer"]
+    if endpoint.get("content_type"):
+        headers["Content-Type"] = endpoint["content_type"]
+    r = s.request(endpoint.get("method") or "GET", endpoint["url"],
+                  data=endpoint.get("post_data"), headers=headers, timeout=t)
+    r.raise_for_status()
+    payload = parse_json(r.text)
+    if payload is None:
+        raise ValueError(f"not JSON: {endpoint['url']}")
+    return payload
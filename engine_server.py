@@ -0,0 +1,671 @@
+# engine_server.py
+# -*- coding: utf-8 -*-
+"""
+상주 엔진 서버: 수집 요청을 작업(job)으로 받아 웜 상태의 엔진에서 실행.
+
+run_once.py / run_public.py 를 cron·스케줄러가 매번 새 프로세스로 띄우면 실행마다
+파이썬 임포트 + YAML/규칙 로드 + Chrome 기동을 다시 한다. 이 서버는 한 번 떠서
+
+- 드라이버 풀(run_once.get_pool)을 미리 기동해 둔 채 작업 사이에 재사용
+- 사설(cert) 작업: run_once.run / run_many 를 같은 프로세스에서 호출
+- 공공(jmcd) 작업: run_public.process_jmcd(inproc=True) → fetch/parse/normalize 를 자식 프로세스 없이 호출,
+                   Q-Net HTTP 세션은 작업 스레드별로 재사용
+- 동시 실행 상한(ENGINE_SERVER_WORKERS) + 대기열 상한(ENGINE_SERVER_QUEUE, 넘치면 429)
+- 같은 자격증은 한 번에 하나만 실행 (자격증별 잠금, 여러 자격증 작업은 정렬 순서로 잡음)
+- 취소: 대기 중이면 즉시, 실행 중이면 탭/단계 경계에서 (cancel 콜백이 JobCancelled 를 올림)
+- 설정 감시: 사설 cert_map.yaml 은 run_once.load_cfg 가 수정 시각으로 다시 읽고,
+             public_cert_api 아래 YAML 이 바뀌면 실행 중인 공공 작업이 없을 때 public_cert_api 모듈을
+             sys.modules 에서 내려 다음 작업이 새로 임포트(모듈 상수로 묶인 헤더/규칙 포함)
+- 결과 캐시(engine_common.result_cache): 단일 cert / jmcd 작업은 제출할 때
+    · 신선한 결과가 있으면 대기열 없이 바로 done (cache=hit, 결과 문서 doc 포함)
+    · 같은 작업이 대기/실행 중이면 새로 만들지 않고 그 작업을 돌려줌 (single-flight)
+    · TTL 이 지났어도 stale 창 안이면 있던 결과로 바로 done (cache=stale) + 갱신 작업을 한 번만 대기열에
+    · "fresh": true (공공은 options.force 도) 면 캐시를 보지 않고 수집
+- 사설 작업이 끝나면 Pushgateway 로 지표 전송 (기존 배치와 같은 job 이름, 공공은 process_jmcd 가 전송)
+- 메모리(engine_common.memory): 작업마다 RSS 를 ENGINE_MEMORY_USAGE 에 기록하고, ENGINE_MAX_JOBS 작업이나
+    ENGINE_RSS_MAX_MB 를 넘으면 새 작업 시작을 멈추고 실행 중인 작업이 끝나길 기다렸다가 제자리 재활용
+    (드라이버 풀 재기동 + public_cert_api 모듈 내림 + gc). 대기열은 그대로 유지된다.
+    프로세스 단위 재활용이 필요하면 engine_worker.py work --max-jobs/--rss-max-mb (fork 워커)를 쓴다.
+
+탭 간 페이지 캐시(page_cache)는 실행 범위 자원이라 서버에서는 켜지 않는다 (작업 간에 오래된 페이지를 주지 않도록).
+스냅샷 기록/재생(--record/--replay)은 서버로 보내지 않고 예전처럼 그 프로세스에서 실행한다.
+
+JSON API (HTTP/1.1, TCP 또는 유닉스 소켓)
+  POST   /jobs            {"cert": "gtq"} | {"certs": "gtq,itq"} | {"all": true} | {"jmcd": "1320"}
+                          + 선택: tabs, out, config, workers (사설) / options{run_public 인자} (공공) / fresh
+                          → 202 {"id": ..., "state": "queued"}   (대기열이 차면 429)
+  GET    /jobs            최근 작업 목록
+  GET    /jobs/<id>?wait=30  상태/결과 (wait 초 동안 끝나길 기다림)
+  DELETE /jobs/<id>       취소
+  GET    /healthz         프로세스 살아 있음
+  GET    /readyz          풀 기동 완료(드라이버 1개 이상 기동 성공) + 대기열 여유 (아니면 503)
+
+클라이언트: run_once.py --server ADDR / run_public.py --server ADDR (또는 환경변수 ENGINE_SERVER)
+  → submit(addr, job, wait=True) 로 제출하고 끝날 때까지 대기, 상태에 따라 종료 코드
+
+환경변수
+  ENGINE_SERVER_ADDR=127.0.0.1:8765   TCP 수신 주소
+  ENGINE_SERVER_SOCKET=               유닉스 소켓 경로 (지정하면 TCP 대신 사용)
+  ENGINE_SERVER_WORKERS=2             동시에 실행할 작업 수
+  ENGINE_SERVER_QUEUE=64              대기열 상한
+  ENGINE_SERVER_KEEP=200              보관할 끝난 작업 수
+  ENGINE_SERVER_WATCH_S=2             설정 파일 감시 주기(초)
+  ENGINE_PUBLIC_ROOT=data/chansol_api 공공 작업의 기본 --root
+  ENGINE_SERVER=                      (클라이언트) 서버 주소: http://host:port | unix:/path.sock
+"""
+from __future__ import annotations
+import argparse, hashlib, http.client, json, os, queue, socket, sys, threading, time, uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from engine_common import memory, result_cache
+
+ROOT = Path(__file__).parent
+
+ENGINE_SERVER_ADDR    = os.getenv("ENGINE_SERVER_ADDR", "127.0.0.1:8765")
+ENGINE_SERVER_SOCKET  = os.getenv("ENGINE_SERVER_SOCKET", "").strip()
+ENGINE_SERVER_WORKERS = int(os.getenv("ENGINE_SERVER_WORKERS", "2"))
+ENGINE_SERVER_QUEUE   = int(os.getenv("ENGINE_SERVER_QUEUE", "64"))
+ENGINE_SERVER_KEEP    = int(os.getenv("ENGINE_SERVER_KEEP", "200"))
+ENGINE_SERVER_WATCH_S = float(os.getenv("ENGINE_SERVER_WATCH_S", "2"))
+ENGINE_PUBLIC_ROOT    = os.getenv("ENGINE_PUBLIC_ROOT", "data/chansol_api")
+
+_FINISHED = ("done", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, spec: Dict[str, Any]):
+        self.id = uuid.uuid4().hex[:12]
+        self.spec = spec
+        self.kind = "public" if spec.get("jmcd") else "private"
+        self.state = "queued"
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.cache_key: Optional[str] = None
+        self.cache_ttl = 0.0
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def check_cancel(self) -> None:
+        """run()/process_jmcd 의 cancel 콜백: 취소 요청이 있으면 JobCancelled."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def finish(self, state: str, result: Any = None, error: Optional[str] = None) -> None:
+        self.state, self.result, self.error = state, result, error
+        self.finished = time.time()
+        self._done.set()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {"id": self.id, "kind": self.kind, "state": self.state, "spec": self.spec,
+             "created": self.created, "started": self.started, "finished": self.finished}
+        if self.started:
+            d["seconds"] = round((self.finished or time.time()) - self.started, 1)
+        if self.result is not None:
+            d["result"] = self.result
+        if self.error:
+            d["error"] = self.error
+        return d
+
+
+def _split(v) -> List[str]:
+    if v is None:
+        return []
+    if isinstance(v, str):
+        v = v.split(",")
+    return [str(x).strip() for x in v if str(x).strip()]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 엔진 (작업 대기열 + 실행 스레드)
+# ──────────────────────────────────────────────────────────────────────────────
+class Engine:
+    def __init__(self, workers: int = ENGINE_SERVER_WORKERS, queue_max: int = ENGINE_SERVER_QUEUE):
+        import run_once
+        self.ro = run_once
+        self.workers = max(1, workers)
+        self._queue: "queue.Queue[Job]" = queue.Queue(maxsize=max(1, queue_max))
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._cert_locks: Dict[str, threading.Lock] = {}
+        self._running_public = 0
+        self._public_stale = False
+        self._inflight: Dict[str, Job] = {}      # 캐시 키 → 대기/실행 중인 작업 (single-flight)
+        self.cache = result_cache.current()
+        self._idle = threading.Condition(self._lock)
+        self._local = threading.local()
+        self._active = 0                         # 실행 중인 작업 수
+        self._recycler = memory.Recycler(gauge=run_once.ENGINE_MEMORY_USAGE)
+        self._recycle_reason: Optional[str] = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._started = False
+
+    # ── 수명 ──
+    def start(self) -> None:
+        self.ro.get_pool().warm()          # 백그라운드로 Chrome 기동
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f"job-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        threading.Thread(target=self._watch_configs, name="cfg-watch", daemon=True).start()
+        self._started = True
+        print(f"[server] engine started (workers={self.workers}, queue={self._queue.maxsize}); warming drivers")
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._started = False
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for j in jobs:
+            if j.state not in _FINISHED:
+                self.cancel(j.id)
+        for t in self._threads:
+            t.join(timeout=30)
+        self.ro.close_run_scope()
+
+    # ── 작업 ──
+    def submit(self, spec: Dict[str, Any]) -> Job:
+        """검증 후 대기열에 넣음. 형식 오류는 ValueError, 대기열이 차면 queue.Full."""
+        if not any(spec.get(k) for k in ("cert", "certs", "all", "jmcd")):
+            raise ValueError("one of cert / certs / all / jmcd is required")
+        key, ttl = self._cache_key(spec)
+        if key is None:
+            return self._enqueue(Job(spec))
+        fresh = bool(spec.get("fresh") or (spec.get("options") or {}).get("force"))
+        entry = None if fresh else self.cache.lookup(key)
+        state = entry.state() if entry else None
+        if state == "fresh":
+            self.cache.count("hit")
+            return self._cached_job(spec, entry, "hit")
+        job = None
+        with self._lock:          # 조회와 자리 잡기를 한 번에 → 같은 키가 동시에 와도 수집 작업은 하나
+            running = self._inflight.get(key)
+            if running is None and state == "stale":
+                try:
+                    self._enqueue_locked(Job(dict(spec, fresh=True)), key, ttl)
+                except queue.Full:    # 갱신만 건너뛰고 stale 결과는 그대로 돌려줌 (다음 요청이 다시 시도)
+                    print(f"[server] queue full → skip revalidation of {key}")
+            elif running is None:
+                job = self._enqueue_locked(Job(spec), key, ttl)
+        if state == "stale":
+            self.cache.count("stale")
+            return self._cached_job(spec, entry, "stale")
+        if running is not None:
+            self.cache.count("shared")
+            print(f"[server] {running.id} already {running.state} for {key} → shared")
+            return running
+        self.cache.count("miss")
+        return job
+
+    def _enqueue(self, job: Job, key: Optional[str] = None, ttl: float = 0.0) -> Job:
+        with self._lock:
+            return self._enqueue_locked(job, key, ttl)
+
+    def _enqueue_locked(self, job: Job, key: Optional[str], ttl: float) -> Job:
+        """self._lock 을 쥔 채로 호출. 대기열이 차면 queue.Full (single-flight 자리는 잡지 않음)."""
+        job.cache_key, job.cache_ttl = key, ttl
+        self._queue.put_nowait(job)
+        self._jobs[job.id] = job
+        if key is not None:
+            self._inflight[key] = job
+        self._trim()
+        print(f"[server] queued {job.id} {job.kind} {job.spec}")
+        return job
+
+    def _cached_job(self, spec: Dict[str, Any], entry, outcome: str) -> Job:
+        job = Job(spec)
+        job.started = job.created
+        job.finish("done", dict(entry.value, cache=outcome, age=round(entry.age, 1)))
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        print(f"[server] {job.id} {outcome} from cache ({entry.key}, age {entry.age:.0f}s)")
+        return job
+
+    # ── 결과 캐시 ──
+    def _cache_key(self, spec: Dict[str, Any]) -> Tuple[Optional[str], float]:
+        """단일 cert / jmcd 작업의 (캐시 키, TTL). 여러 자격증 작업이나 캐시 off 면 (None, 0)."""
+        if self.cache is None or spec.get("all") or spec.get("certs"):
+            return None, 0.0
+        ident = {k: v for k, v in spec.items() if k not in ("fresh", "workers")}
+        digest = hashlib.sha1(json.dumps(ident, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:12]
+        try:
+            if spec.get("jmcd"):
+                cfg = self.ro.load_cfg(str(ROOT / "public_cert_api" / "configs" / "cert_map.yaml"))
+                tabs = ((cfg.get("certifications") or {}).get("chansol_api") or {}).get("tabs") or []
+                return f"jmcd:{str(spec['jmcd']).strip()}:{digest}", result_cache.ttl_for(tabs)
+            cfg = self.ro.load_cfg(spec.get("config"))
+            cert_cfg = (cfg.get("certifications") or {}).get(str(spec["cert"]).strip())
+        except (OSError, ValueError) as e:
+            print(f"[WARN] result_cache: no TTL for {spec}: {e}")
+            return None, 0.0
+        if not cert_cfg:
+            return None, 0.0           # unknown cert → 작업에서 오류로 보고
+        tabs = self.ro._pick_tabs(cert_cfg.get("tabs") or [], _split(spec.get("tabs")) or None)
+        return f"cert:{str(spec['cert']).strip()}:{digest}", result_cache.ttl_for(tabs)
+
+    def _cache_result(self, job: Job, result: Any) -> Any:
+        """성공한 결과에 문서(doc)를 붙여 캐시에 저장 (작업을 done 으로 바꾸기 전 → 기다리던 쪽도 doc 을 받음)."""
+        if job.cache_key is None or not isinstance(result, dict):
+            return result
+        out = result.get("out")
+        try:
+            doc = json.loads(Path(out).read_text(encoding="utf-8")) if out else None
+        except (OSError, ValueError) as e:
+            print(f"[WARN] result_cache: cannot read {out}: {e}")
+            return result
+        value = dict(result, doc=doc)
+        self.cache.put(job.cache_key, value, job.cache_ttl)
+        return dict(value, cache="miss")
+
+    def _release(self, job: Job) -> None:
+        """끝난(취소 포함) 작업의 single-flight 자리 비우기."""
+        if job.cache_key is None:
+            return
+        with self._lock:
+            if self._inflight.get(job.cache_key) is job:
+                del self._inflight[job.cache_key]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is None or job.state in _FINISHED:
+            return job
+        job._cancel.set()
+        if job.state == "queued":       # 실행 스레드가 꺼내면 바로 건너뜀
+            job.finish("cancelled")
+            self._release(job)          # 같은 키의 다음 요청이 취소된 작업을 "shared" 로 받지 않게
+        return job
+
+    @property
+    def ready(self) -> bool:
+        """작업 스레드 시작 + 현재 풀에서 드라이버가 하나 이상 기동에 성공(유휴 큐에 들어감)."""
+        pool = self.ro._POOL
+        return self._started and pool is not None and pool.warmed.is_set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            states: Dict[str, int] = {}
+            for j in self._jobs.values():
+                states[j.state] = states.get(j.state, 0) + 1
+        pool = self.ro._POOL
+        return {"ready": self.ready, "queued": self._queue.qsize(), "queue_max": self._queue.maxsize,
+                "workers": self.workers, "jobs": states, "pool": dict(pool.stats, **pool.counts()) if pool is not None else None,
+                "cache": dict(self.cache.stats) if self.cache is not None else None,
+                "rss_mb": round(memory.rss_bytes() / (1024 * 1024), 1), "recycling": self._recycle_reason}
+
+    def _trim(self) -> None:
+        done = [k for k, j in self._jobs.items() if j.state in _FINISHED]
+        for k in done[:max(0, len(done) - ENGINE_SERVER_KEEP)]:
+            del self._jobs[k]
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if job.state != "queued":           # 대기 중 취소됨
+                self._release(job)
+                continue
+            with self._lock:
+                while self._recycle_reason:         # 재활용 대기 중이면 시작하지 않음
+                    self._idle.wait()
+                self._active += 1
+            job.state, job.started = "running", time.time()
+            try:
+                result = self._run_public(job) if job.kind == "public" else self._run_private(job)
+                job.finish("done", self._cache_result(job, result))
+            except JobCancelled:
+                job.finish("cancelled")
+            except (Exception, SystemExit) as e:
+                print(f"[WARN] job {job.id} failed: {type(e).__name__}: {e}")
+                job.finish("failed", error=f"{type(e).__name__}: {e}")
+            print(f"[server] {job.id} {job.state} in {job.finished - job.started:.1f}s")
+            self._release(job)
+            self._push_metrics(job)
+            self._after_job()
+
+    # ── 메모리 ──
+    def _after_job(self) -> None:
+        """RSS 기록 + 재활용 판단. 마지막으로 끝난 작업의 스레드가 재활용을 실행한다."""
+        with self._lock:
+            self._active -= 1
+            if self._recycler.enabled and not self._recycle_reason:
+                self._recycle_reason = self._recycler.tick()
+                if self._recycle_reason:
+                    print(f"[server] recycle requested: {self._recycle_reason} (waiting for {self._active} jobs)")
+            else:
+                memory.report(self.ro.ENGINE_MEMORY_USAGE)
+            if not self._recycle_reason or self._active:
+                return
+        try:
+            self._recycle()
+        finally:
+            with self._lock:
+                self._recycle_reason = None
+                self._recycler.jobs = 0
+                self._idle.notify_all()
+
+    def _recycle(self) -> None:
+        import gc
+        before = memory.rss_bytes()
+        self.ro.close_pool()                      # Chrome 프로세스 교체
+        with self._lock:
+            self._purge_public("recycle")         # 파싱 규칙/설정 캐시 등 공공 모듈 상태
+            self._local = threading.local()       # 작업 스레드별 Q-Net 세션
+        gc.collect()
+        self.ro.get_pool().warm()
+        mb = 1024 * 1024
+        print(f"[server] recycled in place: rss {before / mb:.0f}MB → {memory.rss_bytes() / mb:.0f}MB")
+
+    # ── 사설(cert) ──
+    def _lock_certs(self, certs: List[str]) -> List[threading.Lock]:
+        with self._lock:
+            locks = [self._cert_locks.setdefault(c, threading.Lock()) for c in sorted(set(certs))]
+        for lk in locks:
+            lk.acquire()
+        return locks
+
+    def _run_private(self, job: Job):
+        ro, spec = self.ro, job.spec
+        config = spec.get("config")
+        cfg = ro.load_cfg(config)                 # 수정 시각이 바뀌었으면 새로 읽음
+        tabs = _split(spec.get("tabs")) or None
+        if spec.get("all"):
+            certs = list(cfg.get("certifications", {}))
+        else:
+            certs = _split(spec.get("certs") or spec.get("cert"))
+        locks = self._lock_certs(certs)
+        try:
+            job.check_cancel()
+            if len(certs) == 1 and not spec.get("certs"):
+                cert = certs[0]
+                out = spec.get("out") or ro.default_output_for(cert)
+                pre = ro.prefetch_sites(cfg, [cert], tabs)     # 이 작업에서만 쓰고 버림
+                saved = ro.run(cert=cert, tabs=tabs, out=out, config_path=config, cancel=job.check_cancel,
+                               prefetched=pre)
+                return {"cert": cert, "out": str(saved)}
+            results = ro.run_many(certs, tabs=tabs, out_dir=spec.get("out"), config_path=config,
+                                  workers=spec.get("workers"), cancel=job.check_cancel)
+            job.check_cancel()
+            if not all(r["ok"] for r in results):
+                raise RuntimeError(f"{sum(not r['ok'] for r in results)}/{len(results)} certs failed: "
+                                   + json.dumps(results, ensure_ascii=False))
+            return results
+        finally:
+            for lk in locks:
+                lk.release()
+
+    # ── 공공(jmcd) ──
+    def _public_args(self, rp, options: Dict[str, Any]):
+        args = rp.build_parser().parse_args([])
+        args.sleep = 0.0           # 자식 프로세스 간 간격용 — 서버에서는 작업 대기열이 간격을 만든다
+        for k, v in (options or {}).items():
+            k = k.replace("-", "_")
+            if not hasattr(args, k):
+                raise ValueError(f"unknown run_public option: {k}")
+            setattr(args, k, v)
+        args.root = args.snapshot_root or args.root or ENGINE_PUBLIC_ROOT
+        return args
+
+    def _session(self, fq, args):
+        key = (args.cookies, args.prewarm)
+        cached = getattr(self._local, "session", None)
+        if cached is None or cached[0] != key:
+            cached = self._local.session = (key, fq.new_session(args.cookies, args.prewarm))
+        return cached[1]
+
+    def _run_public(self, job: Job):
+        import importlib
+        with self._lock:
+            while self._public_stale and self._running_public:
+                self._idle.wait()
+            if self._public_stale:
+                self._purge_public()
+            self._running_public += 1
+        try:
+            rp = importlib.import_module("public_cert_api.run_public")
+            fq = importlib.import_module("public_cert_api.fetch_qnet_tabs_min")
+            args = self._public_args(rp, job.spec.get("options"))
+            root = Path(args.root).resolve()
+            root.mkdir(parents=True, exist_ok=True)
+            out_root = Path(args.out).resolve() if args.out else None
+            if out_root:
+                out_root.mkdir(parents=True, exist_ok=True)
+            rp.ensure_free_space(root, args.min_free_gb)
+            jmcd = str(job.spec["jmcd"]).strip()
+            with self._lock_jmcd(jmcd):
+                res = rp.process_jmcd(jmcd, root, args, rp.parse_steps(args), out_root, rp.load_idmap(args.csv),
+                                      inproc=True, session=self._session(fq, args), cancel=job.check_cancel)
+            return {"jmcd": jmcd, "out": str(res["out"]) if res["out"] else None}
+        finally:
+            with self._lock:
+                self._running_public -= 1
+                self._idle.notify_all()
+
+    def _lock_jmcd(self, jmcd: str) -> threading.Lock:
+        with self._lock:
+            return self._cert_locks.setdefault(f"jmcd:{jmcd}", threading.Lock())
+
+    # ── 설정 감시 ──
+    @staticmethod
+    def _public_yaml_mtimes() -> Dict[str, int]:
+        out = {}
+        for p in (ROOT / "public_cert_api").rglob("*.y*ml"):
+            try:
+                out[str(p)] = p.stat().st_mtime_ns
+            except OSError:
+                continue
+        return out
+
+    def _purge_public(self, why: str = "public config changed") -> None:
+        """public_cert_api 모듈을 내려 다음 작업이 YAML(모듈 상수·설정 캐시 포함)을 새로 읽게 함. _lock 안에서 호출."""
+        names = [m for m in sys.modules if m == "public_cert_api" or m.startswith("public_cert_api.")]
+        for m in names:
+            del sys.modules[m]
+        self._public_stale = False
+        print(f"[server] {why} → reloaded {len(names)} modules on next job")
+
+    def _watch_configs(self) -> None:
+        seen = self._public_yaml_mtimes()
+        while not self._stop.wait(ENGINE_SERVER_WATCH_S):
+            now = self._public_yaml_mtimes()
+            if now != seen:
+                changed = sorted(set(now.items()) ^ set(seen.items()))
+                print(f"[server] config changed: {', '.join(sorted({Path(p).name for p, _ in changed}))}")
+                seen = now
+                with self._lock:
+                    self._public_stale = True
+                    if not self._running_public:
+                        self._purge_public()
+
+    # ── 지표 ──
+    def _push_metrics(self, job: Job) -> None:
+        if job.state != "done" or job.kind == "public":      # 공공은 process_jmcd 가 jmcd 마다 직접 전송
+            return
+        try:
+            name = job.spec.get("cert") if not (job.spec.get("all") or job.spec.get("certs")) else "all"
+            self.ro.push_to_gateway('pushgateway:9091', job=f'batch-engine-{name}', registry=self.ro.registry)
+            print(f"📤 Metrics successfully pushed to Pushgateway for job {job.id}")
+        except Exception as e:
+            print(f"⚠️ Failed to push metrics: {e}")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# HTTP
+# ──────────────────────────────────────────────────────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    engine: Engine = None       # serve() 에서 지정
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):       # 유닉스 소켓은 client_address 가 비어 있음
+        pass
+
+    def _send(self, code: int, body: Any) -> None:
+        data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _job_id(self, path: str) -> Optional[str]:
+        parts = [p for p in path.split("/") if p]
+        return parts[1] if len(parts) == 2 and parts[0] == "jobs" else None
+
+    def do_GET(self):
+        u = urlsplit(self.path)
+        eng = self.engine
+        if u.path == "/healthz":
+            return self._send(200, {"ok": True})
+        if u.path == "/readyz":
+            st = eng.stats()
+            ok = st["ready"] and st["queued"] < st["queue_max"]
+            return self._send(200 if ok else 503, st)
+        if u.path.rstrip("/") == "/jobs":
+            return self._send(200, [j.to_dict() for j in eng.list()])
+        job_id = self._job_id(u.path)
+        job = eng.get(job_id) if job_id else None
+        if job is None:
+            return self._send(404, {"error": "not found"})
+        wait = parse_qs(u.query).get("wait")
+        if wait:
+            job.wait(min(float(wait[0]), 300.0))
+        return self._send(200, job.to_dict())
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip("/") != "/jobs":
+            return self._send(404, {"error": "not found"})
+        try:
+            n = int(self.headers.get("Content-Length") or 0)
+            spec = json.loads(self.rfile.read(n) or b"{}")
+            if not isinstance(spec, dict):
+                raise ValueError("job must be a JSON object")
+            job = self.engine.submit(spec)
+        except queue.Full:
+            return self._send(429, {"error": "queue full"})
+        except ValueError as e:          # json.JSONDecodeError 포함
+            return self._send(400, {"error": str(e)})
+        return self._send(202, job.to_dict())
+
+    def do_DELETE(self):
+        job_id = self._job_id(urlsplit(self.path).path)
+        job = self.engine.cancel(job_id) if job_id else None
+        if job is None:
+            return self._send(404, {"error": "not found"})
+        return self._send(200, job.to_dict())
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(addr: Optional[str] = None, sock_path: Optional[str] = None) -> None:
+    engine = Engine()
+    _Handler.engine = engine
+    sock_path = sock_path if sock_path is not None else ENGINE_SERVER_SOCKET
+    if sock_path:
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+        httpd = _UnixHTTPServer(sock_path, _Handler)
+        where = f"unix:{sock_path}"
+    else:
+        host, _, port = (addr or ENGINE_SERVER_ADDR).rpartition(":")
+        httpd = ThreadingHTTPServer((host or "127.0.0.1", int(port)), _Handler)
+        where = f"http://{host or '127.0.0.1'}:{port}"
+    engine.start()
+    print(f"[server] listening on {where}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        engine.stop()
+        if sock_path and os.path.exists(sock_path):
+            os.unlink(sock_path)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 클라이언트 (run_once.py / run_public.py --server)
+# ──────────────────────────────────────────────────────────────────────────────
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+def _request(addr: str, method: str, path: str, body: Any = None, timeout: float = 330.0):
+    if addr.startswith("unix:"):
+        conn = _UnixConnection(addr[len("unix:"):], timeout=timeout)
+    else:
+        u = urlsplit(addr if "://" in addr else f"http://{addr}")
+        conn = http.client.HTTPConnection(u.hostname or "127.0.0.1", u.port or 80, timeout=timeout)
+    try:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else None
+        conn.request(method, path, body=data, headers={"Content-Type": "application/json"} if data else {})
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read() or b"null")
+    finally:
+        conn.close()
+
+
+def submit(addr: str, job: Dict[str, Any], wait: bool = True, poll_s: float = 60.0) -> Dict[str, Any]:
+    """작업 제출 (wait=True 면 끝날 때까지 대기). Ctrl+C 면 서버 쪽 작업도 취소한다."""
+    code, res = _request(addr, "POST", "/jobs", job)
+    if code != 202:
+        raise SystemExit(f"[server] submit failed ({code}): {res.get('error') if isinstance(res, dict) else res}")
+    print(f"[server] {res['id']} queued on {addr}")
+    if not wait:
+        return res
+    try:
+        while res.get("state") not in _FINISHED:
+            _code, res = _request(addr, "GET", f"/jobs/{res['id']}?wait={poll_s:g}")
+    except KeyboardInterrupt:
+        _request(addr, "DELETE", f"/jobs/{res['id']}")
+        print(f"[server] {res['id']} cancel requested")
+        raise
+    mark = "✔" if res["state"] == "done" else "✘"
+    print(f"{mark} [server] {res['id']} {res['state']} in {res.get('seconds')}s  "
+          f"{json.dumps(res.get('result') or res.get('error'), ensure_ascii=False)}")
+    return res
+
+
+def main():
+    p = argparse.ArgumentParser(description="상주 엔진 서버 (사설 cert / 공공 jmcd 수집 작업)")
+    p.add_argument("--addr", default=ENGINE_SERVER_ADDR, help="TCP 수신 주소 host:port")
+    p.add_argument("--socket", default=ENGINE_SERVER_SOCKET, help="유닉스 소켓 경로 (지정 시 TCP 대신)")
+    args = p.parse_args()
+    serve(args.addr, args.socket)
+
+
+if __name__ == "__main__":
+    main()
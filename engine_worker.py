@@ -0,0 +1,256 @@
+# engine_worker.py
+# -*- coding: utf-8 -*-
+"""
+공유 작업 대기열(engine_common.work_queue) 기반 수평 확장 워커.
+
+목록을 손으로 쪼개 컨테이너마다 돌리는 대신, 한 번 넣고(enqueue) 노드 수만큼 워커를 띄운다.
+같은 회차(WORK_QUEUE_RUN) 안에서는 단위마다 한 워커만 수집하고, 실패/만료는 재시도, 반복 실패는 dead.
+
+  # 넣기 (회차 이름은 --run 또는 WORK_QUEUE_RUN)
+  python engine_worker.py enqueue --run 2026-10-19 --jmcd-list r013.txt --jmcd-list others.txt
+  python engine_worker.py enqueue --run 2026-10-19 --all-certs --config private-cert-crawl/configs/cert_map.yaml
+
+  # 워커 (노드마다) — 공공은 -- 뒤에 run_public 인자를 그대로
+  python engine_worker.py work --run 2026-10-19 --kind jmcd -- --root data/chansol_api --csv certs.csv
+  python engine_worker.py work --run 2026-10-19 --kind cert --config private-cert-crawl/configs/cert_map.yaml
+
+  # 상태 / dead 되살리기
+  python engine_worker.py status --run 2026-10-19
+  python engine_worker.py requeue-dead --run 2026-10-19
+
+공공 jmcd 는 run_public.process_jmcd(inproc=True) 로 같은 프로세스에서 실행(Q-Net 세션 재사용),
+사설 cert 는 run_once.run (드라이버 풀 공유, --threads 만큼 동시에).
+--follow 면 대기열이 비어도 끝나지 않고 새 단위를 기다린다.
+
+메모리 (engine_common.memory)
+  --procs N       임포트·설정 로드가 끝난 뒤 gc.freeze() 하고 워커 프로세스 N 개로 fork (0 = 가용 메모리로 산정)
+  --max-jobs N    워커 프로세스가 N 단위를 처리하면 새 프로세스로 교체 (기본 ENGINE_MAX_JOBS)
+  --rss-max-mb M  단위가 끝난 뒤 RSS 가 M 을 넘으면 교체 (기본 ENGINE_RSS_MAX_MB)
+  교체는 처리 중인 단위를 끝내고(결과 기록 후) 일어나므로 임대를 잃지 않는다.
+
+환경변수: engine_common/work_queue.py, engine_common/memory.py 참고
+  (WORK_QUEUE_URL, WORK_QUEUE_RUN, WORK_QUEUE_LEASE_S, ENGINE_MAX_JOBS, ENGINE_RSS_MAX_MB …)
+"""
+from __future__ import annotations
+import argparse, json, os, sys, threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from engine_common import memory, snapshot_codec, work_queue
+
+
+def _read_list(path: str) -> List[str]:
+    with open(path, encoding="utf-8-sig") as f:
+        return [ln.strip() for ln in f if ln.strip() and not ln.lstrip().startswith("#")]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 핸들러
+# ──────────────────────────────────────────────────────────────────────────────
+def public_handler(argv: List[str]) -> Callable[[Dict[str, Any], Callable[[], None]], Any]:
+    from public_cert_api import run_public as rp
+    from public_cert_api.fetch_qnet_tabs_min import new_session
+    # fork 전에 임포트(헤더/규칙 YAML 로드 포함) → 자식 워커가 copy-on-write 로 공유
+    from public_cert_api import normalizer_min_v1, parse_tabs_min  # noqa: F401
+
+    args = rp.build_parser().parse_args(argv)
+    root_arg = args.snapshot_root or args.root
+    if not root_arg:
+        raise SystemExit("--root 또는 --snapshot-root 중 하나는 필요합니다. (work --kind jmcd -- --root …)")
+    root = Path(root_arg).resolve()
+    root.mkdir(parents=True, exist_ok=True)
+    out_root = Path(args.out).resolve() if args.out else None
+    if out_root:
+        out_root.mkdir(parents=True, exist_ok=True)
+    steps = rp.parse_steps(args)
+    idmap = rp.load_idmap(args.csv)
+    local = threading.local()
+
+    def handle(payload: Dict[str, Any], cancel: Callable[[], None]) -> Dict[str, Any]:
+        jmcd = rp._clean_jmcd(str(payload.get("id") or ""))
+        if not jmcd:
+            raise ValueError(f"bad jmcd: {payload.get('id')!r}")
+        if getattr(local, "session", None) is None:
+            local.session = new_session(args.cookies, args.prewarm)
+        res = rp.process_jmcd(jmcd, root, args, steps, out_root, idmap,
+                              inproc=True, session=local.session, cancel=cancel)
+        return {"jmcd": jmcd, "out": str(res["out"]) if res["out"] else None,
+                "issues": len(res["issues"] or [])}
+
+    return handle
+
+
+def private_handler(args) -> Callable[[Dict[str, Any], Callable[[], None]], Any]:
+    import run_once as ro
+    tabs = [s.strip() for s in args.tabs.split(",") if s.strip()] if args.tabs else None
+    ro.load_cfg(args.config)        # fork 전에 설정 로드 (이후 수정 시각이 바뀔 때만 다시 읽음)
+
+    def handle(payload: Dict[str, Any], cancel: Callable[[], None]) -> Dict[str, Any]:
+        cert = str(payload.get("id") or "")
+        cfg = ro.load_cfg(args.config)
+        if args.out:
+            out = Path(args.out)
+            out.mkdir(parents=True, exist_ok=True)
+        else:
+            out = ro.default_output_for(cert)
+        pre = ro.prefetch_sites(cfg, [cert], tabs)     # 이 작업에서만 쓰고 버림
+        saved = ro.run(cert=cert, tabs=tabs, out=out, config_path=args.config, cancel=cancel, prefetched=pre)
+        return {"cert": cert, "out": str(saved)}
+
+    return handle
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────────
+def cmd_enqueue(args) -> None:
+    q = work_queue.open_queue(args.url, args.run)
+    n = 0
+    jmcds = list(args.jmcd or [])
+    for path in args.jmcd_list or []:
+        jmcds += _read_list(path)
+    if jmcds:
+        from public_cert_api.run_public import _clean_jmcd
+        n += work_queue.enqueue_many(q, "jmcd", [j for j in map(_clean_jmcd, jmcds) if j])
+    certs = [c.strip() for c in (args.certs or "").split(",") if c.strip()]
+    if args.all_certs:
+        import yaml
+        p = Path(args.config) if args.config else Path(__file__).parent / "configs" / "cert_map.yaml"
+        with open(p, encoding="utf-8") as f:
+            certs += list((yaml.safe_load(f) or {}).get("certifications", {}))
+    if certs:
+        n += work_queue.enqueue_many(q, "cert", certs)
+    print(f"[queue] {args.run}: {n} new units → {q.stats()}")
+
+
+def _work_loop(args, handler, recycler: Optional[memory.Recycler] = None) -> int:
+    """이 프로세스에서 --threads 만큼 대기열 처리 → 재활용이 필요하면 memory.RECYCLE_EXIT, 아니면 0."""
+    q = work_queue.open_queue(args.url, args.run)      # Redis 연결은 (fork 뒤) 프로세스마다
+    if args.kind == "cert":
+        import run_once as ro
+        ro.get_pool().warm()
+
+    stop = threading.Event()
+    totals: Dict[str, int] = {}
+    lock = threading.Lock()
+    recycled: List[str] = []
+
+    def _only(payload, cancel):
+        if payload.get("kind") != args.kind:
+            raise ValueError(f"{payload.get('kind')} unit on a {args.kind} worker")
+        try:
+            return handler(payload, cancel)
+        finally:
+            if recycler is not None:
+                with lock:
+                    reason = recycler.tick()
+                    if reason and not recycled:
+                        recycled.append(reason)
+                        print(f"[mem] worker pid {os.getpid()} will recycle: {reason}")
+                        stop.set()      # 다른 스레드도 지금 단위만 끝내고 멈춤
+
+    def _loop():
+        c = work_queue.work(q, _only, lease_s=args.lease_s, drain=not args.follow, stop=stop)
+        with lock:
+            for k, v in c.items():
+                totals[k] = totals.get(k, 0) + v
+
+    threads = [threading.Thread(target=_loop, name=f"w{i}") for i in range(max(1, args.threads))]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            while t.is_alive():
+                t.join(timeout=1)
+    except KeyboardInterrupt:
+        stop.set()
+        for t in threads:
+            t.join()
+    finally:
+        if args.kind == "cert":
+            import run_once as ro
+            ro.close_pool()
+        snapshot_codec.drain()      # 재활용 자식은 os._exit 로 끝나 atexit 가 안 돎 → 백그라운드 HTML 압축은 여기서
+    print(f"[queue] worker finished {totals} → {q.stats()}")
+    return memory.RECYCLE_EXIT if recycled else 0
+
+
+def cmd_work(args, rest: List[str]) -> None:
+    # 임포트·설정 로드는 fork 전에 한 번 (자식은 그 메모리를 공유)
+    handler = public_handler(rest) if args.kind == "jmcd" else private_handler(args)
+    procs = args.procs
+    if procs <= 0:
+        per = memory.ENGINE_WORKER_MB
+        if args.kind == "cert":
+            import run_once as ro
+            per += ro.DRIVER_POOL_SIZE * memory.ENGINE_DRIVER_MB
+        procs = memory.auto_size(per, os.cpu_count() or 1, "procs")
+    recycle = args.max_jobs > 0 or args.rss_max_mb > 0
+    if procs == 1 and not recycle:
+        sys.exit(_work_loop(args, handler))       # 예전처럼 이 프로세스에서
+
+    codes = memory.prefork(procs, lambda slot: _work_loop(
+        args, handler, memory.Recycler(args.max_jobs, args.rss_max_mb)))
+    print(f"[queue] {len(codes)} worker processes finished (exit codes {sorted(codes.values())})")
+    if any(c not in (0, memory.RECYCLE_EXIT) for c in codes.values()):
+        sys.exit(1)
+
+
+def cmd_status(args) -> None:
+    q = work_queue.open_queue(args.url, args.run)
+    print(json.dumps({"run": args.run, **q.stats()}, ensure_ascii=False))
+    for d in q.dead():
+        print(f"  ✘ {d['id']:<20} {d['error']}")
+
+
+def cmd_requeue_dead(args) -> None:
+    q = work_queue.open_queue(args.url, args.run)
+    print(f"[queue] {args.run}: {q.requeue_dead()} dead units requeued")
+
+
+def main():
+    p = argparse.ArgumentParser(description="공유 작업 대기열 워커 (공공 jmcd / 사설 cert)")
+    p.add_argument("--url", default=work_queue.WORK_QUEUE_URL, help="redis://… 또는 memory")
+    p.add_argument("--run", default=work_queue.WORK_QUEUE_RUN, help="회차 이름 (예: 2026-10-19)")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    e = sub.add_parser("enqueue", help="단위 넣기 (이미 있거나 끝난 단위는 건너뜀)")
+    e.add_argument("--jmcd", action="append", help="jmcd (여러 번 가능)")
+    e.add_argument("--jmcd-list", action="append", help="jmcd 목록 txt (여러 번 가능)")
+    e.add_argument("--certs", help="사설 자격증들 (콤마 구분)")
+    e.add_argument("--all-certs", action="store_true", help="--config 의 모든 자격증")
+    e.add_argument("--config", help="사설 cert_map.yaml 경로")
+
+    w = sub.add_parser("work", help="대기열이 빌 때까지 수집 (공공은 -- 뒤에 run_public 인자)")
+    w.add_argument("--kind", choices=["jmcd", "cert"], required=True)
+    w.add_argument("--threads", type=int, default=1, help="이 프로세스의 동시 작업 수")
+    w.add_argument("--lease-s", type=float, default=work_queue.WORK_QUEUE_LEASE_S, help="임대 기한(초)")
+    w.add_argument("--follow", action="store_true", help="대기열이 비어도 계속 대기")
+    w.add_argument("--config", help="(cert) 사설 cert_map.yaml 경로")
+    w.add_argument("--tabs", help="(cert) 실행할 탭 (콤마 구분)")
+    w.add_argument("--out", help="(cert) 출력 폴더")
+    w.add_argument("--procs", type=int, default=1, help="워커 프로세스 수 (임포트 후 fork, 0 = 가용 메모리로 산정)")
+    w.add_argument("--max-jobs", type=int, default=memory.ENGINE_MAX_JOBS, help="프로세스당 처리 단위 수 상한 → 교체")
+    w.add_argument("--rss-max-mb", type=float, default=memory.ENGINE_RSS_MAX_MB, help="단위 뒤 RSS 상한(MB) → 교체")
+
+    sub.add_parser("status", help="대기열 상태 + dead 목록")
+    sub.add_parser("requeue-dead", help="dead 단위를 다시 대기열로")
+
+    argv = sys.argv[1:]
+    rest: List[str] = []
+    if "--" in argv:
+        i = argv.index("--")
+        argv, rest = argv[:i], argv[i + 1:]
+    args = p.parse_args(argv)
+    if args.cmd == "enqueue":
+        cmd_enqueue(args)
+    elif args.cmd == "work":
+        cmd_work(args, rest)
+    elif args.cmd == "status":
+        cmd_status(args)
+    else:
+        cmd_requeue_dead(args)
+
+
+if __name__ == "__main__":
+    main()
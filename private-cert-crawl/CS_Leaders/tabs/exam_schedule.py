@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 # exam_scheduler_compact.py
 
-import os, re, json, time
+import os, re, json
 from bs4 import BeautifulSoup
 from html import unescape
 from typing import Optional, List, Dict
 from engine_common.utils_text import sanitize_text
+from engine_common import dom_tables, waits
 
 # ── tiny helpers ──
 _txt = lambda el: re.sub(r"\s+", " ", unescape(sanitize_text(el.get_text()) if el else "").replace("\xa0", " ")).strip()
@@ -29,6 +30,9 @@ def _parse_md_with_year(md: str, ref_year: int, ref_month: Optional[int]=None):
     year = ref_year + (1 if (ref_month and ref_month >= 11 and mm <= 2) else 0)
     return f"{year:04d}-{mm:02d}-{dd:02d}"
 
+# 일정 표 헤더 조건 (브라우저 경로: dom_tables 로 같은 조건의 표만 받음)
+SCHEDULE_KEYWORDS = ["회차", ("접수", "원서접수"), ("시험", "시험일자"), ("발표", "합격자")]
+
 def _find_table_for_schedule(soup: BeautifulSoup):
     # 1) thead가 있는 표에서 헤더 키워드 검사
     for tbl in soup.find_all("table"):
@@ -96,8 +100,9 @@ def parse_exam_schedule_html(html: str) -> Dict[str, List[Dict]]:
 # ── selenium entry (optional) ──
 def get_data(driver, debug_dir=None):
     url = "https://www.kie.or.kr/kiehomepage/fc/licenceSchedule?licence="
-    driver.get(url); time.sleep(1.0)
-    html = driver.page_source
+    driver.get(url); waits.rows_stable(driver, "table tbody tr", timeout=5)
+    # 헤더가 맞는 표의 outerHTML 만 (못 찾으면 예전처럼 page_source → _find_table_for_schedule 폴백 규칙)
+    html = dom_tables.table_html(driver, SCHEDULE_KEYWORDS) or driver.page_source
     data = parse_exam_schedule_html(html)
 
     if debug_dir and not data["시험일정"]["정기검정일정"]:
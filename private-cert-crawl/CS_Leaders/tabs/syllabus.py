@@ -3,22 +3,18 @@
 
 import re
 from html import unescape
-from bs4 import BeautifulSoup
 from typing import List, Dict, Any, Optional, Tuple
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException
 from engine_common.utils_text import sanitize_text
+from engine_common.table_grid import build_grid
+from engine_common import waits
 
 TABLE_SEL = "table.table1"
 
 # ---------- fetch (default → all iframes) ----------
-def _select_table_in_context(driver, timeout=2) -> Optional[str]:
-    try:
-        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, TABLE_SEL)))
-    except Exception:
-        return None
+def _select_table_in_context(driver) -> Optional[str]:
+    """현재 문서(프레임)에서 헤더가 맞는 표를 바로 확인 (대기 없음 → waits.find_in_frames 가 재시도)"""
     for t in driver.find_elements(By.CSS_SELECTOR, TABLE_SEL):
         html = t.get_attribute("outerHTML")
         head = (html.split("</thead>", 1)[0] if "<thead" in html else html[:800]).replace(" ", "").lower()
@@ -28,32 +24,16 @@ def _select_table_in_context(driver, timeout=2) -> Optional[str]:
             return html
     return None
 
-def _scan_iframes(driver, depth=0, max_depth=5, timeout=2) -> Optional[str]:
-    if depth > max_depth: return None
-    html = _select_table_in_context(driver, timeout)
-    if html: return html
-    for f in driver.find_elements(By.TAG_NAME, "iframe"):
-        try:
-            driver.switch_to.frame(f)
-            html = _scan_iframes(driver, depth+1, max_depth, timeout)
-            if html: return html
-        except (StaleElementReferenceException, NoSuchElementException):
-            pass
-        finally:
-            driver.switch_to.default_content()
-    return None
-
 def get_exam_scope_table_html(driver, timeout=15) -> str:
     driver.get("https://www.kie.or.kr/kiehomepage/fc/licenceCSLeadersG1?licence=")
-    WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-    html = _select_table_in_context(driver, 3) or _scan_iframes(driver, 0, 5, 3)
-    if not html:
+    try:
+        return waits.find_in_frames(driver, _select_table_in_context, timeout, max_depth=5)
+    except TimeoutException:
         raise TimeoutException("시험종목/세부항목/내용 헤더를 가진 표를 찾지 못함.")
-    return html
 
 # ---------- tiny text utils ----------
 _clean = lambda s: re.sub(r"[ \t\r\f\v]+"," ", unescape((s or "").replace("\xa0"," "))).replace("“","").replace("”","").strip()
-def _txt(el): return _clean(sanitize_text(el.get_text())) if el else ""
+def _txt(cell): return _clean(sanitize_text(cell.text())) if cell else ""
 def _split(text): return [p.strip() for p in re.split(r"\n+", _clean(text)) if p.strip()]
 
 def _parse_subject(s:str)->Tuple[Optional[str],Optional[int]]:
@@ -63,45 +43,9 @@ def _parse_major(s:str)->Tuple[Optional[str],Optional[int]]:
     s=_clean(s); m=re.search(r"(.+?)\s*\(\s*(\d+)\s*%\s*\)",s)
     return (m.group(1).strip(), int(m.group(2))) if m else (s or None, None)
 
-# ---------- grid & header ----------
-def _visible(tr): return [td for td in tr.find_all(["th","td"]) if "display:none" not in (td.get("style","").replace(" ","").lower())]
-
-def _grid(table):
-    tbody = table.find("tbody") or table
-    grid, cellmap, r = [], {}, 0
-    for tr in tbody.find_all("tr"):
-        if len(grid) <= r: grid.append([])
-        row, c, cells, i = grid[r], 0, _visible(tr), 0
-        while i < len(cells):
-            while c < len(row) and row[c] is not None:
-                c += 1
-            if c == len(row):
-                row.append(None)
-
-            # ✅ 여기 3줄로 분리 (버그 수정)
-            el = cells[i]
-            rs = int(el.get("rowspan", 1) or 1)
-            cs = int(el.get("colspan", 1) or 1)
-
-            info = {"el": el, "rowspan": rs, "colspan": cs, "r0": r, "c0": c}
-            for rr in range(r, r + rs):
-                while len(grid) <= rr:
-                    grid.append([])
-                while len(grid[rr]) < c + cs:
-                    grid[rr].extend([None] * ((c + cs) - len(grid[rr])))
-                for cc in range(c, c + cs):
-                    grid[rr][cc] = info
-                    cellmap[(rr, cc)] = el
-            i += 1
-            c += cs
-        r += 1
-    return grid, cellmap
-
-
-def _header_indexes(table)->dict:
-    thead = table.find("thead")
-    header_tr = (thead.find("tr") if thead else table.find("tr")) or None
-    labels = [_txt(th) for th in header_tr.find_all(["th","td"])] if header_tr else []
+# ---------- header (grid: engine_common.table_grid) ----------
+def _header_indexes(grid)->dict:
+    labels = [_txt(th) for th in grid.header]
     def find(*keys):
         for i,h in enumerate(labels):
             hh=h.replace(" ","")
@@ -116,14 +60,11 @@ def _header_indexes(table)->dict:
 
 # ---------- parse ----------
 def parse_exam_scope_table_html(table_html:str)->List[Dict[str,Any]]:
-    soup = BeautifulSoup(table_html, "lxml")
-    table = soup.find("table");  grid, cellmap = _grid(table);  col = _header_indexes(table)
+    grid = build_grid(table_html);  col = _header_indexes(grid)
     out=[]
     for r in range(len(grid)):
         def pick(c):
-            if c is None: return None
-            if c == -1: c = len(grid[r])-1
-            return cellmap.get((r,c))
+            return grid.at(r, c)          # c=-1 → 그 행의 마지막 셀
         subj_raw, major_raw, detail_raw, content_raw = map(_txt, [pick(col.get("subject")), pick(col.get("major")), pick(col.get("detail")), pick(col.get("content"))])
         if col.get("major") is None and not major_raw and subj_raw:
             _,pct=_parse_major(subj_raw);  major_raw=subj_raw if pct is not None else major_raw
@@ -2,9 +2,10 @@ import re
 from html import unescape
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from engine_common.utils_text import sanitize_text
+from engine_common.table_grid import build_grid, records
+from engine_common import waits
+from engine_common import page_cache
 
 # ───────────────────────── helpers ─────────────────────────
 def _txt(el):
@@ -16,31 +17,14 @@ def _txt(el):
     s = re.sub(r"[ \t\r\f\v]+", " ", s.replace("\xa0", " ")).strip()
     return s
 
-def _consume_row(row, cols, prev, left):
+def _rows(table, cols):
     """
-    위치 기반 + rowspan 트래커
-    - cols: 각 열의 '의미 이름' 리스트
-    - prev: 직전 행의 값들
-    - left: 열별 남은 rowspan 카운트
+    위치 기반 + rowspan/colspan 펼침 (engine_common.table_grid)
+    - cols: 각 열의 '의미 이름' 리스트 → 행마다 {이름: 텍스트}
+    - 병합으로 이어지는 칸/누락된 칸은 직전 행 값
     """
-    out = {}
-    cells = row.find_all(["th", "td"])
-    i = 0
-    for key in cols:
-        if left[key] > 0:
-            out[key] = prev[key]
-            left[key] -= 1
-        else:
-            if i < len(cells):
-                val = _txt(cells[i])
-                out[key] = val
-                rs = int(cells[i].get("rowspan", 1) or 1)
-                left[key] = max(0, rs - 1)
-                i += 1
-            else:
-                out[key] = prev[key]
-        prev[key] = out[key]
-    return out
+    grid = build_grid(table)
+    return records(grid, cols, lambda cell, _key: _txt(cell)) if grid else iter(())
 
 def _find_table_with_headers(soup: BeautifulSoup, required_keywords):
     """
@@ -107,13 +91,9 @@ def parse_regular_schedule(soup: BeautifulSoup):
         return []
 
     cols = ["종목및등급", "회차", "원서접수", "장소공고", "시험일자", "발표"]
-    prev = {k: None for k in cols}
-    left = {k: 0    for k in cols}
 
     results = []
-    tbody = table.find("tbody") or table
-    for tr in tbody.find_all("tr"):
-        row = _consume_row(tr, cols, prev, left)
+    for row in _rows(table, cols):
 
         # 회차/시험일자 없는 빈 줄은 스킵
         if not (row["회차"] and row["시험일자"]):
@@ -141,10 +121,6 @@ def parse_exam_time_table(soup: BeautifulSoup):
 
     # 왼쪽 구분 + 4등급 열 구조
     cols = ["구분", "C1", "C2", "C3", "C4"]
-    prev = {k: None for k in cols}
-    left = {k: 0    for k in cols}
-
-    tbody = table.find("tbody") or table
 
     header_levels = None         # 등급 라벨들
     time_row = None              # 'HH:MM ~ HH:MM'
@@ -154,8 +130,7 @@ def parse_exam_time_table(soup: BeautifulSoup):
     is_level_row = lambda s: bool(s) and re.search(r"급\s*수", s) is not None
     is_time_label = lambda s: bool(s) and re.search(r"시험\s*시간?", s) is not None
 
-    for tr in tbody.find_all("tr"):
-        row = _consume_row(tr, cols, prev, left)
+    for row in _rows(table, cols):
 
         # ① 등급 라벨 행(‘급수’) 찾기
         if header_levels is None and is_level_row(row["구분"]):
@@ -179,9 +154,8 @@ def parse_exam_time_table(soup: BeautifulSoup):
 
     # 폴백: 간혹 '급수' 라벨이 누락되면, 첫 행의 4개 셀을 등급으로 간주
     if not header_levels:
-        first_tr = tbody.find("tr")
-        if first_tr:
-            r = _consume_row(first_tr, cols, {k: None for k in cols}, {k: 0 for k in cols})
+        r = next(_rows(table, cols), None)
+        if r:
             cand = [_compact_level_name(r["C1"]), _compact_level_name(r["C2"]),
                     _compact_level_name(r["C3"]), _compact_level_name(r["C4"])]
             if all(cand):
@@ -196,25 +170,11 @@ def parse_exam_time_table(soup: BeautifulSoup):
     ]
 
 # ─────────────────────── orchestrator ──────────────────────
-def get_data(driver):
-    """
-    전산회계/전산세무 자격 페이지에서
-      - 정기검정일정(표1)
-      - 시험시간(표2)
-    을 파싱해 가벼운 JSON으로 반환.
-    """
-    # ▶▶ 여기 URL은 실제 전산세무회계 일정 페이지로 교체하세요.
-    driver.get("https://license.kacpta.or.kr/m/info/info_diary.aspx")
-    # 필요 시 특정 탭 클릭이 있으면 아래에 넣기
-    # WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "..."))).click()
+PAGE_URL = "https://license.kacpta.or.kr/m/info/info_diary.aspx"
 
-    # 표 로딩 대기(선택)
-    try:
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table")))
-    except Exception:
-        pass
-
-    soup = BeautifulSoup(driver.page_source, "lxml")
+def parse_page(html: str):
+    """페이지 HTML(브라우저 page_source 또는 HTTP 응답) → 원시 JSON"""
+    soup = BeautifulSoup(html, "lxml")
 
     regular = parse_regular_schedule(soup)
     exam_time = parse_exam_time_table(soup)
@@ -225,3 +185,28 @@ def get_data(driver):
             "시험시간": exam_time  
         }
     }
+
+def load_page(driver) -> str:
+    """info_diary.aspx 로드 → page_source (syllabus 탭과 공유: page_cache 키 = (PAGE_URL, ()))"""
+    driver.get(PAGE_URL)
+    # 필요 시 특정 탭 클릭이 있으면 아래에 넣기
+    # waits.clickable(driver, (By.XPATH, "...")).click()
+
+    # 표 로딩 대기(선택) → 행 수가 더 늘지 않을 때까지
+    try:
+        waits.present(driver, (By.CSS_SELECTOR, "table"), timeout=10)
+        waits.rows_stable(driver, "table tr")
+    except Exception:
+        pass
+
+    return driver.page_source
+
+def get_data(driver):
+    """
+    전산회계/전산세무 자격 페이지에서
+      - 정기검정일정(표1)
+      - 시험시간(표2)
+    을 파싱해 가벼운 JSON으로 반환.
+    """
+    html = page_cache.cached(PAGE_URL, (), lambda: load_page(driver))
+    return parse_page(html)
@@ -1,56 +1,29 @@
 import re
 from html import unescape
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from engine_common.utils_text import sanitize_text
+from engine_common.table_grid import build_grid, records
+from engine_common import waits
+from engine_common import page_cache
 from bs4 import BeautifulSoup
 
-def get_exam_scope_table_html(driver):
-    driver.get("https://license.kacpta.or.kr/m/info/info_diary.aspx")
+PAGE_URL = "https://license.kacpta.or.kr/m/info/info_diary.aspx"
+
+def load_page(driver) -> str:
+    """info_diary.aspx 로드 → page_source. exam_schedule 탭과 같은 페이지라 page_cache 로 공유."""
+    driver.get(PAGE_URL)
     # 제목 요소가 보일 때까지 대기
-    title_el = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((
-            By.XPATH,
-            "//div[contains(@class,'title_big')][contains(.,'시험종목') and contains(.,'평가범위')]"
-        ))
-    )
-    # 제목 바로 다음에 오는 첫 번째 table만 집어옴
-    table_el = title_el.find_element(By.XPATH, "following-sibling::table[1]")
-    return table_el.get_attribute("outerHTML")
+    waits.present(driver, (
+        By.XPATH,
+        "//div[contains(@class,'title_big')][contains(.,'시험종목') and contains(.,'평가범위')]"
+    ), timeout=10)
+    return driver.page_source
 
 def _txt(el):
     if not el: return ""
     s = unescape(sanitize_text(el.get_text()))
     return re.sub(r"[ \t\r\f\v]+", " ", s.replace("\xa0"," ")).strip()
 
-def _visible_cells(row):
-    cells = []
-    for c in row.find_all(["th","td"]):
-        style = (c.get("style") or "").replace(" ", "").lower()
-        if "display:none" in style:   # 숨김 셀은 무시
-            continue
-        cells.append(c)
-    return cells
-
-def _consume_row(row, cols, prev, left):
-    out = {}
-    cells = _visible_cells(row)
-    i = 0
-    for key in cols:
-        if left[key] > 0:
-            out[key] = prev[key]; left[key] -= 1
-        else:
-            if i < len(cells):
-                val = _txt(cells[i])
-                out[key] = val
-                rs = int(cells[i].get("rowspan", 1) or 1)
-                left[key] = max(0, rs - 1)
-                i += 1
-            else:
-                out[key] = prev[key]
-        prev[key] = out[key]
-    return out
 
 def _split_item_and_grade(text: str):
     s = re.sub(r"\s+", "", text or "")
@@ -58,17 +31,14 @@ def _split_item_and_grade(text: str):
     return (f"{m.group(1)}{m.group(2)}", m.group(3)) if m else (None, None)
 
 def parse_exam_scope_table_html(table_html: str):
-    soup = BeautifulSoup(table_html, "lxml")
-    table = soup.find("table")
+    grid = build_grid(table_html)          # rowspan/colspan 펼침 + 숨김 셀(display:none) 제외
+    if grid is None:
+        return []
     # 이 표는 실제로 5열입니다.
     cols = ["종목", "등급", "구분", "평가범위", "비고"]
-    prev = {k: None for k in cols}
-    left = {k: 0    for k in cols}
 
     out = []
-    tbody = table.find("tbody") or table
-    for tr in tbody.find_all("tr"):
-        row = _consume_row(tr, cols, prev, left)
+    for row in records(grid, cols, lambda cell, _key: _txt(cell)):
 
         # 등급/종목이 rowspan으로 분리되므로 둘을 합쳐서 판별
         item, grade = _split_item_and_grade((row.get("등급") or "") + (row.get("종목") or ""))
@@ -90,11 +60,26 @@ def parse_exam_scope_table_html(table_html: str):
     return out
 
 
-def get_data(driver):
-    table_html = get_exam_scope_table_html(driver)
-    items = parse_exam_scope_table_html(table_html)
+def _scope_table_html_from_page(html: str):
+    """'시험종목·평가범위' 제목 div 바로 다음 table 의 HTML"""
+    soup = BeautifulSoup(html, "lxml")
+    for div in soup.select("div[class*=title_big]"):
+        t = div.get_text()
+        if "시험종목" in t and "평가범위" in t:
+            table = div.find_next_sibling("table")
+            return str(table) if table else None
+    return None
+
+def parse_page(html: str):
+    """페이지 HTML(브라우저 page_source 또는 HTTP 응답) → 원시 JSON"""
+    table_html = _scope_table_html_from_page(html)
+    items = parse_exam_scope_table_html(table_html) if table_html else []
     return {
         "시험내용": {
             "시험종목 및 평가범위": items
         }
     }
+
+def get_data(driver):
+    html = page_cache.cached(PAGE_URL, (), lambda: load_page(driver))
+    return parse_page(html)
@@ -3,7 +3,7 @@ import re
 from datetime import datetime, date
 from typing import Any, Dict, Iterable, Tuple, Optional, List
 from engine_common.utils_text import _prune
-from engine_common.utils_date import _parse_md_range, _parse_one_date, _split_time_range, _minutes_ko
+from engine_common.utils_date import _parse_md_range, _parse_one_date, _minutes_ko, parse_time_column
 
 # ---------- 공용 헬퍼 ----------
 def _first(src: Dict[str, Any], *keys: Iterable[str]) -> Any:
@@ -150,10 +150,13 @@ def normalize_schedule(raw: dict, base_year: int | None = None) -> dict:
     rounds = [_normalize_round_line(r, base_year) for r in rounds_in]
 
     # 시험시간은 2번 로직 재사용
+    time_shows = [t.get("시험시간표시") or t.get("시험시간") for t in times_in]
+    time_col   = parse_time_column(time_shows)
+
     times = []
-    for t in times_in:
-        show_time = t.get("시험시간표시") or t.get("시험시간")
-        start, end = _split_time_range(show_time or "")
+    for i, t in enumerate(times_in):
+        show_time = time_shows[i]
+        start, end = time_col[i]
         times.append(_prune({
             "등급": t.get("등급"),
             "차수": t.get("차수"),
@@ -3,9 +3,10 @@ import re
 from html import unescape
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from engine_common.utils_text import sanitize_text
+from engine_common.table_grid import build_grid, records
+from engine_common import dom_tables, waits
+from engine_common.driver_pool import fan_out
 
 # ───────────── helpers ─────────────
 def _txt(el):
@@ -15,31 +16,6 @@ def _txt(el):
     # 공백 정리
     return re.sub(r"[ \t\r\f\v]+", " ", s).strip()
 
-def _consume_row(tr, cols, prev, left):
-    """
-    열 의미(cols) 순서대로 셀을 소비하면서 rowspan을 추적하는 위치기반 파서.
-    - prev: 직전 행 값 (rowspan으로 이어짐)
-    - left: 각 열에 남아있는 rowspan 카운트
-    """
-    out = {}
-    cells = tr.find_all(["th", "td"])
-    i = 0
-    for key in cols:
-        if left[key] > 0:
-            out[key] = prev[key]
-            left[key] -= 1
-        else:
-            if i < len(cells):
-                c = cells[i]
-                val = _txt(c)
-                rs = int(c.get("rowspan", 1) or 1)
-                out[key] = val
-                left[key] = max(0, rs - 1)
-                i += 1
-            else:
-                out[key] = prev[key]
-        prev[key] = out[key]
-    return out
 
 _RX_ROUND = re.compile(r"(\d{1,3})\s*회")
 def _pick_round(text):
@@ -47,12 +23,14 @@ def _pick_round(text):
     return (m.group(1) + "회") if m else None
 
 # ───────────── 표 파싱 ─────────────
+# 헤더 텍스트에 '필기','실기'가 모두 있는 표 (브라우저 경로: dom_tables 가 같은 조건으로 찾음)
+SCHEDULE_KEYWORDS = ["필기", "실기"]
+
 def parse_barista_schedule_table(soup: BeautifulSoup, grade: str):
     """
-    바리스타 1/2급 일정 표(필기/실기 2블록)를 '위치기반 + rowspan 트래커'로 파싱.
+    바리스타 1/2급 일정 표(필기/실기 2블록)를 '위치기반 + rowspan/colspan 펼침(table_grid)'으로 파싱.
     컬럼 의미(왼→오): 월 | [필기] 제목 | [필기] 일시 | [실기] 제목 | [실기] 일시
     """
-    # 헤더 텍스트에 '필기','실기','제목','일시'가 섞여 있는 표를 찾음
     target = None
     for tbl in soup.find_all("table"):
         heads = [ _txt(th) for th in tbl.select("thead th") ]
@@ -61,15 +39,14 @@ def parse_barista_schedule_table(soup: BeautifulSoup, grade: str):
             break
     if not target:
         return []
+    return schedule_rows(build_grid(target), grade)
 
+def schedule_rows(grid, grade: str):
+    """펼친 격자(table_grid.Grid — HTML 파싱이든 브라우저 추출이든) → 필기/실기 이벤트 목록"""
     cols = ["월", "필기_항목", "필기_일시", "실기_항목", "실기_일시"]
-    prev = {k: "" for k in cols}
-    left = {k: 0  for k in cols}
 
     results = []
-    tbody = target.find("tbody") or target
-    for tr in tbody.find_all("tr"):
-        row = _consume_row(tr, cols, prev, left)
+    for row in records(grid, cols, lambda cell, _key: _txt(cell), fill=""):
 
         # 필기 이벤트 생성
         if row["필기_항목"] or row["필기_일시"]:
@@ -116,23 +93,25 @@ def get_barista_grade_schedule(driver, grade: str):
     }
     driver.get(url_map[grade])
 
-    # 표 로딩 대기(최소 보장)
+    # 표 로딩 대기(최소 보장) → 행 수가 더 늘지 않을 때까지
     try:
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table")))
+        waits.present(driver, (By.CSS_SELECTOR, "table"), timeout=10)
+        waits.rows_stable(driver, "table tr")
     except Exception:
         pass
 
-    soup = BeautifulSoup(driver.page_source, "lxml")
-    return parse_barista_schedule_table(soup, grade)
+    # page_source 전체 대신 브라우저 안에서 표만 펼쳐서 받음 (thead 가 있는 표만 — HTML 경로와 같은 조건)
+    grid = dom_tables.find_grid(driver, SCHEDULE_KEYWORDS, css="table:has(thead)")
+    return schedule_rows(grid, grade) if grid else []
 
 def get_data(driver):
     """
     바리스타 1급/2급 두 페이지를 각각 방문 → 결과를 하나의 배열로 합침.
     이후 상위 스키마에서 '시험일정.정기검정일정'로 넣어 쓰면 됨.
     """
-    all_rows = []
-    all_rows += get_barista_grade_schedule(driver, "1급")
-    all_rows += get_barista_grade_schedule(driver, "2급")
+    # 풀이 있으면 등급 페이지를 여러 드라이버로 동시에 수집(순서는 1급 → 2급 유지)
+    per_grade = fan_out(driver, get_barista_grade_schedule, ["1급", "2급"])
+    all_rows = [row for rows in per_grade for row in rows]
 
     return {
         "시험일정": {
@@ -3,9 +3,9 @@ from html import unescape
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from engine_common.utils_text import sanitize_text
+from engine_common.table_grid import build_grid, records
+from engine_common import dom_tables, waits
 
 # 바리스타 사이트 기준
 BASE = "https://www.kca-coffee.org"
@@ -22,8 +22,8 @@ def _txt(el):
     return _norm(sanitize_text(el.get_text(separator="\n"))) if el else ""
 
 def _bullets(cell):
-    """<ul><li>…</li></ul>은 리스트로만 수집"""
-    items = [_norm(sanitize_text(li.get_text(" "))) for li in cell.select("li")]
+    """<ul><li>…</li></ul>은 리스트로만 수집 (cell: table_grid.Cell)"""
+    items = [_norm(sanitize_text(li)) for li in cell.list_items(" ")]
     if not items:
         t = _txt(cell)
         if t:
@@ -35,31 +35,9 @@ def _bullets(cell):
             dedup.append(it)
     return dedup
 
-def _consume_row(tr, cols, prev, left):
-    """
-    cols: ["자격종목","등급","종류","출제"] 위치 기반 소비 + rowspan 트래킹
-    """
-    out = {}
-    cells = tr.find_all(["th","td"])
-    i = 0
-    for key in cols:
-        if left[key] > 0:
-            out[key] = prev[key]
-            left[key] -= 1
-        else:
-            if i < len(cells):
-                c = cells[i]
-                if key == "출제":
-                    out[key] = _bullets(c)
-                else:
-                    out[key] = _txt(c)
-                rs = int(c.get("rowspan", 1) or 1)
-                left[key] = max(0, rs - 1)
-                i += 1
-            else:
-                out[key] = prev[key]
-        prev[key] = out[key]
-    return out
+def _cell_value(cell, key):
+    """cols: ["자격종목","등급","종류","출제"] — '출제' 칸만 항목 리스트"""
+    return _bullets(cell) if key == "출제" else _txt(cell)
 
 # ───────────── core ─────────────
 def parse_exam_content_table(soup: BeautifulSoup):
@@ -67,7 +45,7 @@ def parse_exam_content_table(soup: BeautifulSoup):
     바리스타 시험안내 > 평가방법 표 파싱
     반환: {"시험내용": {"syllabus": [...]}}
     """
-    # 헤더 매칭: '자격종목/등급/종류/출제범위 및 평가방법'
+    # 헤더 매칭: '자격종목/등급/종류/출제범위 및 평가방법' (브라우저 경로는 CONTENT_KEYWORDS 로 같은 조건)
     target = None
     for tbl in soup.find_all("table"):
         heads = [_txt(th) for th in tbl.select("thead th")]
@@ -77,15 +55,16 @@ def parse_exam_content_table(soup: BeautifulSoup):
             break
     if not target:
         return []
+    return content_rows(build_grid(target))    # 위치 기반 + rowspan/colspan 펼침
+
+CONTENT_KEYWORDS = ["자격", "등급", "종류", ("출제범위", "평가방법")]
 
+def content_rows(grid):
+    """펼친 격자(table_grid.Grid — HTML 파싱이든 브라우저 추출이든) → 시험내용 행"""
     cols = ["자격종목","등급","종류","출제"]
-    prev = {k: "" for k in cols}
-    left = {k:  0 for k in cols}
 
     rows = []
-    tbody = target.find("tbody") or target
-    for tr in tbody.find_all("tr"):
-        row = _consume_row(tr, cols, prev, left)
+    for row in records(grid, cols, _cell_value, fill=""):
 
         items = row.get("출제") or []
         if row["등급"] and row["종류"] and items:
@@ -105,12 +84,12 @@ def get_data(driver):
 
     # (모바일/응답형이라 가끔 컨텐츠가 지연되므로) 표 로딩 대기
     try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
-        )
+        waits.present(driver, (By.CSS_SELECTOR, "table"), timeout=10)
+        waits.rows_stable(driver, "table tr")
     except Exception:
         pass
 
-    soup = BeautifulSoup(driver.page_source, "lxml")
-    syllabus = parse_exam_content_table(soup)
+    # page_source 전체 대신 브라우저 안에서 표만 펼쳐서 받음
+    grid = dom_tables.find_grid(driver, CONTENT_KEYWORDS, css="table:has(thead)")
+    syllabus = content_rows(grid) if grid else []
     return {"시험내용": {"syllabus": syllabus}}
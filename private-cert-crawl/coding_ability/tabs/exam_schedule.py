@@ -1,71 +1,52 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 from html import unescape
 from engine_common.utils_text import sanitize_text
-import time
+from engine_common.table_grid import build_grid, records
+from engine_common import dom_tables, waits
 
 
 def _txt(el):
     return unescape(sanitize_text(el.get_text())) if el else ""
 
-def _consume_row(row, cols, prev, left):
-    out = {}
-    cells = row.find_all(["th", "td"])
-    i = 0
-
-    for key in cols:
-        if left[key] > 0:
-            out[key] = prev[key]
-            left[key] -= 1
-        else:
-            if i < len(cells):
-                val = _txt(cells[i])
-                out[key] = val
-                rs = int(cells[i].get("rowspan", 1) or 1)
-                left[key] = max(0, rs - 1)
-                i += 1
-            else:
-                out[key] = prev[key]    
-        prev[key] = out[key]
-    return out
+
+PAGE_URL = "https://www.ihd.or.kr/guidecert8.do"
 
 def get_data(driver):
-    driver.get("https://www.ihd.or.kr/guidecert8.do")
-    time.sleep(2)
+    driver.get(PAGE_URL)
 
     try:
         # 코딩활용능력 탭 클릭
-        tab_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, "//a[text()='코딩활용능력']"))
-        )
+        tab_element = waits.present(driver, (By.XPATH, "//a[text()='코딩활용능력']"), timeout=10)
         driver.execute_script("arguments[0].click();", tab_element)
 
-        # 테이블 로딩 대기
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
-        )
+        # 테이블 로딩 대기 (행 수가 더 늘지 않을 때까지)
+        waits.present(driver, (By.CSS_SELECTOR, "table"), timeout=10)
+        waits.rows_stable(driver, "table tbody tr")
     except Exception as e:
         return {"exam_schedule": f"❌ 코딩활용능력 탭 클릭 또는 표 로딩 실패: {str(e)}"}
 
-    soup = BeautifulSoup(driver.page_source, "lxml")
+    # parse_page 는 표만 읽으므로 page_source 대신 페이지의 표 HTML 만 받음
+    return parse_page(dom_tables.page_tables_html(driver))
+
+def parse_page(html: str):
+    """페이지 HTML(브라우저 page_source 또는 HTTP 응답) → 원시 JSON"""
+    soup = BeautifulSoup(html, "lxml")
     tables = soup.find_all("table")
     if len(tables) < 2:
         return {"exam_schedule": "❌ 테이블 수 부족"}
 
     # ✅ 첫 번째 테이블: 정기검정일정
     cols = ["종목", "등급", "회차", "접수일자", "시험일자", "합격자 발표"]
-    prev = {k: None for k in cols}
-    left = {k: 0    for k in cols}
 
     tables_0 = tables[0]
-    rows = tables_0.select("tbody tr")
+    # tbody 행만 (rowspan/colspan 은 table_grid 가 펼쳐서 위 행 값을 이어줌)
+    grid = build_grid(tables_0) if tables_0.find("tbody") else None
+    rows = records(grid, cols, lambda cell, _key: _txt(cell)) if grid else []
 
     result = []
 
-    for tr in rows:
-        row = _consume_row(tr, cols, prev, left)  # 너가 만든 함수 재사용
+    for row in rows:
         
         # 필요하면 종목은 버리고 등급/회차/날짜만 저장
         if row["회차"] and row["시험일자"]:
@@ -1,19 +1,17 @@
-import time
 import re
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from engine_common.utils_text import sanitize_text
+from engine_common.table_grid import build_grid, records
+from engine_common import waits
 
 BASE = "https://www.ihd.or.kr"
 
 # --- helpers ---
 def _txt_and_imgs(cell):
-    # 텍스트 + 이미지 src
+    # 텍스트 + 이미지 src (cell: table_grid.Cell)
     txt = sanitize_text(cell.get_text())
-    imgs = [urljoin(BASE, img.get("src", "")) for img in cell.find_all("img")]
+    imgs = cell.imgs(BASE)
     #imgs = [img.get("src", "") for img in cell.find_all("img")]
     # 텍스트가 없고 이미지만 있으면 표시 텍스트를 만들어 준다
     if not txt and imgs:
@@ -24,35 +22,27 @@ def _txt(cell):
     # 텍스트만 필요할 때
     return sanitize_text(cell.get_text())
 
-def _consume_row(row, cols, prev, left, collect_content_imgs=False):
+def _rows(table, cols, collect_content_imgs=False):
     """
     cols: ["등급","과목","항목","내용","상세"] 또는 ["등급","과목","항목","내용","비고"]
-    collect_content_imgs=True 이면 '내용' 열의 이미지 src 리스트를 함께 반환
+    행마다 (값 dict, '내용' 이미지 src 리스트 | None) — rowspan/colspan 은 table_grid 가 펼침.
+    이미지는 '내용' 셀이 실제로 놓인 행에서만 (위에서 이어진 행은 [])
     """
-    row_vals = {}
-    row_imgs = []
-    cells = row.find_all(["th", "td"])
-    i = 0
-    for key in cols:
-        if left[key] > 0:
-            row_vals[key] = prev[key]
-            left[key] -= 1
-        else:
-            if i < len(cells):
-                if key == "내용" and collect_content_imgs:
-                    t, imgs = _txt_and_imgs(cells[i])
-                    row_vals[key] = "" if t == "-" else t
-                    row_imgs = imgs
-                else:
-                    t = _txt(cells[i])
-                    row_vals[key] = "" if t == "-" else t
-                rs = int(cells[i].get("rowspan", 1) or 1)
-                left[key] = max(0, rs - 1)
-                i += 1
-            else:
-                row_vals[key] = prev[key]
-        prev[key] = row_vals[key]
-    return (row_vals, row_imgs) if collect_content_imgs else (row_vals, None)
+    grid = build_grid(table)
+    if grid is None:
+        return
+    ci = cols.index("내용")
+
+    def value(cell, key):
+        t = _txt_and_imgs(cell)[0] if (key == "내용" and collect_content_imgs) else _txt(cell)
+        return "" if t == "-" else t
+
+    for r, row_vals in enumerate(records(grid, cols, value)):
+        if not collect_content_imgs:
+            yield row_vals, None
+            continue
+        cell = grid.at(r, ci)
+        yield row_vals, (cell.imgs(BASE) if cell is not None and cell.is_origin(r) else [])
 
 def parse_syllabus_from_criteria_section(soup: BeautifulSoup):
     # 섹션 경계: '출제기준' h3 ~ 다음 h3
@@ -75,12 +65,8 @@ def parse_syllabus_from_criteria_section(soup: BeautifulSoup):
     if len(tables) >= 1:
         t1 = tables[0]
         cols1 = ["등급","과목","항목","내용","상세"]  # 고정 위치
-        prev = {k: None for k in cols1}
-        left = {k: 0    for k in cols1}
-        tbody = t1.find("tbody") or t1
 
-        for tr in tbody.find_all("tr"):
-            vals, _ = _consume_row(tr, cols1, prev, left, collect_content_imgs=False)
+        for vals, _ in _rows(t1, cols1, collect_content_imgs=False):
             if vals["등급"] and vals["과목"] and vals["항목"] and (vals["내용"] or vals["상세"]):
                 results.append({
                     "등급": vals["등급"],
@@ -94,12 +80,8 @@ def parse_syllabus_from_criteria_section(soup: BeautifulSoup):
     if len(tables) >= 2:
         t2 = tables[1]
         cols2 = ["등급","과목","항목","내용","비고"]  # 마지막 열이 '비고'
-        prev = {k: None for k in cols2}
-        left = {k: 0    for k in cols2}
 
-        tbody = t2.find("tbody") or t2
-        for tr in tbody.find_all("tr"):
-            vals, imgs = _consume_row(tr, cols2, prev, left, collect_content_imgs=True)
+        for vals, imgs in _rows(t2, cols2, collect_content_imgs=True):
 
             # 내용이 비어도 (이미지 존재 or 비고 존재)이면 유효
             has_content = bool(vals["내용"]) or (imgs and len(imgs) > 0)
@@ -120,17 +102,22 @@ def parse_syllabus_from_criteria_section(soup: BeautifulSoup):
 
     return results
 
+PAGE_URL = "https://www.ihd.or.kr/introducesubject8.do"
+
+def parse_page(html: str):
+    """페이지 HTML(브라우저 page_source 또는 HTTP 응답) → 원시 JSON"""
+    soup = BeautifulSoup(html, "lxml")
+    syllabus = parse_syllabus_from_criteria_section(soup)
+    return {"시험내용": {"syllabus": syllabus}}
+
 def get_data(driver):
-    driver.get("https://www.ihd.or.kr/introducesubject8.do")
-    wait = WebDriverWait(driver, 10)
+    driver.get(PAGE_URL)
     try:
-        el = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[normalize-space()='시험내용']")))
+        el = waits.clickable(driver, (By.XPATH, "//a[normalize-space()='시험내용']"), timeout=10)
         driver.execute_script("arguments[0].click();", el)
-        wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-        time.sleep(0.4)
+        waits.present(driver, (By.TAG_NAME, "table"), timeout=10)
+        waits.rows_stable(driver, "table tbody tr")
     except Exception as e:
         return {"시험내용": {"syllabus": [], "error": f"탭 클릭 실패: {e}"}}
 
-    soup = BeautifulSoup(driver.page_source, "lxml")
-    syllabus = parse_syllabus_from_criteria_section(soup)
-    return {"시험내용": {"syllabus": syllabus}}
+    return parse_page(driver.page_source)
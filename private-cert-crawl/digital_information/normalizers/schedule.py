@@ -1,6 +1,6 @@
 from datetime import datetime
 from engine_common.utils_text import _prune
-from engine_common.utils_date import _parse_md_range, _parse_one_date, _split_time_range, _minutes_ko
+from engine_common.utils_date import _minutes_ko, parse_date_column, parse_time_column
 
 def normalize_schedule(raw: dict, base_year: int | None = None) -> dict:
     """
@@ -26,13 +26,20 @@ def normalize_schedule(raw: dict, base_year: int | None = None) -> dict:
                  or sched_root.get("입실 및 시험시간")
                  or [])
 
+    # 표시용 원문(여러 이름 흡수) → 열 단위로 한 번에 파싱
+    shows = [(
+        (r.get("원서접수표시") or r.get("원서접수") or
+         r.get("접수일자") or r.get("접수기간")),
+        (r.get("시험일자표시") or r.get("시험일자") or r.get("시험일")),
+        (r.get("발표표시") or r.get("발표") or r.get("발표일") or r.get("합격자 발표")),
+    ) for r in rounds_in]
+    reg_col  = parse_date_column([s[0] for s in shows], base_year)
+    exam_col = parse_date_column([s[1] for s in shows], base_year)
+    res_col  = parse_date_column([s[2] for s in shows], base_year, kind="one")
+
     rounds = []
-    for r in rounds_in:
-        # 표시용 원문(여러 이름 흡수)
-        show_register = (r.get("원서접수표시") or r.get("원서접수") or
-                         r.get("접수일자") or r.get("접수기간"))
-        show_exam   = (r.get("시험일자표시") or r.get("시험일자") or r.get("시험일"))
-        show_result = (r.get("발표표시") or r.get("발표") or r.get("발표일") or r.get("합격자 발표"))
+    for i, r in enumerate(rounds_in):
+        show_register, show_exam, show_result = shows[i]
 
         # ISO (이미 있으면 우선 사용)
         rs = r.get("registerStart")
@@ -41,12 +48,12 @@ def normalize_schedule(raw: dict, base_year: int | None = None) -> dict:
         res = r.get("resultDate")
 
         if not (rs and re_) and show_register:
-            rs, re_ = _parse_md_range(show_register, base_year)
+            rs, re_ = reg_col[i]
         if not ex and show_exam:
-            es, ee = _parse_md_range(show_exam, base_year)
+            es, ee = exam_col[i]
             ex = es or ee
         if not res and show_result:
-            res = _parse_one_date(show_result, base_year)
+            res = res_col[i][0]
 
         rounds.append(_prune({
             "회차": r.get("회차"),
@@ -61,10 +68,13 @@ def normalize_schedule(raw: dict, base_year: int | None = None) -> dict:
             "resultDate": res,
         }))
 
+    time_shows = [t.get("시험시간표시") or t.get("시험시간") for t in times_in]
+    time_col   = parse_time_column(time_shows)
+
     times = []
-    for t in times_in:
-        show_time = t.get("시험시간표시") or t.get("시험시간")
-        start, end = _split_time_range(show_time or "")
+    for i, t in enumerate(times_in):
+        show_time = time_shows[i]
+        start, end = time_col[i]
         times.append(_prune({
             "등급": t.get("등급"),
             "차수": t.get("차수"),
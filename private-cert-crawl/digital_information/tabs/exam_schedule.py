@@ -1,9 +1,7 @@
-import time
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from engine_common.utils_text import  sanitize_text
+from engine_common import dom_tables, waits
 
 def _get_int(v, default=1):
     try:
@@ -11,28 +9,30 @@ def _get_int(v, default=1):
     except:
         return default
 
+PAGE_URL = "https://www.ihd.or.kr/guidecert.do"
+
 def get_data(driver):
-    driver.get("https://www.ihd.or.kr/guidecert.do")
-    wait = WebDriverWait(driver, 10)
+    driver.get(PAGE_URL)
 
-    # ✅ 디지털활용능력 탭 클릭 (정확 매칭 실패 시 contains 폴백)
+    # ✅ 디지털활용능력 탭 클릭 (정확 매칭 우선, 없으면 contains 후보 — 한 번의 대기로 같이 확인)
     try:
-        try:
-            tab_element = wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//a[normalize-space()='디지털활용능력']"))
-            )
-        except:
-            tab_element = wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//a[contains(normalize-space(),'디지털') and contains(normalize-space(),'활용')]"))
-            )
+        tab_element = waits.first_present(driver, [
+            (By.XPATH, "//a[normalize-space()='디지털활용능력']"),
+            (By.XPATH, "//a[contains(normalize-space(),'디지털') and contains(normalize-space(),'활용')]"),
+        ], timeout=10, clickable_only=True)
         driver.execute_script("arguments[0].click();", tab_element)
-        # 표 로딩 대기
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table")))
-        time.sleep(0.5)
+        # 표 로딩 대기 (행 수가 더 늘지 않을 때까지)
+        waits.present(driver, (By.CSS_SELECTOR, "table"), timeout=10)
+        waits.rows_stable(driver, "table tbody tr")
     except Exception as e:
         return {"시험일정": {"error": f"디지털활용능력 탭/표 로딩 실패: {e}"}}
 
-    soup = BeautifulSoup(driver.page_source, "lxml")
+    # parse_page 는 표만 읽으므로 page_source 대신 페이지의 표 HTML 만 받음
+    return parse_page(dom_tables.page_tables_html(driver))
+
+def parse_page(html: str):
+    """페이지 HTML(브라우저 page_source 또는 HTTP 응답) → 원시 JSON"""
+    soup = BeautifulSoup(html, "lxml")
 
     # ─────────────────────────────────────────────────────────
     # 1) 정기검정 일정
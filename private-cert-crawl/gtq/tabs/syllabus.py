@@ -3,11 +3,10 @@
 import re
 from html import unescape
 from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from engine_common.utils_text import sanitize_text
+from engine_common.table_grid import build_grid
+from engine_common import waits
 
 URL = "https://license.kpc.or.kr/nasec/qlfint/qlfint/selectGtqinfomg.do"
 
@@ -15,64 +14,24 @@ URL = "https://license.kpc.or.kr/nasec/qlfint/qlfint/selectGtqinfomg.do"
 def _clean(s: str) -> str:
     return re.sub(r"[ \t\r\f\v]+", " ", unescape((s or "").replace("\xa0"," "))).strip()
 
-def _txt(el) -> str:
-    return _clean(sanitize_text(el.get_text(separator=" "))) if el else ""
-
-def _join_lines(el) -> str:
-    return " ".join([t.strip() for t in el.stripped_strings]) if el else ""
-
-# ───────────── grid (rowspan/colspan aware) ─────────────
-def _visible(tr):
-    return [cell for cell in tr.find_all(["th", "td"]) if "display:None" not in (cell.get("style", "").replace(" ", "").lower())]
-#우선 조건 필터링을 위해 리스트로 반환하고, td를 기준으로 th,td를 싹 다 찾고 style이 display:None이 아닐 때 없으면 빈 값 반환하고, 공백이나 대문자가 섞여있다면 소문자로 변환해서 비교한다.
-#즉 diplay:None이 아닌 것만 필터링해서 th,td를 갖고 와야 하기에 리스트로 반환한다.
-#display:None이 아닐 때만 하는 이유는 이 때일떄는 브라우저에 숨겨진 데이터이기 때문임
-#td for td in tr.find_all(["th", "td"]) -> 이건 th,td를 찾아서 앞에 있는 td란 변수에 넣는다 이떄 이름은 상관없다 
-
-def _grid(table):
-    tbody = table.find("tbody") or table
-    grid, cellmap, r = [], {}, 0
-    for tr in tbody.find_all("tr"):
-        if len(grid) <= r: grid.append([])
-        row, c, cells, i = grid[r], 0, _visible(tr), 0
-        while i < len(cells):
-            while c < len(row) and row[c] is not None:
-               c += 1
-            if c == len(row):
-                row.append(None)
-            el = cells[i]
-            rs = int(el.get("rowspan", 1) or 1)
-            cs = int(el.get("colspan", 1) or 1)
-            info = {"el": el, "rowspan": rs, "colspan": cs, "r0": r, "c0": c}
-            for rr in range(r, r + rs):
-                while len(grid) <= rr: grid.append([])
-                while len(grid[rr]) < c + cs: grid[rr].extend([None] * ((c + cs) - len(grid[rr])))
-                for cc in range(c, c + cs):
-                    grid[rr][cc] = info
-            i += 1
-            c += cs
-        r += 1
-    # cellmap: 좌표→원소
-    cellmap = {(r,c): grid[r][c]["el"] for r in range(len(grid)) for c in range(len(grid[r])) if grid[r][c]} 
-    return grid, cellmap                   
-#일단 간단하게 tbody에 있는 정보를 갖고오고, len(grid)를 해서 길이를 기준으로 하고 만약 아무것도 없다면 grid 리스트를 추가
-#HTML 표를 읽어서 rowspan/colspan까지 전부 풀어낸 2차원 배열과 좌표 매핑을 만들어주는 함수이다.
-#cellmap을 써서 좌표로 바로 셀에 접근할 수 있게 한다. ex) cellmap[0][1] -> 무엇무엇 이렇게
-
-
-def _header_labels(table) -> List[str]:
-    thead = table.find("thead")
-    header_tr = (thead.find("tr") if thead else table.find("tr") or None)
-    return [_txt(cell) for cell in header_tr.find_all(["th", "td"])] if header_tr else []
+def _txt(cell) -> str:
+    return _clean(sanitize_text(cell.text(" "))) if cell else ""
+
+def _join_lines(cell) -> str:
+    return " ".join([t.strip() for t in cell.strings() if t.strip()]) if cell else ""
+
+# ───────────── grid (rowspan/colspan aware): engine_common.table_grid ─────────────
+def _header_labels(grid) -> List[str]:
+    return [_txt(cell) for cell in grid.header]
 #th,td를 공백이나 특수문자를 제외하고 새롭게 가지고 오는 함수
 
 
 def _parse_gtq_subject_table(table_html: str) -> List[Dict[str,Any]]:
-    soup = BeautifulSoup(table_html, "lxml")
-    table = soup.find("table")
-    grid, cellmap = _grid(table)
+    grid = build_grid(table_html)
+    if grid is None:
+        return []
 
-    labels = _header_labels(table)
+    labels = _header_labels(grid)
     def find(*keys):
         for i, h in enumerate(labels):
             hh = h.replace(" ", "")
@@ -87,8 +46,7 @@ def _parse_gtq_subject_table(table_html: str) -> List[Dict[str,Any]]:
     idx_ver = find("Version", "버전")
 
     def pick(r,c):
-        if c is None: return None
-        return cellmap.get((r,c))
+        return grid.at(r, c)
     
     out = []
     current_subject = None
@@ -177,7 +135,7 @@ def _wait_subject_table_contains(driver, keyword: str, timeout: int = 10):
             return false;
         """, kw)
 
-    WebDriverWait(driver, timeout).until(_cond)
+    waits.until(driver, _cond, timeout)
 
 
 
@@ -189,26 +147,22 @@ def _click_tab(driver, text: str) -> bool:
         (By.XPATH, f"//a[normalize-space(.)='{text}']"),
         (By.XPATH, f"//a[contains(normalize-space(.), '{text}')]"),
     ]
-    for by, sel in locs:
-        try:
-            el = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((by, sel)))
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-            driver.execute_script("arguments[0].click();", el)
-            # 활성화 표시(aria-selected) 있으면 기다리기 (옵션)
-            try:
-                WebDriverWait(driver, 3).until(lambda d: el.get_attribute("aria-selected") in ("true","1"))
-            except Exception:
-                pass
-            return True
-        except Exception:
-            pass
-    return False
+    # 후보를 차례로 5초씩 기다리지 않고 한 번의 대기로 함께 확인 (앞 후보 우선)
+    try:
+        el = waits.first_present(driver, locs, timeout=5, clickable_only=True)
+    except Exception:
+        return False
+    waits.js_click(driver, el)
+    # 활성화 표시(aria-selected) 있으면 기다리기 (옵션)
+    try:
+        waits.until(driver, lambda d: el.get_attribute("aria-selected") in ("true","1"), timeout=3)
+    except Exception:
+        pass
+    return True
 
 
 def _wait_subject_table(driver, timeout=10):
-    WebDriverWait(driver, timeout).until(
-        EC.presence_of_element_located((By.XPATH, "//h4[contains(.,'시험과목')]"))
-    )
+    waits.present(driver, (By.XPATH, "//h4[contains(.,'시험과목')]"), timeout)
 
 def _extract_subject_table_html(driver) -> Optional[str]:
     return driver.execute_script("""
@@ -233,10 +187,15 @@ def _extract_subject_table_html(driver) -> Optional[str]:
 def get_data(driver, debug_dir: Optional[str] = None) -> Dict[str, Any]:
     driver.set_window_size(1280, 900)
     driver.get(URL)
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    waits.present(driver, (By.TAG_NAME, "body"))
+    return collect(driver)
+
 
-    # 상위 서브탭(시험안내) 보장 (안 눌려도 무해)
-    _click_tab(driver, "시험안내")
+def collect(driver) -> Dict[str, Any]:
+    """URL 이 이미 열린 상태에서 시험과목 표 수집 (sites.kpc.crawl 이 exam_schedule 방문에 이어서 호출)."""
+    # 상위 서브탭(시험안내) 보장 (안 눌려도 무해) → 탭 내용 다시 그려질 때까지
+    if _click_tab(driver, "시험안내"):
+        waits.dom_settled(driver, timeout=3)
 
     # 세 개 제품 탭 순회
     tabs = [
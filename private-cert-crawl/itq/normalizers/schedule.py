@@ -1,5 +1,6 @@
 # gtq/normalizers/schedule.py
 from __future__ import annotations
+import re
 from typing import Dict, Any, List, Tuple, Optional
 from engine_common.utils_text import _prune
 
@@ -15,10 +16,11 @@ def _pick_max(a: Optional[str], b: Optional[str]) -> Optional[str]:
         return a if a >= b else b
     return a or b
 
+_RX_HHMM_RANGE = re.compile(r"(\d{1,2}:\d{2})\s*~\s*(\d{1,2}:\d{2})")
+
 def _split_time_range(s: str) -> Tuple[Optional[str], Optional[str]]:
     # "09:00~10:30" → ("09:00","10:30")
-    import re
-    m = re.search(r"(\d{1,2}:\d{2})\s*~\s*(\d{1,2}:\d{2})", s or "")
+    m = _RX_HHMM_RANGE.search(s or "")
     return (m.group(1), m.group(2)) if m else (None, None)
 
 def _hm_to_minutes(hm: Optional[str]) -> Optional[int]:
@@ -1,29 +1,30 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 from engine_common.utils_text import sanitize_text
-import time
+from engine_common import dom_tables, waits
+
+PAGE_URL = "https://www.ihd.or.kr/guidecert1.do"
 
 def get_data(driver):
-    driver.get("https://www.ihd.or.kr/guidecert1.do")
-    time.sleep(2)
+    driver.get(PAGE_URL)
 
     try:
         # 리눅스마스터 탭 클릭
-        tab_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, "//a[text()='리눅스마스터']"))
-        )
+        tab_element = waits.present(driver, (By.XPATH, "//a[text()='리눅스마스터']"), timeout=10)
         driver.execute_script("arguments[0].click();", tab_element)
 
-        # 테이블 로딩 대기
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
-        )
+        # 테이블 로딩 대기 (행 수가 더 늘지 않을 때까지)
+        waits.present(driver, (By.CSS_SELECTOR, "table"), timeout=10)
+        waits.rows_stable(driver, "table tbody tr")
     except Exception as e:
         return {"exam_schedule": f"❌ 리눅스마스터 탭 클릭 또는 표 로딩 실패: {str(e)}"}
 
-    soup = BeautifulSoup(driver.page_source, "lxml")
+    # parse_page 는 표만 읽으므로 page_source 대신 페이지의 표 HTML 만 받음
+    return parse_page(dom_tables.page_tables_html(driver))
+
+def parse_page(html: str):
+    """페이지 HTML(브라우저 page_source 또는 HTTP 응답) → 원시 JSON"""
+    soup = BeautifulSoup(html, "lxml")
     tables = soup.find_all("table")
     if len(tables) < 2:
         return {"exam_schedule": "❌ 테이블 수 부족"}
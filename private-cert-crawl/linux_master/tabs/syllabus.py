@@ -1,20 +1,73 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
-import time
 from engine_common.utils_text import sanitize_text
+from engine_common import waits
+
+PAGE_URL = "https://www.ihd.or.kr/introducesubject1.do"
+
+def _parse_criteria_table(html: str):
+    """'출제기준' 제목 다음 요소(표 래퍼)의 HTML → 원시 JSON"""
+    soup = BeautifulSoup(html, "lxml")
+    table = soup.find("table")
+    if not table:
+        return {"syllabus": "출제기준 테이블 파싱 실패"}
+
+    result = []
+
+    current_grade = None
+    current_subject = None
+    current_section = None
+    current_detail = None
+
+    for row in table.select("tbody tr"):
+        cells = [sanitize_text(td.get_text()) for td in row.find_all(["th", "td"])]
+        if not cells:
+            continue
+
+        if len(cells) == 4:
+            current_grade, current_subject, current_section, current_detail = cells
+
+        elif len(cells) == 3:
+            current_subject, current_section, current_detail = cells
+
+        elif len(cells) == 2:
+            current_section, current_detail = cells
+
+        elif len(cells) == 1:
+            current_detail = cells[0]
+
+        if current_grade and current_subject and current_section and current_detail:
+            result.append({
+                "등급": current_grade,
+                "과목": current_subject,
+                "검정항목": current_section,
+                "검정내용": current_detail
+            })
+            current_detail = None
+
+    print(f"✅ 출제기준 {len(result)}개 항목 추출 완료")
+    return {"syllabus": result}
+
+
+def parse_page(html: str):
+    """페이지 HTML(HTTP 응답 등) → 원시 JSON (브라우저 경로의 h3 탐색 JS 와 같은 규칙)"""
+    soup = BeautifulSoup(html, "lxml")
+    for h in soup.find_all("h3"):
+        if "출제기준" in h.get_text():
+            wrap = h.find_next_sibling()
+            return _parse_criteria_table(str(wrap) if wrap else "")
+    return {"syllabus": "출제기준 테이블이 존재하지 않습니다."}
 
 def get_data(driver):
     print("✅ 페이지 접속 중...")
-    driver.get("https://www.ihd.or.kr/introducesubject1.do")
-    time.sleep(1)
+    driver.get(PAGE_URL)
 
     try:
         print("⏳ 시험내용 탭 클릭 준비 중...")
-        tab = driver.find_element(By.XPATH, '//a[text()="시험내용"]')
+        tab = waits.present(driver, (By.XPATH, '//a[text()="시험내용"]'))
         driver.execute_script("arguments[0].click();", tab)
         print("✅ 시험내용 탭 클릭 완료")
+        waits.header_present(driver, "출제기준", ("h3",))
 
         html = driver.execute_script("""
             const headers = [...document.querySelectorAll('h3')];
@@ -33,46 +86,7 @@ def get_data(driver):
 
         print("✅ 출제기준 테이블 추출 성공")
 
-        soup = BeautifulSoup(html, "lxml")
-        table = soup.find("table")
-        if not table:
-            return {"syllabus": "출제기준 테이블 파싱 실패"}
-
-        result = []
-
-        current_grade = None
-        current_subject = None
-        current_section = None
-        current_detail = None
-
-        for row in table.select("tbody tr"):
-            cells = [sanitize_text(td.get_text()) for td in row.find_all(["th", "td"])]
-            if not cells:
-                continue
-
-            if len(cells) == 4:
-                current_grade, current_subject, current_section, current_detail = cells
-
-            elif len(cells) == 3:
-                current_subject, current_section, current_detail = cells
-
-            elif len(cells) == 2:
-                current_section, current_detail = cells
-
-            elif len(cells) == 1:
-                current_detail = cells[0]
-
-            if current_grade and current_subject and current_section and current_detail:
-                result.append({
-                    "등급": current_grade,
-                    "과목": current_subject,
-                    "검정항목": current_section,
-                    "검정내용": current_detail
-                })
-                current_detail = None
-
-        print(f"✅ 출제기준 {len(result)}개 항목 추출 완료")
-        return {"syllabus": result}
+        return _parse_criteria_table(html)
 
     except Exception as e:
         print(f"❌ 에러 발생: {str(e)}")
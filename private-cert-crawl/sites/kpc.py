@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+KPC(license.kpc.or.kr) 사이트 단위 수집.
+
+gtq / itq / erp_information 은 같은 qlfint 페이지 구조(시험일정 탭 → 검색 → #testScheduleList,
+시험안내 탭 → 시험시간/시험과목 표)를 쓴다.
+- 시험일정/시험시간 파서와 탭 클릭은 여기 한 벌만 두고 각 자격증 exam_schedule 이 URL 만 바꿔 사용
+- crawl(driver, plan): run_once 의 사이트 단위 실행(cert_map 의 sites.kpc)에서 호출.
+  브라우저 1개로 자격증 페이지를 한 번씩만 열고, 같은 방문에서 시험일정 → 시험안내(시험시간·시험과목)까지 수집
+  → {cert: {탭 이름: raw}} 로 돌려주면 run_once 가 자격증별 normalizer 로 나눠 보낸다.
+- 시험일정 표는 "검색" 클릭 후 AJAX 로 채워진다. XHR_CAPTURE=1 이면 그 응답(JSON)을 캡처해
+  DOM 파싱 결과와 똑같이 재현되는 경우에만 엔드포인트 + 필드 매핑을 저장(engine_common.xhr_capture)
+  → 다음 실행부터 시험일정은 HTTP 로 JSON 만 받고(렌더 대기/표 파싱 없음), 브라우저는 시험안내 탭에만 쓴다.
+"""
+import importlib, re
+from bs4 import BeautifulSoup
+from html import unescape
+from selenium.webdriver.common.by import By
+from engine_common.utils_text import sanitize_text
+from engine_common import dom_tables, waits, xhr_capture
+
+def _txt(el):
+    s = unescape(sanitize_text(el.get_text("")) if el else "")
+    return re.sub(r"\s+"," ", s.replace("\xa0", " " ).strip())
+#sanitize_text(el.get_text(""))로 td의 내용 텍스트를 뽑고 unescape로 특수문자 제거
+#정규식으로 연속된 모든 공백 문자 \s+를 단일 공백으로 치환함 ex) "안녕 세계\n텍스트" -> "안녕 세계 텍스트"
+
+ROUND_IN_TITLE_RE = re.compile(r"제\s*(\d+)\s*회")
+YMD_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+MMDD_RANGE_RE=re.compile(r"(\d{1,2})\.(\d{1,2})\s*~\s*(\d{1,2})\.(\d{1,2})")
+
+
+# ───────────── 시험시간 (시험안내 탭) ─────────────
+def _looks_time_header(th_texts:list[str], with_grade: bool) -> bool:
+    wants = [("교시",)] + ([("등급",)] if with_grade else []) + [("입실시간","입실완료시간"), ("시험시간",)]
+    for alts in wants:
+        if not any(any(w in t for w in alts) for t in th_texts):
+            return False
+    return True
+#헤더 t 안에 alts 중 하나라도 있으면 통과 (입실시간/입실완료시간 처럼 사이트마다 다른 표기 때문에 튜플로 묶음)
+#with_grade: GTQ 는 교시 다음에 등급 열이 있고 ITQ/ERP 는 없다
+
+def parse_exam_times_html(page_html:str, with_grade: bool = True) -> list[dict]:
+    soup = BeautifulSoup(page_html, "lxml")
+
+    cand_tables=[]
+    for h in soup.find_all(["h3","h4"]):
+        if "시험시간" in _txt(h):
+            t = h.find_next("table")
+            if t:
+                cand_tables.append(t)
+
+    if not cand_tables:
+        for t in soup.find_all("table"):
+            heads = [_txt(th) for th in t.find_all("th")]
+            if _looks_time_header(heads, with_grade):
+                cand_tables.append(t)
+
+    if not cand_tables:
+        return []
+    return _times_from_table(cand_tables[0], with_grade)
+
+def parse_exam_times_table(table_html: str, with_grade: bool = True) -> list[dict]:
+    """시험시간 표 하나의 HTML(브라우저에서 표만 받은 경우) → 행 목록"""
+    table = BeautifulSoup(table_html or "", "lxml").find("table")
+    return _times_from_table(table, with_grade) if table else []
+
+def _times_from_table(table, with_grade: bool) -> list[dict]:
+    tbody = table.find("tbody") or table
+    out = []
+
+    cur_period = None
+    cur_admit = None
+    cur_note = None
+    full = 4 if with_grade else 3     # 교시/입실시간이 rowspan 으로 빠지지 않은 행의 최소 칸 수
+
+    for tr in tbody.find_all("tr"):
+        tds = tr.find_all("td")
+        if not tds:
+            continue
+        cells =[_txt(td) for td in tds]
+
+        grade = None
+        if len(cells) >= full:
+            cur_period = cells[0] or cur_period
+            i = 1
+            if with_grade:
+                grade = cells[1]
+                i = 2
+            cur_admit = cells[i] or cur_admit
+            time_disp = cells[i + 1]
+            if len(cells) >= full + 1 and cells[i + 2]:
+                cur_note = cells[i + 2]
+        elif with_grade and len(cells) == 2:
+            grade = cells[0]
+            time_disp = cells[1]
+        elif not with_grade and len(cells) == 2:
+            time_disp = cells[0]
+        else:
+            continue
+
+        row = {"교시": cur_period}
+        if with_grade:
+            row["등급"] = grade
+        row.update({
+            "입실완료시간": cur_admit,
+            "시험시간표시": time_disp,
+            "비고": cur_note,
+        })
+        out.append(row)
+
+    return out
+#cur_period/cur_admit/cur_note 는 rowspan 으로 다음 행에서 빠지는 칸이라 직전 값을 그대로 이어 쓴다
+
+
+# ───────────── 시험일정 (#testScheduleList) ─────────────
+def _parse_mmdd_range_with_year(s: str, ref_year: int, pivot_month: int):
+    m = MMDD_RANGE_RE.search(s or "")
+    if not m: return (None, None)
+    sm, sd, em, ed = map(int, m.groups())
+    sy, ey = ref_year, ref_year
+    # 1) 일반적인 연도 넘김: 시작 월 > 종료 월이면 종료는 다음 해
+    if sm > em: ey = ref_year + 1
+    # 2) 같은 월인데 일만 뒤로 가는 비정형 케이스도 연도 넘김으로 간주
+    elif sm == em and sd > ed: ey = ref_year + 1
+
+    # 3) 연말 문맥 보정: 11–12월 공지에서 1–2월 구간은 다음 해(둘 다 초봄이면 시작도 다음 해로)
+    if pivot_month >= 11 and sm <= 2 and em <= 2:
+        sy = ref_year + 1
+        ey = ref_year + 1
+
+    return (f"{sy:04d}-{sm:02d}-{sd:02d}", f"{ey:04d}-{em:02d}-{ed:02d}")
+
+def _get_table(soup:BeautifulSoup):
+    t = soup.find("table", id="testScheduleList")
+    if t: return t
+    for tbl in soup.find_all("table"):
+        heads = "".join(_txt(th) for th in tbl.find_all("th"))
+        if all(k in heads for k in["시험일", "시험명", "온라인원서접수", "방문접수", "수험표공고", "성적공고"]):
+            return tbl
+    return None
+
+def parse_schedule_html(html:str):
+    soup = BeautifulSoup(html, "lxml")
+    table = _get_table(soup)
+    if not table:
+        return {"시험일정": {"정기검정일정": []}}
+
+    items=[]
+    for tr in (table.find("tbody") or table).find_all("tr"):
+        tds = tr.find_all("td")
+        if len(tds) < 6:
+            continue
+
+        exam_date_str= _txt(tds[0])
+        title = _txt(tds[1])
+        online_disp=_txt(tds[2])
+        offline_disp=_txt(tds[3])
+        admit_disp=_txt(tds[4])
+        result_disp=_txt(tds[5])
+        if not YMD_RE.match(exam_date_str):
+            continue
+
+        m_round = ROUND_IN_TITLE_RE.search(title)
+        round_level = f"제{m_round.group(1)}회" if m_round else None
+        ref_y = int(exam_date_str[:4]); ref_m = int(exam_date_str[5:7])
+
+        on_s,on_e = _parse_mmdd_range_with_year(online_disp, ref_y, ref_m)
+        off_s, off_e = _parse_mmdd_range_with_year(offline_disp, ref_y, ref_m)
+        ad_s, ad_e = _parse_mmdd_range_with_year(admit_disp, ref_y, ref_m)
+        rs_s, rs_e = _parse_mmdd_range_with_year(result_disp, ref_y, ref_m)
+
+        items.append({
+            "회차": round_level,
+            "시험명":title,
+            "시험일": exam_date_str,
+            "온라인원서접수표시": online_disp,
+            "방문접수표시": offline_disp,
+            "수험표공고표시": admit_disp,
+            "성적공고표시": result_disp,
+            "examDate": exam_date_str,
+            "onlineRegisterStart": on_s, "onlineRegisterEnd": on_e,
+            "offlineRegisterStart": off_s, "offlineRegisterEnd": off_e,
+            "admitCardStart": ad_s, "admitCardEnd": ad_e,
+            "resultStart": rs_s, "resultEnd": rs_e,
+        })
+
+    return _schedule_result(items)
+
+def _schedule_result(items: list[dict]) -> dict:
+    # dedupe((날짜, 회차) 기준으로 덮어쓰기) + 시험일 오름차순
+    dedup = {}
+    for i in items:
+        dedup[(i["examDate"], i.get("회차"))] = i
+    items = sorted(dedup.values(), key=lambda x : x["examDate"])
+    return {"시험일정": {"정기검정일정": items}}
+
+
+# ───────────── 시험일정 (AJAX JSON) ─────────────
+# (표시 필드, 시작/끝 필드 접두어) — parse_schedule_html 의 열 순서
+_RANGES = (("온라인원서접수표시", "onlineRegister"), ("방문접수표시", "offlineRegister"),
+           ("수험표공고표시", "admitCard"), ("성적공고표시", "result"))
+SCHEDULE_FIELDS = ["시험명", "examDate"] + [d for d, _ in _RANGES] + \
+                  [f"{p}{se}" for _, p in _RANGES for se in ("Start", "End")]
+
+def parse_schedule_records(records: list[dict], fields: dict) -> dict:
+    """
+    AJAX 응답의 행(records) → parse_schedule_html 과 같은 구조.
+    fields: {출력 필드: JSON 키} (xhr_capture.learn_fields 로 학습). 시작/끝 날짜 키가 있으면 그대로 쓰고
+    (연도 추정 불필요, 표시 문자열이 없으면 화면 표기로 만듦), 없으면 표시 문자열에서 parse_schedule_html 과 같은 규칙으로 계산.
+    """
+    def _get(r, f):
+        k = fields.get(f)
+        v = r.get(k) if k else None
+        return None if v is None else re.sub(r"\s+", " ", str(v)).strip()
+
+    items = []
+    for r in records or []:
+        exam = xhr_capture.as_ymd(_get(r, "examDate"))
+        if not exam:
+            continue
+        title = _get(r, "시험명") or ""
+        m_round = ROUND_IN_TITLE_RE.search(title)
+        ref_y, ref_m = int(exam[:4]), int(exam[5:7])
+        item = {
+            "회차": f"제{m_round.group(1)}회" if m_round else None,
+            "시험명": title,
+            "시험일": exam,
+        }
+        dates = {}
+        for disp_f, pre in _RANGES:
+            disp = _get(r, disp_f)
+            s, e = xhr_capture.as_ymd(_get(r, pre + "Start")), xhr_capture.as_ymd(_get(r, pre + "End"))
+            if not (s and e):
+                s, e = _parse_mmdd_range_with_year(disp, ref_y, ref_m)
+            elif disp is None:
+                disp = f"{s[5:7]}.{s[8:10]} ~ {e[5:7]}.{e[8:10]}"    # 화면 표기(MM.DD ~ MM.DD)
+            item[disp_f] = disp
+            dates[pre + "Start"], dates[pre + "End"] = s, e
+        item["examDate"] = exam
+        item.update(dates)
+        items.append(item)
+    return _schedule_result(items)
+
+def _learn_schedule_endpoint(url: str, exchanges: list[dict], data: dict) -> bool:
+    """캡처한 XHR 중 DOM 결과(data)를 그대로 재현하는 JSON 응답을 찾아 엔드포인트로 저장."""
+    items = data["시험일정"]["정기검정일정"]
+    for x in exchanges:
+        records = xhr_capture.json_records(xhr_capture.parse_json(x.get("body")))
+        fields = xhr_capture.learn_fields(records, items, SCHEDULE_FIELDS, key="examDate")
+        if not fields or parse_schedule_records(records, fields) != data:
+            continue
+        xhr_capture.endpoints().put(url, {
+            "url": x["url"], "method": x.get("method"), "post_data": x.get("post_data"),
+            "content_type": x.get("content_type"), "referer": url, "fields": fields,
+        })
+        print(f"[xhr] {url}: schedule endpoint learned → {x['url']}")
+        return True
+    print(f"[xhr] {url}: no JSON response matched the schedule table ({len(exchanges)} captured)")
+    return False
+
+def _schedule_via_endpoint(url: str):
+    """학습된 엔드포인트로 시험일정만 HTTP 수집. 없거나 실패/빈 결과면 None (→ 브라우저)."""
+    ep = xhr_capture.usable(url)
+    if not ep:
+        return None
+    try:
+        data = parse_schedule_records(xhr_capture.json_records(xhr_capture.call(ep)), ep.get("fields") or {})
+    except Exception as e:
+        print(f"[WARN] kpc xhr {ep.get('url')}: {type(e).__name__}: {e} → browser")
+        return None
+    if not data["시험일정"]["정기검정일정"]:
+        print(f"[WARN] kpc xhr {ep.get('url')}: no rows → browser")
+        return None
+    print(f"[xhr] {url}: schedule via http")
+    return data
+
+
+# ───────────── 브라우저 ─────────────
+def click_tab(driver, text):
+    locs = [
+        (By.XPATH, f"//a[normalize-space(.)='{text}']"),
+        (By.XPATH, f"//a[contains(normalize-space(.),'{text}')]"),
+        (By.XPATH, f"//li[a[contains(normalize-space(.), '{text}')]]/a"),
+    ]
+    try:
+        el = waits.first_present(driver, locs, timeout=5)
+        waits.js_click(driver, el)
+        return True
+    except Exception:
+        return False
+#후보 XPATH들을 한 번의 대기(최대 5초)로 같이 확인해서 먼저 나타난 요소를 클릭 (동시에 있으면 앞 후보 우선)
+
+def fetch_schedule_table_html(driver, url: str, capture=None) -> str | None:
+    driver.set_window_size(1280,900)
+    driver.get(url)
+    if capture is not None:
+        capture.start()        # 탭 클릭/검색이 부르는 XHR 부터 기록
+
+    if not click_tab(driver, "시험일정"):
+        driver.get(url + "?pagekind=testSchedule")
+
+    try:
+        btn = waits.present(driver, (By.XPATH, "//button[contains(normalize-space(.), '검색')]"), timeout=5)
+        waits.js_click(driver, btn)
+    except Exception:
+        pass
+
+    waits.present(driver, (By.CSS_SELECTOR, "table#testScheduleList"), timeout=20)
+    waits.rows_stable(driver, "table#testScheduleList tbody tr", min_rows=1, timeout=5)
+
+    return driver.execute_script("""
+        const t = document.querySelector('#testScheduleList');
+        return t ? t.outerHTML : null;
+    """)
+#url 에 접속해서 시험일정 탭 → 검색 버튼 클릭 → 표 행이 더 늘지 않을 때까지 기다린 뒤 <table> html 반환
+
+def get_schedule(driver, url: str, with_grade: bool = True):
+    """자격증 exam_schedule runner 본체: 시험일정 표 + 시험안내 탭의 시험시간 표. 끝나면 시험안내 탭이 열려 있다."""
+    if driver is None:
+        return {"시험일정": {"정기검정일정": [], "시험시간": []}}
+
+    data = _schedule_via_endpoint(url)
+    if data is None:
+        capture = xhr_capture.Capture(driver) if xhr_capture.enabled() else None
+        try:
+            table_html = fetch_schedule_table_html(driver, url, capture)
+        finally:
+            exchanges = capture.exchanges() if capture is not None else []
+        if not table_html:
+           return {"시험일정": {"정기검정일정": [], "시험시간": []}}
+        data = parse_schedule_html(table_html)
+        if capture is not None and data["시험일정"]["정기검정일정"]:
+            _learn_schedule_endpoint(url, exchanges, data)
+    else:
+        driver.set_window_size(1280, 900)
+        driver.get(url)        # 시험안내 탭(시험시간)만 브라우저로
+
+    times = []
+    try:
+        if click_tab(driver, "시험안내"):
+            waits.header_present(driver, "시험시간", ("h3", "h4"), timeout=3)
+            # '시험시간' 제목 다음 표만 받음 (없으면 page_source 에서 헤더 조건으로 찾기)
+            table_html = dom_tables.table_html(driver, heading="시험시간")
+            times = (parse_exam_times_table(table_html, with_grade) if table_html
+                     else parse_exam_times_html(driver.page_source, with_grade))
+    except Exception:
+        times = []
+
+    data["시험일정"]["시험시간"] = times or []
+    return data
+
+
+# ───────────── 사이트 단위 수집 ─────────────
+def _module(t: dict):
+    return importlib.import_module(t["runner"].split(":")[0])
+
+def _runner(t: dict):
+    mod_name, attr = t["runner"].split(":")
+    return getattr(importlib.import_module(mod_name), attr)
+
+def crawl(driver, plan):
+    """
+    plan: {cert: [탭 설정, ...]} (cert_map 순서) → {cert: {탭 이름: raw}}
+    자격증마다 페이지 1회 방문: exam_schedule runner 가 시험안내 탭까지 연 상태에서
+    syllabus 모듈의 collect(driver) 로 이어서 시험과목 표를 읽는다(같은 URL 일 때만, 아니면 그 runner 그대로).
+    브라우저 탭만 처리한다 — 결과가 없는 탭은 run_once 가 탭별 runner 로 다시 수집.
+    """
+    out = {}
+    for cert, tabs in plan.items():
+        by_name = {t["name"]: t for t in tabs if (t.get("fetch") or "browser") == "browser"}
+        got = out.setdefault(cert, {})
+        es_t, syl_t = by_name.get("exam_schedule"), by_name.get("syllabus")
+        try:
+            if es_t:
+                got["exam_schedule"] = _runner(es_t)(driver)
+            if syl_t:
+                mod = _module(syl_t)
+                same_page = es_t is not None and getattr(mod, "URL", None) == getattr(_module(es_t), "URL", None)
+                if same_page and callable(getattr(mod, "collect", None)):
+                    got["syllabus"] = mod.collect(driver)
+                else:
+                    got["syllabus"] = _runner(syl_t)(driver)
+        except Exception as e:
+            print(f"[WARN] kpc/{cert}: {type(e).__name__}: {e}")
+    return out
@@ -20,20 +20,21 @@ LIST_ENDPOINT = f"{BASE}/crf005.do?id=crf00501s01"
 IMG_ACCEPT = "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Optional deps
+# Optional deps (selenium 은 --frame-mode selenium 일 때만 dump_frames_with_selenium 안에서 임포트)
 try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
+    from bs4 import BeautifulSoup
 except Exception:
-    webdriver = None
+    BeautifulSoup = None
 
 try:
-    from bs4 import BeautifulSoup
+    from engine_common import browser_profile   # 경량 Chrome 프로필 (루트에서 실행할 때)
 except Exception:
-    BeautifulSoup = None
+    browser_profile = None
+
+try:
+    from engine_common import snapshot_codec    # .zst(학습 사전) 저장 — 없으면 gzip 만
+except Exception:
+    snapshot_codec = None
 
 # ──────────────────────────────────────────────────────────────────────────────
 # IO utils
@@ -42,7 +43,11 @@ def save_text(path: Path, text: str):
     path.write_text(text, encoding="utf-8")
 
 def save_gz(path: Path, text: str):
+    """압축 저장 — 코덱은 확장자대로 (.zst 면 zstd, 그 외 gzip)."""
     path.parent.mkdir(parents=True, exist_ok=True)
+    if snapshot_codec is not None and path.suffix in snapshot_codec.SUFFIXES:
+        snapshot_codec.write_text(path, text)
+        return
     with gzip.open(path, "wb") as f:
         f.write(text.encode("utf-8"))
 
@@ -277,7 +282,13 @@ def fetch_tab_with_recovery(session: requests.Session, url: str, data: dict,
 # ──────────────────────────────────────────────────────────────────────────────
 # Selenium iframe dump (keeps into base_dir)
 def dump_frames_with_selenium(doc_url: str, base_dir: Path) -> int:
-    if webdriver is None:
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+    except Exception:
         print("[warn] selenium not installed; skip frames")
         return 0
 
@@ -285,8 +296,13 @@ def dump_frames_with_selenium(doc_url: str, base_dir: Path) -> int:
     opt.add_argument("--headless=new")
     opt.add_argument("--no-sandbox")
     opt.add_argument("--disable-gpu")
+    if browser_profile is not None:
+        browser_profile.configure(opt)
     driver = webdriver.Chrome(options=opt)
     try:
+        if browser_profile is not None:
+            # 프레임 HTML 만 저장하고 이미지는 download_and_rewrite_images 가 따로 받으므로 브라우저에서는 차단
+            browser_profile.apply(driver)
         driver.get(doc_url)
         try:
             WebDriverWait(driver, 5).until(
@@ -350,8 +366,10 @@ def run_one_jmcd(session: requests.Session, inst: str, jmcd: str,
         log_csv([time.strftime("%F %T"), inst, jmcd, "open", "error", str(e)], log_path)
         return
 
-    # 탭별 HTML 저장
-    for tab, (endpoint, div_code) in TABS.items():
+    # 탭별 HTML 저장 (--tabs 가 있으면 그 탭만: 재수집 계획이 바뀔 만한 탭만 다시 받음)
+    only = getattr(args, "tabs", None)
+    tabs = {t: v for t, v in TABS.items() if not only or t in only}
+    for tab, (endpoint, div_code) in tabs.items():
         url = f"{BASE}/crf005.do?id={endpoint}"
         data = {"id": endpoint, "gSite": "Q", "gId": "", "jmCd": jmcd, "jmInfoDivCcd": div_code}
         try:
@@ -374,7 +392,7 @@ def run_one_jmcd(session: requests.Session, inst: str, jmcd: str,
         _sleep()
 
     # HTML 내부 이미지 로컬화 + 경로 치환 (/img/<jmcd>/…)
-    for stem in ["basic_info", "exam_info", "preference"]:
+    for stem in tabs:
         p = base_dir / f"{stem}.html"
         if p.exists():
             download_and_rewrite_images(session, p, doc_url, jmcd, out_root)
@@ -391,6 +409,31 @@ def run_one_jmcd(session: requests.Session, inst: str, jmcd: str,
             print(f"[err] frames {inst}/{jmcd}: {e}")
             log_csv([time.strftime("%F %T"), inst, jmcd, "frames", "error", str(e)], log_path)
 
+def new_session(cookies: str | None = None, prewarm: bool = False) -> requests.Session:
+    s = requests.Session()
+    s.headers.update({"User-Agent": "Mozilla/5.0", "Accept": "text/html,*/*;q=0.01"})
+    if cookies:
+        load_cookies_from_file(s, cookies)
+    if prewarm:
+        prewarm_session(s)
+    return s
+
+def fetch_jmcd(jmcd: str, out: str = "data/chansol_api", inst: str = "R013", frame_mode: str = "off",
+               resume: bool = False, prewarm: bool = False, cookies: str | None = None,
+               session: requests.Session | None = None, tabs: List[str] | None = None) -> Path:
+    """
+    단일 jmCd 를 inst 후보들로 수집 (CLI 단일 모드와 같은 동작, engine_server 가 세션을 재사용해 호출).
+    tabs: 받을 탭 (None = 전체 TABS)
+    반환: <out>/<jmcd> 폴더
+    """
+    out_root = Path(out).resolve()
+    log_path = out_root / "_logs" / "fetch_log.csv"
+    s = session or new_session(cookies, prewarm)
+    opts = argparse.Namespace(prewarm=prewarm, cookies=cookies, tabs=tabs)
+    for i in [x.strip() for x in inst.split(",") if x.strip()]:
+        run_one_jmcd(s, i, jmcd, out_root, frame_mode, resume, log_path, opts)
+    return out_root / jmcd
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Main
 def main():
@@ -409,6 +452,8 @@ def main():
     ap.add_argument("--prewarm", action="store_true",
                 help="시작 시 세션 예열(프리워밍) 1회 수행")
     ap.add_argument("--cookies", help="Netscape 포맷 cookies.txt 경로 (WMONID/JSESSIONID 주입)")
+    ap.add_argument("--tabs", type=lambda v: [t.strip() for t in v.split(",") if t.strip()],
+                    help=f"받을 탭만 (쉼표구분, 기본 전체: {','.join(TABS)})")
     args = ap.parse_args()
 
     out_root = Path(args.out).resolve()
@@ -1,6 +1,5 @@
 # public_cert_api/normalizers/adapters/passrate_qnet.py
-from ..utils.text import clean
-from ..utils.tables import to_int
+from ..utils.tables import to_int, as_view
 import re
 from typing import List, Dict, Tuple
 
@@ -9,22 +8,22 @@ def parse_passrate_tables_qnet(tables: List[Dict]) -> Tuple[List[Dict], float]:
     for t in (tables or []):
         if not isinstance(t, dict):   # <<< 방어 코드
             continue
-        rows = t.get("rows") or []
+        t = as_view(t)
+        rows = t.cells
         if len(rows) < 3:
             continue
         # 2행 헤더 감지
         head2 = None
         for i in range(min(5, len(rows))):
-            h1 = "".join(clean(x) for x in rows[i])
-            h2 = "".join(clean(x) for x in rows[i+1]) if i+1 < len(rows) else ""
+            h1 = "".join(rows[i])
+            h2 = "".join(rows[i+1]) if i+1 < len(rows) else ""
             if ("필기" in h1 and "실기" in h1) and ("응시" in h2 and "합격" in h2):
                 head2 = i + 1
                 break
         if head2 is None:
             continue
 
-        for r in rows[head2+1:]:
-            cs = [clean(c) for c in r]
+        for cs in rows[head2+1:]:
             m = re.search(r"\b(\d{4})\b", cs[0] if cs else "")
             if not m:
                 continue
@@ -1,9 +1,6 @@
-from ..utils.text import clean
-from ..utils.tables import to_int
+from ..utils.tables import to_int, as_view
 import re
 from typing import List, Dict, Tuple
-import re
-from ..utils.text import clean as _c
 
 YEAR = re.compile(r"^(19|20)\d{2}$")
 
@@ -24,12 +21,13 @@ def parse_basicinfo_stats_table(tables: list[dict]) -> list[dict] | None:
     for t in tables or []:
         if not isinstance(t, dict):   # <<< 방어 코드
             continue
-        rows = t.get("rows") or []
+        t = as_view(t)
+        rows = t.cells
         if len(rows) < 3:
             continue
 
         # 헤더에서 연도 열 찾기
-        header = [_c(x) for x in rows[0]]
+        header = rows[0]
         years = []
         for j, h in enumerate(header):
             if YEAR.match(h):
@@ -45,8 +43,7 @@ def parse_basicinfo_stats_table(tables: list[dict]) -> list[dict] | None:
                    for _, y in years}
 
         current_stage = None  # 1 -> 필기, 2 -> 실기
-        for r in rows[1:]:
-            cells = [_c(c) for c in r]
+        for cells in rows[1:]:
             if not any(cells):
                 continue
 
@@ -94,9 +91,10 @@ def parse_stage_year_matrix(tables: List[Dict]) -> Tuple[List[Dict], float]:
     for t in tables or []:
         if not isinstance(t, dict):   # <<< 방어 코드
             continue
-        rows = t.get("rows") or []
+        t = as_view(t)
+        rows = t.cells
         if len(rows) < 3: continue
-        head = [clean(c) for c in rows[0]]
+        head = rows[0]
         years = []
         for c in head:
             m = re.fullmatch(r"\s*(\d{4})\s*", c or "")
@@ -104,8 +102,7 @@ def parse_stage_year_matrix(tables: List[Dict]) -> Tuple[List[Dict], float]:
         if len(years) < 3: continue  # 연도형 헤더가 아니면 skip
 
         # 본문에서 1차/2차 블록 추출
-        for r in rows[1:]:
-            cs = [clean(c) for c in r]
+        for cs in rows[1:]:
             if not cs: continue
             stage = cs[0] if any(k in cs[0] for k in STAGE_KEYS) else None
             if not stage: continue
@@ -1,4 +1,10 @@
+import hashlib
+from pathlib import Path
+from time import perf_counter
 from typing import List, Dict, Tuple, Callable
+from ..utils.tables import table_sig
+from ..utils.plan_cache import PlanCache, fingerprint
+from ..utils.rule_profile import RULE_PROFILE, declare, record
 from .passrate_qnet import parse_passrate_tables_qnet
 from .passrate_stage_year import parse_basicinfo_stats_table
 
@@ -8,6 +14,54 @@ ADAPTERS: list[tuple[str, Callable]] = [
     ("qnet_twoheader",        parse_passrate_tables_qnet),
 ]
 
+# 표 묶음 시그니처 → 매칭된 어댑터 이름 캐시 (먼저 시도할 순서 힌트)
+# table_sig 는 숫자/-/% 를 같은 토큰으로 가리므로 값이 빈 표('-')와 채워진 표가 같은 시그니처 →
+# 같은 시그니처라도 앞 어댑터가 이번 표에는 매칭될 수 있다. 그래서 힌트는 첫 어댑터일 때만 쓰고
+# (ADAPTERS 순서의 첫 매칭 = 원래 결과 유지), "매칭 없음"은 캐시하지 않으며, 빗나가면 전체 어댑터를 다시 돈다.
+# 어댑터 목록/코드가 바뀌면 버전 키가 달라져 자동 무효화된다.
+_HERE = Path(__file__).resolve().parent
+_PLANS = PlanCache("adapters", fingerprint(
+    [_HERE / "registry.py", _HERE / "passrate_qnet.py", _HERE / "passrate_stage_year.py"],
+    extra=",".join(n for n, _ in ADAPTERS),
+))
+declare("adapters", (n for n, _ in ADAPTERS), ordered=True)
+_SIG_TOP = 6  # qnet_twoheader 가 2행 헤더를 찾는 범위(상위 5행+1)까지 포함
+
+def _tables_sig(tables: List[Dict]) -> str:
+    raw = "\n".join(table_sig(t["rows"], top=_SIG_TOP) for t in tables)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def _try_adapter(name: str, fn: Callable, tables: List[Dict]):
+    """어댑터 1개 실행 → (rows, meta) 또는 None."""
+    if RULE_PROFILE:
+        t0 = perf_counter()
+        hit = _run_adapter(name, fn, tables)
+        record("adapters", name, hit is not None, perf_counter() - t0)
+        return hit
+    return _run_adapter(name, fn, tables)
+
+def _run_adapter(name: str, fn: Callable, tables: List[Dict]):
+    try:
+        r = fn(tables)
+    except Exception as e:
+        # 어댑터 내부 에러는 삼키고 다음 어댑터로 진행
+        # (필요하면 로깅 추가)
+        return None
+
+    if not r:
+        return None
+
+    if isinstance(r, tuple):
+        rows, score = r
+        rows = rows or []
+        if rows:
+            return rows, {"confidence": float(score or 0.0), "source": name}
+    else:
+        rows = r or []
+        if rows:
+            return rows, {"confidence": 0.7, "source": name}
+    return None
+
 def _coerce_tables(x) -> List[Dict]:
     """
     어떤 형태가 오더라도 어댑터에 전달 가능한 List[Dict]('rows' 키 보유)만 반환.
@@ -43,28 +97,28 @@ def run(bi_tables: List[Dict] | None, ex_tables: List[Dict] | None
     if not tables:  # 전달할 표가 없으면 즉시 종료
         return [], adapters_used, {"confidence": 0.0, "source": None}
 
-    for name, fn in ADAPTERS:
-        try:
-            r = fn(tables)
-        except Exception as e:
-            # 어댑터 내부 에러는 삼키고 다음 어댑터로 진행
-            # (필요하면 로깅 추가)
-            continue
+    sig = _tables_sig(tables)
+    # 프로파일 중에는 어댑터 순서대로 전부 평가되도록 캐시를 보지 않는다
+    known = None if RULE_PROFILE else _PLANS.get(sig)
 
-        if not r:
-            continue
+    first, first_fn = ADAPTERS[0]
+    tried = None
+    if known == first:
+        tried = first
+        hit = _try_adapter(first, first_fn, tables)
+        if hit:
+            adapters_used.append(first)
+            return hit[0], adapters_used, hit[1]
 
-        if isinstance(r, tuple):
-            rows, score = r
-            rows = rows or []
-            if rows:
-                adapters_used.append(name)
-                return rows, adapters_used, {"confidence": float(score or 0.0), "source": name}
-        else:
-            rows = r or []
-            if rows:
-                adapters_used.append(name)
-                return rows, adapters_used, {"confidence": 0.7, "source": name}
+    for name, fn in ADAPTERS:
+        if name == tried:
+            continue  # 위에서 이미 시도
+        hit = _try_adapter(name, fn, tables)
+        if hit:
+            adapters_used.append(name)
+            if name == first:  # 뒤 어댑터는 힌트로 쓰지 않으므로 저장하지 않음
+                _PLANS.put(sig, name)
+            return hit[0], adapters_used, hit[1]
 
-    # 아무 어댑터도 매칭 실패
+    # 아무 어댑터도 매칭 실패 (캐시에 남기지 않음 — 같은 시그니처라도 다음 표는 값이 있을 수 있음)
     return [], adapters_used, {"confidence": 0.0, "source": None}
@@ -0,0 +1,51 @@
+# public_cert_api/normalizers/utils/config_cache.py
+"""
+헤더/규칙 YAML 파싱 결과의 디스크 캐시 (YAML 내용 해시 키).
+
+jmcd 마다 새 프로세스(parse/normalize)가 뜨는 배치에서는 매번 yaml 임포트 + safe_load 를 다시 한다.
+파싱 결과(순수 dict/list)를 <data>/_cache/config/<파일명>-<내용 해시>.json 에 두고,
+같은 내용이면 yaml 을 임포트하지 않고 JSON 으로 읽는다. YAML 을 고치면 해시가 바뀌어 자동으로 다시 파싱.
+정규식 컴파일은 각 로더가 처음 쓸 때 한 번(프로세스 안 메모이즈)만 한다.
+
+환경변수
+  CONFIG_CACHE=0         → 캐시 비활성(매번 YAML 파싱)
+  CONFIG_CACHE_DIR=...   → 저장 폴더 (기본: <CERT_DATA_DIR|Engine/data>/_cache/config)
+"""
+from __future__ import annotations
+import json, os
+from pathlib import Path
+from typing import Any
+
+from .plan_cache import data_root, fingerprint
+
+ENABLED = os.environ.get("CONFIG_CACHE", "1") != "0"
+
+
+def _cache_dir() -> Path:
+    p = os.getenv("CONFIG_CACHE_DIR")
+    return Path(p) if p else data_root() / "_cache" / "config"
+
+
+def load_yaml(path) -> Any:
+    """YAML 파일 → 파싱 결과 (같은 내용이면 디스크 캐시에서)."""
+    path = Path(path)
+    cached = _cache_dir() / f"{path.stem}-{fingerprint([path])}.json" if ENABLED else None
+    if cached is not None:
+        try:
+            with open(cached, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    import yaml                 # 캐시가 없을 때만
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    if cached is not None:
+        try:
+            text = json.dumps(data, ensure_ascii=False)
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, cached)
+        except (OSError, TypeError, ValueError) as e:     # 날짜 등 JSON 으로 못 담는 값 → 캐시 없이
+            print(f"[WARN] config cache save failed: {cached} ({e})")
+    return data
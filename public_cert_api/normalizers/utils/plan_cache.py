@@ -0,0 +1,158 @@
+# public_cert_api/normalizers/utils/plan_cache.py
+"""
+표 시그니처 → 해석 계획(plan) 캐시.
+
+- 같은 헤더 모양의 표가 수천 번 반복되므로, 헤더 분류/어댑터 탐색 결과를
+  시그니처 단위로 한 번만 계산하고 재사용한다.
+- 네임스페이스마다 버전 키(설정 YAML/어댑터 코드의 해시)를 갖고,
+  버전이 바뀌면 해당 네임스페이스의 plan 은 통째로 버린다.
+- 디스크(JSON)에 저장해 프로세스(jmcd 단위 subprocess) 간에 재사용.
+
+환경변수
+  PLAN_CACHE=0          → 캐시 비활성(매번 계산)
+  PLAN_CACHE_PATH=...   → 저장 파일 경로 (기본: <CERT_DATA_DIR|Engine/data>/_cache/plan_cache.json)
+"""
+from __future__ import annotations
+import atexit, hashlib, json, os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+ENABLED = os.environ.get("PLAN_CACHE", "1") != "0"
+
+# .../Engine/public_cert_api/normalizers/utils/plan_cache.py → parents[3] = .../Engine
+_BASE_DIR = Path(__file__).resolve().parents[3]
+
+_MISS = object()
+
+
+def data_root() -> Path:
+    """public_cert_api.paths.get_data_root 와 같은 규칙(임포트 부작용 없이)."""
+    root = os.getenv("CERT_DATA_DIR")
+    return Path(root) if root else _BASE_DIR / "data"
+
+
+def _default_path() -> Path:
+    p = os.getenv("PLAN_CACHE_PATH")
+    if p:
+        return Path(p)
+    return data_root() / "_cache" / "plan_cache.json"
+
+
+def fingerprint(paths: Iterable[Path], extra: str = "") -> str:
+    """파일 내용(+부가 문자열) 기반 버전 키. 파일이 없으면 이름만 반영."""
+    h = hashlib.sha1(extra.encode("utf-8"))
+    for p in paths:
+        h.update(str(Path(p).name).encode("utf-8"))
+        try:
+            h.update(Path(p).read_bytes())
+        except OSError:
+            pass
+    return h.hexdigest()[:16]
+
+
+class _Store:
+    """모든 네임스페이스를 하나의 JSON 파일에 보관. 종료 시 변경분만 병합 저장."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.spaces: Dict[str, Dict[str, Any]] = {}
+        self.dirty: set[str] = set()
+        self._loaded = False
+
+    def _read_file(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def space(self, name: str, version: str) -> Dict[str, Any]:
+        if not self._loaded:
+            self.spaces = self._read_file()
+            self._loaded = True
+        sp = self.spaces.get(name)
+        if not isinstance(sp, dict) or sp.get("version") != version:
+            sp = {"version": version, "plans": {}}
+            self.spaces[name] = sp
+        return sp["plans"]
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        # 다른 프로세스가 그 사이 저장한 내용과 병합(같은 버전이면 plan 합치기)
+        disk = self._read_file()
+        for name in self.dirty:
+            mine = self.spaces.get(name) or {}
+            theirs = disk.get(name)
+            if isinstance(theirs, dict) and theirs.get("version") == mine.get("version"):
+                merged = dict(theirs.get("plans") or {})
+                merged.update(mine.get("plans") or {})
+                disk[name] = {"version": mine.get("version"), "plans": merged}
+            else:
+                disk[name] = mine
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(disk, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self.dirty.clear()
+        except OSError as e:
+            print(f"[WARN] plan cache save failed: {self.path} ({e})")
+
+
+_STORE: Optional[_Store] = None
+
+
+def _store() -> _Store:
+    global _STORE
+    if _STORE is None:
+        _STORE = _Store(_default_path())
+        atexit.register(_STORE.save)
+    return _STORE
+
+
+class PlanCache:
+    """
+    네임스페이스 단위 plan 캐시.
+      cache = PlanCache("schedule", version)
+      plan = cache.get(sig)          # 없으면 None
+      cache.put(sig, plan)           # plan 은 JSON 직렬화 가능한 값
+    음성 결과도 저장할 수 있도록 get(sig, default) 로 '없음'과 구분 가능.
+    """
+
+    def __init__(self, name: str, version: str):
+        self.name = name
+        self.version = version
+        self._plans: Optional[Dict[str, Any]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _p(self) -> Dict[str, Any]:
+        if self._plans is None:
+            self._plans = _store().space(self.name, self.version) if ENABLED else {}
+        return self._plans
+
+    def get(self, sig: str, default: Any = None) -> Any:
+        v = self._p().get(sig, _MISS)
+        if v is _MISS:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return v
+
+    def put(self, sig: str, plan: Any) -> None:
+        if not ENABLED:
+            return
+        self._p()[sig] = plan
+        _store().dirty.add(self.name)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._p())}
+
+
+def flush() -> None:
+    """명시적 저장(기본은 프로세스 종료 시 atexit 로 저장)."""
+    if _STORE is not None:
+        _STORE.save()
@@ -0,0 +1,192 @@
+# public_cert_api/normalizers/utils/rule_profile.py
+"""
+규칙 적중 프로파일러 (opt-in).
+
+휴리스틱 규칙(YAML 헤더 토큰, 배너 규칙, outlook 통계 신호, 라벨 추정 정규식,
+SEC_MAP 토큰, 어댑터 순서 등)이 실제로 얼마나 평가/적중되고 시간을 얼마나 쓰는지 집계한다.
+
+  RULE_PROFILE=1                 → 활성화(기본 비활성: 호출부는 `if RULE_PROFILE:` 한 번만 검사)
+  RULE_PROFILE_OUT=path.json     → 누적 리포트 경로 (기본: <data>/_logs/rule_profile.json)
+
+jmcd 마다 subprocess 로 도는 배치에서도 종료 시 기존 파일에 합산 저장되므로,
+코퍼스 전체 실행 후 리포트 하나로 보면 된다.
+
+  python -m public_cert_api.normalizers.utils.rule_profile [path]   → 요약 출력
+
+리포트 항목
+  dead    : 선언(declare)됐지만 한 번도 적중하지 않은 규칙/설정 항목
+  hot     : 적중 수 / 누적 시간 상위 규칙
+  reorder : 첫 적중에서 멈추는 체인(ordered 그룹) 중, 적중률/비용 순으로 재배치하면
+            더 빨리 단락되는 그룹. (규칙끼리 겹치면 결과가 바뀔 수 있으니 적용 전 확인)
+"""
+from __future__ import annotations
+import atexit, json, os, sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterable, List
+
+from .plan_cache import data_root
+
+RULE_PROFILE = os.environ.get("RULE_PROFILE") == "1"
+
+# group -> {"ordered": bool, "order": [rule...], "rules": {rule: [evals, hits, seconds]}}
+_GROUPS: Dict[str, Dict[str, Any]] = {}
+
+
+def _group(name: str) -> Dict[str, Any]:
+    g = _GROUPS.get(name)
+    if g is None:
+        g = _GROUPS[name] = {"ordered": False, "order": [], "rules": {}}
+    return g
+
+
+def declare(group: str, rules: Iterable[str], ordered: bool = False) -> None:
+    """그룹의 전체 규칙 목록(평가 순서)을 등록 → 한 번도 안 맞은 규칙을 dead 로 잡기 위함."""
+    if not RULE_PROFILE:
+        return
+    g = _group(group)
+    g["ordered"] = g["ordered"] or ordered
+    for r in rules:
+        r = str(r)
+        if r not in g["rules"]:
+            g["rules"][r] = [0, 0, 0.0]
+            g["order"].append(r)
+
+
+def record(group: str, rule: str, hit: bool, seconds: float = 0.0) -> None:
+    g = _group(group)
+    st = g["rules"].get(rule)
+    if st is None:
+        st = g["rules"][rule] = [0, 0, 0.0]
+        g["order"].append(rule)
+    st[0] += 1
+    if hit:
+        st[1] += 1
+    st[2] += seconds
+
+
+def search(group: str, rule: str, rx, s: str):
+    """rx.search(s) 를 실행하면서 평가/적중/시간을 기록."""
+    t0 = perf_counter()
+    m = rx.search(s) if rx is not None else None
+    record(group, rule, m is not None, perf_counter() - t0)
+    return m
+
+
+def match(group: str, rule: str, rx, s: str):
+    t0 = perf_counter()
+    m = rx.match(s) if rx is not None else None
+    record(group, rule, m is not None, perf_counter() - t0)
+    return m
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 저장/리포트
+# ──────────────────────────────────────────────────────────────────────────────
+def _out_path() -> Path:
+    p = os.getenv("RULE_PROFILE_OUT")
+    return Path(p) if p else data_root() / "_logs" / "rule_profile.json"
+
+
+def _merge(disk: Dict[str, Any]) -> Dict[str, Any]:
+    groups = dict(disk.get("groups") or {})
+    for name, g in _GROUPS.items():
+        dst = groups.get(name) or {"ordered": False, "order": [], "rules": {}}
+        dst["ordered"] = bool(dst.get("ordered")) or g["ordered"]
+        order = list(dst.get("order") or [])
+        rules = dict(dst.get("rules") or {})
+        for r in g["order"]:
+            ev, hit, sec = g["rules"][r]
+            cur = rules.get(r) or {"evals": 0, "hits": 0, "time_ms": 0.0}
+            rules[r] = {
+                "evals": cur["evals"] + ev,
+                "hits": cur["hits"] + hit,
+                "time_ms": round(cur["time_ms"] + sec * 1000.0, 4),
+            }
+            if r not in order:
+                order.append(r)
+        groups[name] = {"ordered": dst["ordered"], "order": order, "rules": rules}
+    return {"runs": int(disk.get("runs") or 0) + 1, "groups": groups}
+
+
+def analyze(data: Dict[str, Any], top: int = 20) -> Dict[str, Any]:
+    """누적 데이터 → dead/hot/reorder 요약."""
+    dead: List[str] = []
+    flat: List[Dict[str, Any]] = []
+    reorder: List[Dict[str, Any]] = []
+    for name, g in (data.get("groups") or {}).items():
+        rules = g.get("rules") or {}
+        order = [r for r in (g.get("order") or []) if r in rules]
+        for r in order:
+            st = rules[r]
+            flat.append({"rule": f"{name}/{r}", **st})
+            if st["hits"] == 0:
+                dead.append(f"{name}/{r}")
+        if not g.get("ordered"):
+            continue
+        # 체인: 적중 확률/평가 비용이 큰 규칙이 앞에 올수록 평균 평가 수가 준다.
+        def score(r):
+            st = rules[r]
+            if not st["evals"]:
+                return 0.0
+            p = st["hits"] / st["evals"]
+            cost = (st["time_ms"] / st["evals"]) or 1e-6
+            return p / cost
+        live = [r for r in order if rules[r]["evals"]]
+        suggested = sorted(live, key=score, reverse=True)
+        if suggested != live:
+            reorder.append({"group": name, "current": live, "suggested": suggested})
+    hot_hits = sorted(flat, key=lambda x: x["hits"], reverse=True)[:top]
+    hot_time = sorted(flat, key=lambda x: x["time_ms"], reverse=True)[:top]
+    return {"dead": dead, "hot_by_hits": hot_hits, "hot_by_time": hot_time, "reorder": reorder}
+
+
+def save() -> None:
+    if not _GROUPS:
+        return
+    path = _out_path()
+    try:
+        disk = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    except (OSError, ValueError):
+        disk = {}
+    data = _merge(disk)
+    data["report"] = analyze(data)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        _GROUPS.clear()
+    except OSError as e:
+        print(f"[WARN] rule profile save failed: {path} ({e})")
+
+
+if RULE_PROFILE:
+    atexit.register(save)
+
+
+def _main(argv: List[str]) -> int:
+    path = Path(argv[0]) if argv else _out_path()
+    if not path.exists():
+        print(f"[rule-profile] not found: {path}")
+        return 1
+    data = json.loads(path.read_text(encoding="utf-8"))
+    rep = analyze(data, top=10)
+    print(f"[rule-profile] {path} runs={data.get('runs')}")
+    print(f"  dead ({len(rep['dead'])}):")
+    for r in rep["dead"]:
+        print("   -", r)
+    print("  hot by hits:")
+    for x in rep["hot_by_hits"]:
+        print(f"   {x['hits']:>8} / {x['evals']:<8} {x['time_ms']:>10.2f}ms  {x['rule']}")
+    print("  hot by time:")
+    for x in rep["hot_by_time"]:
+        print(f"   {x['time_ms']:>10.2f}ms  {x['hits']:>8} / {x['evals']:<8} {x['rule']}")
+    print("  reorder candidates:")
+    for x in rep["reorder"]:
+        print(f"   {x['group']}: {x['current']} -> {x['suggested']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -2,10 +2,87 @@ from .text import clean, norm_for_cmp
 import re
 
 def table_sig(rows: list[list[str]], top=3) -> str:
-    head = [" ".join(rows[i]) if i < len(rows) else "" for i in range(min(top, len(rows)))]
-    return " | ".join(norm_for_cmp(" ".join(head)))
+    head = [" ".join(str(c) for c in rows[i]) for i in range(min(top, len(rows)))]
+    return " | ".join(norm_for_cmp(h) for h in head)
+
+def header_sig(cells: list[str]) -> str:
+    """헤더 행 그대로의 시그니처(공백 제거). '1차/2차'처럼 숫자가 의미를 갖는 헤더용."""
+    return "\x1f".join(clean(str(c)).replace(" ", "") for c in (cells or []))
 
 def to_int(s: str | None) -> int | None:
     if not s: return None
     v = re.sub(r"[^\d]", "", s)
     return int(v) if v else None
+
+
+# ── 정제 결과 공유용 표 뷰 ─────────────────────────────────────────────────────
+def _cell(c) -> str:
+    if c is None: return ""
+    return clean(c if isinstance(c, str) else str(c))
+
+class TableView(dict):
+    """
+    파서가 만든 표 dict(rows/caption/index ...)를 그대로 담고,
+    정제 셀/헤더/flat 문자열/키워드 여부를 처음 요청될 때 한 번만 계산해 보관한다.
+    dict 하위 클래스라서 t.get("rows"), `tb in list`, JSON 직렬화는 원본과 동일하게 동작.
+    """
+    __slots__ = ("_cells", "_header_norm", "_flat", "_row_texts", "_bits")
+
+    def __init__(self, src=None):
+        super().__init__(src or {})
+        self._cells = None
+        self._header_norm = None
+        self._flat = None
+        self._row_texts = None
+        self._bits = {}
+
+    @property
+    def cells(self) -> list[list[str]]:
+        """clean() 된 셀 행렬(행이 None 이면 빈 행)."""
+        if self._cells is None:
+            self._cells = [[_cell(c) for c in (r or [])] for r in (self.get("rows") or [])]
+        return self._cells
+
+    @property
+    def header(self) -> list[str]:
+        cs = self.cells
+        return cs[0] if cs else []
+
+    @property
+    def header_norm(self) -> list[str]:
+        """공백 제거한 헤더(exam_schedule.norm 과 동일 규칙)."""
+        if self._header_norm is None:
+            self._header_norm = [h.replace(" ", "") for h in self.header]
+        return self._header_norm
+
+    @property
+    def row_texts(self) -> list[str]:
+        """행별 ' '.join(cells)."""
+        if self._row_texts is None:
+            self._row_texts = [" ".join(r) for r in self.cells]
+        return self._row_texts
+
+    @property
+    def flat(self) -> str:
+        """표 전체를 공백으로 이은 문자열(키워드 판별용)."""
+        if self._flat is None:
+            self._flat = " ".join(self.row_texts)
+        return self._flat
+
+    def has(self, word: str) -> bool:
+        """flat 에 word 가 있는지(결과 캐시)."""
+        b = self._bits.get(word)
+        if b is None:
+            b = self._bits[word] = word in self.flat
+        return b
+
+    def has_any(self, words) -> bool:
+        return any(self.has(w) for w in words)
+
+
+def as_view(t) -> TableView:
+    return t if isinstance(t, TableView) else TableView(t)
+
+def as_views(tables) -> list[TableView]:
+    """dict 인 표만 TableView 로 감싼다(그 외 타입은 그대로 둬서 기존 방어 코드가 걸러내게 함)."""
+    return [as_view(t) if isinstance(t, dict) else t for t in (tables or [])]
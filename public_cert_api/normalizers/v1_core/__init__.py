@@ -1,2 +1,11 @@
 # public_cert_api/normalizers/v1_core/__init__.py
-from .build import build_norm  # 외부에서 호출하는 단일 진입점만 노출
+# 외부에서 호출하는 단일 진입점만 노출 — parse_tabs_min 처럼 support 설정만 쓰는 쪽이
+# 정규화 모듈 전체를 임포트하지 않도록 처음 접근할 때 로드
+__all__ = ["build_norm"]
+
+
+def __getattr__(name):
+    if name == "build_norm":
+        from .build import build_norm
+        return build_norm
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
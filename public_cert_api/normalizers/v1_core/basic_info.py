@@ -15,6 +15,7 @@ from typing import Dict, List, Tuple, Optional
 
 from ..utils.text import clean, first_long
 from ..utils.regexes import norm_date
+from ..utils.tables import as_view
 from .support.basic_info_config_loader import extract_basic_sections, load_basic_info_cfg
 
 # ── 기본 라벨(파이썬 상수) ────────────────────────────────────────────────────
@@ -266,11 +267,10 @@ def _extract_agency(blob: str, lines: List[str],
 def _parse_history_tables_fallback(tables: List[Dict]) -> List[Dict]:
     out: List[Dict] = []
     for tb in tables or []:
-        rows = tb.get("rows") or []
+        rows = as_view(tb).cells
         if len(rows) < 2:
             continue
-        top = [clean(c) for c in rows[0]]
-        bot = [clean(c) for c in rows[1]]
+        top, bot = rows[0], rows[1]
 
         if not any("대통령령" in x or "현재" in x or re.search(r"\d{4}\.", x) for x in top):
             continue
@@ -6,6 +6,8 @@ from .exam_info import extract_fees, extract_sections
 from .preference import parse_preference
 from ..adapters import run as run_adapters
 from ..utils.text import clean
+from ..utils.tables import as_views
+from ..utils.rule_profile import RULE_PROFILE, declare, search as rp_search
 from .support.basic_info_config_loader import augment_paras_with_virtual_sections
 
 import re
@@ -26,6 +28,12 @@ _OUTLOOK_STATS_SIGNALS = (
     re.compile(r"(필기|실기).*(응시|합격|합격률)"),
 )
 _OUTLOOK_TERM_RX = re.compile(r"[\.!?…]|[다요]\s*$")  # 문장 종결
+declare("build.outlook_stats", (rx.pattern for rx in _OUTLOOK_STATS_SIGNALS), ordered=True)
+
+def _outlook_stats_hit(t: str) -> bool:
+    if RULE_PROFILE:
+        return any(rp_search("build.outlook_stats", rx.pattern, rx, t) for rx in _OUTLOOK_STATS_SIGNALS)
+    return any(rx.search(t) for rx in _OUTLOOK_STATS_SIGNALS)
 
 def patch_outlook_safely(txt: str | None, max_chars: int = 4000) -> str | None:
     if not txt:
@@ -38,7 +46,7 @@ def patch_outlook_safely(txt: str | None, max_chars: int = 4000) -> str | None:
         if _OUTLOOK_URL_RX.search(t) or _OUTLOOK_DROP_HEAD_RX.search(t):
             # URL/기관 라벨 라인은 버림
             continue
-        if any(rx.search(t) for rx in _OUTLOOK_STATS_SIGNALS):
+        if _outlook_stats_hit(t):
             # 표/통계 신호를 만나면 바로 본문 수집은 중지하고,
             # 문장 종결이 나올 때까지만 이어서 받고 컷
             cut_pending = True
@@ -164,19 +172,18 @@ def _append_legacy_band_and_total(pass_rows: list[dict], bi_tables: list[dict])
     if not bi_tables:
         return pass_rows
     rows = []
-    for tb in bi_tables:
-        r = tb.get("rows") or []
+    for tb in as_views(bi_tables):
+        r = tb.cells
         if len(r) < 2:
             continue
-        head = " ".join(clean(c) for c in r[0])
+        head = tb.row_texts[0]
         if not ("필기" in head and "실기" in head):
             continue
         rows = r[1:]
         break
     if not rows:
         return pass_rows
-    def to_item(cells: list[str]) -> dict | None:
-        cs = [clean(x) for x in cells]
+    def to_item(cs: list[str]) -> dict | None:
         if not cs:
             return None
         y = cs[0]
@@ -249,9 +256,10 @@ def build_norm(raw: dict, jmcd: str, name: str | None, type_str: str | None, iss
     ex_paras = ex.get("paragraphs") or []
     pr_paras = pr.get("paragraphs") or []
 
-    bi_tables = bi.get("tables") or []
-    ex_tables = ex.get("tables") or []
-    pr_tables = pr.get("tables") or []
+    # 표는 여기서 한 번만 TableView 로 감싸 정제 결과를 모든 소비자가 공유
+    bi_tables = as_views(bi.get("tables"))
+    ex_tables = as_views(ex.get("tables"))
+    pr_tables = as_views(pr.get("tables"))
     ex_links  = ex.get("links") or []
 
     # ==== 라벨 RX (outlook 보강용 판단에만 사용)
@@ -103,7 +103,7 @@ def build_norm_with_trace(raw: dict, jmcd: str,
     trace = {
         "jmcd": jmcd,
         "timestamp": now_iso(),
-        "source_files": {
+        "source_files": {    # run_public 이 실제 남은 파일 이름(.html/.zst/.gz)으로 덮어씀
             "basic_info_html": "basic_info.html.gz",
             "exam_info_html": "exam_info.html.gz",
             "preference_html": "preference.html.gz",
@@ -3,12 +3,15 @@ from __future__ import annotations
 import re
 from typing import List, Dict
 from ..utils.text import clean, dedupe_keep_order
+from ..utils.tables import as_view
+from ..utils.rule_profile import RULE_PROFILE, declare, match as rp_match
 from .support.exam_info_config_loader import load_exam_info_config
 
 __all__ = ["extract_fees", "extract_sections"]
 
 # YAML 설정 수신
 FEE_KEYS, WRIT_KEYS, PRACT_KEYS, TIP_KEYS, SEC_TITLES, NXT_TITLES, SEC_MAP = load_exam_info_config()
+declare("exam_info.sec_heading", SEC_MAP.keys(), ordered=True)
 
 _BULLET = r"[·•○\-\u25CF\u25E6\u2022]"  # 글머리표 후보
 
@@ -35,12 +38,12 @@ def extract_fees(paras: List[str], tables: List[Dict]) -> Dict | str:
 
     # ── 1) 표 우선
     for t in tables or []:
-        rows = [[clean(c) for c in (r or [])] for r in (t.get("rows") or [])]
+        t = as_view(t)
+        rows = t.cells
         if not rows:
             continue
         head = rows[0]
-        flat = " ".join(" ".join(r) for r in rows)
-        has_fee_word = any(k in flat for k in FEE_KEYS)
+        has_fee_word = t.has_any(FEE_KEYS)
         has_w = any(any(w in h for w in WRIT_KEYS) for h in head)
         has_p = any(any(p in h for p in PRACT_KEYS) for h in head)
         if not (has_fee_word or (has_w and has_p)):
@@ -115,7 +118,7 @@ def extract_sections(paras: List[str], link_texts: List[str] | None = None) -> D
     heading_at: Dict[int, str] = {}
     for i, s in enumerate(P):
         for name, rx in compiled.items():
-            if rx.match(s):
+            if (rp_match("exam_info.sec_heading", name, rx, s) if RULE_PROFILE else rx.match(s)):
                 heading_at[i] = name
                 break
 
@@ -1,14 +1,26 @@
 # normalizers/v1_core/exam_schedule.py
 from __future__ import annotations
 import os, re
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from ..utils.text import clean
+from ..utils.tables import header_sig, as_view
+from ..utils.plan_cache import PlanCache, fingerprint
+from ..utils.rule_profile import RULE_PROFILE, record as rp_record, search as rp_search
 from .support.config_loader import load_schedule_config, classify_from_yaml
+# 날짜 패턴/정리는 engine_common 날짜 엔진과 공유 (사설 정규화기와 같은 규칙·메모 캐시)
+from engine_common.utils_date import DATE_ANY, DATE_RANGE, DATE_SINGLE, coalesce_dotted as _coalesce_date_field
 
 ES_DEBUG = os.environ.get("ES_DEBUG") == "1"
 
-# ── 설정 로드 ─────────────────────────────────────────────────────────────────
-ROW_PHASE_RX, RX, BANNERS = load_schedule_config()
+# ── 설정: load_schedule_config() 가 처음 쓸 때 읽고 메모이즈 → (ROW_PHASE_RX, RX, BANNERS) ──
+# 헤더 시그니처 → 열 계획 캐시 (schedule_headers.yaml 또는 이 모듈이 바뀌면 무효화)
+_PLANS = PlanCache("schedule", fingerprint([
+    Path(__file__).resolve().parent / "configs" / "schedule_headers.yaml",
+    Path(__file__).resolve().parent / "support" / "config_loader.py",
+    Path(__file__).resolve(),
+]))
+_LIVE: Dict[str, Optional[Dict]] = {}   # 프로세스 내 변환 완료본
 
 # ── 상수/정규식 ───────────────────────────────────────────────────────────────
 KNUM = {"一":1,"二":2,"三":3,"四":4,"五":5,"六":6,"七":7,"八":8,"九":9,"十":10}
@@ -21,10 +33,6 @@ ROUND_FROM_WORDY = re.compile(
 ROUND_TOKEN  = re.compile(r"(상시)|(?:제?\s*([0-9一二三四五六七八九十Ⅰ-Ⅻ]+)\s*(?:회|회차|차))", re.I)
 CHASU_TOKEN  = re.compile(r"(?:^|[^0-9一二三四五六七八九十Ⅰ-Ⅻ])([0-9一二三四五六七八九十Ⅰ-Ⅻ]+)\s*차", re.I)
 
-DATE_ANY     = re.compile(r"\d{4}\.\d{1,2}\.\d{1,2}")
-DATE_RANGE   = re.compile(r"\d{4}\.\d{2}\.\d{2}\s*[~\-]\s*\d{4}\.\d{2}\.\d{2}")
-DATE_SINGLE  = re.compile(r"\d{4}\.\d{2}\.\d{2}")
-
 MERGE_FIELDS = {"접수기간","추가접수기간","서류제출기간","의견제시기간","시험일","발표","정답발표"}
 
 # ── 보조 유틸 ─────────────────────────────────────────────────────────────────
@@ -32,7 +40,8 @@ def norm(s: Optional[str]) -> str:
     return clean(s or "").replace(" ", "")
 
 def classify(header_text: str) -> Tuple[Optional[str], Optional[str]]:
-    return classify_from_yaml(norm(header_text), ROW_PHASE_RX, RX)
+    row_phase_rx, rx, _ = load_schedule_config()
+    return classify_from_yaml(norm(header_text), row_phase_rx, rx)
 
 def _header_has_chasu(headers: List[str]) -> bool:
     ht = "".join(norm(h) for h in headers)
@@ -43,10 +52,21 @@ def _value_has_chasu(v: Optional[str]) -> bool:
 
 def detect_row_phase(text: str) -> Optional[str]:
     t = norm(text)
-    for ph, patt in ROW_PHASE_RX.items():
+    row_phase_rx = load_schedule_config()[0]
+    if RULE_PROFILE:
+        for ph, patt in row_phase_rx.items():
+            if rp_search("schedule.row_phase", ph, patt, t): return ph
+        return None
+    for ph, patt in row_phase_rx.items():
         if patt.search(t): return ph
     return None
 
+def _banner_search(rule: str, rx, s: str):
+    """RULE_PROFILE 용: 배너 규칙 적중 + 어떤 YAML 토큰이 맞았는지 기록."""
+    m = rp_search("schedule.banner", rule, rx, s)
+    if m: rp_record("schedule.banner_token", f"{rule}:{m.group(0)}", True)
+    return m
+
 def _round_num(tok: Optional[str]) -> Optional[int]:
     if not tok: return None
     if tok.isdigit(): return int(tok)
@@ -72,22 +92,6 @@ def extract_round(text: Optional[str]) -> Optional[str]:
 def _dateish(s: Optional[str]) -> bool:
     return bool(s and DATE_ANY.search(s))
 
-def _coalesce_date_field(value: Optional[str]) -> Optional[str]:
-    if not value: 
-       return None
-    s = value.strip()
-    dates = DATE_SINGLE.findall(s)
-    if not dates: 
-       return None
-    
-    if "~" in s and len(dates) == 1: 
-        return f"{dates[0]} ~"
-    
-    if len(dates) == 1:
-        return dates[0]
-
-    return f"{dates[0]} ~ {dates[-1]}"
-
 def _sanitize_dates(rec: Dict) -> None:
     if rec.get("시험일") and not _dateish(rec["시험일"]):
         rec["시험일"] = None
@@ -155,7 +159,7 @@ def expand_by_round(rec: Dict) -> List[Dict]:
     if not rounds: return [rec]
     out: List[Dict] = []
     for r in rounds:
-        rr = dict(rec)
+        rr = rec.copy()
         rr["회차"] = "상시" if r == "상시" else f"제{r}회"
         out.append(rr)
     return out
@@ -171,7 +175,7 @@ def expand_by_round_and_chasu(rec: Dict) -> List[Dict]:
     for r in round_nums:
         base_round = "상시" if r == "상시" else f"제{r}회"
         for c in chasus:
-            rr = dict(rec)
+            rr = rec.copy()
             rr["회차"] = f"{base_round} {c}차"
             out.append(rr)
     return out
@@ -241,27 +245,31 @@ def fill_missing_practical_from_row(rec: Dict, row_text: str) -> None:
         rec["접수기간"] = _coalesce_date_field(earlier)
 
 # ── 테이블/행 필터 ─────────────────────────────────────────────────────────────
-def is_banner_row(cells: List[str]) -> bool:
-    text  = " ".join(cells or [])
+def is_banner_row(cells: List[str], text: Optional[str] = None) -> bool:
+    if text is None: text = " ".join(cells or [])
     first = (cells[0] if cells else "")
     tnorm = norm(text); fnorm = norm(first)
     dates_in_row = len(DATE_ANY.findall(text))
     has_round_token = bool(extract_round(first) or ROUND_TOKEN.search(tnorm))
+    BANNERS = load_schedule_config()[2]
 
     rc = BANNERS.get("first_cell_contains")
-    if rc and rc.search(fnorm):
+    if rc and (_banner_search("first_cell_contains", rc, fnorm) if RULE_PROFILE else rc.search(fnorm)):
         rx_ex = BANNERS.get("first_cell_excludes")
-        if not (rx_ex and rx_ex.search(fnorm)) and not has_round_token and dates_in_row == 0:
+        if not (rx_ex and (_banner_search("first_cell_excludes", rx_ex, fnorm) if RULE_PROFILE else rx_ex.search(fnorm))) \
+                and not has_round_token and dates_in_row == 0:
             return True
 
     r = BANNERS.get("contains_any")
-    if r and r.search(tnorm):
+    if r and (_banner_search("contains_any", r, tnorm) if RULE_PROFILE else r.search(tnorm)):
         if not has_round_token and dates_in_row == 0:
             return True
 
     thr = int(BANNERS.get("min_dates_in_row") or 0)
-    if thr > 0 and dates_in_row >= thr:  # (선택적) 일정아님 배너에 날짜가 다수 찍혀있을 때
-        return True
+    if thr > 0:
+        if RULE_PROFILE: rp_record("schedule.banner", "min_dates_in_row", dates_in_row >= thr)
+        if dates_in_row >= thr:  # (선택적) 일정아님 배너에 날짜가 다수 찍혀있을 때
+            return True
     return False
 
 def is_fee_only_table(headers: List[str]) -> bool:
@@ -275,75 +283,122 @@ def is_fee_only_table(headers: List[str]) -> bool:
     )
     return (only_fee_phases and not has_schedule_cols)
 
+# ── 열 계획(헤더 해석) ─────────────────────────────────────────────────────────
+def _build_plan(headers: List[str]) -> Optional[Dict]:
+    """헤더 행만으로 결정되는 해석 결과. 일정표가 아니면 None."""
+    col_info = [classify(h) for h in headers]
+    phased_table = any(ph for ph, _ in col_info)
+
+    # 정답발표 헤더 즉시 재매핑
+    for i, h in enumerate(headers):
+        tt = norm(h)
+        if ("발표" in tt) and ("정답" in tt):
+            ph, _ = col_info[i]
+            col_info[i] = (ph, "정답발표")
+
+    # === 수수료 전용 표 스킵 ===
+    if is_fee_only_table(headers):
+        if ES_DEBUG: print("[skip] fee-only table (no schedule columns)")
+        return None
+
+    header_text = "".join(norm(x) for x in headers)
+    if not any(k in header_text for k in ("원서","접수","필기","실기","면접","1차", "2차", "발표","회차","구분","시험일정","서류","의견제시")):
+        return None
+
+    return {
+        "col_info": col_info,
+        "hdr_norms": [norm(h) for h in headers],
+        "phased": phased_table,
+        "chasu": _header_has_chasu(headers),
+    }
+
+def _table_plan(headers: List[str]) -> Optional[Dict]:
+    """_build_plan 결과를 헤더 시그니처로 캐시. 스킵 대상 표도 {"skip": True} 로 기억."""
+    if RULE_PROFILE:
+        return _build_plan(headers)  # 규칙 적중을 빠짐없이 세기 위해 캐시 우회
+    sig = header_sig(headers)
+    if sig in _LIVE:
+        return _LIVE[sig]
+    cached = _PLANS.get(sig)
+    if cached is not None:
+        plan = None if cached.get("skip") else {
+            "col_info": [tuple(x) for x in cached["col_info"]],
+            "hdr_norms": cached["hdr_norms"],
+            "phased": cached["phased"],
+            "chasu": cached["chasu"],
+        }
+    else:
+        plan = _build_plan(headers)
+        _PLANS.put(sig, {"skip": True} if plan is None
+                   else {**plan, "col_info": [list(x) for x in plan["col_info"]]})
+    _LIVE[sig] = plan
+    return plan
+
 # ── 메인 파서 ─────────────────────────────────────────────────────────────────
+_PHASES = (None, "필기", "실기", "면접", "1차", "2차")  # 버킷 순서 = 출력 순서
+_PAYLOAD = ("접수기간","추가접수기간","서류제출기간","시험일","의견제시기간","발표","정답발표")
+_EVENT_KEYS = ("회차", "phase") + _PAYLOAD     # 출력 키 순서
+
+def _bucket_of(bucket: Dict, ph: Optional[str]) -> Dict:
+    rec = bucket.get(ph)
+    if rec is None:
+        rec = bucket[ph] = dict.fromkeys(_EVENT_KEYS)
+    return rec
+
 def parse_schedule_tables(tables: List[Dict]) -> List[Dict]:
     out: List[Dict] = []
     last_round: Optional[str] = None
 
     for t in tables or []:
-        rows = t.get("rows") or []
+        t = as_view(t)
+        rows = t.cells
         if len(rows) < 2:
             continue
 
-        headers  = [str(x) for x in rows[0]]
-        col_info = [classify(h) for h in headers]
-        phased_table = any(ph for ph, _ in col_info)
-
-        # 정답발표 헤더 즉시 재매핑
-        for i, h in enumerate(headers):
-            tt = norm(h)
-            if ("발표" in tt) and ("정답" in tt):
-                ph, _ = col_info[i]
-                col_info[i] = (ph, "정답발표")
-
-        # === 수수료 전용 표 스킵 ===
-        if is_fee_only_table(headers):
-            if ES_DEBUG: print("[skip] fee-only table (no schedule columns)")
-            continue
-
-        header_text = "".join(norm(x) for x in headers)
-        if not any(k in header_text for k in ("원서","접수","필기","실기","면접","1차", "2차", "발표","회차","구분","시험일정","서류","의견제시")):
+        headers  = t.header
+        plan = _table_plan(headers)
+        if plan is None:
             continue
-
-        header_has_chasu = _header_has_chasu(headers)
+        col_info = plan["col_info"]
+        hdr_norms = plan["hdr_norms"]
+        phased_table = plan["phased"]
+        header_has_chasu = plan["chasu"]
 
         # ── 행 처리 ───────────────────────────────────────────────
-        for r in rows[1:]:
-            cells = [clean(c) for c in r]  # JSON 경로
+        for ri in range(1, len(rows)):
+            cells = rows[ri]  # TableView 에서 이미 clean()
             if not cells:
                 if ES_DEBUG: print("[skip] empty row")
                 continue
-            if is_banner_row(cells):
+            if is_banner_row(cells, t.row_texts[ri]):
                 if ES_DEBUG: print("[skip] banner row:", cells[:2])
                 continue
 
-            row_text_norm = norm(" ".join(cells))
+            row_text = t.row_texts[ri]
+            row_text_norm = row_text.replace(" ", "")  # 이미 clean 된 셀 → norm() 과 동일
             suppress_phases: set[str] = set()
             if ("필기" in row_text_norm) and ("면제" in row_text_norm):
                 suppress_phases.add("필기")
 
             # 수수료 내용만 있고 날짜가 전혀 없으면 행 스킵
-            if ("수수료" in row_text_norm or "응시료" in row_text_norm) and not DATE_ANY.search(" ".join(cells)):
+            if ("수수료" in row_text_norm or "응시료" in row_text_norm) and not DATE_ANY.search(row_text):
                 if ES_DEBUG: print("[skip] fee row without dates")
                 continue
 
             first_cell_raw = cells[0] if len(cells) > 0 else ""
-            row_phase = detect_row_phase(first_cell_raw) or detect_row_phase(" ".join(cells))
+            row_phase = detect_row_phase(first_cell_raw) or detect_row_phase(row_text)
             if ES_DEBUG:
                 print("[ROWPHASE]", first_cell_raw, "->", row_phase, "| phased_table=", phased_table)
 
-            base = {"회차":None,"phase":None,
-                    "접수기간":None,"추가접수기간":None,"서류제출기간":None,
-                    "시험일":None,"의견제시기간":None,"발표":None,"정답발표":None}
-            bucket = {None: base.copy(), "필기": base.copy(), "실기": base.copy(), "면접": base.copy(), "1차":base.copy(), "2차":base.copy()}
+            bucket = {None: dict.fromkeys(_EVENT_KEYS)}  # phase 버킷은 실제로 쓰일 때 생성(_bucket_of)
             phase_touch = {None:0, "필기":0, "실기":0, "면접":0, "1차":0, "2차":0}
 
             # 1) 첫 셀에서 회차 추출
             first_cell_round = extract_round(first_cell_raw)
             if first_cell_round:
                 bucket[None]["회차"] = first_cell_round
-            elif "정기" in norm(first_cell_raw):
-                bucket[None]["회차"] = clean(first_cell_raw)
+            elif "정기" in first_cell_raw.replace(" ", ""):
+                bucket[None]["회차"] = first_cell_raw
 
             # 2) 열 매핑
             for i, (phase, field) in enumerate(col_info):
@@ -351,18 +406,18 @@ def parse_schedule_tables(tables: List[Dict]) -> List[Dict]:
                 val = cells[i] if i < len(cells) else ""
 
                 if field == "회차":
-                    vr = extract_round(val) or clean(val)
+                    vr = extract_round(val) or val
                     bucket[None]["회차"] = vr
                     txt = norm(vr)
-                    if "필기" in txt: bucket["필기"]["회차"] = vr
-                    if "실기" in txt: bucket["실기"]["회차"] = vr
-                    if "면접" in txt: bucket["면접"]["회차"] = vr
-                    if "1차" in txt: bucket["1차"]["회차"] = vr
-                    if "2차" in txt: bucket["2차"]["회차"] = vr
+                    if "필기" in txt: _bucket_of(bucket, "필기")["회차"] = vr
+                    if "실기" in txt: _bucket_of(bucket, "실기")["회차"] = vr
+                    if "면접" in txt: _bucket_of(bucket, "면접")["회차"] = vr
+                    if "1차" in txt: _bucket_of(bucket, "1차")["회차"] = vr
+                    if "2차" in txt: _bucket_of(bucket, "2차")["회차"] = vr
                     continue
 
                 eff_phase = phase if phased_table else None
-                ht = norm(headers[i]); vt = norm(val)
+                ht = hdr_norms[i]; vt = val.replace(" ", "")
                 field_eff = field
                 if ("발표" in ht or "발표" in vt) and ("정답" in ht or "정답" in vt):
                     field_eff = "정답발표"
@@ -373,14 +428,14 @@ def parse_schedule_tables(tables: List[Dict]) -> List[Dict]:
 
                 # 중립헤더 + 행 phase 라우팅
                 if eff_phase is None and row_phase in ("필기","실기","면접", "1차", "2차"):
-                    target_bucket = bucket[row_phase]; target_phase = row_phase
+                    target_bucket = _bucket_of(bucket, row_phase); target_phase = row_phase
                 else:
-                    target_bucket = bucket[eff_phase] if eff_phase in bucket else bucket[None]
+                    target_bucket = _bucket_of(bucket, eff_phase) if eff_phase in _PHASES else bucket[None]
                     target_phase  = eff_phase
                 if ES_DEBUG:
                     print(f"[PUT] -> target_phase={target_phase} field={field_eff} has_date={bool(DATE_ANY.search(val or ''))}")
 
-                _merge_assign(target_bucket, field_eff, clean(val))
+                _merge_assign(target_bucket, field_eff, val)  # val 은 TableView 에서 이미 clean
                 if DATE_ANY.search(val or ""):
                     phase_touch[target_phase if target_phase in phase_touch else None] += 1
 
@@ -388,18 +443,20 @@ def parse_schedule_tables(tables: List[Dict]) -> List[Dict]:
             dominant_phase = max(("필기","실기","면접"), key=lambda ph: phase_touch.get(ph,0))
             if phase_touch.get(dominant_phase,0) == 0: dominant_phase = None
             if dominant_phase:
+                dom = _bucket_of(bucket, dominant_phase)
                 for k in ("접수기간","추가접수기간","서류제출기간","시험일","의견제시기간","발표","정답발표"):
                     v = bucket[None].get(k)
-                    if v and not bucket[dominant_phase].get(k):
-                        bucket[dominant_phase][k] = v
-                if bucket[None].get("회차") and not bucket[dominant_phase].get("회차"):
-                    bucket[dominant_phase]["회차"] = bucket[None]["회차"]
+                    if v and not dom.get(k):
+                        dom[k] = v
+                if bucket[None].get("회차") and not dom.get("회차"):
+                    dom["회차"] = bucket[None]["회차"]
 
             # 3) 레코드 확정
             phase_records: List[Dict] = []
-            for ph, rec in bucket.items():
-                has_payload = any(rec.get(k) for k in ("접수기간","추가접수기간","서류제출기간","시험일","의견제시기간","발표","정답발표"))
-                if not has_payload: continue
+            for ph in _PHASES:
+                rec = bucket.get(ph)
+                if rec is None: continue
+                if not any(rec[k] for k in _PAYLOAD): continue
                 if ph in suppress_phases: continue
                 if phased_table and ph in ("필기","실기","면접","1차","2차") and phase_touch.get(ph,0) == 0:
                     continue
@@ -417,10 +474,10 @@ def parse_schedule_tables(tables: List[Dict]) -> List[Dict]:
                 if extra and not rec.get("추가접수기간"): rec["추가접수기간"] = extra
                 fix_spillover_in_signup(rec)
                 rescue_misplaced_announce_or_exam(rec)
-                fill_missing_practical_from_row(rec, " ".join(cells))
+                fill_missing_practical_from_row(rec, row_text)
 
                 for k in ("접수기간","추가접수기간","서류제출기간","의견제시기간","시험일","발표","정답발표"):
-                    rec[k] = _coalesce_date_field(rec.get(k))
+                    rec[k] = _coalesce_date_field(rec[k])
                 _sanitize_dates(rec)
 
                 use_chasu = phased_table or header_has_chasu or _value_has_chasu(rec.get("회차"))
@@ -2,6 +2,7 @@
 from __future__ import annotations
 from typing import List, Dict
 from ..utils.text import clean, dedupe_keep_order
+from ..utils.tables import as_view
 
 __all__ = ["parse_preference"]
 
@@ -50,10 +51,11 @@ def parse_preference(pr_tabs: Dict, qual_name: str | None) -> Dict:
     # --- 표(법령우대) 추출 ---
     law_rows: List[Dict] = []
     for t in tables:
-        rows = t.get("rows") or []
+        t = as_view(t)
+        rows = t.cells
         if len(rows) < 2:
             continue
-        header = [clean(x) for x in rows[0]]
+        header = rows[0]
         joined = "".join(header)
         if not any(k in joined for k in TABLE_HINTS):
             continue
@@ -63,8 +65,7 @@ def parse_preference(pr_tabs: Dict, qual_name: str | None) -> Dict:
         i_clause = next((i for i, h in enumerate(header) if "조문" in h), 1)
         i_use = next((i for i, h in enumerate(header) if "활용" in h), (2 if len(header) > 2 else 1))
 
-        for r in rows[1:]:
-            cells = [clean(c) for c in r]
+        for cells in rows[1:]:
             if not any(cells):
                 continue
             law_rows.append({
@@ -14,12 +14,12 @@ CHANGES
 """
 
 from __future__ import annotations
-import os, re, yaml
+import os, re
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+from ...utils.config_cache import load_yaml
 from ...utils.text import clean
+from ...utils.tables import as_view, as_views
 
 # ──────────────────────────────────────────────────────────────────────────────
 # HTML → 문단
@@ -37,6 +37,23 @@ def _split_to_paras(txt: str) -> List[str]:
             out.append(t)
     return out
 
+# ──────────────────────────────────────────────────────────────────────────────
+# bs4 는 가상 섹션 주입(augment_paras_with_virtual_sections)에서만 필요 → 처음 쓸 때 임포트
+# ──────────────────────────────────────────────────────────────────────────────
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag
+else:
+    BeautifulSoup = Tag = None
+
+def _bs4():
+    global BeautifulSoup, Tag
+    if BeautifulSoup is None:
+        from bs4 import BeautifulSoup as _BS
+        from bs4.element import Tag as _Tag
+        BeautifulSoup, Tag = _BS, _Tag
+    return BeautifulSoup
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Q-Net 특유: iframe ↔ textarea 매칭
 # ──────────────────────────────────────────────────────────────────────────────
@@ -98,7 +115,7 @@ def augment_paras_with_virtual_sections(paras: List[str], html: str) -> List[str
     - 탐지되면 paras에 '가상 라벨 + 본문'을 문서 순서대로 주입
     - 같은 라벨이 이미 있으면 중복 삽입하지 않음
     """
-    soup = BeautifulSoup(html or "", "lxml")
+    soup = _bs4()(html or "", "lxml")
     injections: List[Tuple[int, List[str]]] = []
     seen_label = set()
 
@@ -164,8 +181,7 @@ def load_basic_info_cfg() -> Dict[str, Any]:
     if _CFG:
         return _CFG
     p = Path(__file__).resolve().parent.parent / "configs" / "basic_info_headers.yaml"
-    with open(p, "r", encoding="utf-8") as f:
-        y = yaml.safe_load(f)
+    y = load_yaml(p)
 
     _CFG = {
         "duties_hdr":    _mk_header_regex(y["duties"]["headers"]),
@@ -253,22 +269,23 @@ def _has_header(paras: List[str], hdr_pat: re.Pattern) -> bool:
 # 통계 표 시그널/정규화
 # ──────────────────────────────────────────────────────────────────────────────
 def _strong_stats_signature(tb) -> bool:
-    rows = tb.get("rows") or []
+    tb = as_view(tb)
+    rows = tb.cells
     if not rows:
         return False
-    flat = " ".join(" ".join(clean(c) for c in r if c) for r in rows)
+    flat = tb.flat
     years   = re.findall(r"\b20(1\d|2\d)\b", flat)
     metrics = re.findall(r"(응시|합격|합격률|필기|실기|면접|1차|2차)", flat)
-    first_row = " ".join(clean(c) for c in rows[0] if c)
-    first_col = " ".join(clean(r[0]) for r in rows if r and r[0])
+    first_row = tb.row_texts[0]
+    first_col = " ".join(r[0] for r in rows if r and r[0])
     labels = re.findall(r"(구분|1차|2차|필기|실기|면접|계|소계|급)", first_row + " " + first_col)
     return len(set(years)) >= 4 and len(metrics) >= 4 and len(labels) >= 1
 
 def _weak_stats_signature(tb) -> bool:
-    rows = tb.get("rows") or []
-    if not rows:
+    tb = as_view(tb)
+    if not tb.cells:
         return False
-    flat = " ".join(" ".join(clean(c) for c in r if c) for r in rows)
+    flat = tb.flat
     years   = re.findall(r"\b20(1\d|2\d)\b", flat)
     metric1 = re.search(r"(응시|합격|합격률|필기|실기|면접|1차|2차)", flat)
     return len(set(years)) >= 2 and bool(metric1)
@@ -428,7 +445,8 @@ def extract_basic_sections(paras: List[str], tables: List[dict]) -> Dict[str, An
             cand = _pick_ministry_only(clean(raw) or "")
             if cand: ministry = cand; break
 
-    # 통계표 후보 수집
+    # 통계표 후보 수집 (build_norm 에서 넘어온 TableView 를 그대로 재사용)
+    tables = as_views(tables)
     stats_tables: List[dict] = []
     normalize_only_candidates: List[dict] = []
     _log("table_count:", len(tables or []))
@@ -449,18 +467,18 @@ def extract_basic_sections(paras: List[str], tables: List[dict]) -> Dict[str, An
     if has_stats_hdr:
         for tb in (tables or []):
             if tb in stats_tables or tb in normalize_only_candidates: continue
-            rows = tb.get("rows") or []
+            rows = tb.cells
             if rows:
-                head = " ".join(clean(c) for c in rows[0] if c is not None)
+                head = tb.row_texts[0]
                 has_year   = bool(re.search(r"\b20\d{2}\b", head))
                 has_metric = any(k in head for k in ("응시","합격","합격률","1차","2차","필기","실기"))
                 if ("구분" in head and has_year) or (has_year and has_metric):
                     stats_tables.append(tb);  continue
             if not rows: continue
-            body_flat = " ".join(" ".join(clean(c) for c in r if c) for r in rows[:5])
+            body_flat = " ".join(tb.row_texts[:5])
             if re.search(r"\b20\d{2}\b.*\b20\d{2}\b", body_flat):
                 stats_tables.append(tb);  continue
-            flat = " ".join(" ".join(clean(c) for c in r if c) for r in rows)
+            flat = tb.flat
             year_hits   = re.findall(r"\b20\d{2}\b", flat)
             metric_hits = re.findall(r"(응시|합격|합격률|필기|실기|1차|2차)", flat)
             if len(set(year_hits)) >= 3 and len(metric_hits) >= 3:
@@ -574,31 +592,31 @@ def extract_basic_sections(paras: List[str], tables: List[dict]) -> Dict[str, An
 
     # 표 기반 보강(비통계성 표만)
     def _looks_like_stats(tb) -> bool:
-        rows = tb.get("rows") or []
-        flat = " ".join(" ".join(clean(c) for c in r if c) for r in rows[:2])
+        flat = " ".join(tb.row_texts[:2])
         return bool(re.search(r"\b20\d{2}\b", flat))
 
     def table_to_text(rows: List[List[str]]) -> Optional[str]:
+        # rows 는 TableView.cells (이미 clean 됨)
         lines=[]
         for r in rows:
-            if any(clean(c) for c in r):
-                lines.append(" - " + " ".join(clean(c) for c in r if clean(c)))
+            if any(r):
+                lines.append(" - " + " ".join(c for c in r if c))
         return "\n".join(s[1:] for s in lines) if lines else None
 
     if not duties:
         for tb in tables or []:
             if _looks_like_stats(tb):  continue
-            head = " ".join(clean(c) for c in (tb.get("rows") or [[]])[0])
+            head = tb.row_texts[0] if tb.cells else ""
             if any(h in head for h in C["table_hints"].get("duties", [])):
-                tmp = table_to_text(tb.get("rows") or [])
+                tmp = table_to_text(tb.cells)
                 if tmp: duties = tmp;  break
 
     if not outlook:
         for tb in tables or []:
             if _looks_like_stats(tb):  continue
-            head = " ".join(clean(c) for c in (tb.get("rows") or [[]])[0])
+            head = tb.row_texts[0] if tb.cells else ""
             if any(h in head for h in C["table_hints"].get("outlook", [])):
-                tmp = table_to_text(tb.get("rows") or [])
+                tmp = table_to_text(tb.cells)
                 if tmp: outlook = tmp;  break
 
     _log("history lines:", len(history_paras))
@@ -1,8 +1,9 @@
 # normalizers/v1_core/build/config_loader.py
 from __future__ import annotations
-import re, yaml
-from importlib.resources import files as pkg_files
+import re
 from pathlib import Path
+from ...utils.config_cache import load_yaml
+from ...utils.rule_profile import RULE_PROFILE, declare, record, search as rp_search
 
 __all__ = ["load_schedule_config", "classify_from_yaml"]
 
@@ -17,18 +18,20 @@ def _to_rx(words):
 
 
 def _load_yaml():
-    try:
-        cfg_path = pkg_files("public_cert_api.normalizers.v1_core.configs") / "schedule_headers.yaml"
-        print("[CFG] from", cfg_path)
-        with cfg_path.open("r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
-    except Exception:
-        local = Path(__file__).resolve().parents[1] / "configs" / "schedule_headers.yaml"
-        with open(local, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+    cfg_path = Path(__file__).resolve().parents[1] / "configs" / "schedule_headers.yaml"
+    print("[CFG] from", cfg_path)
+    return load_yaml(cfg_path)       # YAML 내용이 같으면 디스크 캐시(JSON)에서
+
+_CFG = None
 
 def load_schedule_config():
-    cfg = _load_yaml()
+    """(row_phase_rx, rx, banners) — 처음 호출할 때 한 번만 읽고 컴파일(임포트 시점에는 읽지 않음)."""
+    global _CFG
+    if _CFG is None:
+        _CFG = _build_schedule_config(_load_yaml())
+    return _CFG
+
+def _build_schedule_config(cfg):
 
     # row-phase 감지
     row_phase_tokens = cfg.get("row_phase_tokens", [])
@@ -68,37 +71,69 @@ def load_schedule_config():
         "min_dates_in_row": int(bcfg.get("min_dates_in_row") or 0),
     }
 
+    _declare_rules(fields, rx)
+    declare("schedule.row_phase", row_phase_rx.keys(), ordered=True)
+    declare("schedule.banner", [k for k in ("first_cell_contains", "first_cell_excludes", "contains_any", "min_dates_in_row")
+                                if banners.get(k)])
+    declare("schedule.banner_token",
+            [f"{k}:{(w or '').replace(' ', '')}" for k in ("first_cell_contains", "first_cell_excludes", "contains_any")
+             for w in (bcfg.get(k) or [])])
+
     return row_phase_rx, rx, banners  # ← 반환값 확장
 
-def classify_from_yaml(h_norm: str, _: dict, rx: dict):
-    if rx["회차"] and rx["회차"].search(h_norm):
-        return None, "회차"
+# 헤더 분류 체인(평가 순서 = 우선순위). (RX 경로, 반환 phase, 반환 field)
+_CHAIN = (
+    (("회차",),               None,   "회차"),
+    (("접수기간", "필기"),     "필기", "접수기간"),
+    (("접수기간", "실기"),     "실기", "접수기간"),
+    (("접수기간", "neutral"),  None,   "접수기간"),
+    (("서류제출기간",),        None,   "서류제출기간"),
+    (("의견제시기간",),        None,   "의견제시기간"),
+    (("시험일", "필기"),       "필기", "시험일"),
+    (("시험일", "실기"),       "실기", "시험일"),
+    (("시험일", "면접"),       "면접", "시험일"),
+    (("시험일", "neutral"),    None,   "시험일"),
+    (("발표", "필기"),         "필기", "발표"),
+    (("발표", "실기"),         "실기", "발표"),
+    (("발표", "neutral"),      None,   "발표"),
+)
+
+def _rx_at(rx: dict, path: tuple):
+    r = rx.get(path[0])
+    return r.get(path[1]) if (len(path) > 1 and isinstance(r, dict)) else r
+
+def _declare_rules(fields: dict, rx: dict) -> None:
+    """프로파일러에 체인 규칙 + YAML 토큰(설정 항목)을 등록(RULE_PROFILE=1 일 때만 동작)."""
+    declare("schedule.header", (".".join(p) for p, _, _ in _CHAIN), ordered=True)
+    toks = []
+    for path, _, _ in _CHAIN:
+        if _rx_at(rx, path) is None:
+            continue
+        node = fields.get(path[0])
+        if len(path) > 1:
+            node = (node or {}).get(path[1]) if isinstance(node, dict) else None
+        elif isinstance(node, dict):
+            node = node.get("any")
+        toks += [f"{'.'.join(path)}:{(w or '').replace(' ', '')}" for w in (node or [])]
+    declare("schedule.header_token", toks)
 
-    # 접수기간
-    for ph in ("필기","실기"):
-        r = rx["접수기간"].get(ph)
+def classify_from_yaml(h_norm: str, _: dict, rx: dict):
+    if RULE_PROFILE:
+        return _classify_profiled(h_norm, rx)
+    for path, phase, field in _CHAIN:
+        r = _rx_at(rx, path)
         if r and r.search(h_norm):
-            return ph, "접수기간"
-    if rx["접수기간"]["neutral"] and rx["접수기간"]["neutral"].search(h_norm):
-        return None, "접수기간"
-
-    # 서류/의견제시
-    for k in ("서류제출기간","의견제시기간"):
-        if rx[k] and rx[k].search(h_norm):
-            return None, k
-
-    # 시험일
-    for ph in ("필기","실기","면접"):
-        r = rx["시험일"].get(ph)
-        if r and r.search(h_norm): return ph, "시험일"
-    if rx["시험일"]["neutral"] and rx["시험일"]["neutral"].search(h_norm):
-        return None, "시험일"
-
-    # 발표
-    for ph in ("필기","실기"):
-        r = rx["발표"].get(ph)
-        if r and r.search(h_norm): return ph, "발표"
-    if rx["발표"]["neutral"] and rx["발표"]["neutral"].search(h_norm):
-        return None, "발표"
+            return phase, field
+    return None, None
 
+def _classify_profiled(h_norm: str, rx: dict):
+    for path, phase, field in _CHAIN:
+        r = _rx_at(rx, path)
+        if not r:
+            continue
+        rule = ".".join(path)
+        m = rp_search("schedule.header", rule, r, h_norm)
+        if m:
+            record("schedule.header_token", f"{rule}:{m.group(0)}", True)
+            return phase, field
     return None, None
@@ -2,7 +2,8 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Tuple, Dict, Any, List
-import itertools, yaml
+import itertools
+from ...utils.config_cache import load_yaml
 
 def _dedupe(xs: List[str]) -> List[str]:
     seen, out = set(), []
@@ -50,15 +51,23 @@ def _derive(data: Dict[str,Any]) -> Dict[str,Any]:
     data["nxt_titles"] = tuple(_dedupe(all_alias + data["fee_headers"] + common))
     return data
 
+_CFG = None
+
 def load_exam_info_config() -> Tuple[tuple, tuple, tuple, tuple, Dict[str, list], tuple, Dict[str, list]]:
+    """프로세스당 한 번만 읽음 (exam_info / parse_tabs_min 이 같은 결과를 공유)."""
+    global _CFG
+    if _CFG is None:
+        _CFG = _load()
+    return _CFG
+
+def _load():
     here = Path(__file__).resolve().parents[1]
     yml = here / "configs" / "exam_info_headers.yaml"
 
     data = _defaults()
     try:
         if yml.exists():
-            with yml.open("r", encoding="utf-8") as f:
-                user = yaml.safe_load(f) or {}
+            user = load_yaml(yml) or {}
             data = _merge(data, user)
     except Exception:
         pass
@@ -2,13 +2,37 @@
 # parse_tabs_min.py — Q-Net 탭 파서 (섹션 우선 리팩토링)
 from __future__ import annotations
 from pathlib import Path
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING
 from urllib.parse import urljoin
-import json, argparse, gzip, re, html as _html
-
-# YAML 설정 로드 (섹션 라벨 판정에만 사용)
-from public_cert_api.normalizers.v1_core.support.exam_info_config_loader import load_exam_info_config
-_, _, _, _, _, _, SEC_MAP = load_exam_info_config()
+import json, argparse, re, html as _html
+
+from engine_common import snapshot_codec
+from public_cert_api.normalizers.utils.rule_profile import RULE_PROFILE, declare, record as rp_record, search as rp_search
+
+# bs4 는 실제로 HTML 을 파싱할 때 임포트 (run_public --inproc 의 임포트 시간에서 뺌)
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+else:
+    BeautifulSoup = None
+
+def _soup(markup: str) -> "BeautifulSoup":
+    global BeautifulSoup
+    if BeautifulSoup is None:
+        from bs4 import BeautifulSoup as _BS
+        BeautifulSoup = _BS
+    return BeautifulSoup(markup, "lxml")
+
+# 섹션 라벨 판정용 SEC_MAP (exam_info_headers.yaml) — parse_exam_info_file 에서 처음 쓸 때 읽고 메모이즈
+_SEC_MAP = None
+
+def _sec_map() -> dict:
+    global _SEC_MAP
+    if _SEC_MAP is None:
+        from public_cert_api.normalizers.v1_core.support.exam_info_config_loader import load_exam_info_config
+        sec_map = load_exam_info_config()[6]
+        declare("parse.sec_map_token", [f"{lab}:{tok}" for lab, toks in sec_map.items() for tok in toks])
+        _SEC_MAP = sec_map
+    return _SEC_MAP
 
 BASE = "https://q-net.or.kr"
 IMG_SECT_CAND = {"응시수수료","합격기준","시험과목및배점","시험방법","응시자격","취득방법"}
@@ -20,13 +44,8 @@ def clean(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "").strip())
 
 def read_html(p: Path) -> str:
-    if p.exists():
-        return p.read_text(encoding="utf-8", errors="ignore")
-    gz = Path(str(p) + ".gz")
-    if gz.exists():
-        with gzip.open(gz, "rb") as f:
-            return f.read().decode("utf-8", errors="ignore")
-    raise FileNotFoundError(p)
+    # p 또는 압축본(p.zst — 학습 사전 / p.gz) 중 있는 것, 없으면 FileNotFoundError
+    return snapshot_codec.read_text(p, errors="ignore")
 
 def _deep_unescape(s: str, max_rounds: int = 8) -> str:
     prev = s or ""
@@ -44,12 +63,12 @@ def sanitize_text(txt: str) -> str:
     if not txt: return ""
     # <p, <br, <span 등 태그 기호가 보인다면 한 번 더 파싱
     if "<" in txt and ">" in txt:
-        txt = BeautifulSoup(txt, "lxml").get_text(" ", strip=True)
+        txt = _soup(txt).get_text(" ", strip=True)
     return clean(txt)
 
 def _bs_tables(html_fragment: str) -> list[dict]:
     out = []
-    soup = BeautifulSoup(html_fragment, "lxml")
+    soup = _soup(html_fragment)
     for i, tbl in enumerate(soup.find_all("table")):
         rows = []
         for tr in tbl.find_all("tr"):
@@ -94,7 +113,7 @@ def collect_links(soup: BeautifulSoup) -> list[dict]:
     for ta in soup.find_all('textarea'):
         raw_html = ta.get_text(strip=True)
         if "<a" in raw_html.lower():
-            chunks.append(BeautifulSoup(raw_html, "lxml"))
+            chunks.append(_soup(raw_html))
 
     # 2. 모든 덩어리에서 링크 추출
     for snp in chunks:
@@ -153,7 +172,7 @@ def _images_from_dom_block(block) -> list[str]:
 
 def _images_from_html_fragment(html_fragment: str) -> list[str]:
     if not html_fragment: return []
-    frag = BeautifulSoup(html_fragment, "lxml")
+    frag = _soup(html_fragment)
     return _images_from_dom_block(frag)
 
 def _images_from_near_table(dom_tbl_list, idx) -> list[str]:
@@ -177,7 +196,7 @@ def _images_from_near_table(dom_tbl_list, idx) -> list[str]:
 # ──────────────────────────────────────────────────────────────────────────────
 def parse_file(html_path: Path) -> dict:
     html = read_html(html_path)
-    soup = BeautifulSoup(html, "lxml")
+    soup = _soup(html)
     for bad in soup(["script", "style", "noscript"]): bad.decompose()
 
     body_len = len(soup.get_text(" ", strip=True))
@@ -198,9 +217,11 @@ def _title_to_label(ttl: str) -> str | None:
     if any(t in ttl for t in SYL_TOK): return "시험과목및배점"
     if any(t in ttl for t in MTH_TOK): return "시험방법"
     cands = []
-    for label, tokens in (SEC_MAP or {}).items():
+    for label, tokens in (_sec_map() or {}).items():
         hit = sum(1 for tok in tokens if tok in ttl)
         if hit: cands.append((label, hit))
+        if RULE_PROFILE:
+            for tok in tokens: rp_record("parse.sec_map_token", f"{label}:{tok}", tok in ttl)
     if not cands: return None
     cands.sort(key=lambda x: (-int(x[0] in {"시험과목및배점", "시험방법"}), -x[1]))
     return cands[0][0]
@@ -231,13 +252,21 @@ def _nearest_heading_label(el) -> str | None:
         cur, p = p, p.parent
     return None
 
+# 표 본문으로 라벨 추정 (위에서부터 첫 적중)
+_LABEL_GUESS_RULES = (
+    ("시험과목및배점", re.compile(r"(문항수|시험시간|과목|배점)")),
+    ("시험방법",       re.compile(r"(객관식|주관식|필답형|작업형|복합형|면접|서술형|CBT|PBT|검정방법|시험방법)")),
+    ("응시자격",       re.compile(r"(응시자격|결격사유)")),
+    ("합격기준",       re.compile(r"(합격기준|만점|평균|득점)")),
+    ("응시수수료",     re.compile(r"(응시수수료|수수료|응시료|원\b)")),
+)
+declare("parse.guess_label", (lab for lab, _ in _LABEL_GUESS_RULES), ordered=True)
+
 def _guess_label_from_rows(rows: list[list[str]]) -> str | None:
     flat = " ".join(" ".join(r) for r in rows)
-    if re.search(r"(문항수|시험시간|과목|배점)", flat): return "시험과목및배점"
-    if re.search(r"(객관식|주관식|필답형|작업형|복합형|면접|서술형|CBT|PBT|검정방법|시험방법)", flat): return "시험방법"
-    if re.search(r"(응시자격|결격사유)", flat): return "응시자격"
-    if re.search(r"(합격기준|만점|평균|득점)", flat): return "합격기준"
-    if re.search(r"(응시수수료|수수료|응시료|원\b)", flat): return "응시수수료"
+    for label, rx in _LABEL_GUESS_RULES:
+        if (rp_search("parse.guess_label", label, rx, flat) if RULE_PROFILE else rx.search(flat)):
+            return label
     return None
 
 def _is_schedule_table(rows: list[list[str]]) -> bool:
@@ -328,8 +357,9 @@ def _collect_section_images_by_heading(
 # 메인 파서
 # ──────────────────────────────────────────────────────────────────────────────
 def parse_exam_info_file(html_path: Path) -> dict:
+    sec_map = _sec_map()
     html = read_html(html_path)
-    soup = BeautifulSoup(html, "lxml")
+    soup = _soup(html)
     for bad in soup(["script", "style", "noscript"]):
         bad.decompose()
 
@@ -362,8 +392,8 @@ def parse_exam_info_file(html_path: Path) -> dict:
         if not m: continue
         i = int(m.group(1))
         dump = html_path.with_name(f"exam_info.frame.{i}.html")
-        if dump.exists():
-            frame_map[i] = dump.read_text(encoding="utf-8", errors="ignore")
+        if snapshot_codec.exists(dump):
+            frame_map[i] = read_html(dump)
         else:
             raw = _deep_unescape((fr.decode_contents() or "").strip())
             if raw: frame_map[i] = raw
@@ -438,7 +468,7 @@ def parse_exam_info_file(html_path: Path) -> dict:
             if txt: paras.append(f"{lab}: {txt}")
 
     have = {p.split(":", 1)[0] for p in paras if ":" in p}
-    need = set(SEC_MAP.keys()) & {"출제경향", "공개문제", "취득방법", "출제기준"}
+    need = set(sec_map.keys()) & {"출제경향", "공개문제", "취득방법", "출제기준"}
     if not need.issubset(have):
         for h in soup.select("b.contTit1"):
             title = clean(h.get_text()); label = _title_to_label(title)
@@ -462,14 +492,10 @@ def parse_exam_info_file(html_path: Path) -> dict:
 # ──────────────────────────────────────────────────────────────────────────────
 # 엔트리
 # ──────────────────────────────────────────────────────────────────────────────
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--jmcd", required=True)
-    ap.add_argument("--root", default="data/chansol_api")
-    args = ap.parse_args()
-
-    root = Path(args.root).resolve()
-    jm_root = root / args.jmcd
+def parse_jmcd(jmcd: str, root="data/chansol_api") -> Path:
+    """<root>/<jmcd>/*.html → 탭별 json + <jmcd>.json (CLI 와 engine_server 공용). 합친 파일 경로 반환."""
+    root = Path(root).resolve()
+    jm_root = root / jmcd
     jm_root.mkdir(parents=True, exist_ok=True)
 
     files = {
@@ -478,7 +504,7 @@ def main():
         "preference": jm_root / "preference.html",
     }
 
-    result = {"jmcd": args.jmcd, "tabs": {}}
+    result = {"jmcd": jmcd, "tabs": {}}
     for tab, f in files.items():
         try:
             parsed = parse_exam_info_file(f) if tab == "exam_info" else parse_file(f)
@@ -491,9 +517,17 @@ def main():
         print(f"[write] {out_json}")
         result["tabs"][tab] = parsed
 
-    merged = jm_root / f"{args.jmcd}.json"
+    merged = jm_root / f"{jmcd}.json"
     merged.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"[write] merged -> {merged}")
+    return merged
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jmcd", required=True)
+    ap.add_argument("--root", default="data/chansol_api")
+    args = ap.parse_args()
+    parse_jmcd(args.jmcd, args.root)
 
 if __name__ == "__main__":
     main()
@@ -21,6 +21,7 @@ RAW_DIR  = DATA_DIR / "raw_storage"
 LOG_DIR  = DATA_DIR / "_logs"
 ERR_DIR  = DATA_DIR / "_errors"
 
-# 필요하면 최초 import 시 폴더 생성
-for p in (DATA_DIR, RAW_DIR, LOG_DIR, ERR_DIR):
-    p.mkdir(parents=True, exist_ok=True)
+def ensure_dirs() -> None:
+    """데이터 폴더들 생성 (예전에는 import 시점에 했음 — 임포트만 하는 쪽에 파일시스템 부작용이 없도록 분리)."""
+    for p in (DATA_DIR, RAW_DIR, LOG_DIR, ERR_DIR):
+        p.mkdir(parents=True, exist_ok=True)
@@ -1,29 +1,27 @@
 # public_cert_api/run_public.py
 from __future__ import annotations
 from typing import Optional, Dict  # 파일 상단에 있으면 더 좋음
-import argparse, sys, subprocess, time, shutil, gzip
+import argparse, hashlib, sys, subprocess, time, shutil
 from pathlib import Path
 import json
-from .normalizers.v1_core.build_trace import build_norm_with_trace
+from engine_common import events, freshness, memory, metrics, snapshot_codec
 # run_public.py 상단
 import csv
 import os
 import re
 
-from prometheus_client import CollectorRegistry, Counter, Gauge , push_to_gateway
+from engine_common.metrics import push_to_gateway
 import time
 
 
 # 전역 변수로 registry를 먼저 생성 (이 줄이 빠졌거나 아래에 있을 겁니다)
-registry = CollectorRegistry()
+registry = metrics.Registry()     # prometheus_client 는 처음 지표를 쓸 때 임포트
 
 # 1. 수집할 데이터(Metrics) 정의
 # 성공 횟수 기록 (계속 올라가는 숫자)
-CRAWL_SUCCESS_TOTAL = Counter('crawl_success_total', 'Total number of successful crawls' , 
-    registry=registry)
+CRAWL_SUCCESS_TOTAL = registry.counter('crawl_success_total', 'Total number of successful crawls')
 # 현재 메모리 사용량 (오르락내리락하는 숫자)
-ENGINE_MEMORY_USAGE = Gauge('engine_memory_usage_bytes', 'Current memory usage of the engine' , 
-    registry=registry)
+ENGINE_MEMORY_USAGE = registry.gauge('engine_memory_usage_bytes', 'Current memory usage of the engine')
 
 def _clean_jmcd(s: str) -> str | None:
     # 앞뒤 공백, 따옴표, BOM 제거
@@ -64,11 +62,14 @@ def run(cmd: list[str]) -> None:
 def has(path: Path) -> bool:
     return path.exists()
 
+TAB_STEMS = ("basic_info", "exam_info", "preference")
+
+def has_html(jm_root: Path, stem: str) -> bool:
+    # .html 또는 압축본(.html.zst / .html.gz) 모두 인정
+    return snapshot_codec.exists(jm_root / f"{stem}.html")
+
 def exists_htmls(jm_root: Path) -> bool:
-    # .html 또는 .html.gz 둘 다 인정
-    def any_ext(stem: str) -> bool:
-        return has(jm_root / f"{stem}.html") or has(jm_root / f"{stem}.html.gz")
-    return all(any_ext(stem) for stem in ("basic_info","exam_info","preference"))
+    return all(has_html(jm_root, stem) for stem in TAB_STEMS)
 
 def exists_parsed(jm_root: Path) -> bool:
     # 9694.json 또는 9694 (무확장) 둘 다 인정
@@ -81,23 +82,19 @@ def exists_norm(jm_root: Path) -> bool:
     return has(base.with_suffix(".json")) or has(base)
 
 def compress_or_remove_htmls(jm_root: Path, policy: str) -> None:
-    files = [jm_root/"basic_info.html", jm_root/"exam_info.html", jm_root/"preference.html"]
-    for f in files:
-        if not f.exists():  # 이미 .gz일 수도 있음
-            gz = Path(str(f) + ".gz")
-            if gz.exists():
-                continue
-            else:
-                continue
-        if policy == "keep":
+    """
+    parse 이후 HTML 보존: keep=그대로, rm=삭제, auto|zst|gz=압축본으로 교체.
+    압축은 engine_common.snapshot_codec 백그라운드 스레드에서 스트리밍으로 (다음 jmcd 를 막지 않음, main 끝에서 drain).
+    이미 압축본만 있으면(.html 없음) 건너뜀 — 예전 .gz 를 .zst 로 바꾸려면 tools/snapshot_codec.py migrate.
+    """
+    for stem in TAB_STEMS:
+        f = jm_root / f"{stem}.html"
+        if policy == "keep" or not f.exists():
             continue
-        if policy == "gz":
-            gz_path = f.with_suffix(f.suffix + ".gz")
-            with f.open("rb") as src, gzip.open(gz_path, "wb") as dst:
-                dst.write(src.read())
-            f.unlink(missing_ok=True)
         if policy == "rm":
             f.unlink(missing_ok=True)
+        else:
+            snapshot_codec.compress_later(f, snapshot_codec.get_codec(policy))
 
 def ensure_free_space(root: Path, min_free_gb: float) -> None:
     free_gb = shutil.disk_usage(root).free / (1024**3)
@@ -133,9 +130,9 @@ def run_normalize_with_trace(root: Path, jmcd: str, cert_meta: Optional[Dict] =
 
     def read_json_variants(stem: str):
         for fname in [stem, f"{stem}.json"]:
-            p = jm_dir / fname
-            if p.exists():
-                return json.loads(p.read_text(encoding="utf-8"))
+            p = snapshot_codec.find(jm_dir / fname)      # 압축본(.zst/.gz)도 투명하게
+            if p is not None:
+                return json.loads(snapshot_codec.read_text(p))
         return None
 
     raw_p = jm_dir / "raw.json"
@@ -149,9 +146,16 @@ def run_normalize_with_trace(root: Path, jmcd: str, cert_meta: Optional[Dict] =
             raise FileNotFoundError(f"[{jmcd}] no raw.json and no basic_info/exam_info/preference files in {jm_dir}")
         raw = {"tabs": {"basic_info": bi, "exam_info": ex, "preference": pr}}
 
-    # build_norm_with_trace: (norm, trace, issues)
+    # build_norm_with_trace: (norm, trace, issues) — 정규화 모듈은 trace 를 만들 때만 임포트
+    from .normalizers.v1_core.build_trace import build_norm_with_trace
     _, trace, issues = build_norm_with_trace(raw, jmcd, name=None, type_str=None, issued_by=None)
 
+    # 원본 HTML 은 실제로 남아 있는 파일 이름으로 (.html / .html.zst / .html.gz)
+    for stem in TAB_STEMS:
+        src = snapshot_codec.find(jm_dir / f"{stem}.html")
+        if src is not None:
+            trace.setdefault("source_files", {})[f"{stem}_html"] = src.name
+
     # ← 여기서 certificate_id/이름을 trace 메타에 주입
     if cert_meta:
        trace.setdefault("_meta", {}).update({
@@ -175,11 +179,12 @@ def run_normalize_with_trace(root: Path, jmcd: str, cert_meta: Optional[Dict] =
             "certificate_id": (cert_meta.get("certificate_id") if cert_meta else None),
             "issues": issues
         }, ensure_ascii=False) + "\n")
+    return issues
 
     
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser(description="Fetch→Parse→Normalize 파이프라인")
     ap.add_argument("--root", help=r'예: C:\cert-data\chansol_api')
     ap.add_argument("--snapshot-root", help="스냅샷 루트 별칭(없으면 --root 사용)")
@@ -193,8 +198,9 @@ def main():
     ap.add_argument("--out", help=r'정규화 결과 저장 루트(예: C:\cert_norm_out)')
     ap.add_argument("--sleep", type=float, default=0.6, help="jmcd 간 대기(초)")
     ap.add_argument("--min-free-gb", type=float, default=5.0, help="최소 여유 용량(GB)")
-    ap.add_argument("--keep-html", choices=["keep","gz","rm"], default="gz",
-                    help="parse 이후 HTML 보존 정책: keep=그대로, gz=gzip 압축, rm=삭제")
+    ap.add_argument("--keep-html", choices=["keep","auto","zst","gz","rm"], default="auto",
+                    help="parse 이후 HTML 보존 정책: keep=그대로, zst=zstd(학습 사전) 압축, gz=gzip 압축, "
+                         "auto=zstandard 가 있으면 zst 아니면 gz (SNAPSHOT_CODEC), rm=삭제")
     ap.add_argument("--name", default="seed", help="태그/로그용 이름(선택)")
     ap.add_argument("--display-name", help="한글 표시명(파일 _meta.name 패치용)")
     ap.add_argument("--csv", help="certificate_id/jmcd 매핑 CSV 경로")
@@ -206,50 +212,92 @@ def main():
     # 선택: 쿠키 로그 on/off (환경변수 대신 플래그로)
     ap.add_argument("--cookie_log", action="store_true",
                 help="쿠키 적재/전송 정보 로그 출력")
-    args = ap.parse_args()
-
-    idmap = load_idmap(args.csv)
-
-    root_arg = args.snapshot_root or args.root
-    if not root_arg:
-        raise SystemExit("--root 또는 --snapshot-root 중 하나는 필요합니다.")
-    root = Path(root_arg).resolve()
-    ensure_free_space(root, args.min_free_gb)
-
+    ap.add_argument("--events", default=None, metavar="PATH|-",
+                help="jmcd 가 끝날 때마다 결과를 JSON Lines 로 기록 (-: stdout, 사람용 로그는 stderr; 기본 ENGINE_EVENTS)")
+    ap.add_argument("--events-inline", action="store_true", default=None,
+                help="결과 이벤트에 정규화 문서(norm.json)를 그대로 실음")
+    ap.add_argument("--server", default=os.getenv("ENGINE_SERVER"),
+                help="상주 엔진 서버 주소(예: http://127.0.0.1:8765, unix:/tmp/engine.sock) → 작업만 제출")
+    ap.add_argument("--tabs", help=f"fetch 할 탭만 (콤마 구분: {','.join(TAB_STEMS)}; 저장본이 없는 탭은 항상 받음)")
+    ap.add_argument("--inproc", choices=["auto", "on", "off"], default=os.getenv("PUBLIC_INPROC", "auto"),
+                    help="단계(parse/normalize…)를 이 프로세스에서 실행 (auto: snapshot 모드면 on — 자식 파이썬 기동/임포트 생략)")
+    ap.add_argument("--cache", action="store_true",
+                    help="결과 캐시(RESULT_CACHE, 탭 ttl:) 안의 jmcd 는 다시 수집하지 않고 캐시된 norm.json 을 저장")
+    ap.add_argument("--plan", help="재수집 계획 JSON(tools/recrawl_plan.py) → 계획의 jmcd 를 우선순위 순으로, 탭은 계획대로")
+    return ap
+
+def parse_steps(args) -> set:
     # steps 정리: snapshot 모드면 fetch 강제 제외
     steps = set(s.strip() for s in args.steps.split(",") if s.strip())
     if args.mode == "snapshot" and "fetch" in steps:
         steps.remove("fetch")
+    return steps
 
-    # 출력 루트
-    out_root = Path(args.out).resolve() if args.out else None
-    if out_root:
-        out_root.mkdir(parents=True, exist_ok=True)
+def use_inproc(args) -> bool:
+    """--inproc auto: 네트워크가 없는 snapshot 모드는 같은 프로세스에서 (jmcd 마다 자식 2개 기동이 대부분의 시간)."""
+    mode = getattr(args, "inproc", "auto") or "auto"
+    return mode == "on" or (mode == "auto" and args.mode == "snapshot")
 
-    for jmcd in iter_jmcds(args.jmcd, args.list, root):
-        jm_root = root / jmcd
-        jm_root.mkdir(parents=True, exist_ok=True)
-        print(f"\n===== [{jmcd}] ({args.name}) =====")
-
-        # 존재 체크 플래그
-        have_htmls = exists_htmls(jm_root)
-        have_parsed = exists_parsed(jm_root)
-        have_norm = exists_norm(jm_root)
-
-        # 스킵/포스 정책
-        def should(step_exists: bool) -> bool:
-            if args.force:  # 항상 실행
-                return True
-            if args.resume and step_exists:  # 있으면 건너뛰기
-                return False
+def fetch_tabs_for(jm_root: Path, tabs) -> Optional[list]:
+    """받을 탭 목록: tabs(계획/--tabs) + 저장본이 없는 탭. None 이면 전체."""
+    if not tabs:
+        return None
+    want = [t for t in TAB_STEMS if t in tabs or not has_html(jm_root, t)]
+    return None if len(want) == len(TAB_STEMS) else want
+
+def process_jmcd(jmcd: str, root: Path, args, steps: set, out_root: Optional[Path], idmap: dict,
+                 inproc: bool = False, session=None, cancel=None, unit: Optional[events.Unit] = None,
+                 tabs: Optional[list] = None) -> dict:
+    """
+    jmcd 하나의 fetch → parse → normalize (+ 패치/trace/지표).
+    - inproc=False(CLI): 단계마다 자식 파이썬 프로세스 (기존 동작)
+    - inproc=True(engine_server): 같은 프로세스에서 함수 호출 → 임포트/설정/규칙 캐시/세션(session) 재사용
+    - cancel: 단계 사이마다 호출 (취소됐으면 예외를 올리는 콜백)
+    - unit: 단계별 시간 기록/stage 이벤트 (engine_common.events)
+    - tabs: fetch 할 탭 (없으면 --tabs, 그것도 없으면 전체) — 재수집 계획 실행용
+    반환: {"out": norm.json 경로 또는 None, "issues": trace 이슈 목록 또는 None}
+    """
+    unit = unit or events.Unit("jmcd", jmcd)
+
+    def _checkpoint(stage: str):
+        unit.lap(stage)
+        if cancel is not None:
+            cancel()
+
+    jm_root = root / jmcd
+    jm_root.mkdir(parents=True, exist_ok=True)
+    print(f"\n===== [{jmcd}] ({args.name}) =====")
+
+    # 존재 체크 플래그
+    have_htmls = exists_htmls(jm_root)
+    have_parsed = exists_parsed(jm_root)
+    have_norm = exists_norm(jm_root)
+
+    # 스킵/포스 정책
+    def should(step_exists: bool) -> bool:
+        if args.force:  # 항상 실행
             return True
-
-        # 1) Fetch
-        if "fetch" in steps:
-            if args.mode == "snapshot":
-                print("[skip] fetch (snapshot mode)")
-            elif not should(have_htmls):
-                print("[skip] fetch (resume)")
+        if args.resume and step_exists:  # 있으면 건너뛰기
+            return False
+        return True
+
+    # 1) Fetch
+    if tabs is None and getattr(args, "tabs", None):
+        tabs = [t.strip() for t in args.tabs.split(",") if t.strip()]
+    fetched = None      # 이번에 받은 탭 (변경 이력 기록용)
+    if "fetch" in steps:
+        if args.mode == "snapshot":
+            print("[skip] fetch (snapshot mode)")
+        elif not should(have_htmls):
+            print("[skip] fetch (resume)")
+        else:
+            if args.cookie_log:
+               os.environ["FETCH_COOKIE_LOG"] = "1"
+            only = fetch_tabs_for(jm_root, tabs)
+            if inproc:
+                from .fetch_qnet_tabs_min import fetch_jmcd
+                fetch_jmcd(jmcd, str(root), frame_mode=args.frame_mode, prewarm=args.prewarm,
+                           cookies=args.cookies, session=session, tabs=only)
             else:
                 cmd = [sys.executable, "-m", "public_cert_api.fetch_qnet_tabs_min",
                "--jmcd", jmcd, "--out", str(root), "--frame-mode", args.frame_mode]
@@ -257,101 +305,271 @@ def main():
                    cmd += ["--prewarm"]
                 if args.cookies:
                    cmd += ["--cookies", args.cookies]
-                if args.cookie_log:
-                   os.environ["FETCH_COOKIE_LOG"] = "1"
+                if only:
+                   cmd += ["--tabs", ",".join(only)]
 
                 run(cmd)
-                have_htmls = exists_htmls(jm_root)
-                #run(cmd)는 public_cert_api.fetch_qnet_tabs로 자식 파이썬 프로세스를 띄우고
-                #자식 프로세스는 시작 시점에 부모(run_public)의 환경변수를 가져가므로 쿠키 로깅(쿠키 발급과정을 보여줌)을 켜려면
-                #run(cmd)를 호출 직전에 os.environ["FETCH_COOKIE_LOG"] = "1" -> 이걸로 설정해야 됨
-                #따라서 cookie.log안에 run(cmd)를 쓸 경우 이미 호출한 상태에서 쿠키 로깅을 키는 것이므로
-                #의미가 없다 그래서 반드시 호출전에 찍어야 된다.  
-        else:
-            print("[skip] fetch (steps)")
+            fetched = only or list(TAB_STEMS)
+            have_htmls = exists_htmls(jm_root)
+            #run(cmd)는 public_cert_api.fetch_qnet_tabs로 자식 파이썬 프로세스를 띄우고
+            #자식 프로세스는 시작 시점에 부모(run_public)의 환경변수를 가져가므로 쿠키 로깅(쿠키 발급과정을 보여줌)을 켜려면
+            #run(cmd)를 호출 직전에 os.environ["FETCH_COOKIE_LOG"] = "1" -> 이걸로 설정해야 됨
+            #따라서 cookie.log안에 run(cmd)를 쓸 경우 이미 호출한 상태에서 쿠키 로깅을 키는 것이므로
+            #의미가 없다 그래서 반드시 호출전에 찍어야 된다.  
+    else:
+        print("[skip] fetch (steps)")
+    _checkpoint("fetch")
 
-        # 2) Parse
-        if "parse" in steps:
-            if not should(have_parsed):
-                print("[skip] parse (resume)")
+    # 2) Parse
+    if "parse" in steps:
+        if not should(have_parsed):
+            print("[skip] parse (resume)")
+        else:
+            if inproc:
+                from .parse_tabs_min import parse_jmcd
+                parse_jmcd(jmcd, str(root))
             else:
                 run([sys.executable, "-m", "public_cert_api.parse_tabs_min",  "--jmcd", jmcd, "--root", str(root)])
-                compress_or_remove_htmls(jm_root, args.keep_html)
-                have_parsed = exists_parsed(jm_root)
-        else:
-            print("[skip] parse (steps)")
+            compress_or_remove_htmls(jm_root, args.keep_html)
+            have_parsed = exists_parsed(jm_root)
+    else:
+        print("[skip] parse (steps)")
+    _checkpoint("parse")
 
-        # 3) Normalize
-        if "normalize" in steps:
-            if not should(have_norm):
-                print("[skip] normalize (resume)")
+    # 3) Normalize
+    if "normalize" in steps:
+        if not should(have_norm):
+            print("[skip] normalize (resume)")
+        else:
+            if inproc:
+                from .normalizer_min_v1 import normalize_jmcd
+                normalize_jmcd(jmcd, str(root), out=str(out_root) if out_root else None)
             else:
                 cmd = [sys.executable, "-m", "public_cert_api.normalizer_min_v1",
                        "--jmcd", jmcd, "--root", str(root)]
                 if out_root:
                     cmd += ["--out", str(out_root)]
                 run(cmd)
-                have_norm = exists_norm(jm_root) or (out_root and any((out_root/ jmcd).parent.exists() for _ in [0]))
-        else:
-            print("[skip] normalize (steps)")
-
-        if args.csv:
-            cert = idmap.get(jmcd)
-            if cert:
-                # out_root가 있으면 out 쪽, 아니면 jm_root 쪽에서 찾음
-                target_root = out_root or jm_root
-                legacy = target_root / f"{jmcd}.norm.json"
-                if legacy.exists():
-                    obj = json.loads(legacy.read_text(encoding="utf-8"))
-                    meta = obj.setdefault("_meta", {})
-                    cid = cert.get("certificate_id")
-                    if cid:
-                        meta["certificate_id"] = str(cid)
-                    csv_name = (cert.get("certificate_name") or "").strip()
-                    if csv_name and (meta.get("name") in (None, "", jmcd)):
-                        meta["name"] = csv_name
-                    legacy.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
-                    print(f"[patch] add certificate_id -> {legacy}")
-                else:
-                    print(f"[patch][skip] legacy norm not found: {legacy}")    
-
-        ensure_free_space(root, args.min_free_gb)
-        time.sleep(args.sleep)
-
-        try:
-            run_normalize_with_trace(root, jmcd, cert_meta=idmap.get(jmcd))
-            print(f"[trace] norm_trace.json + issues.jsonl written for {jmcd}")
-        except Exception as e:
-            print(f"[trace][warn] failed to build trace for {jmcd}: {e}")
+            have_norm = exists_norm(jm_root) or (out_root and any((out_root/ jmcd).parent.exists() for _ in [0]))
+    else:
+        print("[skip] normalize (steps)")
+    unit.lap("normalize")
 
-        if args.display_name:
-            # out_root가 있으면 out 경로의 norm.json, 아니면 jm_root의 norm.json을 패치
+    if args.csv:
+        cert = idmap.get(jmcd)
+        if cert:
+            # out_root가 있으면 out 쪽, 아니면 jm_root 쪽에서 찾음
             target_root = out_root or jm_root
-            norm_path = target_root / f"{jmcd}.norm.json"
-            if norm_path.exists():
-                obj = json.loads(norm_path.read_text(encoding="utf-8"))
+            legacy = target_root / f"{jmcd}.norm.json"
+            if legacy.exists():
+                obj = json.loads(legacy.read_text(encoding="utf-8"))
                 meta = obj.setdefault("_meta", {})
-                meta["name"] = args.display_name
-                norm_path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
-                print(f"[patch] set _meta.name='{args.display_name}' -> {norm_path}")
+                cid = cert.get("certificate_id")
+                if cid:
+                    meta["certificate_id"] = str(cid)
+                csv_name = (cert.get("certificate_name") or "").strip()
+                if csv_name and (meta.get("name") in (None, "", jmcd)):
+                    meta["name"] = csv_name
+                legacy.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+                print(f"[patch] add certificate_id -> {legacy}")
             else:
-                print(f"[warn] norm file not found for display-name: {norm_path}")
+                print(f"[patch][skip] legacy norm not found: {legacy}")    
+
+    ensure_free_space(root, args.min_free_gb)
+    time.sleep(args.sleep)
+
+    issues = None
+    try:
+        issues = run_normalize_with_trace(root, jmcd, cert_meta=idmap.get(jmcd))
+        print(f"[trace] norm_trace.json + issues.jsonl written for {jmcd}")
+    except Exception as e:
+        print(f"[trace][warn] failed to build trace for {jmcd}: {e}")
+    unit.lap("trace")
+
+    if args.display_name:
+        # out_root가 있으면 out 경로의 norm.json, 아니면 jm_root의 norm.json을 패치
+        target_root = out_root or jm_root
+        norm_path = target_root / f"{jmcd}.norm.json"
+        if norm_path.exists():
+            obj = json.loads(norm_path.read_text(encoding="utf-8"))
+            meta = obj.setdefault("_meta", {})
+            meta["name"] = args.display_name
+            norm_path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+            print(f"[patch] set _meta.name='{args.display_name}' -> {norm_path}")
+        else:
+            print(f"[warn] norm file not found for display-name: {norm_path}")
+
+    # 🟢 [추가] 모든 단계가 성공적으로 끝난 이 시점에 지표 상승!
+    CRAWL_SUCCESS_TOTAL.inc()
+    memory.report(ENGINE_MEMORY_USAGE)
+    print(f"✅ [{jmcd}] 모니터링 지표 업데이트 완료")
 
-        # 🟢 [추가] 모든 단계가 성공적으로 끝난 이 시점에 지표 상승!
-        CRAWL_SUCCESS_TOTAL.inc()
-        print(f"✅ [{jmcd}] 모니터링 지표 업데이트 완료")
+    try:
+        push_to_gateway('pushgateway:9091', job='public-batch-engine', registry=registry)
+        print(f"📤 Metrics successfully pushed to Pushgateway for {jmcd}")
+    except Exception as e:
+        print(f"⚠️ Failed to push metrics for {jmcd}: {e}")
 
+    ensure_free_space(root, args.min_free_gb)
+    time.sleep(args.sleep) 
+
+    norm = (out_root or jm_root) / f"{jmcd}.norm.json"
+    if fetched and norm.exists():
+        # 새로 받은 탭의 섹션 해시 + 시험일정 날짜 → 재수집 계획(engine_common.freshness)
         try:
-            push_to_gateway('pushgateway:9091', job='public-batch-engine', registry=registry)
-            print(f"📤 Metrics successfully pushed to Pushgateway for {jmcd}")
-        except Exception as e:
-            print(f"⚠️ Failed to push metrics for {jmcd}: {e}")
+            freshness.observe_public(jmcd, json.loads(norm.read_text(encoding="utf-8")), fetched)
+        except ValueError as e:
+            print(f"[WARN] freshness: cannot read {norm}: {e}")
+    return {"out": norm if norm.exists() else None, "issues": issues}
+
+_PUBLIC_TTL: Optional[float] = None
+
+def _public_ttl() -> float:
+    """jmcd 결과 TTL — engine_server 와 같이 configs/cert_map.yaml 의 chansol_api 탭 ttl: 중 최솟값."""
+    global _PUBLIC_TTL
+    if _PUBLIC_TTL is None:
+        from engine_common import result_cache
+        import yaml
+        p = Path(__file__).resolve().parent / "configs" / "cert_map.yaml"
+        try:
+            cfg = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+        except (OSError, yaml.YAMLError) as e:
+            print(f"[WARN] result_cache: cannot read {p}: {e}")
+            cfg = {}
+        tabs = ((cfg.get("certifications") or {}).get("chansol_api") or {}).get("tabs") or []
+        _PUBLIC_TTL = result_cache.ttl_for(tabs)
+    return _PUBLIC_TTL
+
+# 캐시 키에서 뺄 옵션: 결과 문서를 바꾸지 않는 실행 제어(간격/로그/이벤트/대상 목록/캐시 자체)
+_KEY_IGNORE = {"jmcd", "list", "plan", "sleep", "min_free_gb", "events", "events_inline", "server",
+               "cache", "force", "resume", "cookie_log", "name", "inproc", "keep_html", "root", "snapshot_root",
+               "out", "steps", "tabs"}
+
+def _cache_key(jmcd: str, root: Path, args, steps: set, out_root: Optional[Path], tabs: Optional[list]) -> str:
+    """
+    jmcd 결과 캐시 키 — engine_server._cache_key 처럼 출력에 영향을 주는 옵션의 digest.
+    루트/출력 루트는 절대경로로, steps/탭은 정렬해서 넣는다 (--root A 의 결과가 --root B 에 쓰이지 않게).
+    """
+    ident = {k: v for k, v in vars(args).items() if k not in _KEY_IGNORE}
+    ident.update(root=str(Path(root).resolve()), out=str(out_root.resolve()) if out_root else None,
+                 steps=sorted(steps), tabs=sorted(tabs) if tabs else None)
+    digest = hashlib.sha1(json.dumps(ident, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()[:12]
+    return f"jmcd:{jmcd}:{digest}"
+
+def process_jmcd_cached(jmcd: str, root: Path, args, steps: set, out_root: Optional[Path], idmap: dict,
+                        tabs: Optional[list] = None, **kw) -> dict:
+    """
+    결과 캐시(engine_common.result_cache.get_or_load) 뒤의 process_jmcd — --cache.
+    TTL 안의 결과면 fetch/parse/normalize 없이 캐시된 norm 문서를 저장 위치에 쓴다.
+    stale 이면 저장된 문서를 먼저 쓰고 뒤에서 한 번 다시 수집(main 이 끝나기 전에 drain).
+    --force 는 캐시를 보지 않고 수집. normalize 단계가 없거나 RESULT_CACHE=off 면 process_jmcd 그대로.
+    """
+    from engine_common import result_cache
+    cache = result_cache.current()
+    if cache is None or "normalize" not in steps:
+        return process_jmcd(jmcd, root, args, steps, out_root, idmap, tabs=tabs, **kw)
+
+    def _load():
+        res = process_jmcd(jmcd, root, args, steps, out_root, idmap, tabs=tabs, **kw)
+        if res["out"] is None:
+            raise RuntimeError(f"{jmcd}: norm.json not produced")
+        return {"doc": json.loads(Path(res["out"]).read_text(encoding="utf-8")), "issues": res["issues"]}
+
+    key = _cache_key(jmcd, root, args, steps, out_root, tabs)
+    value, outcome = cache.get_or_load(key, _load, _public_ttl(), refresh=bool(args.force))
+    norm = (out_root or root / jmcd) / f"{jmcd}.norm.json"
+    if outcome in ("hit", "stale"):
+        norm.parent.mkdir(parents=True, exist_ok=True)
+        norm.write_text(json.dumps(value["doc"], ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[cache] {jmcd}: {outcome} ({key})")
+    return {"out": norm, "issues": value.get("issues"), "cache": outcome}
+
+def _submit_to_server(args) -> None:
+    """--server: 이 프로세스는 jmcd 작업만 제출하고 결과를 기다린다 (파이프라인은 상주 서버가 실행)."""
+    import engine_server
+    root_arg = args.snapshot_root or args.root
+    opts = {k: v for k, v in vars(args).items() if k not in ("server", "jmcd", "list", "plan") and v is not None}
+    opts["root"] = str(Path(root_arg).resolve())
+    unit_tabs: Dict[str, list] = {}
+    if args.plan:
+        unit_tabs = {u["id"]: u.get("tabs") for u in freshness.load_plan(args.plan, "jmcd")}
+        jmcds = [j for j in map(_clean_jmcd, unit_tabs) if j]
+    elif args.list:
+        jmcds = list(iter_jmcds(None, args.list, Path(root_arg)))
+    else:
+        jmcds = list(iter_jmcds(args.jmcd, None, Path(root_arg)))
+    failed = 0
+    for jmcd in jmcds:
+        o = dict(opts, tabs=",".join(unit_tabs[jmcd])) if unit_tabs.get(jmcd) else opts
+        res = engine_server.submit(args.server, {"jmcd": jmcd, "options": o}, wait=True)
+        failed += res.get("state") != "done"
+    print("\n[ALL DONE]" + (f" ({failed} failed)" if failed else ""))
+    if failed:
+        raise SystemExit(1)
+
+def main():
+    args = build_parser().parse_args()
 
-        # (선택 사항) 메모리 사용량 업데이트
-        # import psutil 등을 써서 ENGINE_MEMORY_USAGE.set(psutil.Process().memory_info().rss)
+    root_arg = args.snapshot_root or args.root
+    if not root_arg:
+        raise SystemExit("--root 또는 --snapshot-root 중 하나는 필요합니다.")
+    if args.server:
+        return _submit_to_server(args)
+    stream = events.open_stream(args.events, args.events_inline)   # 이후 사람용 로그는 (stdout 스트림이면) stderr
+
+    idmap = load_idmap(args.csv)
+
+    root = Path(root_arg).resolve()
+    ensure_free_space(root, args.min_free_gb)
 
-        ensure_free_space(root, args.min_free_gb)
-        time.sleep(args.sleep) 
+    steps = parse_steps(args)
+    inproc = use_inproc(args)
+
+    # 출력 루트
+    out_root = Path(args.out).resolve() if args.out else None
+    if out_root:
+        out_root.mkdir(parents=True, exist_ok=True)
+
+    plan_tabs: Dict[str, list] = {}
+    if args.plan:
+        # 계획 순서(우선순위) 그대로, jmcd 마다 계획된 탭만
+        plan_tabs = {u["id"]: u.get("tabs") for u in freshness.load_plan(args.plan, "jmcd")}
+        jmcds = [j for j in map(_clean_jmcd, plan_tabs) if j]
+        print(f"[plan] {args.plan}: {len(jmcds)} jmcd")
+    elif stream:
+        jmcds = list(iter_jmcds(args.jmcd, args.list, root))
+    else:
+        jmcds = iter_jmcds(args.jmcd, args.list, root)
+    if stream:
+        events.emit("start", kind="jmcd", units=jmcds)
+    t0, ok, failed = time.time(), 0, 0
+    try:
+        for jmcd in jmcds:
+            unit = events.Unit("jmcd", jmcd)
+            try:
+                pipeline = process_jmcd_cached if args.cache else process_jmcd
+                res = pipeline(jmcd, root, args, steps, out_root, idmap, inproc=inproc, unit=unit,
+                               tabs=plan_tabs.get(jmcd))
+            except BaseException as e:      # SystemExit(자식 실패/ENOSPC) 포함 → 기록 후 예전처럼 중단
+                unit.fail(e)
+                failed += 1
+                raise
+            unit.done(**res)
+            ok += 1
+    finally:
+        if args.cache:                      # stale 로 돌려준 jmcd 의 백그라운드 재수집이 끝날 때까지
+            from engine_common import result_cache
+            cache = result_cache.current()
+            if cache is not None and cache.drain():
+                print("[cache] background refresh done")
+        cz = snapshot_codec.drain()         # 백그라운드 HTML 압축이 끝날 때까지
+        if cz and (cz["done"] or cz["failed"]):
+            print(f"[snapshot] compressed {cz['done']} html ({cz['bytes_in'] / 1024:.0f}KB → "
+                  f"{cz['bytes_out'] / 1024:.0f}KB), failed {cz['failed']}")
+        if stream:
+            events.emit("end", kind="jmcd", ok=ok, failed=failed,
+                        skipped=len(jmcds) - ok - failed, seconds=round(time.time() - t0, 3))
+            events.close_stream()
 
     print("\n[ALL DONE]")
 
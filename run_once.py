@@ -1,9 +1,9 @@
 # run_once.py산
 # -*- coding: utf-8 -*-
 
-import argparse, importlib, json, yaml, inspect, sys
+import argparse, importlib, json, os, inspect, sys, threading
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Optional
 from collections import OrderedDict
 
 # ───────────────────────── paths / imports ─────────────────────────
@@ -12,65 +12,348 @@ ROOT = Path(__file__).parent
 sys.path.insert(0, str(ROOT / "private-cert-crawl"))
 sys.path.insert(0, str(ROOT / "public_cert_api"))
 
-from schemas.v1 import RootV1, MetaV1  # Engine/schemas 에 있어야 함
+# 기동 시간: selenium(waits 포함)·pydantic(schemas.v1)·yaml 은 실제로 쓰는 함수 안에서 임포트
+# (engine_server 기동, --server 제출, --help 는 이것들 없이 끝남 — tools/bench_startup.py 로 측정)
 
 # ───────────────────────── selenium driver ─────────────────────────
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from engine_common import browser_cache, browser_profile, driver_pool, events, freshness, http_fetch, memory, page_cache, snapshot
+from engine_common.driver_pool import DriverPool
 
-from prometheus_client import CollectorRegistry, Counter, Gauge, push_to_gateway
+from engine_common.metrics import Registry, push_to_gateway
 import time
 
-# 기존의 전역 변수 위치에 만드시면 됩니다.
-registry = CollectorRegistry()
+# 기존의 전역 변수 위치에 만드시면 됩니다. (prometheus_client 는 처음 지표를 쓸 때 임포트)
+registry = Registry()
 
 # 1. 수집할 데이터(Metrics) 정의
 # 성공 횟수 기록 (계속 올라가는 숫자)
-CRAWL_SUCCESS_TOTAL = Counter('crawl_success_total', 'Total number of successful crawls', registry=registry)
-ENGINE_MEMORY_USAGE = Gauge(
-    'engine_memory_usage_bytes', 
-    'Current memory usage of the engine', 
-    registry=registry # 👈 여기도요!
-)
+CRAWL_SUCCESS_TOTAL = registry.counter('crawl_success_total', 'Total number of successful crawls')
+ENGINE_MEMORY_USAGE = registry.gauge('engine_memory_usage_bytes', 'Current memory usage of the engine')
 
 def _make_driver(headless: bool = True):
     """Selenium Chrome WebDriver 생성 (동적 렌더링 필요 시 사용)."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
     opts = Options()
     opts.add_argument("--headless=new")  # 필요시 활성화
     opts.add_argument("--disable-dev-shm-usage")  # 대용량 페이지 충돌 방지
     opts.add_argument("--no-sandbox")
     opts.add_argument("--disable-gpu")
     opts.add_argument("--window-size=1280,2000")
-    return webdriver.Chrome(options=opts)
-
-def _call_runner(fn):
+    # 네트워크 이벤트 로그 → engine_common.waits.network_idle
+    opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    # 경량 프로필: eager 로드 + 이미지/폰트/미디어/트래커 차단 (BROWSER_PROFILE=full 이면 예전 동작)
+    browser_profile.configure(opts)
+    # BROWSER_CACHE_DIR 이 있으면 풀 슬롯별 고정 프로필(디스크 캐시 유지)로 기동
+    return browser_cache.launch(opts, lambda o: webdriver.Chrome(options=o))
+
+# ───────────────────────── driver pool ─────────────────────────
+# 탭마다 Chrome 을 새로 띄우지 않고 미리 띄운 브라우저를 빌려 쓴다.
+DRIVER_POOL_SIZE  = memory.env_size("DRIVER_POOL_SIZE", 2, memory.ENGINE_DRIVER_MB)   # auto: 가용 메모리 / ENGINE_DRIVER_MB
+DRIVER_MAX_PAGES  = int(os.getenv("DRIVER_MAX_PAGES", "40"))
+DRIVER_MAX_RSS_MB = float(os.getenv("DRIVER_MAX_RSS_MB", "900"))
+
+_POOL: Optional[DriverPool] = None
+
+def _on_discard(driver):
+    browser_profile.forget(driver)
+    browser_cache.release(driver)     # quit 된 뒤 → 프로필 슬롯 반납
+
+def get_pool() -> DriverPool:
+    global _POOL
+    if _POOL is None:
+        _POOL = DriverPool(
+            lambda: _make_driver(headless=True),
+            size=DRIVER_POOL_SIZE,
+            max_pages=DRIVER_MAX_PAGES,
+            max_rss_mb=DRIVER_MAX_RSS_MB,
+            on_lease=browser_profile.apply,     # 빌린 스레드의 탭 설정(allow/block)으로 차단 목록 갱신
+            on_discard=_on_discard,
+        )
+        driver_pool.set_current(_POOL)
+    return _POOL
+
+def close_pool():
+    global _POOL
+    if _POOL is not None:
+        print(f"[pool] {_POOL.stats}")
+        _POOL.close()
+        driver_pool.set_current(None)
+        _POOL = None
+
+# ───────────────────────── record / replay ─────────────────────────
+# --record DIR : 탭마다 드라이버 호출 결과(page_source, outerHTML …)와 HTTP 응답을 스냅샷으로 저장
+# --replay DIR : 브라우저/네트워크 없이 스냅샷을 같은 runner·parse 함수에 흘려 보냄
+SNAPSHOT_MODE: Optional[str] = None     # None | "record" | "replay"
+SNAPSHOT_DIR: Optional[Path] = None
+
+def set_snapshot_mode(mode: Optional[str], root: Optional[str]):
+    global SNAPSHOT_MODE, SNAPSHOT_DIR
+    SNAPSHOT_MODE = mode
+    SNAPSHOT_DIR = Path(root) if root else None
+    if mode == "replay" or "engine_common.waits" in sys.modules:
+        # 기록된 결과를 바로 돌려주므로 폴링 대기는 의미가 없다 (대기 루프 타임아웃은 스냅샷이 재현)
+        from engine_common import waits
+        waits.set_replay(mode == "replay")
+
+def open_run_scope():
+    """실행 범위 자원 준비: 드라이버 풀 미리 기동 + 탭/자격증 간 공유 페이지 캐시."""
+    if SNAPSHOT_MODE:
+        # 스냅샷은 탭 단위로 자기완결적이어야 함 → 탭 간 캐시/드라이버 fan-out 없이 순차
+        if SNAPSHOT_MODE == "record":
+            get_pool().warm()
+            driver_pool.set_current(None)
+        return
+    page_cache.set_current(page_cache.PageCache())
+    get_pool().warm()   # 설정/임포트 처리 중에 브라우저를 미리 기동
+
+def close_run_scope():
+    cache = page_cache.current()
+    if cache is not None:
+        st = cache.stats()
+        print(f"[page-cache] saved {st['hits']} page loads (misses={st['misses']}, pages={st['pages']})")
+        for k, n in st["by_key"].items():
+            print(f"  {n:>3} × {k}")
+        page_cache.set_current(None)
+    close_pool()
+
+def _call_runner(fn, snap=None, driver=None):
     """
     runner 호출 헬퍼.
     - 시그니처가 ()면 fn() 호출
-    - 첫 인자가 driver면 WebDriver를 만들어 fn(driver) 호출
+    - 첫 인자가 driver면 풀에서 WebDriver를 빌려 fn(driver) 호출 (반납 시 상태 초기화)
+    - driver 를 받으면(사이트 단위 수집) 새로 빌리지 않고 그 드라이버로 호출
+    - snap 이 Recorder 면 드라이버를 기록용으로 감싸고, Replayer 면 브라우저 없이 재생
     """
     sig = inspect.signature(fn)
     params = list(sig.parameters.keys())
     if not params:
         return fn()
     if params[0] == "driver":
-        driver = _make_driver(headless=True)
-        try:
+        if driver is not None:
+            browser_profile.apply(driver)     # 사이트 단위 수집: 같은 드라이버라도 탭마다 차단 목록이 다를 수 있음
+            return fn(driver)
+        if isinstance(snap, snapshot.Replayer):
+            return fn(snapshot.ReplayDriver(snap))
+        with get_pool().lease() as driver:
+            if isinstance(snap, snapshot.Recorder):
+                driver = snapshot.RecordingDriver(driver, snap)
             return fn(driver)
-        finally:
-            driver.quit()
     raise TypeError("runner는 인자 없이 호출되거나 첫번째 인자가 driver여야 합니다.")
 
+# ───────────────────────── fetch mode ─────────────────────────
+def _http_html(url: str, snap=None) -> Optional[str]:
+    key = snapshot.http_key(url)
+    if isinstance(snap, snapshot.Replayer):
+        return snap.take(key)
+    if isinstance(snap, snapshot.Recorder):
+        try:
+            html = http_fetch.fetch_html(url)
+        except Exception as e:
+            snap.add(key, {"$exc": type(e).__name__, "msg": str(e)[:200]})
+            raise
+        snap.add(key, html)
+        return html
+    return page_cache.cached(url, ("http",), lambda: http_fetch.fetch_html(url))
+
+def _collect_raw(t: dict, run_fn, cert: Optional[str] = None, prefetched: Optional[dict] = None):
+    """사이트 단위로 미리 수집된 결과가 있으면 그것, 스냅샷 모드면 탭 단위 기록/재생을 감싸서 _collect_tab 실행."""
+    if not SNAPSHOT_MODE:
+        hit, raw = _take_prefetched(prefetched, cert, t["name"])
+        if hit:
+            print(f"[site] {cert}/{t['name']}: prefetched")
+            return raw
+        return _collect_tab(t, run_fn)
+    path = snapshot.snapshot_path(SNAPSHOT_DIR, cert or "_", t["name"])
+    if SNAPSHOT_MODE == "replay":
+        return _collect_tab(t, run_fn, snapshot.Replayer(snapshot.read_snapshot(path)))
+    rec = snapshot.Recorder()
+    try:
+        return _collect_tab(t, run_fn, rec)
+    finally:
+        snapshot.write_snapshot(path, rec.calls)
+        print(f"[record] {path}")
+
+def _collect_tab(t: dict, run_fn, snap=None, driver=None):
+    """
+    탭 설정의 fetch 모드에 따라 원시 데이터 수집.
+    - browser(기본): runner(driver) 그대로
+    - http : runner 모듈의 parse_page(html) 에 HTTP 응답 HTML 을 넘김 (url: 또는 모듈의 PAGE_URL)
+    - auto : HTTP 먼저, 실패하거나 markers(기대 표 마커)가 없으면 browser 로 폴백
+    브라우저 요청 차단은 탭의 allow:/block: 으로 조정 (engine_common.browser_profile)
+    """
+    with browser_profile.scope(t.get("allow"), t.get("block")):
+        return _fetch_tab(t, run_fn, snap, driver)
+
+def _fetch_tab(t: dict, run_fn, snap=None, driver=None):
+    mode = (t.get("fetch") or "browser").lower()
+    if mode == "browser":
+        return _call_runner(run_fn, snap, driver)
+    if mode not in ("http", "auto"):
+        raise ValueError(f"unknown fetch mode: {mode} ({t.get('name')})")
+
+    mod = importlib.import_module(t["runner"].split(":")[0])
+    parse = getattr(mod, "parse_page", None)
+    url = t.get("url") or getattr(mod, "PAGE_URL", None)
+    if not (callable(parse) and url):
+        if mode == "http":
+            raise TypeError(f"fetch=http 인데 parse_page/PAGE_URL 이 없습니다: {t['runner']}")
+        return _call_runner(run_fn, snap, driver)
+
+    try:
+        html = _http_html(url, snap)
+    except Exception as e:
+        if mode == "http":
+            raise
+        print(f"[WARN] {t.get('name')}: http fetch failed ({e}) → browser")
+        return _call_runner(run_fn, snap, driver)
+
+    if mode == "auto" and not http_fetch.has_markers(html, t.get("markers")):
+        print(f"[fetch] {t.get('name')}: markers missing → browser")
+        return _call_runner(run_fn, snap, driver)
+
+    print(f"[fetch] {t.get('name')}: http")
+    return parse(html)
+
+# ───────────────────────── site units ─────────────────────────
+# cert_map 의 sites: 같은 사이트 자격증들을 브라우저 세션 1개로 한 번에 수집 → 탭별 raw 를 자격증 run() 으로 나눠 줌
+#   crawler: "모듈:함수" (driver, plan{cert: [탭 설정]}) → {cert: {탭 이름: raw}}
+#            없으면 _crawl_tabs (탭 runner/fetch 모드 그대로, 같은 드라이버로 순차)
+# 결과가 없는 탭은 run() 에서 평소처럼 탭별로 다시 수집한다.
+# 미리 수집한 결과 {(cert, 탭 이름): raw} 는 실행(작업) 하나의 것 → prefetch_sites 가 돌려준 dict 를 run(prefetched=)
+# 으로 넘긴다. 모듈 전역에 두면 쓰이지 않은 사이트 동료 탭이 상주 서버/워커에서 다음 작업까지 남아 오래된 결과가 된다.
+_PREFETCH_LOCK = threading.Lock()
+
+def _take_prefetched(prefetched: Optional[dict], cert: Optional[str], tab: str):
+    if not prefetched:
+        return False, None
+    with _PREFETCH_LOCK:
+        if (cert, tab) in prefetched:
+            return True, prefetched.pop((cert, tab))
+    return False, None
+
+class _LazyDriver:
+    """사이트 단위 수집용 드라이버: 처음 쓰일 때 풀에서 1개 대여 (HTTP 로 끝나는 사이트는 브라우저를 띄우지 않음)."""
+    def __init__(self, pool: DriverPool):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_lease", None)
+        object.__setattr__(self, "_driver", None)
+
+    def _get(self):
+        if self._driver is None:
+            lease = self._pool.lease()
+            object.__setattr__(self, "_driver", lease.__enter__())
+            object.__setattr__(self, "_lease", lease)
+        return self._driver
+
+    @property
+    def leased(self) -> bool:
+        return self._driver is not None
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._lease is not None:
+            self._lease.__exit__(*exc)
+        return False
+
+def _crawl_tabs(driver, plan: dict) -> dict:
+    """기본 사이트 crawler: 자격증/탭 순서대로 _collect_tab (HTTP 빠른 경로 우선, 브라우저는 driver 하나를 공유)."""
+    out = {}
+    for cert, tabs in plan.items():
+        for t in tabs:
+            try:
+                out.setdefault(cert, {})[t["name"]] = _collect_tab(t, import_callable(t["runner"]), driver=driver)
+            except Exception as e:
+                print(f"[WARN] site {cert}/{t['name']}: {type(e).__name__}: {e}")
+    return out
+
+def site_groups(cfg: dict, certs: Iterable[str]) -> list[tuple[str, dict, list[str]]]:
+    """실행 대상 자격증 중 사이트 단위로 묶을 그룹 [(사이트, 설정, 자격증들)] (crawler 가 없으면 2개 이상일 때만)."""
+    certs = list(certs)
+    groups = []
+    for name, site in (cfg.get("sites") or {}).items():
+        members = [c for c in site.get("certs") or [] if c in certs]
+        if len(members) >= (1 if site.get("crawler") else 2):
+            groups.append((name, site, members))
+    return groups
+
+def crawl_site(name: str, site: dict, members: list[str], cfg: dict,
+               tabs: Optional[Iterable[str]] = None, into: Optional[dict] = None) -> int:
+    """사이트 그룹 하나 수집 → into 에 저장. 반환: 미리 수집한 탭 수 (실패는 0 → 탭별 수집으로 폴백)."""
+    plan = OrderedDict((c, _pick_tabs(cfg["certifications"][c]["tabs"], tabs)) for c in members)
+    crawler = import_callable(site["crawler"]) if site.get("crawler") else _crawl_tabs
+    n_tabs = sum(len(v) for v in plan.values())
+    t0 = time.time()
+    results = {}
+    driver = _LazyDriver(get_pool())
+    allow, block = browser_profile.merge(t for v in plan.values() for t in v)
+    from engine_common import waits
+    with waits.budget(site.get("budget") or waits.TAB_BUDGET_S * n_tabs, f"site/{name}"), \
+         browser_profile.scope(allow, block):
+        try:
+            with driver:       # 예외면 빌린 브라우저는 폐기(풀 lease 규칙)
+                results = crawler(driver, plan) or {}
+        except Exception as e:
+            print(f"[WARN] site {name} failed: {type(e).__name__}: {e}")
+    n = 0
+    with _PREFETCH_LOCK:
+        for cert, by_tab in results.items():
+            for tab, raw in (by_tab or {}).items():
+                if into is not None:
+                    into[(cert, tab)] = raw
+                n += 1
+    print(f"[site] {name}: {n}/{n_tabs} tabs for {','.join(members)} in {time.time() - t0:.1f}s "
+          f"(browser sessions: {int(driver.leased)})")
+    return n
+
+def _crawl_site_safe(*args) -> int:
+    try:
+        return crawl_site(*args)
+    except Exception as e:        # 설정 오류 등 → 탭별 수집으로 폴백
+        print(f"[WARN] site {args[0]} failed: {type(e).__name__}: {e}")
+        return 0
+
+def prefetch_sites(cfg: dict, certs: Iterable[str], tabs: Optional[Iterable[str]] = None) -> dict:
+    """사이트 그룹을 차례로 미리 수집 (단일 자격증 실행용) → run(prefetched=) 에 넘길 dict. 스냅샷 모드에서는 하지 않음."""
+    prefetched: dict = {}
+    if SNAPSHOT_MODE:
+        return prefetched
+    for name, site, members in site_groups(cfg, certs):
+        _crawl_site_safe(name, site, members, cfg, tabs, prefetched)
+    return prefetched
+
 # ───────────────────────── config loader ─────────────────────────
+_CFG_CACHE: dict = {}        # 절대경로 → (mtime_ns, cfg)
+_CFG_LOCK = threading.Lock()
+
 def load_cfg(path: Optional[str] = None):
     """
     파이프라인 YAML 로드.
     - path가 주어지면 해당 경로 사용
     - 없으면 ROOT/configs/cert_map.yaml 사용
+    - 파일 수정 시각이 같으면 이전에 읽은 dict 재사용 (읽기 전용으로 쓸 것)
+      → 상주 서버(engine_server)는 YAML 을 고치면 다음 작업부터 새 설정을 읽는다
     """
-    p = Path(path) if path else ROOT / "configs" / "cert_map.yaml"
+    p = (Path(path) if path else ROOT / "configs" / "cert_map.yaml").resolve()
+    mtime = p.stat().st_mtime_ns
+    with _CFG_LOCK:
+        hit = _CFG_CACHE.get(p)
+        if hit and hit[0] == mtime:
+            return hit[1]
+    import yaml
     with open(p, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        cfg = yaml.safe_load(f)
+    with _CFG_LOCK:
+        _CFG_CACHE[p] = (mtime, cfg)
+    return cfg
 
 # ───────────────────────── dynamic import ─────────────────────────
 def import_callable(spec: str):
@@ -127,6 +410,9 @@ def run(
     tabs: Optional[Iterable[str]] = None,
     out: Optional[str] = None,
     config_path: Optional[str] = None,
+    cancel: Optional[Callable[[], None]] = None,
+    unit: Optional[events.Unit] = None,
+    prefetched: Optional[dict] = None,
 ):
     """
     실행 파이프라인(수집 → 정규화 → 검증 → 저장).
@@ -134,7 +420,12 @@ def run(
     - tabs: 실행할 탭 이름들의 이터러블 (없으면 전체)
     - out : 출력 경로 (없으면 기본 경로)
     - config_path: 사용할 YAML 경로
+    - cancel: 탭마다 수집 전에 호출 (engine_server 작업 취소 시 예외를 올림)
+    - unit: 탭별 시간 기록 → stage 이벤트 (engine_common.events, 결과 이벤트는 호출 쪽에서)
+    - prefetched: prefetch_sites 결과 (사이트 단위로 미리 수집한 탭은 다시 수집하지 않음, 쓴 항목은 꺼냄)
     """
+    from engine_common import waits
+    from schemas.v1 import RootV1, MetaV1  # Engine/schemas 에 있어야 함
     cfg = load_cfg(config_path)
     cert_cfg = cfg["certifications"].get(cert)
     if not cert_cfg:
@@ -151,9 +442,13 @@ def run(
 
     # 각 탭별로 runner → normalizer 실행 후 섹션 채우기
     for t in sel_tabs:
+        if cancel is not None:
+            cancel()
         run_fn = import_callable(t["runner"])
         norm_fn = import_callable(t["normalizer"])
-        raw = _call_runner(run_fn)  # 원시 데이터 수집
+        with waits.budget(t.get("budget"), f"{cert}/{t.get('name')}") as b:
+            raw = _collect_raw(t, run_fn, cert, prefetched)  # 원시 데이터 수집 (fetch: browser|http|auto)
+        print(f"[tab] {cert}/{t.get('name')}: {b.elapsed():.1f}s")
         if t.get("name") == "exam_schedule":
             try:
                 print("RAW rows:", len(raw.get("시험일정", {}).get("정기검정일정", [])))
@@ -161,6 +456,8 @@ def run(
                 pass
         section = norm_fn(raw)      # 정규화
         root[t["target"]] = section # 대상 섹션에 삽입
+        if unit is not None:
+            unit.lap(t.get("name") or t["target"])
         # ✅ [성공 지표 업데이트] 탭 하나가 성공할 때마다 카운트 증가
         CRAWL_SUCCESS_TOTAL.inc()
 
@@ -170,6 +467,12 @@ def run(
     # 최종 스키마 검증
     RootV1.model_validate(root)
 
+    # 탭별 결과 해시 + 시험일정 날짜 → 재수집 계획 (스냅샷 재생은 실제 변경이 아니므로 기록 안 함)
+    if SNAPSHOT_MODE != "replay":
+        sched = any(t["target"] == "시험일정" for t in sel_tabs)
+        freshness.observe("cert", cert, {t["name"]: root[t["target"]] for t in sel_tabs},
+                          root["시험일정"] if sched else None)
+
     # ── (추가) 공공용: 시험일정을 리스트로 평탄화한 사본 저장
     def _save_flat_schedule_copy(root: dict, out_path: Path):
         # 1) 시험일정 평탄화
@@ -225,6 +528,49 @@ def run(
     #print(f"✔ saved: {out_path}")
 
     _save_flat_schedule_copy(root, out_path)   # ← 여기
+    memory.report(ENGINE_MEMORY_USAGE)
+    return out_path
+
+def run_cached(
+    cert: str,
+    tabs: Optional[Iterable[str]] = None,
+    out: Optional[str] = None,
+    config_path: Optional[str] = None,
+    **kw,
+):
+    """
+    결과 캐시(engine_common.result_cache.get_or_load) 뒤의 사이트 단위 수집 + run() — CLI --cache.
+    - 같은 cert·탭 결과가 TTL 안이면 수집 없이 저장된 문서를 out 에 씀 (hit)
+    - TTL 이 지났지만 stale 기간이면 저장된 문서를 먼저 쓰고 뒤에서 한 번 다시 수집 (호출 쪽에서 drain)
+    - RESULT_CACHE=off 이거나 스냅샷 모드면 run() 과 같음
+    반환: (저장 경로, "hit" | "stale" | "miss" | "shared" | "off")
+    """
+    from engine_common import result_cache
+    cfg = load_cfg(config_path)
+    cert_cfg = cfg["certifications"].get(cert)
+    if not cert_cfg:
+        raise SystemExit(f"unknown cert: {cert}")
+
+    def _load():
+        pre = prefetch_sites(cfg, [cert], tabs)
+        saved = run(cert=cert, tabs=tabs, out=out, config_path=config_path, prefetched=pre, **kw)
+        return json.loads(Path(saved).read_text(encoding="utf-8"))
+
+    cache = result_cache.current()
+    if cache is None or SNAPSHOT_MODE:
+        pre = prefetch_sites(cfg, [cert], tabs)
+        return run(cert=cert, tabs=tabs, out=out, config_path=config_path, prefetched=pre, **kw), "off"
+    sel = _pick_tabs(cert_cfg["tabs"], tabs)
+    cfg_path = (Path(config_path) if config_path else ROOT / "configs" / "cert_map.yaml").resolve()
+    key = f"cert:{cert}:{','.join(t['name'] for t in sel)}:{cfg_path}"   # 다른 cert_map 의 결과와 섞이지 않게
+    doc, outcome = cache.get_or_load(key, _load, result_cache.ttl_for(sel))
+    out_path = Path(out)
+    if out_path.is_dir():
+        out_path = out_path / f"{cert}.norm.json"
+    if outcome in ("hit", "stale"):
+        out_path.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[cache] {cert}: {outcome} ({key})")
+    return out_path, outcome
 
 def _infer_cert_from_cwd(cfg) -> Optional[str]:
     """
@@ -234,8 +580,72 @@ def _infer_cert_from_cwd(cfg) -> Optional[str]:
     cwd = Path.cwd().name
     return cwd if cwd in cfg.get("certifications", {}) else None
 
+# ───────────────────────── multi-cert ─────────────────────────
+def run_many(
+    certs: list[str],
+    tabs: Optional[Iterable[str]] = None,
+    out_dir: Optional[str] = None,
+    config_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    cancel: Optional[Callable[[], None]] = None,
+):
+    """
+    여러 자격증을 병렬 실행(드라이버 풀 공유).
+    - 자격증 단위로 격리: 한 사이트가 실패해도 나머지는 계속 진행
+    - 각 자격증은 run() 그대로 → RootV1 검증 + 개별 파일 저장
+    - cert_map sites: 그룹은 사이트 단위 수집을 먼저 제출하고, 그 자격증들은 끝날 때까지 기다렸다가 결과를 정규화
+    - cancel: run() 에 그대로 전달 (취소되면 남은 자격증은 시작하지 않음)
+    - 반환: [{cert, ok, seconds, out|error}, ...] (입력 순서)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = max(1, min(workers or DRIVER_POOL_SIZE, len(certs) or 1))
+    cfg = None if SNAPSHOT_MODE else load_cfg(config_path)
+    groups = site_groups(cfg, certs) if cfg else []
+
+    def _one(cert: str) -> dict:
+        t0 = time.time()
+        unit = events.Unit("cert", cert)
+        fut = site_of.get(cert)
+        if fut is not None:
+            fut.result()    # 사이트 단위 수집 완료 대기 (먼저 제출돼 이미 실행 중이라 교착 없음)
+            unit.lap("site")
+        try:
+            if cancel is not None:
+                cancel()
+            if out_dir:
+                d = Path(out_dir)
+                d.mkdir(parents=True, exist_ok=True)
+                out = d
+            else:
+                out = default_output_for(cert)
+            saved = run(cert=cert, tabs=tabs, out=out, config_path=config_path, cancel=cancel, unit=unit,
+                        prefetched=prefetched)
+            unit.done(out=saved)      # 끝나는 순서대로 즉시 (ex.map 의 입력 순서와 무관)
+            return {"cert": cert, "ok": True, "seconds": round(time.time() - t0, 1), "out": str(saved)}
+        except (Exception, SystemExit) as e:  # SystemExit(unknown cert) 포함
+            print(f"[WARN] {cert} failed: {type(e).__name__}: {e}")
+            unit.fail(e)
+            return {"cert": cert, "ok": False, "seconds": round(time.time() - t0, 1),
+                    "error": f"{type(e).__name__}: {e}"}
+
+    prefetched: dict = {}     # 이 run_many 호출의 사이트 단위 수집 결과 (끝나면 남은 것도 함께 버려짐)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cert") as ex:
+        site_of = {}
+        for name, site, members in groups:
+            fut = ex.submit(_crawl_site_safe, name, site, members, cfg, tabs, prefetched)
+            site_of.update((c, fut) for c in members)
+        results = list(ex.map(_one, certs))
+
+    ok = sum(1 for r in results if r["ok"])
+    print(f"[summary] {ok}/{len(results)} certs ok (workers={workers})")
+    for r in results:
+        mark = "✔" if r["ok"] else "✘"
+        print(f"  {mark} {r['cert']:<30} {r['seconds']:>6}s  {r.get('out') or r.get('error')}")
+    return results
+
 # ───────────────────────── CLI ─────────────────────────
-def main():
+def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         prog="cert-crawler",
         description="자격증 탭 크롤러 (runner → normalizer → v1 validate → save)",
@@ -244,20 +654,129 @@ def main():
     p.add_argument("--out", help="출력 파일 경로 직접 지정")
     p.add_argument("--tabs", help="실행할 탭 이름들을 콤마(,)로 구분해 지정 (예: 시험일정,시험내용)")
     p.add_argument("--config", help="사용할 YAML 경로 (예: .\\private-cert-crawl\\configs\\cert_map.yaml)")
-    args = p.parse_args()
+    p.add_argument("--all", action="store_true", help="config 의 모든 자격증을 병렬 실행")
+    p.add_argument("--certs", help="병렬 실행할 자격증들을 콤마(,)로 구분해 지정 (예: gtq,itq)")
+    p.add_argument("--workers", type=int, help="병렬 실행 수 (기본: DRIVER_POOL_SIZE)")
+    p.add_argument("--events", default=None, metavar="PATH|-",
+                   help="자격증이 끝날 때마다 결과를 JSON Lines 로 기록 (-: stdout, 사람용 로그는 stderr; 기본 ENGINE_EVENTS)")
+    p.add_argument("--events-inline", action="store_true", default=None,
+                   help="결과 이벤트에 저장한 문서를 그대로 실음")
+    p.add_argument("--server", default=os.getenv("ENGINE_SERVER"),
+                   help="상주 엔진 서버 주소(예: http://127.0.0.1:8765, unix:/tmp/engine.sock) → 작업만 제출하고 대기")
+    p.add_argument("--plan", help="재수집 계획 JSON(tools/recrawl_plan.py) → 계획의 자격증만 우선순위 순으로 병렬 실행")
+    p.add_argument("--cache", action="store_true",
+                   help="단일 자격증: 결과 캐시(RESULT_CACHE, 탭 ttl:) 안의 결과면 수집 없이 그 문서를 저장")
+    snap = p.add_mutually_exclusive_group()
+    snap.add_argument("--record", metavar="DIR", help="탭별 페이지/표 HTML 스냅샷을 DIR 에 기록")
+    snap.add_argument("--replay", metavar="DIR", help="DIR 스냅샷으로 브라우저·네트워크 없이 재실행")
+    return p
+
+def _drain_result_cache() -> None:
+    """stale 결과를 돌려주고 시작한 백그라운드 갱신을 마치고 종료 (드라이버 풀을 닫기 전에)."""
+    from engine_common import result_cache
+    cache = result_cache.current()
+    if cache is not None and cache.drain():
+        print("[cache] background refresh done")
+
+def _submit_to_server(args) -> None:
+    """--server: 수집은 상주 서버(웜 풀)가 하고, 이 프로세스는 작업 제출 → 결과 대기만."""
+    import engine_server
+    job = {"tabs": args.tabs, "workers": args.workers,
+           "config": str(Path(args.config).resolve()) if args.config else None}
+    if args.all:
+        job["all"] = True
+    elif args.plan:
+        job["certs"] = ",".join(u["id"] for u in freshness.load_plan(args.plan, "cert"))
+    elif args.certs:
+        job["certs"] = args.certs
+    else:
+        job["cert"] = args.cert or _infer_cert_from_cwd(load_cfg(args.config))
+        if not job["cert"]:
+            raise SystemExit("cert를 알 수 없습니다. --cert 지정 또는 자격증 폴더에서 실행하세요.")
+    if args.out:
+        job["out"] = str(Path(args.out).resolve())
+    res = engine_server.submit(args.server, {k: v for k, v in job.items() if v is not None}, wait=True)
+    if res.get("state") != "done":
+        sys.exit(1)
+
+def main():
+    args = build_parser().parse_args()
+
+    # 스냅샷 기록/재생은 이 프로세스의 드라이버·네트워크를 감싸야 하므로 서버로 보내지 않는다
+    if args.server and not (args.record or args.replay):
+        return _submit_to_server(args)
+
+    if args.record:
+        set_snapshot_mode("record", args.record)
+    elif args.replay:
+        set_snapshot_mode("replay", args.replay)
 
     cfg = load_cfg(args.config)
+
+    tabs = None
+    if args.tabs:
+        tabs = [s.strip() for s in args.tabs.split(",") if s.strip()]
+
+    if args.all or args.certs or args.plan:
+        if args.plan:
+            # 사설은 자격증 단위로 다시 받는다 (부분 탭 run() 은 나머지 섹션을 비운 채 저장하므로 탭은 전체)
+            certs = [u["id"] for u in freshness.load_plan(args.plan, "cert")]
+            print(f"[plan] {args.plan}: {len(certs)} certs")
+        elif args.all:
+            certs = list(cfg.get("certifications", {}))
+        else:
+            certs = [s.strip() for s in args.certs.split(",") if s.strip()]
+        stream = events.open_stream(args.events, args.events_inline)
+        events.emit("start", kind="cert", units=certs)
+        t0 = time.time()
+        open_run_scope()
+        try:
+            results = run_many(certs, tabs=tabs, out_dir=args.out, config_path=args.config,
+                               workers=args.workers)
+        finally:
+            close_run_scope()
+        if stream:
+            ok = sum(1 for r in results if r["ok"])
+            events.emit("end", kind="cert", ok=ok, failed=len(results) - ok, seconds=round(time.time() - t0, 3))
+            events.close_stream()
+        try:
+            push_to_gateway('pushgateway:9091', job='batch-engine-all', registry=registry)
+            print("📤 Metrics successfully pushed to Pushgateway for all certs")
+        except Exception as e:
+            print(f"⚠️ Failed to push metrics: {e}")
+        if not all(r["ok"] for r in results):
+            sys.exit(1)
+        return
+
     cert = args.cert or _infer_cert_from_cwd(cfg)
     if not cert:
         raise SystemExit("cert를 알 수 없습니다. --cert 지정 또는 자격증 폴더에서 실행하세요.")
 
     out = args.out or default_output_for(cert)
 
-    tabs = None
-    if args.tabs:
-        tabs = [s.strip() for s in args.tabs.split(",") if s.strip()]
-
-    run(cert=cert, tabs=tabs, out=out, config_path=args.config)
+    stream = events.open_stream(args.events, args.events_inline)
+    events.emit("start", kind="cert", units=[cert])
+    unit = events.Unit("cert", cert)
+    open_run_scope()
+    try:
+        if args.cache:
+            saved, outcome = run_cached(cert, tabs=tabs, out=out, config_path=args.config, unit=unit)
+            unit.done(out=saved, cache=outcome)
+            _drain_result_cache()
+        else:
+            pre = prefetch_sites(cfg, [cert], tabs)   # KPC 처럼 crawler 가 있는 사이트면 한 번 방문으로 탭 전체 수집
+            unit.lap("site")
+            saved = run(cert=cert, tabs=tabs, out=out, config_path=args.config, unit=unit, prefetched=pre)
+            unit.done(out=saved)
+    except BaseException as e:
+        unit.fail(e)
+        raise
+    finally:
+        close_run_scope()
+        if stream:
+            events.emit("end", kind="cert", ok=int(unit.ok), failed=int(not unit.ok),
+                        seconds=round(time.time() - unit.t0, 3))
+            events.close_stream()
 
     # ✅ 모든 작업(run)이 끝난 직후, 딱 한 번 우체통으로 데이터를 던집니다!
     try:
@@ -0,0 +1,55 @@
+# tests/test_browser_profile.py
+# -*- coding: utf-8 -*-
+"""
+engine_common.browser_profile.scope / blocked_kinds — 탭 allow:/block: 이 스레드별 차단 종류에 반영되는지.
+
+  python -m pytest -q tests/test_browser_profile.py
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from engine_common import browser_profile as bp  # noqa: E402
+
+DEFAULT = {"images", "media", "fonts", "trackers"}
+
+
+@pytest.fixture(autouse=True)
+def _lite(monkeypatch):
+    monkeypatch.setattr(bp, "BROWSER_PROFILE", "lite")
+    monkeypatch.setattr(bp, "BROWSER_BLOCK", ",".join(sorted(DEFAULT)))
+
+
+def test_default_outside_scope():
+    assert bp.blocked_kinds() == DEFAULT
+
+
+def test_allow_and_block():
+    with bp.scope(allow=["images"], block=["css"]) as kinds:
+        assert kinds == (DEFAULT - {"images"}) | {"css"}
+        assert bp.blocked_kinds() == kinds
+    assert bp.blocked_kinds() == DEFAULT
+
+
+def test_allow_all_blocks_nothing():
+    with bp.scope(allow=sorted(DEFAULT)) as kinds:
+        assert kinds == frozenset()
+        assert bp.blocked_kinds() == frozenset()     # 빈 집합이 기본값으로 되돌아가면 안 됨
+    assert bp.blocked_kinds() == DEFAULT
+
+
+def test_nested_scopes_start_from_outer():
+    with bp.scope(allow=sorted(DEFAULT)):
+        with bp.scope(block=["css"]) as inner:
+            assert inner == {"css"}                  # 바깥의 "모두 허용" 위에 css 만 추가
+        with bp.scope() as inner:
+            assert inner == frozenset()
+        assert bp.blocked_kinds() == frozenset()
+    with bp.scope(allow=["images"]):
+        with bp.scope(allow=["fonts"]) as inner:
+            assert inner == DEFAULT - {"images", "fonts"}
+        assert bp.blocked_kinds() == DEFAULT - {"images"}
@@ -0,0 +1,203 @@
+# tests/test_table_grid.py
+# -*- coding: utf-8 -*-
+"""
+engine_common.table_grid (lxml 경로) 와 dom_tables.grid_from_json (브라우저 경로) 이 같은 격자를 만드는지.
+
+브라우저 JSON 은 dom_tables._JS 의 grid(t) 가 같은 HTML 에 대해 돌려주는 값을 그대로 적어 둔 것이다
+(셀은 한 번만, 칸에는 셀 번호, -1 은 빈 칸). 사설 탭 runner 는 두 경로를 섞어 쓰므로
+(fetch: http/auto 는 HTML → build_grid, 브라우저는 find_grid) 격자가 다르면 같은 탭 결과가 달라진다.
+
+  python -m pytest -q tests/test_table_grid.py
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from engine_common.dom_tables import grid_from_json  # noqa: E402
+from engine_common.table_grid import build_grid, grid_from_html, records  # noqa: E402
+
+
+def _cell(t, r, c, rs, cs, s, **kw):
+    return dict(t=t, r=r, c=c, rs=rs, cs=cs, s=s, **kw)
+
+
+def _shape(grid):
+    """칸마다 (태그, 시작 행, 시작 열, rowspan, colspan, 텍스트) — 두 경로 비교용."""
+    return [[None if c is None else (c.name, c.r0, c.c0, c.rowspan, c.colspan, c.text()) for c in row]
+            for row in grid.rows]
+
+
+def _both(html, js):
+    g, j = build_grid(html), grid_from_json(js)
+    assert _shape(g) == _shape(j)
+    assert g.ncols == j.ncols
+    assert g.header_texts() == j.header_texts()
+    return g, j
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# rowspan / colspan 펼치기
+# ──────────────────────────────────────────────────────────────────────────────
+SPAN_HTML = (
+    "<table><thead><tr><th>회차</th><th>구분</th><th>일자</th></tr></thead><tbody>"
+    '<tr><td rowspan="2">1회</td><td>필기</td><td>03.01</td></tr>'
+    "<tr><td>실기</td><td>04.01</td></tr>"
+    '<tr><td colspan="2">2회 공통</td><td>05.01</td></tr>'
+    "</tbody></table>"
+)
+SPAN_JS = {
+    "header": [_cell("th", 0, 0, 1, 1, ["회차"]), _cell("th", 0, 1, 1, 1, ["구분"]), _cell("th", 0, 2, 1, 1, ["일자"])],
+    "cells": [
+        _cell("td", 0, 0, 2, 1, ["1회"]), _cell("td", 0, 1, 1, 1, ["필기"]), _cell("td", 0, 2, 1, 1, ["03.01"]),
+        _cell("td", 1, 1, 1, 1, ["실기"]), _cell("td", 1, 2, 1, 1, ["04.01"]),
+        _cell("td", 2, 0, 1, 2, ["2회 공통"]), _cell("td", 2, 2, 1, 1, ["05.01"]),
+    ],
+    "rows": [[0, 1, 2], [0, 3, 4], [5, 5, 6]],
+}
+
+
+def test_span_fill_down():
+    for g in _both(SPAN_HTML, SPAN_JS):
+        assert [[c.text() for c in row] for row in g.rows] == [
+            ["1회", "필기", "03.01"],
+            ["1회", "실기", "04.01"],
+            ["2회 공통", "2회 공통", "05.01"],
+        ]
+        assert g.header_texts() == ["회차", "구분", "일자"]
+        # 병합 셀은 덮는 모든 칸이 같은 Cell (텍스트 한 번만 계산)
+        assert g.rows[0][0] is g.rows[1][0]
+        assert g.rows[2][0] is g.rows[2][1]
+        assert g.rows[0][0].is_origin(0) and not g.rows[1][0].is_origin(1)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# display:none 셀
+# ──────────────────────────────────────────────────────────────────────────────
+HIDDEN_HTML = (
+    "<table><tbody>"
+    '<tr><td>a</td><td style="Display: None">x</td><td>b</td></tr>'
+    "<tr><td>c</td><td>d</td></tr>"
+    "</tbody></table>"
+)
+HIDDEN_JS = {
+    # 헤더(thead 없음 → 첫 행)는 숨김 셀도 포함한다 (build_grid 와 같음)
+    "header": [_cell("td", 0, 0, 1, 1, ["a"]), _cell("td", 0, 1, 1, 1, ["x"]), _cell("td", 0, 2, 1, 1, ["b"])],
+    "cells": [_cell("td", 0, 0, 1, 1, ["a"]), _cell("td", 0, 1, 1, 1, ["b"]),
+              _cell("td", 1, 0, 1, 1, ["c"]), _cell("td", 1, 1, 1, 1, ["d"])],
+    "rows": [[0, 1], [2, 3]],
+}
+
+
+def test_hidden_cells_skipped():
+    for g in _both(HIDDEN_HTML, HIDDEN_JS):
+        assert [[c.text() for c in row] for row in g.rows] == [["a", "b"], ["c", "d"]]
+        assert g.ncols == 2
+    shown = build_grid(HIDDEN_HTML, skip_hidden=False)
+    assert [[c and c.text() for c in row] for row in shown.rows] == [["a", "x", "b"], ["c", "d", None]]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 표 끝을 넘는 rowspan
+# ──────────────────────────────────────────────────────────────────────────────
+CLIP_HTML = (
+    "<table><tbody>"
+    '<tr><td>a</td><td rowspan="5">m</td></tr>'
+    "<tr><td>b</td></tr>"
+    "</tbody></table>"
+)
+CLIP_JS = {
+    "header": [_cell("td", 0, 0, 1, 1, ["a"]), _cell("td", 0, 1, 1, 1, ["m"])],
+    "cells": [_cell("td", 0, 0, 1, 1, ["a"]), _cell("td", 0, 1, 2, 1, ["m"]), _cell("td", 1, 0, 1, 1, ["b"])],
+    "rows": [[0, 1], [2, 1]],
+}
+
+
+def test_rowspan_clipped_at_table_end():
+    for g in _both(CLIP_HTML, CLIP_JS):
+        assert len(g) == 2
+        m = g.at(0, 1)
+        assert m.rowspan == 2
+        assert g.at(1, 1) is m
+        assert g.at(2, 1) is None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# records(): 빈 칸은 직전 행 값
+# ──────────────────────────────────────────────────────────────────────────────
+CARRY_HTML = (
+    "<table><tbody>"
+    "<tr><td>1회</td><td>03.01</td></tr>"
+    "<tr><td>2회</td><td>05.01</td><td>06.01</td></tr>"
+    "<tr><td>3회</td></tr>"
+    "</tbody></table>"
+)
+CARRY_JS = {
+    "header": [_cell("td", 0, 0, 1, 1, ["1회"]), _cell("td", 0, 1, 1, 1, ["03.01"])],
+    "cells": [_cell("td", 0, 0, 1, 1, ["1회"]), _cell("td", 0, 1, 1, 1, ["03.01"]),
+              _cell("td", 1, 0, 1, 1, ["2회"]), _cell("td", 1, 1, 1, 1, ["05.01"]), _cell("td", 1, 2, 1, 1, ["06.01"]),
+              _cell("td", 2, 0, 1, 1, ["3회"])],
+    "rows": [[0, 1, -1], [2, 3, 4], [5, -1, -1]],
+}
+
+
+def test_records_carry_over():
+    cols = ["회차", "접수", "발표"]
+    for g in _both(CARRY_HTML, CARRY_JS):
+        assert list(records(g, cols, fill="")) == [
+            {"회차": "1회", "접수": "03.01", "발표": ""},          # 첫 행의 빈 칸은 fill
+            {"회차": "2회", "접수": "05.01", "발표": "06.01"},
+            {"회차": "3회", "접수": "05.01", "발표": "06.01"},     # 빈 칸은 직전 행 값
+        ]
+
+
+def test_records_text_computed_once_per_merged_cell():
+    for g in _both(SPAN_HTML, SPAN_JS):
+        calls = []
+
+        def _text(cell, key):
+            calls.append((cell.r0, cell.c0, key))
+            return cell.text()
+
+        out = list(records(g, ["회차", "구분", "일자"], text=_text))
+        assert [r["회차"] for r in out] == ["1회", "1회", "2회 공통"]
+        assert calls.count((0, 0, "회차")) == 1
+        assert calls.count((2, 0, "회차")) == 1 and calls.count((2, 0, "구분")) == 1
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# img src / li 목록
+# ──────────────────────────────────────────────────────────────────────────────
+MEDIA_HTML = (
+    "<table><tbody><tr>"
+    '<td><img src="/a.png"> 로고 <img src="b.png"></td>'
+    "<td><ul><li>과목 <b>1</b></li><li>과목2<script>x()</script></li></ul></td>"
+    "</tr></tbody></table>"
+)
+MEDIA_JS = {
+    "header": [_cell("td", 0, 0, 1, 1, [" 로고 "], i=["/a.png", "b.png"]),
+               _cell("td", 0, 1, 1, 1, ["과목 ", "1", "과목2"], l=[["과목 ", "1"], ["과목2"]])],
+    "cells": [_cell("td", 0, 0, 1, 1, [" 로고 "], i=["/a.png", "b.png"]),
+              _cell("td", 0, 1, 1, 1, ["과목 ", "1", "과목2"], l=[["과목 ", "1"], ["과목2"]])],
+    "rows": [[0, 1]],
+}
+
+
+def test_imgs_and_list_items():
+    base = "https://www.example.or.kr/cert/guide.do"
+    for g in _both(MEDIA_HTML, MEDIA_JS):
+        logo, subjects = g.at(0, 0), g.at(0, 1)
+        assert logo.imgs() == ["/a.png", "b.png"]
+        assert logo.imgs(base) == ["https://www.example.or.kr/a.png", "https://www.example.or.kr/cert/b.png"]
+        assert logo.get_text(strip=True) == "로고"
+        assert subjects.list_items() == ["과목  1", "과목2"]       # script 텍스트 제외
+        assert subjects.list_items("") == ["과목 1", "과목2"]
+        assert subjects.text("|") == "과목 |1|과목2"
+
+
+def test_grid_from_html_picks_table_by_index():
+    html = f"<div>{CLIP_HTML}{SPAN_HTML}</div>"
+    assert _shape(grid_from_html(html, 1)) == _shape(build_grid(SPAN_HTML))
+    assert grid_from_html(html, 2) is None
+    assert grid_from_json(None) is None
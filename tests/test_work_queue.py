@@ -0,0 +1,54 @@
+# tests/test_work_queue.py
+# -*- coding: utf-8 -*-
+"""
+engine_common.work_queue.MemoryQueue — 임대 만료로 되돌려진 단위를 원래 워커가 늦게 끝냈을 때
+다시 임대되거나 dead 로 가지 않는지 (RedisQueue 의 Lua 스크립트와 같은 규칙).
+
+  python -m pytest -q tests/test_work_queue.py
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from engine_common.work_queue import MemoryQueue  # noqa: E402
+
+TTL = 0.001       # 1ms → 바로 만료
+
+
+def _expire():
+    time.sleep(0.01)
+
+
+def test_late_complete_after_reap_is_not_recrawled():
+    q = MemoryQueue(max_attempts=2)
+    q.enqueue("jmcd:1", {"id": "1"})
+    q.enqueue("jmcd:2", {"id": "2"})
+    a1, a2 = q.lease("A", TTL), q.lease("A", TTL)
+    assert (a1.id, a2.id) == ("jmcd:1", "jmcd:2")
+    _expire()
+    b = q.lease("B")                      # 두 임대를 회수 → jmcd:2 를 가져가고 jmcd:1 은 대기열에 남음
+    assert b.id == "jmcd:2" and q.stats()["pending"] == 1
+    assert q.complete(a1, {"ok": 1})      # 원래 워커가 늦게 끝냄 → 결과 기록 + 대기열에서 제거
+    assert q.stats()["pending"] == 0
+    assert q.lease("C") is None           # 다시 수집하지 않음
+    assert q.complete(b, {"ok": 2})
+    assert q.results() == {"jmcd:1": {"ok": 1}, "jmcd:2": {"ok": 2}}
+    assert q.dead() == [] and q.stats()["leased"] == 0
+
+
+def test_done_unit_with_expired_lease_is_dropped():
+    q = MemoryQueue(max_attempts=2)
+    q.enqueue("jmcd:1", {"id": "1"})
+    a = q.lease("A", TTL)
+    _expire()
+    b = q.lease("B", TTL)                 # 회수 후 다른 워커가 재임대 (attempt 2 = max_attempts)
+    assert b.id == "jmcd:1" and b.attempt == 2
+    assert q.complete(a, {"ok": "A"})     # 늦게 끝난 원래 워커의 결과가 먼저 기록됨
+    _expire()                             # B 도 끝내지 못하고 만료
+    assert q.lease("C") is None           # 이미 done → 되돌리지도 dead 로 보내지도 않음
+    assert q.dead() == [] and q.stats() == {"units": 1, "pending": 0, "leased": 0, "done": 1, "dead": 0}
+    assert not q.complete(b, {"ok": "B"})  # 결과는 처음 기록한 것 하나
+    assert q.results() == {"jmcd:1": {"ok": "A"}}
@@ -0,0 +1,80 @@
+# tools/bench_startup.py
+# -*- coding: utf-8 -*-
+"""
+엔트리포인트 기동 시간 측정 (python -X importtime 요약 + 명령 전체 시간).
+
+  python tools/bench_startup.py                       # 엔트리포인트 5개 임포트 시간 + 무거운 모듈 상위 8개
+  python tools/bench_startup.py --top 15 --runs 5     # 중앙값(ms)
+  python tools/bench_startup.py --cmd "-m public_cert_api.run_public --root data/chansol_api --jmcd 1320 --mode snapshot --steps normalize"
+  python tools/bench_startup.py --json > startup.json # 기록/비교용
+
+각 측정은 새 파이썬 프로세스(cold start, .pyc 는 있는 상태)에서 한다.
+"""
+from __future__ import annotations
+import argparse, json, shlex, statistics, subprocess, sys, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]         # Engine/
+
+ENTRY_POINTS = [
+    "run_once",
+    "public_cert_api.run_public",
+    "public_cert_api.fetch_qnet_tabs_min",
+    "public_cert_api.parse_tabs_min",
+    "public_cert_api.normalizer_min_v1",
+]
+
+
+def importtime(module: str) -> dict:
+    """-X importtime 출력 → {"total_ms", "modules": {이름: (self_ms, cumulative_ms)}}."""
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                       cwd=ROOT, capture_output=True, text=True)
+    if p.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{p.stderr[-2000:]}")
+    mods = {}
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        mods[name.strip()] = (int(self_us) / 1000, int(cum_us) / 1000)
+    return {"total_ms": mods.get(module, (0, 0))[1], "modules": mods}
+
+
+def wall(argv: list[str]) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, *argv], cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser(description="엔트리포인트 임포트/기동 시간 측정")
+    ap.add_argument("--module", action="append", help="측정할 모듈 (여러 번 가능, 기본 엔트리포인트 5개)")
+    ap.add_argument("--runs", type=int, default=3, help="반복 횟수 (중앙값)")
+    ap.add_argument("--top", type=int, default=8, help="누적 시간 상위 모듈 수")
+    ap.add_argument("--cmd", action="append", help="전체 시간을 잴 파이썬 인자 (예: \"-m public_cert_api.run_public …\")")
+    ap.add_argument("--json", action="store_true", help="결과를 JSON 으로")
+    args = ap.parse_args()
+
+    report = {"python": sys.version.split()[0], "imports": {}, "commands": {}}
+    for m in args.module or ENTRY_POINTS:
+        runs = [importtime(m) for _ in range(max(1, args.runs))]
+        last = runs[-1]["modules"]
+        top = sorted(((n, c) for n, (_s, c) in last.items() if n != m), key=lambda x: -x[1])[:args.top]
+        report["imports"][m] = {"ms": round(statistics.median(r["total_ms"] for r in runs), 1),
+                                "modules": len(last), "top": [[n, round(c, 1)] for n, c in top]}
+    for c in args.cmd or []:
+        report["commands"][c] = round(statistics.median(wall(shlex.split(c)) for _ in range(max(1, args.runs))), 1)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    for m, r in report["imports"].items():
+        print(f"{r['ms']:>8.1f} ms  {r['modules']:>4} modules  import {m}")
+        for n, c in r["top"]:
+            print(f"{'':>12}{c:>8.1f} ms  {n}")
+    for c, ms in report["commands"].items():
+        print(f"{ms:>8.1f} ms  python {c}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# tools/recrawl_plan.py
+# -*- coding: utf-8 -*-
+"""
+하루 요청 예산 안의 재수집 계획 만들기 (engine_common.freshness).
+
+  # 공공 jmcd 목록 + 사설 전체 → plan.json
+  python tools/recrawl_plan.py --jmcd-list r013.txt --all-certs \
+      --config private-cert-crawl/configs/cert_map.yaml --budget 800 --out data/_cache/plan.json
+
+  # 실행 (계획 순서 = 우선순위)
+  python -m public_cert_api.run_public --root data/chansol_api --plan data/_cache/plan.json
+  python run_once.py --config private-cert-crawl/configs/cert_map.yaml --plan data/_cache/plan.json
+
+탭 간격은 각 cert_map.yaml 탭의 recrawl:(예: 6h, 7d) → 없으면 탭 이름별 기본값.
+공공 탭 설정은 public_cert_api/configs/cert_map.yaml 의 chansol_api 탭을 모든 jmcd 에 쓴다.
+--out 이 없으면 stdout 으로 계획 JSON, 요약은 항상 stderr.
+"""
+from __future__ import annotations
+import argparse, json, sys
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]         # Engine/
+sys.path.insert(0, str(ROOT))
+
+from engine_common import freshness  # noqa: E402
+
+PUBLIC_CFG = ROOT / "public_cert_api" / "configs" / "cert_map.yaml"
+
+
+def _read_list(path: str) -> list[str]:
+    with open(path, encoding="utf-8-sig") as f:
+        return [ln.strip() for ln in f if ln.strip() and not ln.lstrip().startswith("#")]
+
+
+def _load_yaml(path: Path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="신선도 기반 재수집 계획 (시험일정 날짜 + 변경 이력 + 요청 예산)")
+    ap.add_argument("--jmcd", action="append", help="jmcd (여러 번 가능)")
+    ap.add_argument("--jmcd-list", action="append", help="jmcd 목록 txt (여러 번 가능)")
+    ap.add_argument("--certs", help="사설 자격증들 (콤마 구분)")
+    ap.add_argument("--all-certs", action="store_true", help="--config 의 모든 자격증")
+    ap.add_argument("--config", help="사설 cert_map.yaml 경로")
+    ap.add_argument("--budget", type=int, default=freshness.RECRAWL_BUDGET, help="요청 예산 (기본 RECRAWL_BUDGET)")
+    ap.add_argument("--out", help="계획 JSON 저장 경로 (없으면 stdout)")
+    args = ap.parse_args()
+
+    from public_cert_api.run_public import _clean_jmcd
+
+    units = []
+    jmcds = list(args.jmcd or [])
+    for path in args.jmcd_list or []:
+        jmcds += _read_list(path)
+    if jmcds:
+        pub = _load_yaml(PUBLIC_CFG).get("certifications", {}).get("chansol_api", {}).get("tabs") or []
+        pub_tabs = {t["name"]: t for t in pub}
+        for j in dict.fromkeys(filter(None, map(_clean_jmcd, jmcds))):
+            units.append(("jmcd", j, pub_tabs))
+
+    certs = [c.strip() for c in (args.certs or "").split(",") if c.strip()]
+    if certs or args.all_certs:
+        if not args.config:
+            raise SystemExit("--certs / --all-certs 에는 --config 가 필요합니다.")
+        cfg = _load_yaml(Path(args.config)).get("certifications", {})
+        if args.all_certs:
+            certs += list(cfg)
+        for c in dict.fromkeys(certs):
+            if c not in cfg:
+                print(f"[WARN] unknown cert: {c}", file=sys.stderr)
+                continue
+            units.append(("cert", c, {t["name"]: t for t in cfg[c].get("tabs") or []}))
+
+    plan = freshness.plan(units, budget=args.budget)
+    text = json.dumps(plan, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    print(f"[plan] {len(plan['units'])}/{len(units)} units, cost {plan['cost']}/{plan['budget']}, "
+          f"deferred {len(plan['deferred'])}" + (f" → {args.out}" if args.out else ""), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
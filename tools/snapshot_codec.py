@@ -0,0 +1,141 @@
+# tools/snapshot_codec.py
+# -*- coding: utf-8 -*-
+"""
+공공 HTML 스냅샷 코덱 관리 (engine_common.snapshot_codec).
+
+  # 1) 사전 학습: 스냅샷 루트의 탭 HTML(평문/.gz/.zst)에서 표본 → public_cert_api/configs/zstd/qnet-html-v<N>.zdict
+  python tools/snapshot_codec.py train --root data/chansol_api --limit 3000
+
+  # 2) 기존 .gz 루트를 .zst 로 (풀어서 sha256 비교 후 .gz 삭제, 스레드 병렬)
+  python tools/snapshot_codec.py migrate --root data/chansol_api --workers 4
+  python tools/snapshot_codec.py migrate --root data/chansol_api --dry-run
+
+  # 3) 확장자별 용량 + 전체 풀기 시간(재파싱 I/O) — 이전/이후 비교용
+  python tools/snapshot_codec.py stats --root data/chansol_api
+
+사전 파일은 저장소에 커밋한다 (zst 파일은 만들 때 쓴 사전 ID 로만 풀린다).
+"""
+from __future__ import annotations
+import argparse, json, random, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]         # Engine/
+sys.path.insert(0, str(ROOT))
+
+from engine_common import snapshot_codec  # noqa: E402
+
+TAB_STEMS = ("basic_info", "exam_info", "preference")
+KINDS = ("html", "html.zst", "html.gz")
+
+
+def iter_snapshots(root: Path, kinds=KINDS):
+    """<root>/<jmcd>/<tab>.html[.zst|.gz] (exam_info.frame.N.html 포함)."""
+    for kind in kinds:
+        for stem in (*TAB_STEMS, "exam_info.frame.*"):
+            yield from root.glob(f"*/{stem}.{kind}")
+
+
+def cmd_train(args):
+    files = sorted(iter_snapshots(Path(args.root)))
+    if not files:
+        raise SystemExit(f"no snapshots under {args.root}")
+    random.Random(0).shuffle(files)
+    files = files[:args.limit]
+    t0 = time.time()
+    path = snapshot_codec.train(files, size=args.size, out_dir=args.out_dir)
+    print(f"[train] {len(files)} samples → {path} ({path.stat().st_size / 1024:.0f}KB, {time.time() - t0:.1f}s)")
+
+
+def cmd_migrate(args):
+    codec = snapshot_codec.get_codec(args.to)
+    src_kinds = [k for k in KINDS if not k.endswith(codec.suffix)]
+    if not args.include_plain:
+        src_kinds = [k for k in src_kinds if k != "html"]
+    files = sorted(iter_snapshots(Path(args.root), src_kinds))
+    dictionary = getattr(codec, "dictionary", None)
+    print(f"[migrate] {len(files)} files → {codec.name}"
+          + (f" (dict id {dictionary.dict_id()})" if dictionary is not None else ""))
+    if args.dry_run or not files:
+        return
+
+    before = after = failed = 0
+    t0 = time.time()
+
+    def _one(p: Path):
+        size = p.stat().st_size
+        if p.suffix in snapshot_codec.SUFFIXES:
+            dst = snapshot_codec.transcode(p, codec, verify=not args.no_verify)
+        else:
+            dst = snapshot_codec.compress_file(p, codec)
+        return size, dst.stat().st_size
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        for p, fut in [(p, ex.submit(_one, p)) for p in files]:
+            try:
+                b, a = fut.result()
+                before, after = before + b, after + a
+            except Exception as e:
+                failed += 1
+                print(f"[WARN] {p}: {type(e).__name__}: {e}")
+    ratio = after / before if before else 0
+    print(f"[migrate] {len(files) - failed} ok, {failed} failed: {before / 1048576:.1f}MB → {after / 1048576:.1f}MB "
+          f"({ratio:.1%}) in {time.time() - t0:.1f}s")
+    if failed:
+        raise SystemExit(1)
+
+
+def cmd_stats(args):
+    report = {"dicts": snapshot_codec.dict_info(), "kinds": {}}
+    for kind in KINDS:
+        files = list(iter_snapshots(Path(args.root), [kind]))
+        if not files:
+            continue
+        raw = 0
+        t0 = time.perf_counter()
+        for p in files:
+            raw += len(snapshot_codec.read_bytes(p))
+        report["kinds"][kind] = {"files": len(files), "disk_bytes": sum(p.stat().st_size for p in files),
+                                 "raw_bytes": raw, "read_ms": round((time.perf_counter() - t0) * 1000, 1)}
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    for d in report["dicts"]:
+        print(f"[dict] v{d['version']} id={d['id']} {d['bytes'] / 1024:.0f}KB {d['path']}")
+    for kind, r in report["kinds"].items():
+        ratio = r["disk_bytes"] / r["raw_bytes"] if r["raw_bytes"] else 0
+        print(f"{kind:>9}: {r['files']:>6} files  {r['disk_bytes'] / 1048576:>8.1f}MB on disk "
+              f"({ratio:.1%} of {r['raw_bytes'] / 1048576:.1f}MB)  read {r['read_ms']:.0f}ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="공공 HTML 스냅샷 코덱: 사전 학습 / .gz → .zst 이전 / 용량·읽기 시간")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    t = sub.add_parser("train", help="스냅샷으로 zstd 사전 학습 (새 버전 파일)")
+    t.add_argument("--root", required=True, help="스냅샷 루트 (예: data/chansol_api)")
+    t.add_argument("--limit", type=int, default=3000, help="표본 파일 수 상한")
+    t.add_argument("--size", type=int, default=snapshot_codec.DICT_SIZE, help="사전 크기(바이트)")
+    t.add_argument("--out-dir", type=Path, help="사전 폴더 (기본: SNAPSHOT_DICT_DIR 첫 폴더)")
+    t.set_defaults(fn=cmd_train)
+
+    m = sub.add_parser("migrate", help="기존 압축본(.gz)을 다른 코덱(기본 zst)으로 재압축")
+    m.add_argument("--root", required=True)
+    m.add_argument("--to", choices=["zst", "gz"], default="zst")
+    m.add_argument("--workers", type=int, default=4)
+    m.add_argument("--include-plain", action="store_true", help="압축 안 된 .html 도 압축")
+    m.add_argument("--no-verify", action="store_true", help="재압축 뒤 풀어서 비교하는 검증 생략")
+    m.add_argument("--dry-run", action="store_true")
+    m.set_defaults(fn=cmd_migrate)
+
+    s = sub.add_parser("stats", help="확장자별 파일 수·디스크 용량·전체 풀기 시간")
+    s.add_argument("--root", required=True)
+    s.add_argument("--json", action="store_true")
+    s.set_defaults(fn=cmd_stats)
+
+    args = ap.parse_args()
+    args.fn(args)
+
+
+if __name__ == "__main__":
+    main()